@@ -2,13 +2,25 @@
 Options Trading Configuration
 Configurable settings for RTX options trading strategy
 """
+from dataclasses import dataclass
 from datetime import datetime
+from typing import Optional
 import os
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
+@dataclass(frozen=True)
+class SizingContext:
+    """Per-request position sizing inputs, passed explicitly instead of mutating shared config"""
+    position_size_pct: Optional[float] = None  # Replaces MAX_POSITION_SIZE_PCT for this request (e.g. Kelly fraction)
+    source: str = "default"
+
+    @classmethod
+    def from_fraction(cls, fraction: float, source: str = "kelly") -> "SizingContext":
+        return cls(position_size_pct=fraction, source=source)
+
 class OptionsConfig:
     """Configurable options trading parameters"""
     
@@ -47,6 +59,11 @@ class OptionsConfig:
     
     # Data Quality Settings
     MAX_DATA_AGE_MINUTES = 5  # Data must be fresh
+
+    # Quote staleness budgets (seconds) per consumer
+    QUOTE_MAX_AGE_EXIT = 5         # Exit checks and fills
+    QUOTE_MAX_AGE_SCORING = 60     # Candidate selection / scoring
+    QUOTE_MAX_AGE_DASHBOARD = 300  # Status displays
     PRICE_VALIDATION_TOLERANCE = 0.05  # 5% price difference tolerance
     
     # Learning Parameters
@@ -54,9 +71,13 @@ class OptionsConfig:
     LEARNING_RATE = 0.1  # How fast to adjust signal weights
     
     @classmethod
-    def get_position_size(cls, account_balance: float) -> float:
-        """Calculate maximum position size based on account balance"""
-        max_per_trade = account_balance * cls.MAX_POSITION_SIZE_PCT
+    def get_position_size(cls, account_balance: float, sizing: Optional[SizingContext] = None) -> float:
+        """Calculate maximum position size based on account balance (and the request's sizing inputs)"""
+        position_size_pct = cls.MAX_POSITION_SIZE_PCT
+        if sizing is not None and sizing.position_size_pct is not None:
+            position_size_pct = sizing.position_size_pct
+        
+        max_per_trade = account_balance * position_size_pct
         
         # Override for options trading - need higher limits for real options costs
         # Check for user override
@@ -73,9 +94,10 @@ class OptionsConfig:
             return min(800, max_per_trade * 0.60)  # Even more conservative
     
     @classmethod
-    def get_contracts_for_trade(cls, option_price: float, account_balance: float) -> int:
+    def get_contracts_for_trade(cls, option_price: float, account_balance: float,
+                                sizing: Optional[SizingContext] = None) -> int:
         """Calculate number of contracts to trade"""
-        max_investment = cls.get_position_size(account_balance)
+        max_investment = cls.get_position_size(account_balance, sizing)
         
         # Cost per contract (include commission estimate)
         cost_per_contract = (option_price * 100) + (cls.COMMISSION_PER_CONTRACT * 2)  # Round trip
@@ -95,12 +117,12 @@ class OptionsConfig:
     @classmethod
     def is_market_hours(cls) -> bool:
         """Check if market is currently open"""
-        from datetime import datetime
         import pytz
+        from src.core.market_data_provider import market_data
         
-        # Get current ET time
+        # Get current ET time (simulated clock when replaying recorded data)
         et = pytz.timezone('US/Eastern')
-        now = datetime.now(et)
+        now = market_data.now(et)
         
         # Check if weekday (Monday=0, Sunday=6)
         if now.weekday() >= 5:  # Weekend
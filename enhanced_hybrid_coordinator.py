@@ -37,6 +37,8 @@ from src.ml.advanced_features import AdvancedFeatureEngineer
 from src.ml.lstm_model import LSTMTradingModel, LSTMWithAttention
 from src.ml.ensemble_stacker import EnsembleStacker
 from src.ml.multitask_model import MultiTaskTradingModel
+from src.core.delta_sync import import_delta, remote_export_command, source_id, watermarks_for
+from src.ml.feature_store import FeatureStore, feature_version
 
 class HybridCoordinator:
     """
@@ -64,6 +66,8 @@ class HybridCoordinator:
         self.server_learning_path = '/opt/rtx-trading/continuous_learning.py'
         self.server_models_path = '/opt/rtx-trading/trained_models/'
         self.server_data_path = '/opt/rtx-trading/ml_training_data/signal_performance.db'
+        self.server_app_dir = '/opt/rtx-trading'
+        self.local_mirror_db = self.local_work_dir / 'server_data_latest.db'  # Kept between runs; synced by delta
         self.server_export_path = '/opt/rtx-trading/data_export/'
         
         # Create local directories
@@ -106,14 +110,12 @@ class HybridCoordinator:
             recent_logs = stdout.read().decode().strip()
             
             # Check database for recent updates
-            sftp = ssh.open_sftp()
             try:
-                # Download small sample to check update frequency
-                temp_db = self.local_work_dir / 'status_check.db'
-                sftp.get(self.server_data_path, str(temp_db))
+                # Sync the new rows only to check update frequency
+                mirror_db = self._pull_server_delta(ssh)
                 
                 # Quick analysis
-                conn = sqlite3.connect(temp_db)
+                conn = sqlite3.connect(mirror_db)
                 cursor = conn.cursor()
                 
                 # Get recent prediction count
@@ -131,14 +133,12 @@ class HybridCoordinator:
                 training_tables = cursor.fetchall()
                 
                 conn.close()
-                temp_db.unlink()  # Clean up
                 
             except Exception as e:
                 logger.warning(f"⚠️ Database check failed: {e}")
                 recent_predictions = 0
                 training_tables = []
             
-            sftp.close()
             ssh.close()
             
             status = {
@@ -161,6 +161,33 @@ class HybridCoordinator:
             logger.error(f"❌ Server status check failed: {e}")
             return {'error': str(e), 'needs_local_training': True}
     
+    def _pull_server_delta(self, ssh: paramiko.SSHClient) -> Path:
+        """Bring the local mirror of the server database up to date with only the rows it lacks"""
+        source = source_id(self.server_data_path, host=self.server_config['hostname'])
+        remote_delta = f'/tmp/hybrid_delta_{os.path.basename(self.server_data_path)}.npz'
+        local_delta = self.local_work_dir / 'server_delta.npz'
+        
+        command = remote_export_command(
+            self.server_data_path, remote_delta, watermarks_for(str(self.local_mirror_db), source), self.server_app_dir
+        )
+        stdin, stdout, stderr = ssh.exec_command(command)
+        if stdout.channel.recv_exit_status() != 0:
+            raise RuntimeError(f"Server delta export failed: {stderr.read().decode().strip()}")
+        
+        sftp = ssh.open_sftp()
+        try:
+            sftp.get(remote_delta, str(local_delta))
+            sftp.remove(remote_delta)
+        finally:
+            sftp.close()
+        
+        try:
+            applied = import_delta(str(local_delta), str(self.local_mirror_db), source)
+        finally:
+            local_delta.unlink(missing_ok=True)
+        logger.info(f"🔄 Server delta: {sum(applied.values())} new rows ({', '.join(applied) or 'no changes'})")
+        return self.local_mirror_db
+    
     def _should_run_heavy_training(self, recent_predictions: int) -> bool:
         """Determine if we should run heavy training"""
         # Run if:
@@ -249,16 +276,13 @@ class HybridCoordinator:
         logger.info("🔄 Syncing and analyzing server data...")
         
         try:
-            # Download database
+            # Sync database (rows past the mirror's watermarks only)
             ssh = paramiko.SSHClient()
             ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
             ssh.connect(**self.server_config)
-            sftp = ssh.open_sftp()
             
-            local_db = self.local_work_dir / 'server_data_latest.db'
-            sftp.get(self.server_data_path, str(local_db))
+            local_db = self._pull_server_delta(ssh)
             
-            sftp.close()
             ssh.close()
             
             # Analyze data
@@ -337,7 +361,7 @@ class HybridCoordinator:
         
         try:
             # Load and prepare data
-            local_db = self.local_work_dir / 'server_data_latest.db'
+            local_db = self.local_mirror_db
             if not local_db.exists():
                 logger.error("❌ No synced data found")
                 return False
@@ -398,9 +422,10 @@ class HybridCoordinator:
             df['profitable_move'] = (abs(df['actual_move_24h'].fillna(0)) > 0.01).astype(int)
             df['high_profit'] = (abs(df['actual_move_24h'].fillna(0)) > 0.02).astype(int)
             
-            # Engineer advanced features
+            # Engineer advanced features (only for predictions not already in the feature store)
             logger.info("🔧 Engineering advanced features...")
-            df_enhanced = self.feature_engineer.engineer_features(df)
+            store = FeatureStore("advanced_hybrid", feature_version(AdvancedFeatureEngineer))
+            df_enhanced = store.build(df, lambda rows: self.feature_engineer.engineer_features(df, rows=rows.index))
             
             # Prepare features and targets
             exclude_columns = {
@@ -412,7 +437,7 @@ class HybridCoordinator:
             
             feature_columns = [col for col in df_enhanced.columns if col not in exclude_columns]
             X = df_enhanced[feature_columns].fillna(0)
-            y = df[['outcome_correct', 'profitable_move', 'high_profit']].fillna(0)
+            y = df.loc[X.index, ['outcome_correct', 'profitable_move', 'high_profit']].fillna(0)
             
             data_stats = {
                 'total_samples': len(df),
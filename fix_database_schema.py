@@ -1,68 +1,24 @@
 #!/usr/bin/env python3
 """
 Fix Database Schema
-Ensures strategy databases match the expected schema
+Brings every strategy database up to the current schema version
+
+Strategy databases used to be deleted and recreated by hand when their schema drifted.
+Schema changes now live in src/core/db_migrations.py; this script applies any pending
+steps in place (no data is removed) and prints the query-plan audit for each file.
 """
 import sys
 import os
 sys.path.append('/opt/rtx-trading' if os.path.exists('/opt/rtx-trading') else '.')
 
-from src.core.options_paper_trader import OptionsPaperTrader
-from loguru import logger
+from src.core.db_migrations import main
 
 def fix_database_schema():
-    """Fix database schema by creating fresh strategy databases with correct structure"""
-    
-    # Remove broken databases
-    for strategy in ["conservative", "moderate", "aggressive"]:
-        db_path = f"data/options_performance_{strategy}.db"
-        if os.path.exists(db_path):
-            os.remove(db_path)
-            logger.info(f"🗑️ Removed broken {db_path}")
-    
-    # Define realistic strategy states
-    strategy_configs = {
-        "conservative": {"balance": 890.0, "open_positions": 0},
-        "moderate": {"balance": 720.0, "open_positions": 1},
-        "aggressive": {"balance": 580.0, "open_positions": 2}
-    }
-    
-    print("🔧 Creating fresh strategy databases...")
-    
-    for strategy, config in strategy_configs.items():
-        try:
-            # Create paper trader - this will create the correct database schema
-            trader = OptionsPaperTrader(
-                initial_balance=config["balance"],
-                db_suffix=f"_{strategy}"
-            )
-            
-            # Manually set balance for realism
-            trader.account_balance = config["balance"]
-            
-            # Add some fake positions in memory for moderate/aggressive
-            if config["open_positions"] > 0:
-                for i in range(config["open_positions"]):
-                    position_id = f"RTX_{strategy}_{i+1}_20250620_140000"
-                    trader.open_positions[position_id] = {
-                        'contract_symbol': 'RTX250627C00150000',
-                        'entry_price': 1.10 + (i * 0.15),
-                        'quantity': 2,
-                        'entry_time': '2025-06-20 14:00:00',
-                        'strategy': strategy,
-                        'total_cost': (1.10 + (i * 0.15)) * 2 * 100,
-                        'direction': 'BUY',
-                        'action': 'BUY_TO_OPEN_CALL'
-                    }
-            
-            logger.success(f"✅ {strategy}: ${trader.account_balance:.2f}, {len(trader.open_positions)} positions")
-            print(f"✅ {strategy.title()}: ${config['balance']:.2f}, {config['open_positions']} positions")
-            
-        except Exception as e:
-            logger.error(f"❌ Error creating {strategy}: {e}")
-            print(f"❌ {strategy.title()}: Error - {e}")
-    
-    print("\n🎯 Database schema fixed! All strategies have proper structure.")
+    """Migrate every data/*.db file and report hot queries that scan whole tables"""
+    print("🔧 Migrating strategy databases...")
+    flagged = main(sys.argv[1:])
+    print("\n🎯 Database schemas are current." + (" Some hot queries still scan full tables." if flagged else ""))
+    return flagged
 
 if __name__ == "__main__":
-    fix_database_schema()
\ No newline at end of file
+    sys.exit(fix_database_schema())
@@ -0,0 +1,26 @@
+"""
+Option Chain Fixtures
+Synthetic validated option chains shared by the scoring and sharding tests
+"""
+
+import numpy as np
+
+def synthetic_chain(n: int = 2000, seed: int = 3) -> dict:
+    """{contract_symbol: option_data} chain of n random contracts around a $100 spot (deterministic per seed)"""
+    rng = np.random.default_rng(seed)
+    chain = {}
+    for i in range(n):
+        option_type = "call" if i % 2 == 0 else "put"
+        strike = float(np.round(rng.uniform(85, 115) * 2) / 2)
+        bid = float(np.round(rng.uniform(0.2, 4.0), 2))
+        ask = float(np.round(bid * rng.uniform(1.02, 1.15), 2))
+        symbol = f"RTX261030{'C' if option_type == 'call' else 'P'}{int(strike * 1000):08d}_{i}"
+        chain[symbol] = {
+            "type": option_type, "strike": strike, "expiry": "2026-10-30", "bid": bid, "ask": ask,
+            "last": (bid + ask) / 2, "volume": int(rng.integers(50, 3000)), "openInterest": int(rng.integers(100, 8000)),
+            "impliedVolatility": float(rng.uniform(0.15, 0.6)),
+            "delta": float(rng.uniform(0.1, 0.9) * (1 if option_type == "call" else -1)),
+            "gamma": float(rng.uniform(0, 0.02)), "theta": float(-rng.uniform(0, 0.1)), "vega": float(rng.uniform(0, 0.3)),
+            "mid_price": (bid + ask) / 2, "spread_pct": (ask - bid) / ((ask + bid) / 2)
+        }
+    return chain
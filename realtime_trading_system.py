@@ -30,6 +30,7 @@ sys.path.append(os.path.dirname(__file__))
 from src.core.realtime_data_stream import RealTimeDataStream, MarketDataPoint
 from src.core.realtime_feature_engine import RealTimeFeatureEngine, RealTimeFeatures
 from src.core.streaming_ml_predictor import StreamingMLPredictor, MLPrediction
+from src.core.memory_accounting import memory_accountant
 
 # Import existing components
 try:
@@ -55,6 +56,8 @@ class RealTimeTradingSystem:
         self.data_stream = RealTimeDataStream()
         self.feature_engine = RealTimeFeatureEngine()
         self.ml_predictor = StreamingMLPredictor()
+        memory_accountant.track("realtime_data_stream", self.data_stream)
+        memory_accountant.track("streaming_ml_predictor", self.ml_predictor)
         
         # Performance tracking
         self.total_predictions = 0
@@ -365,6 +368,7 @@ class RealTimeTradingSystem:
         while self.is_running:
             try:
                 await self._check_system_health()
+                memory_accountant.enforce_budget()
                 await asyncio.sleep(60)  # Health check every minute
                 
             except Exception as e:
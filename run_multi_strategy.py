@@ -5,9 +5,11 @@ Launches 8 parallel trading strategies with cross-learning optimization
 """
 
 import asyncio
+import os
 import sys
 from loguru import logger
 from src.core.parallel_strategy_runner import ParallelStrategyRunner
+from src.core.sharded_strategy_runner import ShardedStrategyRunner
 from src.core.telegram_bot import telegram_bot
 
 # Configure logging
@@ -20,8 +22,9 @@ async def main():
     logger.info("🎯 STARTING MULTI-STRATEGY TRADING SYSTEM")
     logger.info("=" * 60)
     
-    # Create and start the parallel runner
-    runner = ParallelStrategyRunner()
+    # Create and start the parallel runner (sharded across processes when STRATEGY_WORKERS > 1)
+    workers = int(os.getenv("STRATEGY_WORKERS", 0))
+    runner = ShardedStrategyRunner(workers=workers) if workers > 1 else ParallelStrategyRunner()
     
     try:
         # Start parallel trading
@@ -17,7 +17,8 @@ USE_OPTIONS_SYSTEM = os.getenv('USE_OPTIONS_SYSTEM', 'true').lower() == 'true'
 
 if USE_OPTIONS_SYSTEM:
     logger.info("🎯 USING OPTIONS TRADING SYSTEM")
-    from src.core.options_scheduler import options_scheduler as scheduler
+    from src.core.component_registry import components
+    scheduler = components.lazy("options_scheduler")  # Built when the server starts trading
 else:
     logger.info("📈 Using legacy stock trading system")
     from src.core.scheduler import scheduler
@@ -12,6 +12,9 @@ from typing import Dict, List, Optional, Tuple, Any
 from loguru import logger
 import os
 
+from src.core.db_migrations import PAPER_TRADER_SCHEMA, ensure_schema
+from src.core.prediction_signals import signal_outcome_stats
+
 class AdaptiveLearningSystem:
     """Real-time learning system for options trading improvement"""
     
@@ -29,113 +32,52 @@ class AdaptiveLearningSystem:
             return {'error': 'No trading database found'}
         
         conn = sqlite3.connect(self.db_path)
-        
-        # Get all completed trades with signals data
-        query = """
-        SELECT 
-            p.prediction_id,
-            p.confidence,
-            p.signals_data,
-            o.net_pnl,
-            o.pnl_percentage,
-            o.exit_reason
-        FROM options_predictions p
-        INNER JOIN options_outcomes o ON p.prediction_id = o.prediction_id
-        WHERE p.signals_data IS NOT NULL 
-        AND p.signals_data != '{}' 
-        AND p.signals_data != ''
-        ORDER BY p.timestamp DESC
-        """
-        
-        df = pd.read_sql_query(query, conn)
+        ensure_schema(conn, PAPER_TRADER_SCHEMA)  # Backfills prediction_signals on older files
+        
+        # Closed trades that recorded signals, and per-(signal, direction) totals over them
+        total_trades = conn.execute("""
+        SELECT COUNT(DISTINCT s.prediction_id)
+        FROM prediction_signals s
+        INNER JOIN options_outcomes o ON s.prediction_id = o.prediction_id
+        """).fetchone()[0]
+        stats = signal_outcome_stats(conn)
         conn.close()
         
-        if df.empty:
+        if not total_trades:
             logger.warning("⚠️ No trades with signals data found")
             return {'error': 'No signals data available for learning'}
         
-        logger.info(f"📊 Analyzing {len(df)} trades with signals data")
+        logger.info(f"📊 Analyzing {total_trades} trades with signals data")
         
-        # Parse signals data and analyze performance
         signal_performance = {}
-        signal_names = set()
-        
-        for _, row in df.iterrows():
-            try:
-                signals_data = json.loads(row['signals_data'])
-                is_profitable = row['net_pnl'] > 0
-                pnl_pct = row['pnl_percentage']
-                
-                # Analyze each signal's contribution
-                for signal_name, signal_info in signals_data.items():
-                    signal_names.add(signal_name)
-                    
-                    if signal_name not in signal_performance:
-                        signal_performance[signal_name] = {
-                            'trades': [],
-                            'profitable_trades': 0,
-                            'total_trades': 0,
-                            'total_pnl': 0.0,
-                            'avg_confidence': 0.0,
-                            'directions': {'BUY': 0, 'SELL': 0, 'HOLD': 0}
-                        }
-                    
-                    perf = signal_performance[signal_name]
-                    direction = signal_info.get('direction', 'HOLD')
-                    confidence = signal_info.get('confidence', 0.5)
-                    
-                    # Convert percentage to decimal if needed
-                    if confidence > 1:
-                        confidence = confidence / 100.0
-                    
-                    perf['trades'].append({
-                        'direction': direction,
-                        'confidence': confidence,
-                        'profitable': is_profitable,
-                        'pnl_pct': pnl_pct
-                    })
-                    
-                    perf['total_trades'] += 1
-                    perf['directions'][direction] += 1
-                    perf['total_pnl'] += pnl_pct
-                    perf['avg_confidence'] += confidence
-                    
-                    if is_profitable:
-                        perf['profitable_trades'] += 1
-                
-            except (json.JSONDecodeError, KeyError) as e:
-                logger.warning(f"⚠️ Error parsing signals data: {e}")
-                continue
+        for row in stats:
+            perf = signal_performance.setdefault(row['signal_name'], {
+                'profitable_trades': 0,
+                'total_trades': 0,
+                'total_pnl': 0.0,
+                'avg_confidence': 0.0,
+                'directions': {'BUY': 0, 'SELL': 0, 'HOLD': 0},
+                'direction_effectiveness': {}
+            })
+            perf['total_trades'] += row['trades']
+            perf['profitable_trades'] += row['wins']
+            perf['total_pnl'] += row['total_pnl_pct']
+            perf['avg_confidence'] += row['total_confidence']
+            perf['directions'][row['direction']] = perf['directions'].get(row['direction'], 0) + row['trades']
+            perf['direction_effectiveness'][row['direction']] = row['wins'] / row['trades']
         
         # Calculate final metrics
         for signal_name, perf in signal_performance.items():
-            if perf['total_trades'] > 0:
-                perf['win_rate'] = perf['profitable_trades'] / perf['total_trades']
-                perf['avg_pnl_pct'] = perf['total_pnl'] / perf['total_trades']
-                perf['avg_confidence'] = perf['avg_confidence'] / perf['total_trades']
-                
-                # Calculate direction effectiveness
-                profitable_by_direction = {}
-                for trade in perf['trades']:
-                    direction = trade['direction']
-                    if direction not in profitable_by_direction:
-                        profitable_by_direction[direction] = {'profitable': 0, 'total': 0}
-                    
-                    profitable_by_direction[direction]['total'] += 1
-                    if trade['profitable']:
-                        profitable_by_direction[direction]['profitable'] += 1
-                
-                perf['direction_effectiveness'] = {}
-                for direction, stats in profitable_by_direction.items():
-                    if stats['total'] > 0:
-                        perf['direction_effectiveness'][direction] = stats['profitable'] / stats['total']
-                
-                # Calculate overall signal score (combines win rate and average P&L)
-                perf['signal_score'] = (perf['win_rate'] * 0.6) + (min(perf['avg_pnl_pct'], 1.0) * 0.4)
+            perf['win_rate'] = perf['profitable_trades'] / perf['total_trades']
+            perf['avg_pnl_pct'] = perf['total_pnl'] / perf['total_trades']
+            perf['avg_confidence'] = perf['avg_confidence'] / perf['total_trades']
+            
+            # Calculate overall signal score (combines win rate and average P&L)
+            perf['signal_score'] = (perf['win_rate'] * 0.6) + (min(perf['avg_pnl_pct'], 1.0) * 0.4)
         
         return {
             'signal_performance': signal_performance,
-            'total_trades_analyzed': len(df),
+            'total_trades_analyzed': total_trades,
             'analysis_timestamp': datetime.now().isoformat()
         }
     
@@ -0,0 +1,186 @@
+"""
+Component Registry
+Lazily built singletons and an import-time profile
+
+Heavy components (paper trader, data engine, Telegram bot, trackers...) are registered by
+"module:attribute" target and only imported/built the first time something touches them.
+``components.lazy(name)`` returns a stand-in that forwards every attribute access to the real
+object, so modules can keep their module-level names without paying for them at import time.
+
+Import-time profile:
+    python -m src.core.component_registry src.core.options_scheduler run_server
+"""
+
+import importlib
+import re
+import subprocess
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from loguru import logger
+
+Factory = Union[str, Callable[[], Any]]
+
+class ComponentRegistry:
+    """Name → factory table; each component is built at most once, on first use"""
+
+    def __init__(self):
+        self._factories: Dict[str, Factory] = {}
+        self._instances: Dict[str, Any] = {}
+        self._lock = threading.RLock()
+        self.build_seconds: Dict[str, float] = {}
+
+    def register(self, name: str, factory: Factory):
+        """factory is a "module:attribute" target or a zero-argument callable"""
+        with self._lock:
+            self._factories[name] = factory
+
+    def get(self, name: str) -> Any:
+        instance = self._instances.get(name)
+        if instance is not None:
+            return instance
+
+        with self._lock:
+            if name in self._instances:
+                return self._instances[name]
+            if name not in self._factories:
+                raise KeyError(f"Unknown component: {name}")
+
+            start = time.perf_counter()
+            instance = self._build(self._factories[name])
+            self.build_seconds[name] = time.perf_counter() - start
+            self._instances[name] = instance
+
+        logger.debug(f"🧱 Built {name} in {self.build_seconds[name] * 1000:.0f}ms")
+        return instance
+
+    def _build(self, factory: Factory) -> Any:
+        if callable(factory):
+            return factory()
+        module_name, _, attribute = factory.partition(":")
+        return getattr(importlib.import_module(module_name), attribute)
+
+    def lazy(self, name: str) -> "LazyComponent":
+        return LazyComponent(self, name)
+
+    def is_built(self, name: str) -> bool:
+        """True once built here, or once its module was imported directly (the singleton exists)"""
+        if name in self._instances:
+            return True
+        factory = self._factories.get(name)
+        if isinstance(factory, str):
+            module_name, _, attribute = factory.partition(":")
+            return hasattr(sys.modules.get(module_name), attribute)
+        return False
+
+    def reset(self, name: Optional[str] = None):
+        """Forget built instances (next access rebuilds)"""
+        with self._lock:
+            if name is None:
+                self._instances.clear()
+            else:
+                self._instances.pop(name, None)
+
+    def status(self) -> Dict[str, Optional[float]]:
+        """Build time in ms per registered component (None = not built yet, 0 = imported directly)"""
+        return {
+            name: round(self.build_seconds.get(name, 0.0) * 1000, 1) if self.is_built(name) else None
+            for name in self._factories
+        }
+
+class LazyComponent:
+    """Attribute-forwarding stand-in for a registry component"""
+
+    __slots__ = ("_registry", "_name")
+
+    def __init__(self, registry: ComponentRegistry, name: str):
+        object.__setattr__(self, "_registry", registry)
+        object.__setattr__(self, "_name", name)
+
+    def __getattr__(self, attribute: str) -> Any:
+        return getattr(self._registry.get(self._name), attribute)
+
+    def __setattr__(self, attribute: str, value: Any):
+        setattr(self._registry.get(self._name), attribute, value)
+
+    def __repr__(self) -> str:
+        state = "built" if self._registry.is_built(self._name) else "lazy"
+        return f"<LazyComponent {self._name} ({state})>"
+
+# Global registry: existing module singletons, imported on first touch
+components = ComponentRegistry()
+for _name, _target in {
+    "options_data_engine": "src.core.options_data_engine:options_data_engine",
+    "options_prediction_engine": "src.core.options_prediction_engine:options_prediction_engine",
+    "options_paper_trader": "src.core.options_paper_trader:options_paper_trader",
+    "outcome_tracker": "src.core.prediction_outcome_tracker:outcome_tracker",
+    "signal_tracker": "src.core.signal_effectiveness_tracker:signal_tracker",
+    "kelly_optimizer": "src.core.kelly_criterion_optimizer:kelly_optimizer",
+    "iv_rank_optimizer": "src.core.iv_rank_optimizer:iv_rank_optimizer",
+    "rtx_earnings_calendar": "src.core.rtx_earnings_calendar:rtx_earnings_calendar",
+    "multi_timeframe_confirmation": "src.core.multi_timeframe_confirmation:multi_timeframe_confirmation",
+    "telegram_bot": "src.core.telegram_bot:telegram_bot",
+    "performance_monitor": "src.core.performance_monitor:performance_monitor",
+    "cross_strategy_learning": "src.core.cross_strategy_learning:cross_strategy_learning",
+    "backtesting_engine": "src.core.backtesting_engine:backtesting_engine",
+    "iv_percentile_alerts": "src.core.iv_percentile_alerts:iv_percentile_alerts",
+    "iv_history": "src.core.iv_history:iv_history",
+    "automated_reset_system": "src.core.automated_reset_system:automated_reset_system",
+    "live_trading_framework": "src.core.live_trading_framework:live_trading_framework",
+}.items():
+    components.register(_name, _target)
+
+def _build_options_scheduler():
+    from src.core.options_scheduler import OptionsScheduler
+    return OptionsScheduler()
+
+components.register("options_scheduler", _build_options_scheduler)
+
+# ------------------------------------------------------------------ import profile
+
+_IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+def import_profile(module: str, python: str = sys.executable) -> List[Tuple[str, float, float, int]]:
+    """(module, self ms, cumulative ms, depth) for every import triggered by importing module"""
+    result = subprocess.run(
+        [python, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            rows.append((name, int(self_us) / 1000, int(cumulative_us) / 1000, len(indent) // 2))
+    return rows
+
+def format_import_profile(module: str, rows: List[Tuple[str, float, float, int]], top: int = 15) -> str:
+    """Total import time plus the heaviest packages pulled in directly by module"""
+    total, children = 0.0, []
+    for row in rows:  # importtime lists children before their parent
+        name, _, cumulative, depth = row
+        if depth > 0:
+            children.append(row)
+        elif name == module:
+            total = cumulative
+            break
+        else:
+            children = []  # Interpreter startup (site, encodings...)
+
+    packages: Dict[str, float] = {}
+    for name, _, cumulative, depth in children:
+        if depth == 1:
+            root = name.split(".")[0] if not name.startswith("src.") else name
+            packages[root] = packages.get(root, 0.0) + cumulative
+
+    lines = [f"📦 import {module}: {total:.0f}ms"]
+    for name, cumulative in sorted(packages.items(), key=lambda item: item[1], reverse=True)[:top]:
+        lines.append(f"   {cumulative:8.1f}ms  {name}")
+    return "\n".join(lines)
+
+if __name__ == "__main__":
+    for target in sys.argv[1:] or ["src.core.options_scheduler"]:
+        print(format_import_profile(target, import_profile(target)))
+        print()
@@ -0,0 +1,223 @@
+"""
+Trading Cycle Tracer
+Structured per-stage spans and latency histograms for the trading loop
+
+Every span is recorded into a Prometheus-style histogram keyed by stage (and an
+optional label such as the signal name), and every completed cycle is written as
+one JSON line to a size-rotated trace file so slow cycles can be inspected later.
+"""
+
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from datetime import datetime
+from logging.handlers import RotatingFileHandler
+from typing import Dict, List, Optional, Tuple
+from loguru import logger
+
+# Cycle budget is 15 minutes, individual stages range from ms (aggregation) to minutes (signals)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+class LatencyHistogram:
+    """Cumulative-bucket latency histogram (Prometheus semantics)"""
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)  # Last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float):
+        """Record one observation"""
+        self.counts[bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        self.max = max(self.max, seconds)
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        """Cumulative counts per upper bound, ending with +Inf"""
+        running = 0
+        result = []
+        for bound, count in zip(self.buckets, self.counts):
+            running += count
+            result.append((f"{bound:g}", running))
+        result.append(("+Inf", running + self.counts[-1]))
+        return result
+
+    def quantile(self, q: float) -> float:
+        """Approximate quantile (bucket upper bound)"""
+        if self.count == 0:
+            return 0.0
+        target = q * self.count
+        for bound, running in self.cumulative():
+            if running >= target:
+                return self.max if bound == "+Inf" else min(float(bound), self.max)
+        return self.max
+
+class CycleTracer:
+    """Collects spans for the current trading cycle and aggregates latency histograms"""
+
+    def __init__(self, trace_path: str = "logs/cycle_traces.jsonl", max_bytes: int = 5 * 1024 * 1024,
+                 backup_count: int = 3, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.trace_path = trace_path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.buckets = buckets
+
+        self.histograms: Dict[Tuple[str, str], LatencyHistogram] = {}
+        self.current_cycle: Optional[Dict] = None
+        self.cycles_completed = 0
+        self._lock = threading.Lock()
+        self._trace_logger: Optional[logging.Logger] = None
+
+    # ----------------------------------------------------------------- spans
+
+    def record(self, stage: str, seconds: float, label: str = "", **attributes):
+        """Record a finished span"""
+        with self._lock:
+            key = (stage, label)
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = LatencyHistogram(self.buckets)
+            histogram.observe(seconds)
+
+            if self.current_cycle is not None:
+                span = {
+                    "stage": stage,
+                    "offset_ms": round((time.perf_counter() - seconds - self.current_cycle["_t0"]) * 1000, 2),
+                    "duration_ms": round(seconds * 1000, 2)
+                }
+                if label:
+                    span["label"] = label
+                if attributes:
+                    span.update(attributes)
+                self.current_cycle["spans"].append(span)
+
+    @contextmanager
+    def span(self, stage: str, label: str = "", **attributes):
+        """Time a block of (sync or async) code as one span"""
+        start = time.perf_counter()
+        error = None
+        try:
+            yield
+        except Exception as e:
+            error = type(e).__name__
+            raise
+        finally:
+            if error:
+                attributes["error"] = error
+            self.record(stage, time.perf_counter() - start, label, **attributes)
+
+    def traced(self, stage: str, label: str = ""):
+        """Decorator form of span() for sync functions"""
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.span(stage, label or func.__name__):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    # ---------------------------------------------------------------- cycles
+
+    def start_cycle(self, cycle_id, source: str = "options_scheduler"):
+        """Begin collecting spans for a new cycle"""
+        with self._lock:
+            self.current_cycle = {
+                "cycle_id": cycle_id,
+                "source": source,
+                "started_at": datetime.now().isoformat(),
+                "spans": [],
+                "_t0": time.perf_counter()
+            }
+
+    def end_cycle(self, **attributes) -> Optional[Dict]:
+        """Finish the current cycle, record its total duration and append it to the trace file"""
+        with self._lock:
+            cycle = self.current_cycle
+            self.current_cycle = None
+        if cycle is None:
+            return None
+
+        duration = time.perf_counter() - cycle.pop("_t0")
+        self.record("cycle", duration)
+        cycle["duration_ms"] = round(duration * 1000, 2)
+        cycle.update(attributes)
+        self.cycles_completed += 1
+
+        self._write_trace(cycle)
+        return cycle
+
+    def _get_trace_logger(self) -> Optional[logging.Logger]:
+        """Lazily create the rotating trace file writer"""
+        if self._trace_logger is None:
+            try:
+                directory = os.path.dirname(self.trace_path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                trace_logger = logging.getLogger(f"algoslayer.cycle_trace.{id(self)}")
+                trace_logger.propagate = False
+                trace_logger.setLevel(logging.INFO)
+                handler = RotatingFileHandler(self.trace_path, maxBytes=self.max_bytes, backupCount=self.backup_count)
+                handler.setFormatter(logging.Formatter("%(message)s"))
+                trace_logger.addHandler(handler)
+                self._trace_logger = trace_logger
+            except Exception as e:
+                logger.warning(f"⚠️ Cycle trace file unavailable: {e}")
+        return self._trace_logger
+
+    def _write_trace(self, cycle: Dict):
+        """Append one cycle as a JSON line"""
+        trace_logger = self._get_trace_logger()
+        if trace_logger:
+            trace_logger.info(json.dumps(cycle, default=str))
+
+    # --------------------------------------------------------------- exports
+
+    def render_prometheus(self, metric: str = "algoslayer_cycle_stage_seconds") -> str:
+        """Render all histograms in Prometheus text exposition format"""
+        with self._lock:
+            items = sorted(self.histograms.items())
+            lines = [
+                f"# HELP {metric} Trading cycle stage latency in seconds",
+                f"# TYPE {metric} histogram"
+            ]
+            for (stage, label), histogram in items:
+                labels = f'stage="{stage}"' + (f',label="{label}"' if label else "")
+                for bound, count in histogram.cumulative():
+                    lines.append(f'{metric}_bucket{{{labels},le="{bound}"}} {count}')
+                lines.append(f"{metric}_sum{{{labels}}} {histogram.sum:.6f}")
+                lines.append(f"{metric}_count{{{labels}}} {histogram.count}")
+
+            lines.append("# HELP algoslayer_cycles_traced_total Trading cycles traced")
+            lines.append("# TYPE algoslayer_cycles_traced_total counter")
+            lines.append(f"algoslayer_cycles_traced_total {self.cycles_completed}")
+
+        return "\n".join(lines) + "\n"
+
+    def get_summary(self, top: int = 10) -> List[Dict]:
+        """Slowest stages by total time spent"""
+        with self._lock:
+            rows = [
+                {
+                    "stage": stage,
+                    "label": label,
+                    "count": h.count,
+                    "total_s": h.sum,
+                    "avg_s": h.sum / h.count if h.count else 0.0,
+                    "p95_s": h.quantile(0.95),
+                    "max_s": h.max
+                }
+                for (stage, label), h in self.histograms.items() if stage != "cycle"
+            ]
+        rows.sort(key=lambda r: r["total_s"], reverse=True)
+        return rows[:top]
+
+# Global instance
+cycle_tracer = CycleTracer()
@@ -3,17 +3,19 @@ Real-Time Performance Dashboard
 Comprehensive live dashboard accessible via Telegram with ASCII visualization
 """
 
-import os
-import sqlite3
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
 from loguru import logger
 
+from src.core.dashboard_snapshot import dashboard_snapshots, calculate_streak, strategy_status
+
 class PerformanceDashboard:
     """Real-time dashboard for multi-strategy trading system"""
     
-    def __init__(self):
-        self.strategies = ["conservative", "moderate", "aggressive", "scalping", "swing", "momentum", "volatility", "mean_reversion"]
+    def __init__(self, snapshots=None):
+        # Rendering reads the in-memory snapshot model; DB work happens in the snapshot engine
+        self.snapshots = snapshots or dashboard_snapshots
+        self.strategies = self.snapshots.strategies
         self.strategy_emojis = {
             "conservative": "🛡️",
             "moderate": "⚖️", 
@@ -26,7 +28,7 @@ class PerformanceDashboard:
         }
         
     def generate_dashboard(self) -> str:
-        """Generate comprehensive dashboard display"""
+        """Generate comprehensive dashboard display (pure formatting over snapshots)"""
         try:
             dashboard = "📊 **Live Multi-Strategy Dashboard**\n"
             dashboard += "=" * 45 + "\n\n"
@@ -59,112 +61,17 @@ class PerformanceDashboard:
             return f"❌ **Dashboard Error**: {str(e)}"
     
     def _get_all_strategy_data(self) -> Dict:
-        """Get comprehensive data for all strategies"""
+        """Get comprehensive data for all strategies from the in-memory snapshots"""
         data = {}
         
-        for strategy in self.strategies:
-            data[strategy] = self._get_strategy_data(strategy)
+        for strategy, strategy_data in self.snapshots.get_all_strategy_data().items():
+            data[strategy] = strategy_data or self._get_default_strategy_data(strategy)
             
         return data
     
     def _get_strategy_data(self, strategy_id: str) -> Dict:
         """Get detailed data for a single strategy"""
-        # Try production path first, fallback to local
-        db_path = f"/opt/rtx-trading/data/options_performance_{strategy_id}.db"
-        if not os.path.exists(db_path):
-            db_path = f"data/options_performance_{strategy_id}.db"
-            
-        if not os.path.exists(db_path):
-            return self._get_default_strategy_data(strategy_id)
-            
-        try:
-            conn = sqlite3.connect(db_path)
-            cursor = conn.cursor()
-            
-            # Get current balance
-            cursor.execute("SELECT balance_after FROM account_history ORDER BY rowid DESC LIMIT 1")
-            balance_row = cursor.fetchone()
-            balance = balance_row[0] if balance_row else 1000.0
-            
-            # Get total trades
-            cursor.execute("SELECT COUNT(*) FROM options_outcomes")
-            total_trades = cursor.fetchone()[0]
-            
-            # Get win rate
-            cursor.execute("SELECT COUNT(*) FROM options_outcomes WHERE net_pnl > 0")
-            winning_trades = cursor.fetchone()[0]
-            win_rate = (winning_trades / total_trades) if total_trades > 0 else 0
-            
-            # Get open positions
-            cursor.execute("SELECT COUNT(*) FROM options_predictions WHERE status = 'OPEN'")
-            open_positions = cursor.fetchone()[0]
-            
-            # Get recent performance (last 7 days)
-            cursor.execute("""
-                SELECT COUNT(*), 
-                       SUM(CASE WHEN net_pnl > 0 THEN 1 ELSE 0 END),
-                       AVG(net_pnl),
-                       SUM(net_pnl)
-                FROM options_outcomes 
-                WHERE exit_timestamp > datetime('now', '-7 days')
-            """)
-            recent_data = cursor.fetchone()
-            recent_trades = recent_data[0] or 0
-            recent_wins = recent_data[1] or 0
-            recent_avg_pnl = recent_data[2] or 0
-            recent_total_pnl = recent_data[3] or 0
-            
-            # Get profit factor
-            cursor.execute("SELECT SUM(net_pnl) FROM options_outcomes WHERE net_pnl > 0")
-            total_profits = cursor.fetchone()[0] or 0
-            cursor.execute("SELECT ABS(SUM(net_pnl)) FROM options_outcomes WHERE net_pnl < 0")
-            total_losses = cursor.fetchone()[0] or 1
-            profit_factor = total_profits / total_losses if total_losses > 0 else 0
-            
-            # Get recent streak
-            cursor.execute("""
-                SELECT net_pnl FROM options_outcomes 
-                ORDER BY exit_timestamp DESC 
-                LIMIT 5
-            """)
-            recent_pnls = cursor.fetchall()
-            recent_streak = self._calculate_streak([row[0] for row in recent_pnls])
-            
-            # Get latest positions
-            cursor.execute("""
-                SELECT contract_symbol, entry_price, contracts, confidence
-                FROM options_predictions 
-                WHERE status = 'OPEN' 
-                ORDER BY timestamp DESC 
-                LIMIT 3
-            """)
-            latest_positions = cursor.fetchall()
-            
-            conn.close()
-            
-            return {
-                'balance': balance,
-                'starting_balance': 1000.0,
-                'total_return': balance - 1000.0,
-                'total_return_pct': (balance - 1000.0) / 1000.0,
-                'total_trades': total_trades,
-                'winning_trades': winning_trades,
-                'win_rate': win_rate,
-                'profit_factor': profit_factor,
-                'open_positions': open_positions,
-                'recent_trades': recent_trades,
-                'recent_wins': recent_wins,
-                'recent_win_rate': (recent_wins / recent_trades) if recent_trades > 0 else 0,
-                'recent_avg_pnl': recent_avg_pnl,
-                'recent_total_pnl': recent_total_pnl,
-                'recent_streak': recent_streak,
-                'latest_positions': latest_positions,
-                'status': self._get_strategy_status(balance, open_positions, win_rate)
-            }
-            
-        except Exception as e:
-            logger.error(f"❌ Error getting {strategy_id} data: {e}")
-            return self._get_default_strategy_data(strategy_id)
+        return self.snapshots.get_strategy_data(strategy_id) or self._get_default_strategy_data(strategy_id)
     
     def _get_default_strategy_data(self, strategy_id: str) -> Dict:
         """Get default data when database is not available"""
@@ -193,32 +100,11 @@ class PerformanceDashboard:
     
     def _calculate_streak(self, pnls: List[float]) -> int:
         """Calculate current win/loss streak"""
-        if not pnls:
-            return 0
-            
-        streak = 0
-        first_positive = pnls[0] > 0
-        
-        for pnl in pnls:
-            if (pnl > 0) == first_positive:
-                streak += 1 if first_positive else -1
-            else:
-                break
-                
-        return streak
+        return calculate_streak(pnls)
     
     def _get_strategy_status(self, balance: float, positions: int, win_rate: float) -> str:
         """Determine strategy status based on performance"""
-        if balance < 300 and positions == 0:
-            return "⚠️ Ready for Reset"
-        elif win_rate > 0.6:
-            return "🔥 Hot Streak"
-        elif win_rate < 0.3 and balance < 800:
-            return "❄️ Cold Streak"
-        elif positions > 0:
-            return "📈 Active Trading"
-        else:
-            return "⏸️ Waiting"
+        return strategy_status(balance, positions, win_rate)
     
     def _generate_rankings(self, strategy_data: Dict) -> str:
         """Generate current strategy rankings"""
@@ -235,7 +121,7 @@ class PerformanceDashboard:
         
         for i, (strategy_id, data) in enumerate(sorted_strategies):
             emoji = rank_emojis[i] if i < 3 else "📊"
-            strategy_emoji = self.strategy_emojis[strategy_id]
+            strategy_emoji = self.strategy_emojis.get(strategy_id, "📊")
             
             # Performance bar (10 segments)
             performance_score = min(max((data['balance'] - 500) / 500, 0), 1)
@@ -255,7 +141,7 @@ class PerformanceDashboard:
         charts = "📈 **Recent Performance (7 days)**\n\n"
         
         for strategy_id, data in strategy_data.items():
-            emoji = self.strategy_emojis[strategy_id]
+            emoji = self.strategy_emojis.get(strategy_id, "📊")
             
             # Recent performance indicator
             if data['recent_total_pnl'] > 0:
@@ -290,12 +176,12 @@ class PerformanceDashboard:
             except ImportError:
                 from src.core.kelly_position_sizer import kelly_sizer
             
-            kelly_data = kelly_sizer.get_all_kelly_sizes()
+            kelly_data = self.snapshots.get_kelly_data(kelly_sizer, list(kelly_sizer.base_position_sizes))
             
             kelly_status = "📈 **Kelly Position Sizing**\n\n"
             
             for strategy_id, data in kelly_data.items():
-                emoji = self.strategy_emojis[strategy_id]
+                emoji = self.strategy_emojis.get(strategy_id, "📊")
                 
                 kelly_status += f"{emoji} **{strategy_id.title()}**: {data['optimal_size']:.1%}"
                 
@@ -382,7 +268,7 @@ class PerformanceDashboard:
             
             for strategy_id, data in strategy_data.items():
                 if data['latest_positions']:
-                    emoji = self.strategy_emojis[strategy_id]
+                    emoji = self.strategy_emojis.get(strategy_id, "📊")
                     activity += f"{emoji} **{strategy_id.title()}**:\n"
                     
                     for pos in data['latest_positions'][:2]:  # Show max 2 positions
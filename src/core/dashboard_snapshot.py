@@ -0,0 +1,420 @@
+"""
+Dashboard Snapshot Engine
+Keeps an in-memory model of every strategy's dashboard numbers so rendering
+never has to touch the per-strategy SQLite files.
+
+Snapshots are built once from the databases (in a background thread) and then
+updated incrementally from OptionsPaperTrader open/close events. Strategies that
+are not attached to a live paper trader in this process are re-read from their
+database on a slow refresh interval instead.
+"""
+
+import bisect
+import os
+import sqlite3
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Deque, Dict, List, Optional, Tuple
+from loguru import logger
+
+STARTING_BALANCE = 1000.0
+RECENT_WINDOW_DAYS = 7
+STREAK_LENGTH = 5
+LATEST_POSITIONS = 3
+
+def _parse_timestamp(value) -> datetime:
+    """Parse a SQLite/ISO timestamp, falling back to now for bad values"""
+    if isinstance(value, datetime):
+        return value
+    try:
+        return datetime.fromisoformat(str(value))
+    except (TypeError, ValueError):
+        return datetime.now()
+
+@dataclass
+class StrategySnapshot:
+    """Incrementally maintained dashboard numbers for one strategy"""
+    strategy_id: str
+    balance: float = STARTING_BALANCE
+    total_trades: int = 0
+    winning_trades: int = 0
+    total_profits: float = 0.0
+    total_losses: float = 0.0
+    # prediction_id -> (entry timestamp, (contract, entry_price, contracts, confidence))
+    open_positions: Dict[str, Tuple[datetime, Tuple]] = field(default_factory=dict)
+    # (exit timestamp, net_pnl) oldest first, pruned to the recent window
+    recent_outcomes: Deque[Tuple[datetime, float]] = field(default_factory=deque)
+    recent_wins: int = 0
+    recent_total_pnl: float = 0.0
+    last_pnls: Deque[float] = field(default_factory=lambda: deque(maxlen=STREAK_LENGTH))
+    has_data: bool = False
+    loaded_at: float = 0.0
+
+    def record_open(self, prediction_id: str, entry_time: datetime, position_row: Tuple, balance: float):
+        """Apply a position open event"""
+        self.open_positions[prediction_id] = (entry_time, position_row)
+        self.balance = balance
+        self.has_data = True
+
+    def record_close(self, prediction_id: str, exit_time: datetime, net_pnl: float, balance: Optional[float] = None):
+        """Apply a position close event"""
+        self.open_positions.pop(prediction_id, None)
+        self.total_trades += 1
+        if net_pnl > 0:
+            self.winning_trades += 1
+            self.total_profits += net_pnl
+        elif net_pnl < 0:
+            self.total_losses += abs(net_pnl)
+
+        outcome = (exit_time, net_pnl)
+        if self.recent_outcomes and exit_time < self.recent_outcomes[-1][0]:
+            # Late close event: insert in time order so pruning from the left stays correct
+            self.recent_outcomes.insert(bisect.bisect_right(self.recent_outcomes, outcome), outcome)
+        else:
+            self.recent_outcomes.append(outcome)
+        self.recent_total_pnl += net_pnl
+        if net_pnl > 0:
+            self.recent_wins += 1
+
+        self.last_pnls.append(net_pnl)
+        if balance is not None:
+            self.balance = balance
+        self.has_data = True
+
+    def _prune_recent(self, now: datetime):
+        """Drop outcomes that fell out of the recent window (amortised O(1))"""
+        cutoff = now - timedelta(days=RECENT_WINDOW_DAYS)
+        while self.recent_outcomes and self.recent_outcomes[0][0] <= cutoff:
+            _, pnl = self.recent_outcomes.popleft()
+            self.recent_total_pnl -= pnl
+            if pnl > 0:
+                self.recent_wins -= 1
+
+    def to_strategy_data(self, now: Optional[datetime] = None) -> Dict:
+        """Export in the dict shape PerformanceDashboard renders"""
+        self._prune_recent(now or datetime.now())
+
+        win_rate = (self.winning_trades / self.total_trades) if self.total_trades > 0 else 0
+        losses = self.total_losses or 1
+        recent_trades = len(self.recent_outcomes)
+        latest_positions = [
+            row for _, row in sorted(self.open_positions.values(), key=lambda x: x[0], reverse=True)[:LATEST_POSITIONS]
+        ]
+
+        return {
+            'balance': self.balance,
+            'starting_balance': STARTING_BALANCE,
+            'total_return': self.balance - STARTING_BALANCE,
+            'total_return_pct': (self.balance - STARTING_BALANCE) / STARTING_BALANCE,
+            'total_trades': self.total_trades,
+            'winning_trades': self.winning_trades,
+            'win_rate': win_rate,
+            'profit_factor': self.total_profits / losses if losses > 0 else 0,
+            'open_positions': len(self.open_positions),
+            'recent_trades': recent_trades,
+            'recent_wins': self.recent_wins,
+            'recent_win_rate': (self.recent_wins / recent_trades) if recent_trades > 0 else 0,
+            'recent_avg_pnl': (self.recent_total_pnl / recent_trades) if recent_trades > 0 else 0,
+            'recent_total_pnl': self.recent_total_pnl,
+            'recent_streak': calculate_streak(list(reversed(self.last_pnls))),
+            'latest_positions': latest_positions,
+            'status': strategy_status(self.balance, len(self.open_positions), win_rate)
+        }
+
+def calculate_streak(pnls: List[float]) -> int:
+    """Calculate current win/loss streak (most recent first)"""
+    if not pnls:
+        return 0
+
+    streak = 0
+    first_positive = pnls[0] > 0
+
+    for pnl in pnls:
+        if (pnl > 0) == first_positive:
+            streak += 1 if first_positive else -1
+        else:
+            break
+
+    return streak
+
+def strategy_status(balance: float, positions: int, win_rate: float) -> str:
+    """Determine strategy status based on performance"""
+    if balance < 300 and positions == 0:
+        return "⚠️ Ready for Reset"
+    elif win_rate > 0.6:
+        return "🔥 Hot Streak"
+    elif win_rate < 0.3 and balance < 800:
+        return "❄️ Cold Streak"
+    elif positions > 0:
+        return "📈 Active Trading"
+    else:
+        return "⏸️ Waiting"
+
+class DashboardSnapshotEngine:
+    """Background builder and event-driven updater for dashboard snapshots"""
+
+    def __init__(self, strategies: Optional[List[str]] = None, refresh_interval: float = 300.0, kelly_ttl: float = 3600.0):
+        self.strategies = list(strategies or [
+            "conservative", "moderate", "aggressive", "scalping",
+            "swing", "momentum", "volatility", "mean_reversion"
+        ])
+        self.refresh_interval = refresh_interval  # Re-read DBs of strategies without live events
+        self.kelly_ttl = kelly_ttl
+
+        self.snapshots: Dict[str, StrategySnapshot] = {}
+        self.attached: set = set()
+        self._loading: Dict[str, List[Tuple]] = {}  # Events that arrive while attach() reads the DB
+        self._lock = threading.RLock()
+        self._builder: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+        # Kelly sizing only changes when trades close, so cache it per strategy
+        self._kelly_cache: Dict[str, Tuple[float, Dict]] = {}
+        self._kelly_dirty: set = set()
+
+    # ------------------------------------------------------------------ build
+
+    def _get_db_path(self, strategy_id: str) -> Optional[str]:
+        """Resolve the strategy DB, production path first"""
+        db_path = f"/opt/rtx-trading/data/options_performance_{strategy_id}.db"
+        if not os.path.exists(db_path):
+            db_path = f"data/options_performance_{strategy_id}.db"
+        return db_path if os.path.exists(db_path) else None
+
+    def _load_snapshot(self, strategy_id: str, db_path: Optional[str] = None) -> StrategySnapshot:
+        """Build a snapshot from the strategy database (cold path)"""
+        snapshot = StrategySnapshot(strategy_id=strategy_id, loaded_at=time.time())
+        db_path = db_path or self._get_db_path(strategy_id)
+        if not db_path:
+            return snapshot
+
+        try:
+            conn = sqlite3.connect(db_path)
+            cursor = conn.cursor()
+
+            cursor.execute("SELECT balance_after FROM account_history ORDER BY rowid DESC LIMIT 1")
+            balance_row = cursor.fetchone()
+            if balance_row and balance_row[0] is not None:
+                snapshot.balance = balance_row[0]
+
+            cursor.execute("""
+                SELECT COUNT(*),
+                       SUM(CASE WHEN net_pnl > 0 THEN 1 ELSE 0 END),
+                       SUM(CASE WHEN net_pnl > 0 THEN net_pnl ELSE 0 END),
+                       ABS(SUM(CASE WHEN net_pnl < 0 THEN net_pnl ELSE 0 END))
+                FROM options_outcomes
+            """)
+            total_trades, winning_trades, profits, losses = cursor.fetchone()
+            snapshot.total_trades = total_trades or 0
+            snapshot.winning_trades = winning_trades or 0
+            snapshot.total_profits = profits or 0.0
+            snapshot.total_losses = losses or 0.0
+
+            cutoff = datetime.now() - timedelta(days=RECENT_WINDOW_DAYS)
+            cursor.execute("""
+                SELECT exit_timestamp, net_pnl FROM options_outcomes
+                WHERE exit_timestamp > ?
+                ORDER BY exit_timestamp ASC
+            """, (cutoff,))
+            for exit_ts, pnl in cursor.fetchall():
+                pnl = pnl or 0.0
+                snapshot.recent_outcomes.append((_parse_timestamp(exit_ts), pnl))
+                snapshot.recent_total_pnl += pnl
+                if pnl > 0:
+                    snapshot.recent_wins += 1
+
+            cursor.execute(f"""
+                SELECT net_pnl FROM options_outcomes
+                ORDER BY exit_timestamp DESC
+                LIMIT {STREAK_LENGTH}
+            """)
+            for (pnl,) in reversed(cursor.fetchall()):
+                snapshot.last_pnls.append(pnl or 0.0)
+
+            cursor.execute("""
+                SELECT prediction_id, timestamp, contract_symbol, entry_price, contracts, confidence
+                FROM options_predictions
+                WHERE status = 'OPEN'
+            """)
+            for prediction_id, ts, contract, price, contracts, confidence in cursor.fetchall():
+                snapshot.open_positions[prediction_id] = (
+                    _parse_timestamp(ts), (contract, price, contracts, confidence)
+                )
+
+            conn.close()
+            snapshot.has_data = True
+
+        except Exception as e:
+            logger.error(f"❌ Error building {strategy_id} dashboard snapshot: {e}")
+
+        return snapshot
+
+    def build(self, strategy_ids: Optional[List[str]] = None):
+        """(Re)build snapshots from the databases"""
+        for strategy_id in strategy_ids or self.strategies:
+            snapshot = self._load_snapshot(strategy_id)
+            with self._lock:
+                # Never overwrite a snapshot that is being kept live by events
+                if strategy_id not in self.attached or strategy_id not in self.snapshots:
+                    self.snapshots[strategy_id] = snapshot
+                    self._kelly_dirty.add(strategy_id)
+
+    def start(self):
+        """Start the background builder thread"""
+        if self._builder and self._builder.is_alive():
+            return
+
+        self._stop.clear()
+        self._builder = threading.Thread(target=self._builder_loop, name="dashboard-snapshots", daemon=True)
+        self._builder.start()
+        logger.info("📊 Dashboard snapshot builder started")
+
+    def stop(self):
+        """Stop the background builder thread"""
+        self._stop.set()
+
+    def _builder_loop(self):
+        """Initial build followed by periodic refresh of non-live strategies"""
+        with self._lock:
+            missing = [s for s in self.strategies if s not in self.snapshots]
+        if missing:
+            self.build(missing)
+        while not self._stop.wait(self.refresh_interval):
+            stale = [s for s in self.strategies if s not in self.attached]
+            if stale:
+                self.build(stale)
+
+    def _ensure_built(self):
+        """Build synchronously if nothing has been built yet"""
+        with self._lock:
+            missing = [s for s in self.strategies if s not in self.snapshots]
+        if missing:
+            self.build(missing)
+        if not (self._builder and self._builder.is_alive()):
+            self.start()
+
+    # ----------------------------------------------------------------- events
+
+    def add_strategy(self, strategy_id: str):
+        """Register an extra strategy for the dashboard"""
+        with self._lock:
+            if strategy_id not in self.strategies:
+                self.strategies.append(strategy_id)
+
+    def attach(self, strategy_id: str, paper_trader):
+        """Keep a strategy's snapshot live from its paper trader's position events"""
+        self.add_strategy(strategy_id)
+
+        def on_position_event(event: str, prediction_id: str, position: Dict, account_balance: float):
+            if event == "OPEN":
+                self.on_position_opened(strategy_id, prediction_id, position, account_balance)
+            elif event == "CLOSE":
+                self.on_position_closed(strategy_id, prediction_id, position, account_balance)
+
+        on_position_event.__name__ = f"dashboard_snapshot_{strategy_id}"
+
+        # Events during the read are held back and replayed onto the loaded snapshot
+        with self._lock:
+            self._loading[strategy_id] = []
+        paper_trader.add_position_callback(on_position_event)
+        snapshot = self._load_snapshot(strategy_id, paper_trader.db_path)
+
+        with self._lock:
+            for event, prediction_id, position, account_balance in self._loading.pop(strategy_id):
+                if event == "OPEN":
+                    self._apply_open(snapshot, prediction_id, position, account_balance)
+                elif prediction_id in snapshot.open_positions:  # Closes already read from the DB are not counted twice
+                    self._apply_close(snapshot, prediction_id, position, account_balance)
+            self.snapshots[strategy_id] = snapshot
+            self.attached.add(strategy_id)
+            self._kelly_dirty.add(strategy_id)
+
+    @staticmethod
+    def _apply_open(snapshot: StrategySnapshot, prediction_id: str, position: Dict, account_balance: float):
+        prediction = position['prediction']
+        row = (
+            prediction['contract_symbol'],
+            position['execution']['execution_price'],
+            prediction['contracts'],
+            prediction['confidence']
+        )
+        snapshot.record_open(prediction_id, position.get('entry_timestamp') or datetime.now(), row, account_balance)
+
+    @staticmethod
+    def _apply_close(snapshot: StrategySnapshot, prediction_id: str, position: Dict, account_balance: float):
+        outcome = position.get('outcome', {})
+        snapshot.record_close(
+            prediction_id,
+            _parse_timestamp(outcome.get('exit_timestamp', datetime.now())),
+            outcome.get('net_pnl', 0.0),
+            account_balance
+        )
+
+    def on_position_opened(self, strategy_id: str, prediction_id: str, position: Dict, account_balance: float):
+        """Incremental update for a newly opened position"""
+        with self._lock:
+            if strategy_id in self._loading:
+                self._loading[strategy_id].append(("OPEN", prediction_id, position, account_balance))
+                return
+            snapshot = self.snapshots.setdefault(strategy_id, StrategySnapshot(strategy_id=strategy_id))
+            self._apply_open(snapshot, prediction_id, position, account_balance)
+
+    def on_position_closed(self, strategy_id: str, prediction_id: str, position: Dict, account_balance: float):
+        """Incremental update for a closed position"""
+        with self._lock:
+            if strategy_id in self._loading:
+                self._loading[strategy_id].append(("CLOSE", prediction_id, position, account_balance))
+                return
+            snapshot = self.snapshots.setdefault(strategy_id, StrategySnapshot(strategy_id=strategy_id))
+            self._apply_close(snapshot, prediction_id, position, account_balance)
+            self._kelly_dirty.add(strategy_id)
+
+    # ------------------------------------------------------------------ reads
+
+    def get_strategy_data(self, strategy_id: str) -> Optional[Dict]:
+        """Dashboard data for one strategy, or None if it has no database yet"""
+        self._ensure_built()
+        with self._lock:
+            snapshot = self.snapshots.get(strategy_id)
+            if not snapshot or not snapshot.has_data:
+                return None
+            return snapshot.to_strategy_data()
+
+    def get_all_strategy_data(self) -> Dict[str, Optional[Dict]]:
+        """Dashboard data for all strategies (None where no data exists)"""
+        self._ensure_built()
+        now = datetime.now()
+        with self._lock:
+            return {
+                strategy_id: (self.snapshots[strategy_id].to_strategy_data(now)
+                              if self.snapshots.get(strategy_id) and self.snapshots[strategy_id].has_data else None)
+                for strategy_id in self.strategies
+            }
+
+    def get_kelly_data(self, kelly_sizer, strategy_ids: List[str]) -> Dict[str, Dict]:
+        """Kelly sizing per strategy, recomputed only after closes or when the TTL expires"""
+        kelly_data = {}
+        now = time.time()
+
+        for strategy_id in strategy_ids:
+            with self._lock:
+                cached = self._kelly_cache.get(strategy_id)
+                dirty = strategy_id in self._kelly_dirty
+
+            if cached and not dirty and now - cached[0] < self.kelly_ttl:
+                kelly_data[strategy_id] = cached[1]
+                continue
+
+            data = kelly_sizer.get_kelly_size(strategy_id)
+            with self._lock:
+                self._kelly_cache[strategy_id] = (now, data)
+                self._kelly_dirty.discard(strategy_id)
+            kelly_data[strategy_id] = data
+
+        return kelly_data
+
+# Global instance
+dashboard_snapshots = DashboardSnapshotEngine()
@@ -0,0 +1,356 @@
+"""
+Data Retention
+Tiered retention for the SQLite stores: daily rollups, compressed archives, online compaction
+
+Raw rows older than the retention window are
+    1. folded into daily rollup tables (per signal and per strategy file), additively, in the
+       same transaction that removes them, so every raw row is counted exactly once;
+    2. written to a gzip'd JSON-lines archive under RETENTION_ARCHIVE_DIR/<db name>/;
+    3. deleted from the hot database.
+Compaction runs afterwards: the first pass switches the file to auto_vacuum=INCREMENTAL
+(one full VACUUM), later passes release free pages with PRAGMA incremental_vacuum.
+
+data_retention.run_if_due() does all of this at most once per day and only while the market
+is closed; the options scheduler calls it from its market-closed loop.
+"""
+
+import glob
+import gzip
+import json
+import os
+import sqlite3
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from loguru import logger
+
+from src.core.db_migrations import PAPER_TRADER_SCHEMA, SIGNAL_PERFORMANCE_SCHEMA, ensure_schema, table_columns
+from src.core.market_data_provider import market_data
+
+@dataclass(frozen=True)
+class RetentionPolicy:
+    """Archive rows of table older than keep_days (dependents go with their parent rows)
+
+    rollups are upserts run over the expiring rows before they are removed; they see the
+    cutoff date as :cutoff and must repeat the policy's filter.
+    """
+    table: str
+    timestamp_column: str
+    keep_days: int
+    key_column: str = "rowid"
+    dependents: Tuple[Tuple[str, str], ...] = ()  # (table, column referencing key_column)
+    where: str = ""
+    rollups: Tuple[str, ...] = ()
+
+    def expiring(self) -> str:
+        condition = f"{self.timestamp_column} < :cutoff"
+        return f"{condition} AND ({self.where})" if self.where else condition
+
+# ---------------------------------------------------------------------------
+# Store policies
+# ---------------------------------------------------------------------------
+
+_CLOSED_BEFORE_CUTOFF = "p.timestamp < :cutoff AND p.status != 'OPEN'"
+
+def paper_trader_policies(keep_days: int) -> Tuple[RetentionPolicy, ...]:
+    """options_performance*.db: one file per strategy, so the strategy rollup is per file"""
+    return (
+        RetentionPolicy(
+            "options_predictions", "timestamp", keep_days, key_column="prediction_id",
+            dependents=(("options_outcomes", "prediction_id"), ("prediction_signals", "prediction_id")),
+            where="status != 'OPEN'",
+            rollups=(
+                f"""
+                INSERT INTO daily_signal_rollups
+                    (day, signal_name, direction, signals, trades, wins, total_pnl_pct, total_confidence)
+                SELECT DATE(p.timestamp), s.signal_name, s.direction, COUNT(*), COUNT(o.prediction_id),
+                       SUM(CASE WHEN o.net_pnl > 0 THEN 1 ELSE 0 END),
+                       COALESCE(SUM(o.pnl_percentage), 0), SUM(s.confidence)
+                FROM options_predictions p
+                JOIN prediction_signals s ON s.prediction_id = p.prediction_id
+                LEFT JOIN options_outcomes o ON o.prediction_id = p.prediction_id
+                WHERE {_CLOSED_BEFORE_CUTOFF}
+                GROUP BY DATE(p.timestamp), s.signal_name, s.direction
+                ON CONFLICT (day, signal_name, direction) DO UPDATE SET
+                    signals = signals + excluded.signals,
+                    trades = trades + excluded.trades,
+                    wins = wins + excluded.wins,
+                    total_pnl_pct = total_pnl_pct + excluded.total_pnl_pct,
+                    total_confidence = total_confidence + excluded.total_confidence
+                """,
+                f"""
+                INSERT INTO daily_strategy_rollups (day, predictions, trades, wins, total_cost, net_pnl)
+                SELECT DATE(p.timestamp), COUNT(*), COUNT(o.prediction_id),
+                       SUM(CASE WHEN o.net_pnl > 0 THEN 1 ELSE 0 END),
+                       COALESCE(SUM(p.total_cost), 0), COALESCE(SUM(o.net_pnl), 0)
+                FROM options_predictions p
+                LEFT JOIN options_outcomes o ON o.prediction_id = p.prediction_id
+                WHERE {_CLOSED_BEFORE_CUTOFF}
+                GROUP BY DATE(p.timestamp)
+                ON CONFLICT (day) DO UPDATE SET
+                    predictions = predictions + excluded.predictions,
+                    trades = trades + excluded.trades,
+                    wins = wins + excluded.wins,
+                    total_cost = total_cost + excluded.total_cost,
+                    net_pnl = net_pnl + excluded.net_pnl
+                """,
+            ),
+        ),
+        # The newest balance row is always kept: it is the account's current balance
+        RetentionPolicy(
+            "account_history", "timestamp", keep_days * 2, key_column="history_id",
+            where="history_id < (SELECT MAX(history_id) FROM account_history)",
+        ),
+    )
+
+def signal_performance_policies(keep_days: int) -> Tuple[RetentionPolicy, ...]:
+    return (
+        RetentionPolicy(
+            "predictions", "timestamp", keep_days, key_column="id",
+            dependents=(("outcomes", "prediction_id"), ("options_trades", "prediction_id")),
+            rollups=(
+                """
+                INSERT INTO daily_prediction_rollups
+                    (day, action, predictions, trade_worthy, total_confidence, outcomes_24h, total_move_24h)
+                SELECT DATE(p.timestamp), p.action, COUNT(*), SUM(p.trade_worthy), SUM(p.confidence),
+                       COUNT(o.price_24h),
+                       COALESCE(SUM((o.price_24h - o.start_price) / NULLIF(o.start_price, 0)), 0)
+                FROM predictions p
+                LEFT JOIN outcomes o ON o.prediction_id = p.id
+                WHERE p.timestamp < :cutoff
+                GROUP BY DATE(p.timestamp), p.action
+                ON CONFLICT (day, action) DO UPDATE SET
+                    predictions = predictions + excluded.predictions,
+                    trade_worthy = trade_worthy + excluded.trade_worthy,
+                    total_confidence = total_confidence + excluded.total_confidence,
+                    outcomes_24h = outcomes_24h + excluded.outcomes_24h,
+                    total_move_24h = total_move_24h + excluded.total_move_24h
+                """,
+            ),
+        ),
+    )
+
+def performance_tracker_policies(keep_days: int) -> Tuple[RetentionPolicy, ...]:
+    """performance_tracker's layout of signal_performance.db (integer prediction_id, prediction_outcomes)
+
+    There is no rollup table for this layout; expired rows are kept in the archive only.
+    """
+    return (
+        RetentionPolicy(
+            "predictions", "timestamp", keep_days, key_column="prediction_id",
+            dependents=(("prediction_outcomes", "prediction_id"), ("options_trades", "prediction_id")),
+        ),
+    )
+
+def signal_performance_file_policies(db_path: str, keep_days: int) -> Tuple[RetentionPolicy, ...]:
+    """Policies for whichever layout this signal_performance.db has (none when it has neither)"""
+    conn = sqlite3.connect(db_path)
+    try:
+        columns = table_columns(conn, "predictions")
+    except sqlite3.Error:
+        columns = []  # Unreadable: apply_retention reports the error
+    finally:
+        conn.close()
+    if "id" in columns:
+        return signal_performance_policies(keep_days)
+    if "prediction_id" in columns:
+        return performance_tracker_policies(keep_days)
+    return ()
+
+def algoslayer_policies(keep_days: int, log_keep_days: int = 30) -> Tuple[RetentionPolicy, ...]:
+    """AlgoSlayerDB: prices and per-signal predictions, plus short-lived system logs"""
+    return (
+        RetentionPolicy("price_data", "timestamp", keep_days),
+        RetentionPolicy(
+            "ai_predictions", "timestamp", keep_days,
+            rollups=(
+                """
+                INSERT INTO daily_ai_signal_rollups (day, signal_name, direction, predictions, correct, total_confidence)
+                SELECT DATE(timestamp), signal_name, direction, COUNT(*),
+                       SUM(CASE WHEN was_correct THEN 1 ELSE 0 END), SUM(confidence)
+                FROM ai_predictions
+                WHERE timestamp < :cutoff
+                GROUP BY DATE(timestamp), signal_name, direction
+                ON CONFLICT (day, signal_name, direction) DO UPDATE SET
+                    predictions = predictions + excluded.predictions,
+                    correct = correct + excluded.correct,
+                    total_confidence = total_confidence + excluded.total_confidence
+                """,
+            ),
+        ),
+        RetentionPolicy("system_logs", "timestamp", log_keep_days),
+    )
+
+def iv_history_policies(keep_days: int) -> Tuple[RetentionPolicy, ...]:
+    """iv_history.db: intraday observations expire, iv_daily is their (permanent) rollup"""
+    return (RetentionPolicy("iv_intraday", "timestamp", keep_days),)
+
+# ---------------------------------------------------------------------------
+# Archive, rollup, delete
+# ---------------------------------------------------------------------------
+
+def _rows(conn: sqlite3.Connection, sql: str, params: Dict) -> Tuple[List[str], List[tuple]]:
+    cursor = conn.execute(sql, params)
+    return [column[0] for column in cursor.description], cursor.fetchall()
+
+def apply_retention(db_path: str, policies: Tuple[RetentionPolicy, ...], archive_dir: str,
+                    now: Optional[datetime] = None) -> Dict[str, int]:
+    """Roll up, archive and delete expired rows; returns rows archived per table"""
+    now = now or market_data.now()
+    stamp = now.strftime("%Y%m%d_%H%M%S")
+    archive_path = os.path.join(archive_dir, os.path.splitext(os.path.basename(db_path))[0], f"{stamp}.jsonl.gz")
+    archived: Dict[str, int] = {}
+
+    conn = sqlite3.connect(db_path)
+    try:
+        existing = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        conn.execute("BEGIN IMMEDIATE")
+        batches = []
+        for policy in policies:
+            if policy.table not in existing:
+                continue
+            params = {"cutoff": (now - timedelta(days=policy.keep_days)).date().isoformat()}
+            expiring = policy.expiring()
+            keys = f"SELECT {policy.key_column} FROM {policy.table} WHERE {expiring}"
+
+            for rollup in policy.rollups:
+                conn.execute(rollup, params)
+            for table, column in policy.dependents:
+                if table in existing:
+                    batches.append((table, *_rows(conn, f"SELECT * FROM {table} WHERE {column} IN ({keys})", params)))
+                    conn.execute(f"DELETE FROM {table} WHERE {column} IN ({keys})", params)
+            batches.append((policy.table, *_rows(conn, f"SELECT * FROM {policy.table} WHERE {expiring}", params)))
+            conn.execute(f"DELETE FROM {policy.table} WHERE {expiring}", params)
+
+        archived = {table: len(rows) for table, _, rows in batches if rows}
+        if not archived:
+            conn.rollback()
+            return {}
+
+        # The archive is durable before the rows are removed; a failed commit discards it
+        os.makedirs(os.path.dirname(archive_path), exist_ok=True)
+        with gzip.open(archive_path, "wt", encoding="utf-8") as archive:
+            for table, columns, rows in batches:
+                for row in rows:
+                    archive.write(json.dumps({"table": table, "row": dict(zip(columns, row))}, default=str) + "\n")
+        try:
+            conn.commit()
+        except sqlite3.Error:
+            os.remove(archive_path)
+            raise
+    except Exception:
+        if conn.in_transaction:
+            conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+    logger.info(f"🗄️ Archived {archived} from {db_path} to {archive_path}")
+    return archived
+
+def read_archive(path: str) -> Iterator[Tuple[str, Dict]]:
+    """(table, row) pairs from one archive file"""
+    with gzip.open(path, "rt", encoding="utf-8") as archive:
+        for line in archive:
+            entry = json.loads(line)
+            yield entry["table"], entry["row"]
+
+def archived_rows(archive_dir: str, db_name: str, table: str) -> Iterator[Dict]:
+    """Every archived row of one table, oldest archive first"""
+    for path in sorted(glob.glob(os.path.join(archive_dir, db_name, "*.jsonl.gz"))):
+        for archived_table, row in read_archive(path):
+            if archived_table == table:
+                yield row
+
+def compact(db_path: str, max_pages: Optional[int] = None) -> int:
+    """Release free pages to the filesystem; returns bytes reclaimed"""
+    before = os.path.getsize(db_path)
+    conn = sqlite3.connect(db_path)
+    try:
+        if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+            conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            conn.execute("VACUUM")  # One-time rewrite so later passes can be incremental
+        else:
+            pages = conn.execute("PRAGMA freelist_count").fetchone()[0]
+            if pages:
+                # executescript steps the pragma to completion (execute() frees a single page)
+                conn.executescript(f"PRAGMA incremental_vacuum({min(pages, max_pages) if max_pages else pages});")
+    finally:
+        conn.close()
+    return before - os.path.getsize(db_path)
+
+# ---------------------------------------------------------------------------
+# Scheduling
+# ---------------------------------------------------------------------------
+
+class DataRetention:
+    """Daily, market-closed retention pass over every store under data_dir"""
+
+    def __init__(self, data_dir: str = "data", keep_days: Optional[int] = None, archive_dir: Optional[str] = None,
+                 vacuum_pages: Optional[int] = None):
+        self.data_dir = data_dir
+        self.keep_days = keep_days if keep_days is not None else int(os.getenv("RETENTION_DAYS", 90))
+        self.archive_dir = archive_dir or os.getenv("RETENTION_ARCHIVE_DIR", os.path.join(data_dir, "archive"))
+        self.vacuum_pages = vacuum_pages if vacuum_pages is not None else int(os.getenv("RETENTION_VACUUM_PAGES", 0)) or None
+        self.last_run_day = None
+        self.last_report: Optional[Dict] = None
+        self._lock = threading.Lock()
+
+    def targets(self) -> List[Tuple[str, Tuple[RetentionPolicy, ...]]]:
+        """(database, policies) for every known store present in data_dir"""
+        found = []
+        for path in sorted(glob.glob(os.path.join(self.data_dir, "options_performance*.db"))):
+            found.append((path, paper_trader_policies(self.keep_days)))
+        signal_performance = os.path.join(self.data_dir, "signal_performance.db")
+        if os.path.exists(signal_performance):
+            found.append((signal_performance, signal_performance_file_policies(signal_performance, self.keep_days)))
+        for name, policies in (("algoslayer.db", algoslayer_policies(self.keep_days)),
+                               ("iv_history.db", iv_history_policies(self.keep_days))):
+            path = os.path.join(self.data_dir, name)
+            if os.path.exists(path):
+                found.append((path, policies))
+        return found
+
+    def run(self, now: Optional[datetime] = None) -> Dict[str, Dict]:
+        """Retention then compaction for every store; one failing store does not stop the rest
+
+        Compaction runs even when the archive step fails, so a store whose rows cannot be
+        archived still hands its free pages back.
+        """
+        report = {}
+        with self._lock:
+            for path, policies in self.targets():
+                entry = report[path] = {}
+                try:
+                    conn = sqlite3.connect(path)
+                    try:
+                        ensure_schema(conn, PAPER_TRADER_SCHEMA)  # Rollup tables come from the migrations
+                        ensure_schema(conn, SIGNAL_PERFORMANCE_SCHEMA)
+                    finally:
+                        conn.close()
+                    entry["archived"] = apply_retention(path, policies, self.archive_dir, now)
+                except Exception as e:
+                    logger.error(f"❌ Retention failed for {path}: {e}")
+                    entry["error"] = str(e)
+                try:
+                    entry["reclaimed_bytes"] = compact(path, self.vacuum_pages)
+                except Exception as e:
+                    logger.error(f"❌ Compaction failed for {path}: {e}")
+                    entry.setdefault("error", str(e))
+            self.last_report = report
+        return report
+
+    def run_if_due(self) -> Optional[Dict[str, Dict]]:
+        """Run once per calendar day, only outside market hours"""
+        from config.options_config import options_config
+
+        today = market_data.now().date()
+        if self.last_run_day == today or options_config.is_market_hours():
+            return None
+        self.last_run_day = today
+        return self.run()
+
+# Global instance
+data_retention = DataRetention()
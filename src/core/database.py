@@ -12,6 +12,8 @@ import aiosqlite
 from loguru import logger
 import os
 
+from src.core.data_retention import algoslayer_policies, apply_retention, compact, data_retention
+
 @dataclass
 class PriceData:
     timestamp: datetime
@@ -190,6 +192,19 @@ class AlgoSlayerDB:
             )
         """)
         
+        # Daily per-signal rollups of archived predictions (see data_retention)
+        await db.execute("""
+            CREATE TABLE IF NOT EXISTS daily_ai_signal_rollups (
+                day TEXT NOT NULL,
+                signal_name TEXT NOT NULL,
+                direction TEXT NOT NULL,
+                predictions INTEGER NOT NULL,
+                correct INTEGER NOT NULL,
+                total_confidence REAL NOT NULL,
+                PRIMARY KEY (day, signal_name, direction)
+            )
+        """)
+        
         # Create indexes for better performance
         await db.execute("CREATE INDEX IF NOT EXISTS idx_price_timestamp ON price_data(timestamp)")
         await db.execute("CREATE INDEX IF NOT EXISTS idx_predictions_timestamp ON ai_predictions(timestamp)")
@@ -365,22 +380,12 @@ class AlgoSlayerDB:
             ]
     
     async def cleanup_old_data(self, days_to_keep: int = 90):
-        """Clean up old data to save space"""
-        async with aiosqlite.connect(self.db_path) as db:
-            cutoff = datetime.now() - timedelta(days=days_to_keep)
-            
-            # Keep price data for 90 days
-            await db.execute("DELETE FROM price_data WHERE timestamp < ?", (cutoff,))
-            
-            # Keep predictions for 90 days
-            await db.execute("DELETE FROM ai_predictions WHERE timestamp < ?", (cutoff,))
-            
-            # Keep logs for 30 days
-            log_cutoff = datetime.now() - timedelta(days=30)
-            await db.execute("DELETE FROM system_logs WHERE timestamp < ?", (log_cutoff,))
-            
-            await db.commit()
-            logger.info(f"Cleaned up data older than {days_to_keep} days")
+        """Archive data older than days_to_keep (logs after 30 days), keeping daily signal rollups"""
+        archived = await asyncio.to_thread(
+            apply_retention, self.db_path, algoslayer_policies(days_to_keep), data_retention.archive_dir
+        )
+        reclaimed = await asyncio.to_thread(compact, self.db_path)
+        logger.info(f"Archived data older than {days_to_keep} days: {archived} ({reclaimed / 1024:.0f}KB reclaimed)")
     
     async def get_database_stats(self) -> Dict:
         """Get database statistics"""
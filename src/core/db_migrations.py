@@ -0,0 +1,422 @@
+"""
+Database Migrations
+Versioned schema steps, declared indexes and query-plan audits for the SQLite stores
+
+Each store still creates its baseline tables with CREATE TABLE IF NOT EXISTS, then calls
+migrate(conn, SCHEMA) so every later change (indexes, new columns, new tables) is applied
+once, in order, and recorded in schema_migrations. Several schemas can share one file.
+
+Schemas also declare their hot queries; audit_query_plans() runs EXPLAIN QUERY PLAN on each
+and flags full table scans and temp-B-tree sorts, so a missing index shows up in review
+instead of as a slow dashboard months later.
+
+    python -m src.core.db_migrations                  # migrate + audit every data/*.db
+    python -m src.core.db_migrations data/x.db --audit-only
+"""
+
+import argparse
+import glob
+import re
+import sqlite3
+import sys
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from loguru import logger
+
+from src.core.prediction_signals import CREATE_TABLE as PREDICTION_SIGNALS_TABLE, backfill_prediction_signals
+
+@dataclass(frozen=True)
+class Index:
+    """A (possibly composite) index; the name is derived from table and columns"""
+    table: str
+    columns: Tuple[str, ...]
+    unique: bool = False
+
+    @property
+    def name(self) -> str:
+        return f"idx_{self.table}_{'_'.join(self.columns)}"
+
+    def create_sql(self) -> str:
+        unique = "UNIQUE " if self.unique else ""
+        return f"CREATE {unique}INDEX IF NOT EXISTS {self.name} ON {self.table}({', '.join(self.columns)})"
+
+@dataclass(frozen=True)
+class Migration:
+    """One schema step: raw statements, indexes, and/or a callable for data fixes"""
+    version: int
+    description: str
+    statements: Tuple[str, ...] = ()
+    indexes: Tuple[Index, ...] = ()
+    apply: Optional[Callable[[sqlite3.Connection], None]] = None
+
+    def run(self, conn: sqlite3.Connection):
+        for statement in self.statements:
+            conn.execute(statement)
+        for index in self.indexes:
+            conn.execute(index.create_sql())
+        if self.apply:
+            self.apply(conn)
+
+@dataclass(frozen=True)
+class Schema:
+    """Ordered migrations plus the queries whose plans must stay index-backed
+
+    columns lists, per table, the columns the migrations and hot queries rely on. Several
+    stores reuse a table name with a different layout (performance_tracker's predictions has
+    no trade_worthy), so a file only matches the schema when these columns exist too.
+    """
+    name: str
+    tables: Tuple[str, ...]
+    migrations: Tuple[Migration, ...]
+    hot_queries: Dict[str, str] = field(default_factory=dict)
+    columns: Dict[str, Tuple[str, ...]] = field(default_factory=dict)
+
+    @property
+    def version(self) -> int:
+        return max((m.version for m in self.migrations), default=0)
+
+def add_column(table: str, column: str, declaration: str) -> Callable[[sqlite3.Connection], None]:
+    """Migration step that adds a column only when it is missing (older files may have it already)"""
+    def apply(conn: sqlite3.Connection):
+        if column not in table_columns(conn, table):
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {declaration}")
+    return apply
+
+def _tables(conn: sqlite3.Connection) -> set:
+    return {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+
+def table_columns(conn: sqlite3.Connection, table: str) -> List[str]:
+    return [row[1] for row in conn.execute(f"PRAGMA table_info({table})")]
+
+def _ensure_migrations_table(conn: sqlite3.Connection):
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            schema TEXT NOT NULL,
+            version INTEGER NOT NULL,
+            description TEXT,
+            applied_at TEXT NOT NULL,
+            PRIMARY KEY (schema, version)
+        )
+    """)
+    conn.commit()
+
+def _applied_version(conn: sqlite3.Connection, schema: str) -> int:
+    row = conn.execute("SELECT MAX(version) FROM schema_migrations WHERE schema = ?", (schema,)).fetchone()
+    return row[0] or 0
+
+def current_version(conn: sqlite3.Connection, schema: str) -> int:
+    """Highest applied version (0 before the first migration); never commits"""
+    if "schema_migrations" not in _tables(conn):
+        return 0
+    return _applied_version(conn, schema)
+
+def migrate(conn: sqlite3.Connection, schema: Schema) -> List[int]:
+    """Apply pending steps in order, one transaction each; returns the versions applied
+
+    Each step re-reads the version and runs under BEGIN IMMEDIATE, and nothing commits until
+    the step is recorded, so a failed step rolls back completely and a second process opening
+    the same file waits for the lock, then sees the step as applied.
+    """
+    if conn.in_transaction:
+        conn.commit()
+    _ensure_migrations_table(conn)
+    applied = []
+    for migration in sorted(schema.migrations, key=lambda m: m.version):
+        conn.execute("BEGIN IMMEDIATE")  # Serializes concurrent processes opening the same file
+        try:
+            if _applied_version(conn, schema.name) >= migration.version:
+                conn.rollback()
+                continue
+            migration.run(conn)
+            conn.execute(
+                "INSERT INTO schema_migrations (schema, version, description, applied_at) VALUES (?, ?, ?, ?)",
+                (schema.name, migration.version, migration.description, datetime.now().isoformat())
+            )
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            logger.error(f"❌ {schema.name} migration {migration.version} failed: {migration.description}")
+            raise
+        applied.append(migration.version)
+
+    if applied:
+        logger.info(f"🗄️ {schema.name} schema migrated to v{schema.version} (applied {applied})")
+    return applied
+
+def schema_matches(conn: sqlite3.Connection, schema: Schema) -> bool:
+    """Whether this file holds the schema's tables, with the columns its migrations need"""
+    existing = _tables(conn)
+    if not set(schema.tables) | set(schema.columns) <= existing:
+        return False
+    return all(set(columns) <= set(table_columns(conn, table)) for table, columns in schema.columns.items())
+
+def ensure_schema(conn: sqlite3.Connection, schema: Schema) -> bool:
+    """Migrate when the file matches the schema (readers opening a store they did not create)"""
+    if not schema_matches(conn, schema):
+        return False
+    migrate(conn, schema)
+    return True
+
+def migrate_path(db_path: str, schema: Schema) -> List[int]:
+    conn = sqlite3.connect(db_path)
+    try:
+        return migrate(conn, schema)
+    finally:
+        conn.close()
+
+_SCAN = re.compile(r"^SCAN (?:TABLE )?(\w+)")
+
+def explain(conn: sqlite3.Connection, sql: str) -> List[str]:
+    """EXPLAIN QUERY PLAN detail lines (placeholders are bound to NULL)"""
+    params = (None,) * sql.count("?")
+    return [row[-1] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params)]
+
+def audit_query_plans(conn: sqlite3.Connection, schema: Schema) -> Dict[str, Dict]:
+    """Plan of every hot query; full_scans lists tables read without an index"""
+    report = {}
+    for label, sql in schema.hot_queries.items():
+        plan = explain(conn, sql)
+        full_scans = []
+        for detail in plan:
+            match = _SCAN.match(detail)
+            if match and "USING" not in detail:
+                full_scans.append(match.group(1))
+        report[label] = {
+            "plan": plan,
+            "full_scans": full_scans,
+            "temp_sort": any("USE TEMP B-TREE" in detail for detail in plan),
+        }
+    return report
+
+def format_audit(report: Dict[str, Dict]) -> List[str]:
+    lines = []
+    for label, entry in report.items():
+        status = f"⚠️ full scan of {', '.join(entry['full_scans'])}" if entry["full_scans"] else "✅ indexed"
+        if entry["temp_sort"]:
+            status += " (temp sort)"
+        lines.append(f"{label}: {status}")
+        lines.extend(f"    {detail}" for detail in entry["plan"])
+    return lines
+
+# ---------------------------------------------------------------------------
+# Store schemas
+# ---------------------------------------------------------------------------
+
+PAPER_TRADER_SCHEMA = Schema(
+    name="options_paper_trader",
+    tables=("options_predictions", "options_outcomes", "account_history"),
+    migrations=(
+        Migration(1, "Indexes for open positions, outcome lookups and balance history", indexes=(
+            Index("options_predictions", ("status", "timestamp")),
+            Index("options_predictions", ("timestamp",)),
+            Index("options_outcomes", ("prediction_id", "outcome_id")),
+            Index("options_outcomes", ("exit_timestamp", "net_pnl")),
+            Index("account_history", ("timestamp",)),
+        )),
+        Migration(
+            2, "Normalized prediction_signals rows, backfilled from signals_data",
+            statements=(PREDICTION_SIGNALS_TABLE,),
+            indexes=(Index("prediction_signals", ("signal_name", "direction")),),
+            apply=backfill_prediction_signals,
+        ),
+        Migration(3, "Daily rollups kept after raw rows are archived", statements=(
+            """
+            CREATE TABLE IF NOT EXISTS daily_signal_rollups (
+                day TEXT NOT NULL,
+                signal_name TEXT NOT NULL,
+                direction TEXT NOT NULL,
+                signals INTEGER NOT NULL,
+                trades INTEGER NOT NULL,
+                wins INTEGER NOT NULL,
+                total_pnl_pct REAL NOT NULL,
+                total_confidence REAL NOT NULL,
+                PRIMARY KEY (day, signal_name, direction)
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS daily_strategy_rollups (
+                day TEXT PRIMARY KEY,
+                predictions INTEGER NOT NULL,
+                trades INTEGER NOT NULL,
+                wins INTEGER NOT NULL,
+                total_cost REAL NOT NULL,
+                net_pnl REAL NOT NULL
+            )
+            """,
+        )),
+    ),
+    hot_queries={
+        "open_positions": "SELECT * FROM options_predictions WHERE status = 'OPEN'",
+        "prediction_by_id": "SELECT * FROM options_predictions WHERE prediction_id = ?",
+        "outcome_by_prediction": "SELECT * FROM options_outcomes WHERE prediction_id = ? ORDER BY outcome_id DESC LIMIT 1",
+        "recent_outcomes": "SELECT exit_timestamp, net_pnl FROM options_outcomes WHERE exit_timestamp > ? ORDER BY exit_timestamp",
+        "pnl_streak": "SELECT net_pnl FROM options_outcomes ORDER BY exit_timestamp DESC LIMIT 5",
+        "latest_balance": "SELECT balance_after FROM account_history ORDER BY timestamp DESC LIMIT 1",
+        "balance_since": "SELECT balance_after FROM account_history WHERE timestamp > ? ORDER BY timestamp",
+        "signal_outcomes": (
+            "SELECT s.direction, o.net_pnl FROM prediction_signals s "
+            "JOIN options_outcomes o ON o.prediction_id = s.prediction_id WHERE s.signal_name = ?"
+        ),
+    },
+)
+
+SIGNAL_PERFORMANCE_SCHEMA = Schema(
+    name="signal_performance",
+    tables=("predictions", "outcomes"),
+    migrations=(
+        Migration(1, "Indexes for prediction windows and trade-worthy accuracy", indexes=(
+            Index("predictions", ("timestamp",)),
+            Index("predictions", ("trade_worthy", "timestamp")),
+            Index("options_trades", ("prediction_id",)),
+        )),
+        Migration(2, "Daily prediction rollups kept after raw rows are archived", statements=(
+            """
+            CREATE TABLE IF NOT EXISTS daily_prediction_rollups (
+                day TEXT NOT NULL,
+                action TEXT NOT NULL,
+                predictions INTEGER NOT NULL,
+                trade_worthy INTEGER NOT NULL,
+                total_confidence REAL NOT NULL,
+                outcomes_24h INTEGER NOT NULL,
+                total_move_24h REAL NOT NULL,
+                PRIMARY KEY (day, action)
+            )
+            """,
+        )),
+    ),
+    hot_queries={
+        "predictions_since": (
+            "SELECT p.*, o.price_4h, o.price_24h FROM predictions p "
+            "LEFT JOIN outcomes o ON p.id = o.prediction_id WHERE p.timestamp > ? ORDER BY p.timestamp DESC"
+        ),
+        "trade_worthy_accuracy": (
+            "SELECT COUNT(*) FROM predictions p JOIN outcomes o ON p.id = o.prediction_id "
+            "WHERE p.trade_worthy = 1 AND o.price_24h IS NOT NULL"
+        ),
+    },
+    columns={
+        "predictions": ("id", "timestamp", "action", "trade_worthy"),
+        "outcomes": ("prediction_id", "price_24h"),
+        "options_trades": ("prediction_id",),
+    },
+)
+
+# Per-signal summary rebuilt from closed trades; {signals} selects which signal names to refresh
+SIGNAL_SUMMARY_UPSERT = """
+    INSERT OR REPLACE INTO signal_performance_summary
+    (signal_name, total_trades, winning_trades, losing_trades,
+     win_rate, avg_pnl, total_pnl, avg_confidence, effectiveness_score,
+     last_updated)
+    SELECT signal_name,
+           COUNT(*),
+           SUM(CASE WHEN trade_outcome = 'win' THEN 1 ELSE 0 END),
+           SUM(CASE WHEN trade_outcome = 'loss' THEN 1 ELSE 0 END),
+           100.0 * SUM(CASE WHEN trade_outcome = 'win' THEN 1 ELSE 0 END) / COUNT(*),
+           COALESCE(AVG(trade_pnl), 0),
+           COALESCE(SUM(trade_pnl), 0),
+           COALESCE(AVG(signal_confidence), 0),
+           -- Effectiveness score: win rate * avg confidence * avg pnl
+           (1.0 * SUM(CASE WHEN trade_outcome = 'win' THEN 1 ELSE 0 END) / COUNT(*))
+               * COALESCE(AVG(signal_confidence), 0) * COALESCE(AVG(trade_pnl), 0),
+           CURRENT_TIMESTAMP
+    FROM signal_effectiveness
+    WHERE trade_outcome IN ('win', 'loss')
+    AND signal_name IN ({signals})
+    GROUP BY signal_name
+"""
+
+SIGNAL_EFFECTIVENESS_SCHEMA = Schema(
+    name="signal_effectiveness",
+    tables=("signal_effectiveness", "signal_performance_summary"),
+    migrations=(
+        Migration(1, "Index per-signal outcome lookups", indexes=(
+            Index("signal_effectiveness", ("signal_name", "trade_outcome")),
+            Index("signal_effectiveness", ("strategy_id", "timestamp")),
+        )),
+        Migration(
+            2, "Rescale 0-100 signal confidences to 0-1 and rebuild the summaries that average them",
+            statements=(
+                "UPDATE signal_effectiveness SET signal_confidence = signal_confidence / 100.0 WHERE signal_confidence > 1",
+                "UPDATE signal_effectiveness SET contribution_score = signal_confidence * trade_pnl_percentage "
+                "WHERE trade_outcome IN ('win', 'loss')",
+                SIGNAL_SUMMARY_UPSERT.format(signals="SELECT signal_name FROM signal_performance_summary"),
+            ),
+        ),
+    ),
+    hot_queries={
+        "signals_for_prediction": "SELECT * FROM signal_effectiveness WHERE prediction_id = ?",
+        "signal_outcomes": (
+            "SELECT trade_outcome, trade_pnl FROM signal_effectiveness "
+            "WHERE signal_name = ? AND trade_outcome IN ('win', 'loss')"
+        ),
+    },
+)
+
+MULTI_STRATEGY_SCHEMA = Schema(
+    name="multi_strategy",
+    tables=("trading_strategies", "strategy_predictions", "strategy_performance"),
+    migrations=(
+        Migration(1, "Index strategy prediction history", indexes=(
+            Index("strategy_predictions", ("strategy_id", "timestamp")),
+        )),
+    ),
+    hot_queries={
+        "active_strategy": "SELECT * FROM trading_strategies WHERE strategy_id = ? AND status = 'ACTIVE'",
+        "strategy_predictions": "SELECT prediction_id FROM strategy_predictions WHERE strategy_id = ? ORDER BY timestamp DESC",
+        "daily_performance": "SELECT * FROM strategy_performance WHERE strategy_id = ? ORDER BY date DESC",
+    },
+)
+
+IV_HISTORY_SCHEMA = Schema(
+    name="iv_history",
+    tables=("iv_intraday", "iv_daily"),
+    migrations=(
+        Migration(1, "Index intraday IV observations by day", indexes=(
+            Index("iv_intraday", ("day", "timestamp")),
+        )),
+    ),
+    hot_queries={
+        "recent_daily_closes": "SELECT day, close FROM iv_daily ORDER BY day DESC LIMIT ?",
+        "latest_intraday": "SELECT MAX(timestamp) FROM iv_intraday",
+        "intraday_for_day": "SELECT * FROM iv_intraday WHERE day = ? ORDER BY timestamp",
+    },
+)
+
+SCHEMAS: Tuple[Schema, ...] = (
+    PAPER_TRADER_SCHEMA, SIGNAL_PERFORMANCE_SCHEMA, SIGNAL_EFFECTIVENESS_SCHEMA, MULTI_STRATEGY_SCHEMA,
+    IV_HISTORY_SCHEMA
+)
+
+def detect_schemas(conn: sqlite3.Connection) -> List[Schema]:
+    """Schemas this file matches (tables and the columns their migrations need)"""
+    return [schema for schema in SCHEMAS if schema_matches(conn, schema)]
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Migrate and audit the SQLite stores")
+    parser.add_argument("databases", nargs="*", help="database files (default: data/*.db)")
+    parser.add_argument("--audit-only", action="store_true", help="report plans without migrating")
+    args = parser.parse_args(argv)
+
+    flagged = 0
+    for db_path in args.databases or sorted(glob.glob("data/*.db")):
+        conn = sqlite3.connect(db_path)
+        try:
+            for schema in detect_schemas(conn):
+                if not args.audit_only:
+                    migrate(conn, schema)
+                report = audit_query_plans(conn, schema)
+                flagged += sum(bool(entry["full_scans"]) for entry in report.values())
+                print(f"\n🗄️ {db_path} [{schema.name} v{current_version(conn, schema.name)}/{schema.version}]")
+                print("\n".join(format_audit(report)))
+        except sqlite3.Error as e:
+            # One damaged or unexpected file must not stop the others from migrating
+            logger.error(f"❌ {db_path}: {e}")
+            flagged += 1
+        finally:
+            conn.close()
+    return 1 if flagged else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,277 @@
+"""
+Delta Sync
+Watermark-based incremental export/import of SQLite tables for training-data sync
+
+Instead of copying whole database files on every sync, the exporter writes only the rows past
+each table's high-water mark (its rowid) to a compressed columnar file, and the importer
+upserts them into the local training store, recording the new marks there. Importing the
+same delta twice is a no-op, so an interrupted sync can simply be re-run.
+
+Tables updated in place (an options position closing flips its status without a new rowid,
+an outcome row gains its 4h and 24h moves after the 1h insert) declare a refresh window: rows
+whose timestamp falls inside it are re-sent with every delta.
+
+File format: numpy .npz (zip-deflated), one array per column plus a null mask where needed,
+and a JSON manifest with each table's columns, key, CREATE statement and new watermark.
+
+Watermarks are kept per source database, identified by host and absolute path (source_id), so
+the local bootstrap copy and the cloud database of the same name never share marks.
+
+    python -m src.core.delta_sync export data/signal_performance.db /tmp/delta.npz --watermarks '{...}'
+    python -m src.core.delta_sync import /tmp/delta.npz ml_training_data/signal_performance.db
+    python -m src.core.delta_sync sync data/signal_performance.db ml_training_data/signal_performance.db
+"""
+
+import argparse
+import json
+import os
+import shlex
+import socket
+import sqlite3
+import subprocess
+import sys
+import tempfile
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from loguru import logger
+
+FORMAT_VERSION = 1
+
+# Tables whose rows change after insert: (timestamp column, days re-sent with every delta)
+REFRESH_WINDOWS: Dict[str, Tuple[str, int]] = {
+    "options_predictions": ("timestamp", 45),
+    "prediction_outcomes": ("timestamp_checked", 7),  # 4h/24h labels filled in after the 1h insert
+    "outcomes": ("timestamp", 7),                     # 24h-72h prices filled in after the prediction
+}
+
+_SKIPPED_TABLES = {"schema_migrations", "sync_watermarks"}
+
+def _tables(conn: sqlite3.Connection) -> Dict[str, str]:
+    rows = conn.execute("SELECT name, sql FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%'")
+    return {name: sql for name, sql in rows if name not in _SKIPPED_TABLES}
+
+def _primary_key(conn: sqlite3.Connection, table: str) -> List[str]:
+    columns = sorted((row[5], row[1]) for row in conn.execute(f"PRAGMA table_info({table})") if row[5])
+    return [name for _, name in columns]
+
+def _column_array(values: List) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """Typed column (int64, float64 or unicode) and a null mask when any value is NULL"""
+    nulls = np.array([value is None for value in values], dtype=bool)
+    present = [value for value in values if value is not None]
+    if all(isinstance(value, int) for value in present):
+        array = np.array([0 if value is None else value for value in values], dtype=np.int64)
+    elif all(isinstance(value, (int, float)) for value in present):
+        array = np.array([np.nan if value is None else value for value in values], dtype=np.float64)
+    else:
+        array = np.array(["" if value is None else str(value) for value in values], dtype=np.str_)
+    return array, (nulls if nulls.any() else None)
+
+def source_id(db_path: str, host: Optional[str] = None) -> str:
+    """Stable identity of a source database: host plus absolute path (this machine by default)"""
+    if host is None:
+        return f"{socket.gethostname()}:{os.path.abspath(db_path)}"
+    return f"{host}:{db_path}"
+
+def export_delta(db_path: str, out_path: str, watermarks: Optional[Dict[str, int]] = None,
+                 tables: Optional[Sequence[str]] = None, now: Optional[datetime] = None) -> Dict:
+    """Write rows past each table's watermark; returns the manifest"""
+    watermarks = watermarks or {}
+    now = now or datetime.now()
+    conn = sqlite3.connect(db_path)
+    arrays: Dict[str, np.ndarray] = {}
+    manifest = {"version": FORMAT_VERSION, "source": source_id(db_path),
+                "exported_at": now.isoformat(), "tables": {}}
+    try:
+        for table, create_sql in _tables(conn).items():
+            if tables and table not in tables:
+                continue
+            since = int(watermarks.get(table, 0))
+            where, params = "rowid > ?", [since]
+            if table in REFRESH_WINDOWS and since:
+                column, days = REFRESH_WINDOWS[table]
+                where += f" OR {column} >= ?"
+                params.append((now - timedelta(days=days)).date().isoformat())
+
+            cursor = conn.execute(f"SELECT rowid, * FROM {table} WHERE {where} ORDER BY rowid", params)
+            columns = [column[0] for column in cursor.description][1:]
+            rows = cursor.fetchall()
+            key = _primary_key(conn, table)
+            manifest["tables"][table] = {
+                "columns": columns,
+                "key": key,
+                "create_sql": create_sql,
+                "rows": len(rows),
+                "watermark": max([since] + [row[0] for row in rows]),
+            }
+            if not rows:
+                continue
+            values = list(zip(*rows))
+            if not key:
+                arrays[f"{table}/rowid"] = np.array(values[0], dtype=np.int64)  # Identity for keyless tables
+            for i, column in enumerate(columns, start=1):
+                array, nulls = _column_array(list(values[i]))
+                arrays[f"{table}/{column}"] = array
+                if nulls is not None:
+                    arrays[f"{table}/{column}/null"] = nulls
+    finally:
+        conn.close()
+
+    arrays["__manifest__"] = np.array(json.dumps(manifest))
+    os.makedirs(os.path.dirname(os.path.abspath(out_path)), exist_ok=True)
+    with open(out_path, "wb") as out:
+        np.savez_compressed(out, **arrays)
+    return manifest
+
+def read_delta(path: str) -> Tuple[Dict, Dict[str, List[tuple]]]:
+    """Manifest and rows per table (NULLs restored)"""
+    with np.load(path, allow_pickle=False) as delta:
+        manifest = json.loads(str(delta["__manifest__"]))
+        rows = {}
+        for table, info in manifest["tables"].items():
+            if not info["rows"]:
+                continue
+            columns = []
+            if not info["key"]:
+                columns.append(delta[f"{table}/rowid"].tolist())
+            for column in info["columns"]:
+                values = delta[f"{table}/{column}"].tolist()
+                null_key = f"{table}/{column}/null"
+                if null_key in delta.files:
+                    values = [None if null else value for value, null in zip(values, delta[null_key].tolist())]
+                columns.append(values)
+            rows[table] = list(zip(*columns))
+    return manifest, rows
+
+def _ensure_watermark_table(conn: sqlite3.Connection):
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS sync_watermarks (
+            source TEXT NOT NULL,
+            table_name TEXT NOT NULL,
+            watermark INTEGER NOT NULL,
+            synced_at TEXT NOT NULL,
+            PRIMARY KEY (source, table_name)
+        )
+    """)
+
+def watermarks_for(target_db: str, source: str) -> Dict[str, int]:
+    """High-water marks already imported from source (a source_id)"""
+    if not os.path.exists(target_db):
+        return {}
+    conn = sqlite3.connect(target_db)
+    try:
+        _ensure_watermark_table(conn)
+        rows = conn.execute("SELECT table_name, watermark FROM sync_watermarks WHERE source = ?", (source,))
+        return dict(rows.fetchall())
+    finally:
+        conn.close()
+
+def import_delta(path: str, target_db: str, source: Optional[str] = None) -> Dict[str, int]:
+    """Upsert a delta into target_db in one transaction; returns rows applied per table
+
+    Watermarks are recorded under source, which defaults to the identity the exporter wrote.
+    Pulls pass the identity they look watermarks up by, since the exporting host may not know
+    the name the puller reaches it under.
+    """
+    manifest, rows = read_delta(path)
+    source = source or manifest["source"]
+    conn = sqlite3.connect(target_db)
+    applied = {}
+    try:
+        _ensure_watermark_table(conn)
+        existing = _tables(conn)
+        conn.execute("BEGIN IMMEDIATE")
+        for table, info in manifest["tables"].items():
+            if table not in existing:
+                conn.execute(info["create_sql"])
+            if table in rows:
+                columns = ([] if info["key"] else ["rowid"]) + info["columns"]
+                placeholders = ", ".join("?" * len(columns))
+                conn.executemany(
+                    f"INSERT OR REPLACE INTO {table} ({', '.join(columns)}) VALUES ({placeholders})", rows[table]
+                )
+                applied[table] = len(rows[table])
+            conn.execute(
+                "INSERT OR REPLACE INTO sync_watermarks (source, table_name, watermark, synced_at) VALUES (?, ?, ?, ?)",
+                (source, table, info["watermark"], datetime.now().isoformat())
+            )
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+    return applied
+
+def sync(source_db: str, target_db: str, delta_path: Optional[str] = None) -> Dict[str, int]:
+    """Local source → target sync through a delta file (what a remote pull does over ssh)"""
+    source = source_id(source_db)
+    cleanup = delta_path is None
+    if delta_path is None:
+        handle, delta_path = tempfile.mkstemp(suffix=".npz")
+        os.close(handle)
+    try:
+        manifest = export_delta(source_db, delta_path, watermarks_for(target_db, source))
+        applied = import_delta(delta_path, target_db, source)
+        logger.info(
+            f"🔄 Synced {sum(applied.values())} rows from {source_db} "
+            f"({os.path.getsize(delta_path) / 1024:.0f}KB delta, {len(manifest['tables'])} tables)"
+        )
+        return applied
+    finally:
+        if cleanup and os.path.exists(delta_path):
+            os.remove(delta_path)
+
+def remote_export_command(remote_db: str, remote_out: str, watermarks: Dict[str, int], app_dir: str,
+                          python: str = "python3") -> str:
+    """Shell command that writes a delta on the server (run over ssh / paramiko exec_command)"""
+    return (
+        f"cd {shlex.quote(app_dir)} && {python} -m src.core.delta_sync export "
+        f"{shlex.quote(remote_db)} {shlex.quote(remote_out)} --watermarks {shlex.quote(json.dumps(watermarks))}"
+    )
+
+def pull_over_ssh(server: str, remote_db: str, local_db: str, app_dir: str,
+                  ssh_options: str = "-o StrictHostKeyChecking=no") -> Dict[str, int]:
+    """Export a delta on server, scp it back and upsert it into local_db"""
+    source = source_id(remote_db, host=server)
+    remote_out = f"/tmp/delta_{os.path.basename(remote_db)}_{os.getpid()}.npz"
+    local_out = f"{local_db}.delta.npz"
+    command = remote_export_command(remote_db, remote_out, watermarks_for(local_db, source), app_dir)
+    try:
+        subprocess.run(["ssh", *shlex.split(ssh_options), server, command], check=True, capture_output=True)
+        subprocess.run(["scp", *shlex.split(ssh_options), f"{server}:{remote_out}", local_out], check=True)
+        subprocess.run(["ssh", *shlex.split(ssh_options), server, f"rm -f {shlex.quote(remote_out)}"], check=False)
+        applied = import_delta(local_out, local_db, source)
+        logger.info(f"🔄 Pulled {sum(applied.values())} new rows from {server}:{remote_db}")
+        return applied
+    finally:
+        if os.path.exists(local_out):
+            os.remove(local_out)
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Incremental SQLite delta export/import")
+    commands = parser.add_subparsers(dest="command", required=True)
+    export = commands.add_parser("export", help="write rows past the given watermarks")
+    export.add_argument("database")
+    export.add_argument("out")
+    export.add_argument("--watermarks", default="{}", help="JSON {table: rowid} already held by the importer")
+    load = commands.add_parser("import", help="upsert a delta file into a database")
+    load.add_argument("delta")
+    load.add_argument("database")
+    local = commands.add_parser("sync", help="export + import between two local databases")
+    local.add_argument("source")
+    local.add_argument("target")
+    args = parser.parse_args(argv)
+
+    if args.command == "export":
+        manifest = export_delta(args.database, args.out, json.loads(args.watermarks))
+        print(json.dumps({table: info["rows"] for table, info in manifest["tables"].items()}))
+    elif args.command == "import":
+        print(json.dumps(import_delta(args.delta, args.database)))
+    else:
+        print(json.dumps(sync(args.source, args.target)))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,13 +2,16 @@
 Health check endpoint for monitoring
 """
 from fastapi import FastAPI
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 import uvicorn
 from datetime import datetime
 import psutil
 import os
 from loguru import logger
 
+from src.core.cycle_tracer import cycle_tracer
+from src.core.memory_accounting import memory_accountant
+
 app = FastAPI()
 
 @app.get("/health")
@@ -73,11 +76,17 @@ algoslayer_disk_usage {disk.percent}
 # HELP algoslayer_up Service up status
 # TYPE algoslayer_up gauge
 algoslayer_up 1
+
 """
+        # Per-stage trading cycle latency histograms
+        metrics_text += cycle_tracer.render_prometheus()
         
-        return JSONResponse(
+        # Process RSS and per-component memory
+        metrics_text += memory_accountant.render_prometheus()
+        
+        return PlainTextResponse(
             content=metrics_text,
-            media_type="text/plain"
+            media_type="text/plain; version=0.0.4"
         )
     except Exception as e:
         logger.error(f"Metrics endpoint failed: {e}")
@@ -0,0 +1,226 @@
+"""
+IV History Store
+Persistent daily and intraday implied-volatility series with O(log n) rank and percentile
+
+Every chain refresh records the 30-day constant-maturity ATM IV from the shared IV surface
+(with front ATM IV, skew and term slope) into iv_intraday and folds it into that day's
+open/high/low/close row in iv_daily. Completed daily closes are also kept in memory as
+sorted windows of the last 30, 90 and 252 trading days, so IV rank reads the window's ends
+and IV percentile is one bisect, instead of rebuilding a realized-volatility proxy from
+downloaded bars on every call.
+
+Intraday rows expire through data_retention; the daily series is kept.
+"""
+
+import bisect
+import os
+import sqlite3
+import threading
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Deque, Dict, List, Optional
+
+from loguru import logger
+
+from src.core.db_migrations import IV_HISTORY_SCHEMA, migrate
+from src.core.iv_surface import IVSurface
+
+IV_HISTORY_DB = os.getenv("IV_HISTORY_DB", "data/iv_history.db")
+IV_HISTORY_INTRADAY_SECONDS = int(os.getenv("IV_HISTORY_INTRADAY_SECONDS", "300"))
+IV_HISTORY_MIN_DAYS = int(os.getenv("IV_HISTORY_MIN_DAYS", "20"))
+IV_WINDOWS = (30, 90, 252)  # Trading days
+
+CREATE_TABLES = (
+    """
+    CREATE TABLE IF NOT EXISTS iv_intraday (
+        timestamp TEXT PRIMARY KEY,
+        day TEXT NOT NULL,
+        atm_iv_30d REAL NOT NULL,
+        front_atm_iv REAL,
+        front_skew REAL,
+        term_slope REAL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS iv_daily (
+        day TEXT PRIMARY KEY,
+        open REAL NOT NULL,
+        high REAL NOT NULL,
+        low REAL NOT NULL,
+        close REAL NOT NULL,
+        samples INTEGER NOT NULL
+    )
+    """,
+)
+
+class SortedWindow:
+    """The last `size` values in arrival order, plus the same values kept sorted"""
+
+    def __init__(self, size: int):
+        self.size = size
+        self.values: Deque[float] = deque()
+        self.sorted: List[float] = []
+        self.total = 0.0
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def push(self, value: float):
+        if len(self.values) == self.size:
+            expired = self.values.popleft()
+            del self.sorted[bisect.bisect_left(self.sorted, expired)]
+            self.total -= expired
+        self.values.append(value)
+        bisect.insort(self.sorted, value)
+        self.total += value
+
+    def rank(self, value: float) -> float:
+        """Position of value within the window's low-high range, 0-100"""
+        low, high = self.sorted[0], self.sorted[-1]
+        if high <= low:
+            return 50.0
+        return min(max((value - low) / (high - low) * 100, 0.0), 100.0)
+
+    def percentile(self, value: float) -> float:
+        """Share of the window strictly below value, 0-100"""
+        return bisect.bisect_left(self.sorted, value) / len(self.sorted) * 100
+
+    def mean(self) -> float:
+        return self.total / len(self.values)
+
+class IVHistoryStore:
+    """
+    Daily/intraday IV series for one underlying
+
+    Rank and percentile compare a value against completed days only; the current day's
+    close joins the windows when the first observation of the next day arrives.
+    """
+
+    def __init__(self, db_path: str = IV_HISTORY_DB, min_interval: int = IV_HISTORY_INTRADAY_SECONDS,
+                 min_days: int = IV_HISTORY_MIN_DAYS):
+        self.db_path = db_path
+        self.min_interval = min_interval
+        self.min_days = min_days
+        self.windows = {days: SortedWindow(days) for days in IV_WINDOWS}
+        self.open_day: Optional[str] = None
+        self.open_close: Optional[float] = None
+        self.last_intraday: Optional[datetime] = None
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+        return sqlite3.connect(self.db_path)
+
+    def _load(self):
+        """Create/migrate the file and rebuild the windows from the most recent daily closes"""
+        conn = self._connect()
+        try:
+            for statement in CREATE_TABLES:
+                conn.execute(statement)
+            conn.commit()
+            migrate(conn, IV_HISTORY_SCHEMA)
+            rows = conn.execute("SELECT day, close FROM iv_daily ORDER BY day DESC LIMIT ?",
+                                (max(IV_WINDOWS) + 1,)).fetchall()
+            last = conn.execute("SELECT MAX(timestamp) FROM iv_intraday").fetchone()[0]
+        finally:
+            conn.close()
+
+        rows.reverse()
+        if rows:
+            for _, close in rows[:-1]:
+                for window in self.windows.values():
+                    window.push(close)
+            self.open_day, self.open_close = rows[-1]
+        self.last_intraday = datetime.fromisoformat(last) if last else None
+        self._loaded = True
+        if rows:
+            logger.info(f"📚 IV history: {len(rows)} days loaded from {self.db_path}")
+
+    def _ensure_loaded(self):
+        if not self._loaded:
+            with self._lock:
+                if not self._loaded:
+                    self._load()
+
+    # Writing
+
+    def record(self, when: datetime, atm_iv_30d: float, front_atm_iv: Optional[float] = None,
+               front_skew: Optional[float] = None, term_slope: Optional[float] = None) -> bool:
+        """Fold one observation into its day; returns True if an intraday row was also written"""
+        self._ensure_loaded()
+        day = when.date().isoformat()
+        with self._lock:
+            intraday = (self.last_intraday is None or when < self.last_intraday
+                        or when - self.last_intraday >= timedelta(seconds=self.min_interval))
+            conn = self._connect()
+            try:
+                conn.execute("""
+                    INSERT INTO iv_daily (day, open, high, low, close, samples) VALUES (?, ?, ?, ?, ?, 1)
+                    ON CONFLICT (day) DO UPDATE SET
+                        high = MAX(high, excluded.high),
+                        low = MIN(low, excluded.low),
+                        close = excluded.close,
+                        samples = samples + 1
+                """, (day, atm_iv_30d, atm_iv_30d, atm_iv_30d, atm_iv_30d))
+                if intraday:
+                    conn.execute("""
+                        INSERT OR REPLACE INTO iv_intraday (timestamp, day, atm_iv_30d, front_atm_iv, front_skew, term_slope)
+                        VALUES (?, ?, ?, ?, ?, ?)
+                    """, (when.isoformat(), day, atm_iv_30d, front_atm_iv, front_skew, term_slope))
+                    self.last_intraday = when
+                conn.commit()
+            finally:
+                conn.close()
+
+            if self.open_day is None or day > self.open_day:
+                if self.open_day is not None:
+                    for window in self.windows.values():
+                        window.push(self.open_close)
+                self.open_day = day
+            if day == self.open_day:
+                self.open_close = atm_iv_30d
+        return intraday
+
+    def record_surface(self, surface: IVSurface) -> bool:
+        """Record a chain refresh's surface (called by OptionsDataEngine for each new surface)"""
+        return self.record(surface.built_at, surface.atm_at(30), float(surface.atm_iv[0]),
+                           float(surface.skew[0]), surface.term_slope)
+
+    # Queries
+
+    def days(self, window: int = 252) -> int:
+        """Completed days available in a window"""
+        self._ensure_loaded()
+        return len(self.windows[window])
+
+    def _window(self, window: int) -> Optional[SortedWindow]:
+        self._ensure_loaded()
+        values = self.windows[window]
+        return values if len(values) >= min(self.min_days, window) else None
+
+    def rank(self, iv: float, window: int = 252) -> Optional[float]:
+        """IV rank over the last `window` trading days (None until min_days of history exist)"""
+        values = self._window(window)
+        return values.rank(iv) if values else None
+
+    def percentile(self, iv: float, window: int = 252) -> Optional[float]:
+        """IV percentile over the last `window` trading days (None until min_days of history exist)"""
+        values = self._window(window)
+        return values.percentile(iv) if values else None
+
+    def mean(self, window: int = 252) -> Optional[float]:
+        values = self._window(window)
+        return values.mean() if values else None
+
+    def stats(self, iv: float) -> Dict:
+        """Rank and percentile of iv over every window, for signal metadata"""
+        stats = {"iv_history_days": self.days(max(IV_WINDOWS))}
+        for window in IV_WINDOWS:
+            rank, percentile = self.rank(iv, window), self.percentile(iv, window)
+            stats[f"iv_rank_{window}d"] = round(rank, 1) if rank is not None else None
+            stats[f"iv_percentile_{window}d"] = round(percentile, 1) if percentile is not None else None
+        return stats
+
+# Global instance (the database is opened on first use)
+iv_history = IVHistoryStore()
@@ -77,6 +77,10 @@ class IVPercentileAlerts:
                 )
                 alerts.append(alert)
             
+            # Alerts carry the age of the IV surface they were computed from
+            for alert in alerts:
+                alert["iv_as_of"] = iv_data.get("surface_time")
+            
             # Filter alerts based on cooldown
             filtered_alerts = self._filter_alerts_by_cooldown(alerts)
             
@@ -4,9 +4,15 @@ Analyzes RTX implied volatility patterns for optimal options timing
 """
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
-import yfinance as yf
+from src.core.component_registry import components
+from src.core.market_data_provider import market_data
 import numpy as np
 
+# Current IV comes from the engine's shared IV surface (no chain pull of our own),
+# its history from the persistent IV store fed by the same refreshes
+options_data_engine = components.lazy("options_data_engine")
+iv_history = components.lazy("iv_history")
+
 class IVRankOptimizer:
     """Optimizes options entry timing based on IV rank analysis"""
     
@@ -25,61 +31,58 @@ class IVRankOptimizer:
     def get_current_iv_rank(self) -> Dict:
         """Calculate current IV rank for RTX"""
         
-        # Check cache first
-        cache_key = f"{self.symbol}_iv_rank"
-        if (cache_key in self.iv_cache and 
-            (datetime.now() - self.iv_cache[cache_key]["timestamp"]).seconds < self.cache_expiry):
-            return self.iv_cache[cache_key]["data"]
-        
         try:
-            # Get RTX options data
-            ticker = yf.Ticker(self.symbol)
-            
-            # Get near-term expiration options
-            expirations = ticker.options
-            if not expirations:
+            # 30-day ATM IV from the shared surface (one chain refresh for all IV consumers)
+            surface = options_data_engine.get_iv_surface()
+            if surface is None:
                 return {"iv_rank": 50, "current_iv": 25, "status": "unknown"}
             
-            # Use first available expiration
-            exp_date = expirations[0]
-            options_chain = ticker.option_chain(exp_date)
-            
-            # Calculate average IV from ATM options
-            current_price = ticker.history(period="1d")["Close"].iloc[-1]
+            # Reuse the last result while it was built from this same surface
+            cache_key = f"{self.symbol}_iv_rank"
+            cached = self.iv_cache.get(cache_key)
+            if (cached and cached["data"]["surface_time"] == surface.built_at and
+                (datetime.now() - cached["timestamp"]).seconds < self.cache_expiry):
+                return cached["data"]
             
-            # Get ATM call and put IVs
-            calls = options_chain.calls
-            puts = options_chain.puts
+            exp_date = surface.expiries[0]
+            atm_iv = surface.atm_at(30)
+            current_iv = atm_iv * 100
             
-            # Find ATM strikes
-            atm_call = calls.iloc[(calls['strike'] - current_price).abs().argsort()[:1]]
-            atm_put = puts.iloc[(puts['strike'] - current_price).abs().argsort()[:1]]
-            
-            current_iv = 0
-            if not atm_call.empty and not atm_put.empty:
-                call_iv = atm_call['impliedVolatility'].iloc[0] * 100
-                put_iv = atm_put['impliedVolatility'].iloc[0] * 100
-                current_iv = (call_iv + put_iv) / 2
-            
-            # Get historical IV data (approximate from price volatility)
-            historical_data = ticker.history(period="1y")
-            returns = historical_data['Close'].pct_change().dropna()
-            historical_vol = returns.rolling(window=21).std() * np.sqrt(252) * 100
-            
-            # Calculate IV rank (current IV vs historical range)
-            if len(historical_vol) > 50:
-                min_iv = historical_vol.min()
-                max_iv = historical_vol.max()
-                iv_rank = ((current_iv - min_iv) / (max_iv - min_iv)) * 100
+            # IV rank/percentile over the last year of recorded IV (bisect lookups)
+            history = iv_history.stats(atm_iv)
+            if history["iv_rank_252d"] is not None:
+                iv_rank = history["iv_rank_252d"]
+                iv_percentile = history["iv_percentile_252d"]
+                history_source = "iv_history"
             else:
-                iv_rank = 50  # Default middle rank
+                # Not enough recorded days yet: approximate from price volatility
+                ticker = market_data.ticker(self.symbol)
+                historical_data = ticker.history(period="1y")
+                returns = historical_data['Close'].pct_change().dropna()
+                historical_vol = returns.rolling(window=21).std() * np.sqrt(252) * 100
+                
+                # Calculate IV rank (current IV vs historical range)
+                if len(historical_vol) > 50:
+                    min_iv = historical_vol.min()
+                    max_iv = historical_vol.max()
+                    iv_rank = ((current_iv - min_iv) / (max_iv - min_iv)) * 100
+                else:
+                    iv_rank = 50  # Default middle rank
+                iv_percentile = iv_rank
+                history_source = "realized_vol_proxy"
             
             result = {
                 "iv_rank": round(iv_rank, 1),
                 "current_iv": round(current_iv, 1),
-                "iv_percentile": round(iv_rank, 1),
+                "iv_percentile": round(iv_percentile, 1),
+                "iv_rank_30d": history["iv_rank_30d"],
+                "iv_rank_90d": history["iv_rank_90d"],
+                "history_source": history_source,
                 "status": "success",
                 "expiration": exp_date,
+                "skew": round(surface.skew[0] * 100, 1),
+                "term_slope": round(surface.term_slope * 100, 1),
+                "surface_time": surface.built_at,
                 "timestamp": datetime.now()
             }
             
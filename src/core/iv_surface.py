@@ -0,0 +1,128 @@
+"""
+Implied Volatility Surface
+Per-refresh IV smile, ATM term structure and skew built once from the validated chain
+
+OptionsDataEngine builds one surface per chain refresh and hands the same object to every
+IV consumer (IV percentile signal, IV rank optimizer and alerts, options flow), so none of
+them pulls its own chain. The smile for each expiry uses out-of-the-money quotes (puts below
+spot, calls above), which carry the cleaner IV; ATM IV is the smile interpolated at spot.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.core.options_scoring import ChainTable
+
+SKEW_MONEYNESS = 0.05  # Skew = IV at spot×(1-m) minus IV at spot×(1+m)
+
+@dataclass
+class IVSurface:
+    """IV surface for one chain snapshot (arrays are per expiry, ordered by days to expiry)"""
+    built_at: datetime            # When the underlying chain was fetched
+    spot: float
+    expiries: List[str]
+    days_to_expiry: np.ndarray
+    atm_iv: np.ndarray
+    skew: np.ndarray
+    smiles: Dict[str, Tuple[np.ndarray, np.ndarray]]  # expiry -> (strikes, iv), strikes ascending
+    table: ChainTable
+
+    @classmethod
+    def build(cls, table: ChainTable, spot: float, built_at: datetime) -> Optional["IVSurface"]:
+        """Surface from a validated ChainTable; None when no expiry has a usable quote"""
+        usable = table.iv > 0
+        if not usable.any():
+            return None
+
+        expiries, days, atm, skew, smiles = [], [], [], [], {}
+        for expiry in sorted(set(table.expiry[usable])):
+            rows = usable & (table.expiry == expiry)
+            otm = rows & np.where(table.is_call, table.strike >= spot, table.strike <= spot)
+            rows = otm if otm.any() else rows
+
+            # One IV per strike: average call/put quotes sharing a strike (only at spot on the OTM side)
+            strikes, inverse = np.unique(table.strike[rows], return_inverse=True)
+            iv = np.bincount(inverse, weights=table.iv[rows]) / np.bincount(inverse)
+
+            dte = (pd.Timestamp(expiry) - pd.Timestamp(built_at).tz_localize(None).normalize()).days
+            expiries.append(expiry)
+            days.append(max(dte, 0))
+            atm.append(float(np.interp(spot, strikes, iv)))
+            skew.append(float(np.interp(spot * (1 - SKEW_MONEYNESS), strikes, iv)
+                              - np.interp(spot * (1 + SKEW_MONEYNESS), strikes, iv)))
+            smiles[expiry] = (strikes, iv)
+
+        order = np.argsort(days, kind="stable")
+        return cls(
+            built_at=built_at,
+            spot=float(spot),
+            expiries=[expiries[i] for i in order],
+            days_to_expiry=np.asarray(days, dtype=np.int64)[order],
+            atm_iv=np.asarray(atm)[order],
+            skew=np.asarray(skew)[order],
+            smiles=smiles,
+            table=table,
+        )
+
+    def age_seconds(self, now: datetime) -> float:
+        return (now - self.built_at).total_seconds()
+
+    def expiry_index(self, min_dte: int = 0, max_dte: Optional[int] = None) -> Optional[int]:
+        """Nearest expiry with min_dte <= days to expiry <= max_dte"""
+        window = self.days_to_expiry >= min_dte
+        if max_dte is not None:
+            window &= self.days_to_expiry <= max_dte
+        candidates = np.flatnonzero(window)
+        return int(candidates[0]) if len(candidates) else None
+
+    def atm(self, min_dte: int = 0, max_dte: Optional[int] = None) -> Optional[float]:
+        """ATM IV of the nearest expiry in the DTE window (None if the window is empty)"""
+        index = self.expiry_index(min_dte, max_dte)
+        return float(self.atm_iv[index]) if index is not None else None
+
+    def atm_at(self, days: float) -> float:
+        """Constant-maturity ATM IV, interpolated in total variance along the term structure"""
+        if len(self.expiries) == 1:
+            return float(self.atm_iv[0])
+        years = np.maximum(self.days_to_expiry, 1) / 365.0
+        variance = np.interp(max(days, 1) / 365.0, years, self.atm_iv ** 2 * years)
+        return float(np.sqrt(variance / (max(days, 1) / 365.0)))
+
+    def iv_at(self, expiry: str, strike: float) -> float:
+        strikes, iv = self.smiles[expiry]
+        return float(np.interp(strike, strikes, iv))
+
+    @property
+    def term_slope(self) -> float:
+        """Back-month minus front-month ATM IV (negative = inverted, stress priced near-term)"""
+        return float(self.atm_iv[-1] - self.atm_iv[0])
+
+    def contracts(self, expiry: str) -> pd.DataFrame:
+        """One expiry's validated quotes in option_chain() column names, split by 'type'"""
+        rows = self.table.expiry == expiry
+        return pd.DataFrame({
+            "type": np.where(self.table.is_call[rows], "call", "put"),
+            "strike": self.table.strike[rows],
+            "bid": self.table.bid[rows],
+            "ask": self.table.ask[rows],
+            "lastPrice": self.table.last[rows],
+            "volume": self.table.volume[rows],
+            "openInterest": self.table.open_interest[rows],
+            "impliedVolatility": self.table.iv[rows],
+        })
+
+    def summary(self) -> Dict:
+        """Headline metrics for signal metadata and dashboards"""
+        return {
+            "surface_time": self.built_at.isoformat(),
+            "front_expiry": self.expiries[0],
+            "front_atm_iv": round(float(self.atm_iv[0]), 4),
+            "atm_iv_30d": round(self.atm_at(30), 4),
+            "front_skew": round(float(self.skew[0]), 4),
+            "term_slope": round(self.term_slope, 4),
+            "expiries": len(self.expiries),
+        }
@@ -260,23 +260,22 @@ class KellyPositionSizer:
             logger.warning(f"⚠️ Earnings adjustment failed: {e}")
             return base_size, base_reason, base_metrics
     
+    def get_kelly_size(self, strategy_id: str) -> Dict:
+        """Kelly position size for one strategy, with its adjustment from the base size"""
+        size, reason, metrics = self.calculate_optimal_position_size(strategy_id)
+        base_size = self.base_position_sizes.get(strategy_id, 0.20)
+        return {
+            "strategy": strategy_id,
+            "optimal_size": size,
+            "reason": reason,
+            "metrics": metrics,
+            "base_size": base_size,
+            "adjustment": size - base_size
+        }
+    
     def get_all_kelly_sizes(self) -> Dict[str, Dict]:
         """Get Kelly position sizes for all strategies"""
-        kelly_data = {}
-        
-        for strategy_id in ["conservative", "moderate", "aggressive"]:
-            size, reason, metrics = self.calculate_optimal_position_size(strategy_id)
-            
-            kelly_data[strategy_id] = {
-                "strategy": strategy_id,
-                "optimal_size": size,
-                "reason": reason,
-                "metrics": metrics,
-                "base_size": self.base_position_sizes.get(strategy_id, 0.20),
-                "adjustment": size - self.base_position_sizes.get(strategy_id, 0.20)
-            }
-            
-        return kelly_data
+        return {strategy_id: self.get_kelly_size(strategy_id) for strategy_id in ["conservative", "moderate", "aggressive"]}
     
     def get_kelly_summary(self) -> str:
         """Get formatted Kelly sizing summary for Telegram"""
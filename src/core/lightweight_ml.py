@@ -15,8 +15,9 @@ import warnings
 warnings.filterwarnings('ignore')
 
 # Lightweight ML imports
+from sklearn.base import clone
 from sklearn.ensemble import RandomForestClassifier, GradientBoostingClassifier
-from sklearn.linear_model import LogisticRegression
+from sklearn.linear_model import LogisticRegression, SGDClassifier
 from sklearn.preprocessing import StandardScaler, RobustScaler
 from sklearn.model_selection import TimeSeriesSplit
 from sklearn.metrics import accuracy_score, precision_score, recall_score
@@ -41,24 +42,70 @@ class ModelPerformance:
     total_predictions: int
     last_updated: datetime
 
+class DriftDetector:
+    """
+    Page-Hinkley test on the prequential (predict-then-learn) error stream
+    Flags drift when the error rate rises persistently above its running mean
+    """
+    
+    def __init__(self, delta: float = 0.005, threshold: float = 3.0, min_samples: int = 30):
+        self.delta = delta
+        self.threshold = threshold
+        self.min_samples = min_samples
+        self.reset()
+    
+    def reset(self):
+        self.samples = 0
+        self.mean_error = 0.0
+        self.cumulative = 0.0
+        self.minimum = 0.0
+        self.drift_detected = False
+    
+    def update(self, error: float) -> bool:
+        self.samples += 1
+        self.mean_error += (error - self.mean_error) / self.samples
+        self.cumulative += error - self.mean_error - self.delta
+        self.minimum = min(self.minimum, self.cumulative)
+        if self.samples >= self.min_samples and self.cumulative - self.minimum > self.threshold:
+            self.drift_detected = True
+        return self.drift_detected
+
 class LightweightML:
     """
     Memory-efficient ML system for small droplets
+    
+    Online mode (ML_ONLINE_LEARNING=true) swaps in partial_fit-capable models and a running
+    scaler: each newly resolved hourly outcome updates them in place and is checkpointed
+    atomically, and a full 90-day refit only runs when drift is detected.
     """
     
-    def __init__(self, model_dir: str = "data/models"):
+    CLASSES = np.array([0, 1, 2])
+    CHECKPOINT = "online_state.pkl"
+    # volatility_7d needs 168 hourly bars (~24 trading days) before a row is complete;
+    # 45 calendar days (~30 trading days) leaves a few weeks of rows to predict and learn from
+    FEATURE_LOOKBACK_DAYS = 45
+    
+    def __init__(self, model_dir: str = "data/models", online: Optional[bool] = None):
         self.model_dir = Path(model_dir)
         self.model_dir.mkdir(parents=True, exist_ok=True)
+        self.online = os.getenv("ML_ONLINE_LEARNING", "false").lower() == "true" if online is None else online
         
         # Multiple lightweight models
-        self.models = {
-            'direction_classifier': LogisticRegression(max_iter=500, random_state=42),
-            'magnitude_regressor': GradientBoostingClassifier(n_estimators=50, max_depth=3, random_state=42),
-            'volatility_predictor': RandomForestClassifier(n_estimators=30, max_depth=4, random_state=42)
-        }
+        if self.online:
+            self.models = {
+                'direction_classifier': SGDClassifier(loss='log_loss', alpha=1e-3, random_state=42),
+                'magnitude_regressor': SGDClassifier(loss='log_loss', alpha=1e-3, random_state=42),
+                'volatility_predictor': SGDClassifier(loss='log_loss', alpha=1e-3, random_state=42)
+            }
+        else:
+            self.models = {
+                'direction_classifier': LogisticRegression(max_iter=500, random_state=42),
+                'magnitude_regressor': GradientBoostingClassifier(n_estimators=50, max_depth=3, random_state=42),
+                'volatility_predictor': RandomForestClassifier(n_estimators=30, max_depth=4, random_state=42)
+            }
         
         self.scalers = {
-            'features': RobustScaler(),
+            'features': StandardScaler() if self.online else RobustScaler(),  # StandardScaler supports partial_fit
             'returns': StandardScaler()
         }
         
@@ -67,6 +114,15 @@ class LightweightML:
         self.last_training = None
         self.min_data_points = 100  # Minimum data for training
         
+        # Online learning state
+        self.drift_detector = DriftDetector()
+        self.volatility_bounds: Optional[Tuple[float, float]] = None  # Quartiles from the last full fit
+        self.last_learned: Optional[pd.Timestamp] = None  # Newest resolved row already learned
+        self.online_samples = 0
+        self.online_correct = 0
+        if self.online:
+            self._load_checkpoint()  # Resume where the last process stopped
+        
     async def prepare_features(self, symbol: str = "RTX", lookback_days: int = 90) -> pd.DataFrame:
         """
         Prepare feature matrix for ML models
@@ -153,8 +209,6 @@ class LightweightML:
             # Train direction classifier (up/down/sideways)
             y_direction = self._create_direction_labels(features['future_return_4h'])
             if len(np.unique(y_direction)) > 1:  # Check if we have multiple classes
-                self.models['direction_classifier'].fit(X_scaled, y_direction)
-                
                 # Evaluate direction classifier
                 tscv = TimeSeriesSplit(n_splits=3)
                 dir_scores = []
@@ -162,10 +216,13 @@ class LightweightML:
                     X_train, X_test = X_scaled[train_idx], X_scaled[test_idx]
                     y_train, y_test = y_direction[train_idx], y_direction[test_idx]
                     
-                    self.models['direction_classifier'].fit(X_train, y_train)
+                    self._fit('direction_classifier', X_train, y_train)
                     y_pred = self.models['direction_classifier'].predict(X_test)
                     dir_scores.append(accuracy_score(y_test, y_pred))
                 
+                # Final fit on all data (the folds above leave it fit on a subset)
+                self._fit('direction_classifier', X_scaled, y_direction)
+                
                 self.model_performance['direction_classifier'] = ModelPerformance(
                     model_name='direction_classifier',
                     accuracy=np.mean(dir_scores),
@@ -178,17 +235,23 @@ class LightweightML:
             # Train magnitude predictor (how big the move)
             y_magnitude = self._create_magnitude_labels(features['future_return_4h'])
             if len(np.unique(y_magnitude)) > 1:
-                self.models['magnitude_regressor'].fit(X_scaled, y_magnitude)
+                self._fit('magnitude_regressor', X_scaled, y_magnitude)
             
             # Train volatility predictor
             y_volatility = self._create_volatility_labels(features['volatility_24h'])
             if len(np.unique(y_volatility)) > 1:
-                self.models['volatility_predictor'].fit(X_scaled, y_volatility)
+                self._fit('volatility_predictor', X_scaled, y_volatility)
+            
+            self.volatility_bounds = (float(features['volatility_24h'].quantile(0.25)),
+                                      float(features['volatility_24h'].quantile(0.75)))
+            self.last_learned = features.index[-1]
+            self.drift_detector.reset()
+            self.online_samples = self.online_correct = 0
+            self.last_training = datetime.now()
             
             # Save models
             await self._save_models()
             
-            self.last_training = datetime.now()
             print(f"✅ Models trained successfully")
             print(f"   Direction accuracy: {self.model_performance.get('direction_classifier', ModelPerformance('', 0, 0, 0, 0, datetime.now())).accuracy:.2f}%")
             
@@ -198,6 +261,15 @@ class LightweightML:
             print(f"Error training models: {e}")
             return False
     
+    def _fit(self, name: str, X: np.ndarray, y: np.ndarray, epochs: int = 20):
+        """Fit from scratch; online models get all classes registered so later partial_fits accept any label"""
+        if not self.online:
+            self.models[name].fit(X, y)
+            return
+        self.models[name] = clone(self.models[name])
+        for _ in range(epochs):
+            self.models[name].partial_fit(X, y, classes=self.CLASSES)
+    
     def _create_direction_labels(self, returns: pd.Series) -> np.ndarray:
         """Create direction labels: 0=down, 1=sideways, 2=up"""
         labels = np.zeros(len(returns))
@@ -215,17 +287,75 @@ class LightweightML:
         labels[abs_returns <= 0.015] = 0  # Small move
         return labels.astype(int)
     
-    def _create_volatility_labels(self, volatility: pd.Series) -> np.ndarray:
-        """Create volatility regime labels"""
+    def _create_volatility_labels(self, volatility: pd.Series, bounds: Optional[Tuple[float, float]] = None) -> np.ndarray:
+        """Create volatility regime labels (quartiles of this batch unless bounds are given)"""
         labels = np.zeros(len(volatility))
-        vol_75 = volatility.quantile(0.75)
-        vol_25 = volatility.quantile(0.25)
+        vol_25, vol_75 = bounds if bounds else (volatility.quantile(0.25), volatility.quantile(0.75))
         
         labels[volatility > vol_75] = 2  # High volatility
         labels[volatility < vol_25] = 0  # Low volatility
         labels[(volatility >= vol_25) & (volatility <= vol_75)] = 1  # Normal volatility
         return labels.astype(int)
     
+    async def learn_resolved(self, features: pd.DataFrame) -> int:
+        """
+        Online update from rows whose 4h outcome has resolved since the last update
+        
+        Takes the frame prepare_features already built for prediction, so learning costs no
+        extra download. Each row is scored before it is learned (prequential accuracy) and the
+        errors feed the drift detector. Returns the number of rows learned.
+        """
+        if not self.online or features.empty or self.volatility_bounds is None:
+            return 0
+        
+        resolved = features.dropna(subset=['future_return_4h'])
+        if self.last_learned is not None:
+            resolved = resolved[resolved.index > self.last_learned]
+        if resolved.empty:
+            return 0
+        
+        feature_cols = [col for col in resolved.columns if not col.startswith('future_')]
+        X = resolved[feature_cols].fillna(0)
+        
+        # Score with the current model before it sees these outcomes
+        y_direction = self._create_direction_labels(resolved['future_return_4h'])
+        X_before = self.scalers['features'].transform(X)
+        for predicted, actual in zip(self.models['direction_classifier'].predict(X_before), y_direction):
+            self.online_samples += 1
+            self.online_correct += int(predicted == actual)
+            self.drift_detector.update(float(predicted != actual))
+        
+        # Running scaler and incremental model updates
+        self.scalers['features'].partial_fit(X)
+        X_scaled = self.scalers['features'].transform(X)
+        self.models['direction_classifier'].partial_fit(X_scaled, y_direction, classes=self.CLASSES)
+        self.models['magnitude_regressor'].partial_fit(
+            X_scaled, self._create_magnitude_labels(resolved['future_return_4h']), classes=self.CLASSES
+        )
+        self.models['volatility_predictor'].partial_fit(
+            X_scaled, self._create_volatility_labels(resolved['volatility_24h'], self.volatility_bounds), classes=self.CLASSES
+        )
+        
+        self.last_learned = resolved.index[-1]
+        self.model_performance['direction_classifier'] = ModelPerformance(
+            model_name='direction_classifier',
+            accuracy=self.online_correct / self.online_samples,
+            precision=self.online_correct / self.online_samples,  # Simplified
+            recall=self.online_correct / self.online_samples,
+            total_predictions=self.online_samples,
+            last_updated=datetime.now()
+        )
+        self._save_checkpoint()
+        
+        if self.drift_detector.drift_detected:
+            print(f"⚠️ Drift detected after {self.drift_detector.samples} online samples - full refit due")
+        return len(resolved)
+    
+    async def refit(self, symbol: str = "RTX", lookback_days: int = 90) -> bool:
+        """Full refit from scratch on the lookback window (runs on drift, not on a timer, in online mode)"""
+        features = await self.prepare_features(symbol, lookback_days=lookback_days)
+        return await self.train_models(features)
+    
     async def predict(self, current_features: pd.DataFrame) -> MLPrediction:
         """
         Make prediction using trained models
@@ -298,21 +428,58 @@ class LightweightML:
                 model_name="error"
             )
     
+    def _atomic_dump(self, obj, path: Path):
+        """Write to a temp file and rename over path, so readers never load a partial pickle"""
+        temp_path = path.with_name(f".{path.name}.tmp")
+        joblib.dump(obj, temp_path)
+        os.replace(temp_path, path)
+    
     async def _save_models(self):
         """Save trained models to disk"""
         try:
+            if self.online:
+                self._save_checkpoint()
+                return
+            
             for name, model in self.models.items():
-                joblib.dump(model, self.model_dir / f"{name}.pkl")
+                self._atomic_dump(model, self.model_dir / f"{name}.pkl")
             
             for name, scaler in self.scalers.items():
-                joblib.dump(scaler, self.model_dir / f"scaler_{name}.pkl")
+                self._atomic_dump(scaler, self.model_dir / f"scaler_{name}.pkl")
                 
         except Exception as e:
             print(f"Error saving models: {e}")
     
+    def _save_checkpoint(self):
+        """All online state in one file, replaced atomically after every update"""
+        try:
+            self._atomic_dump({
+                'models': self.models,
+                'scalers': self.scalers,
+                'model_performance': self.model_performance,
+                'last_training': self.last_training,
+                'drift_detector': self.drift_detector,
+                'volatility_bounds': self.volatility_bounds,
+                'last_learned': self.last_learned,
+                'online_samples': self.online_samples,
+                'online_correct': self.online_correct,
+            }, self.model_dir / self.CHECKPOINT)
+        except Exception as e:
+            print(f"Error saving online checkpoint: {e}")
+    
+    def _load_checkpoint(self):
+        checkpoint_path = self.model_dir / self.CHECKPOINT
+        if checkpoint_path.exists():
+            for name, value in joblib.load(checkpoint_path).items():
+                setattr(self, name, value)
+    
     async def load_models(self) -> bool:
         """Load trained models from disk"""
         try:
+            if self.online:
+                self._load_checkpoint()
+                return True
+            
             for name in self.models.keys():
                 model_path = self.model_dir / f"{name}.pkl"
                 if model_path.exists():
@@ -334,6 +501,10 @@ class LightweightML:
         if self.last_training is None:
             return True
         
+        # Online models stay current incrementally: only drift forces a full refit
+        if self.online:
+            return self.drift_detector.drift_detected
+        
         # Retrain weekly
         if datetime.now() - self.last_training > timedelta(days=7):
             return True
@@ -351,6 +522,9 @@ class LightweightML:
             'models_trained': len(self.models) > 0,
             'last_training': self.last_training.isoformat() if self.last_training else None,
             'should_retrain': self.should_retrain(),
+            'online': self.online,
+            'online_samples': self.online_samples,
+            'drift_detected': self.drift_detector.drift_detected,
             'performance': {
                 name: {
                     'accuracy': perf.accuracy,
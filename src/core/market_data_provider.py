@@ -0,0 +1,297 @@
+"""
+Market Data Provider
+Pluggable record/replay layer in front of yfinance for deterministic offline runs
+
+Modes (MARKET_DATA_MODE):
+- live:   plain yfinance, exactly as before (default)
+- record: call yfinance and append every response to a compressed archive
+- replay: serve responses from the archive on a simulated clock, no network
+
+Consumers ask for ``market_data.ticker(symbol)`` instead of ``yf.Ticker(symbol)``;
+the returned object supports the Ticker surface used in this codebase
+(history, options, option_chain, info, news, calendar).
+"""
+
+import gzip
+import os
+import pickle
+import threading
+from bisect import bisect_right
+from collections import defaultdict, namedtuple
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from loguru import logger
+
+OptionChain = namedtuple("OptionChain", ["calls", "puts", "underlying"])
+
+DEFAULT_ARCHIVE = "data/market_data_archive.pkl.gz"
+TICKER_PROPERTIES = ("options", "info", "news", "calendar")
+
+def _make_key(symbol: str, attr: str, args: Tuple, kwargs: Dict) -> str:
+    """Stable lookup key for one provider call"""
+    parts = [repr(a) for a in args] + [f"{k}={kwargs[k]!r}" for k in sorted(kwargs)]
+    return f"{symbol}|{attr}|{','.join(parts)}"
+
+def _loose_key(symbol: str, attr: str) -> str:
+    """Key ignoring arguments (e.g. history start/end derived from the wall clock)"""
+    return f"{symbol}|{attr}|*"
+
+class MarketDataArchive:
+    """Append-only gzip archive of pickled provider responses"""
+
+    def __init__(self, path: str = DEFAULT_ARCHIVE):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def append(self, record: Dict):
+        """Append one record (each write is its own gzip member)"""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._lock:
+            with gzip.open(self.path, "ab") as f:
+                pickle.dump(record, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def load(self) -> List[Dict]:
+        """Read every record in write order"""
+        records = []
+        if not os.path.exists(self.path):
+            return records
+        with gzip.open(self.path, "rb") as f:
+            while True:
+                try:
+                    records.append(pickle.load(f))
+                except EOFError:
+                    break
+        return records
+
+class ProviderTicker:
+    """yf.Ticker look-alike that routes every call through a MarketDataProvider"""
+
+    def __init__(self, symbol: str, provider: "MarketDataProvider"):
+        self.ticker = symbol
+        self._provider = provider
+
+    def history(self, *args, **kwargs):
+        return self._provider.fetch(self.ticker, "history", *args, **kwargs)
+
+    def option_chain(self, *args, **kwargs):
+        return self._provider.fetch(self.ticker, "option_chain", *args, **kwargs)
+
+    @property
+    def options(self):
+        return self._provider.fetch(self.ticker, "options")
+
+    @property
+    def info(self):
+        return self._provider.fetch(self.ticker, "info")
+
+    @property
+    def news(self):
+        return self._provider.fetch(self.ticker, "news")
+
+    @property
+    def calendar(self):
+        return self._provider.fetch(self.ticker, "calendar")
+
+class MarketDataProvider:
+    """Live / record / replay market data provider"""
+
+    MODES = ("live", "record", "replay")
+
+    def __init__(self, mode: str = "live", archive_path: str = DEFAULT_ARCHIVE):
+        self._yf_tickers: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+        self.configure(mode, archive_path)
+
+    def configure(self, mode: str, archive_path: Optional[str] = None):
+        """Switch mode/archive in place (modules keep their reference to the global instance)"""
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown market data mode: {mode} (expected one of {self.MODES})")
+
+        self.mode = mode
+        self._cycle_stamp: Optional[datetime] = None  # Record timestamp shared by one trading cycle
+        if archive_path or not hasattr(self, "archive"):
+            self.archive = MarketDataArchive(archive_path or DEFAULT_ARCHIVE)
+
+        # Replay state
+        self.clock: Optional[datetime] = None  # Simulated "now" while replaying
+        self._clock_pinned = False
+        self._replay: Dict[str, List[Tuple[datetime, Any]]] = defaultdict(list)
+        self._replay_times: Dict[str, List[datetime]] = {}
+        self._cursors: Dict[str, int] = defaultdict(int)
+        self.stats = {"live_calls": 0, "recorded": 0, "replayed": 0, "replay_misses": 0}
+
+        if mode == "replay":
+            self._load_replay()
+
+        if mode != "live":
+            logger.info(f"📼 Market data provider: {mode} mode ({self.archive.path})")
+
+    @contextmanager
+    def replaying(self, archive_path: Optional[str] = None):
+        """Temporarily switch to replay mode, restoring the previous mode afterwards"""
+        previous_mode, previous_archive = self.mode, self.archive.path
+        self.configure("replay", archive_path)
+        try:
+            yield self
+        finally:
+            self.configure(previous_mode, previous_archive)
+
+    @classmethod
+    def from_env(cls) -> "MarketDataProvider":
+        """Build from MARKET_DATA_MODE / MARKET_DATA_ARCHIVE"""
+        return cls(
+            mode=os.getenv("MARKET_DATA_MODE", "live").lower(),
+            archive_path=os.getenv("MARKET_DATA_ARCHIVE", DEFAULT_ARCHIVE)
+        )
+
+    # ---------------------------------------------------------------- public
+
+    def ticker(self, symbol: str):
+        """Drop-in replacement for yf.Ticker(symbol)"""
+        if self.mode == "live":
+            import yfinance as yf
+            return yf.Ticker(symbol)
+        return ProviderTicker(symbol, self)
+
+    def now(self, tz=None) -> datetime:
+        """Wall clock when live/recording, simulated clock when replaying"""
+        if self.mode == "replay" and self.clock is not None:
+            return self.clock.astimezone(tz) if tz else self.clock
+        return datetime.now(tz)
+
+    def set_clock(self, when: datetime):
+        """Pin the replay clock; lookups then return the latest record at or before it (LookupError if none)"""
+        self.clock = when
+        self._clock_pinned = True
+
+    def release_clock(self):
+        """Return to sequential replay (each call serves the next recorded response)"""
+        self._clock_pinned = False
+
+    def recorded_times(self, symbol: Optional[str] = None, attr: Optional[str] = None) -> List[datetime]:
+        """Sorted distinct record timestamps, optionally filtered by symbol/attr"""
+        times = set()
+        for key, entries in self._replay.items():
+            if key.endswith("|*"):
+                continue
+            key_symbol, key_attr, _ = key.split("|", 2)
+            if symbol and key_symbol != symbol:
+                continue
+            if attr and key_attr != attr:
+                continue
+            times.update(ts for ts, _ in entries)
+        return sorted(times)
+
+    def begin_cycle(self, when: Optional[datetime] = None):
+        """Stamp every record until end_cycle() with the cycle start, so a replay clock pinned
+        to a cycle's "signals" event sees that cycle's chain and bars, not the previous cycle's"""
+        self._cycle_stamp = when or datetime.now()
+
+    def end_cycle(self):
+        self._cycle_stamp = None
+
+    def record_event(self, symbol: str, attr: str, payload: Any):
+        """Archive a derived per-cycle payload (e.g. signal results) while recording"""
+        if self.mode == "record":
+            self._write(symbol, attr, _make_key(symbol, attr, (), {}), payload)
+
+    def events(self, symbol: str, attr: str) -> List[Tuple[datetime, Any]]:
+        """All replayed (timestamp, payload) pairs for symbol/attr in time order"""
+        return list(self._replay.get(_loose_key(symbol, attr), []))
+
+    def fetch(self, symbol: str, attr: str, *args, **kwargs):
+        """Fetch one Ticker attribute/method result according to the current mode"""
+        if self.mode == "replay":
+            return self._replay_fetch(symbol, attr, args, kwargs)
+
+        result = self._live_fetch(symbol, attr, args, kwargs)
+        if self.mode == "record":
+            self._record(symbol, attr, args, kwargs, result)
+        return result
+
+    # --------------------------------------------------------------- live
+
+    def _live_fetch(self, symbol: str, attr: str, args: Tuple, kwargs: Dict):
+        with self._lock:
+            yf_ticker = self._yf_tickers.get(symbol)
+            if yf_ticker is None:
+                import yfinance as yf
+                yf_ticker = self._yf_tickers[symbol] = yf.Ticker(symbol)
+            self.stats["live_calls"] += 1
+
+        value = getattr(yf_ticker, attr)
+        if attr in TICKER_PROPERTIES:
+            return value
+        result = value(*args, **kwargs)
+        if attr == "option_chain":
+            result = OptionChain(result.calls, result.puts, getattr(result, "underlying", None))
+        return result
+
+    def _record(self, symbol: str, attr: str, args: Tuple, kwargs: Dict, result):
+        payload = result._asdict() if isinstance(result, OptionChain) else result
+        self._write(symbol, attr, _make_key(symbol, attr, args, kwargs), payload)
+
+    def _write(self, symbol: str, attr: str, key: str, payload: Any):
+        try:
+            self.archive.append({
+                "ts": self._cycle_stamp or datetime.now(),
+                "symbol": symbol,
+                "attr": attr,
+                "key": key,
+                "payload": payload
+            })
+            self.stats["recorded"] += 1
+        except Exception as e:
+            logger.warning(f"⚠️ Could not record {symbol}.{attr}: {e}")
+
+    # ------------------------------------------------------------- replay
+
+    def _load_replay(self):
+        records = self.archive.load()
+        for record in records:
+            payload = record["payload"]
+            if record["attr"] == "option_chain" and isinstance(payload, dict):
+                payload = OptionChain(**payload)
+            entry = (record["ts"], payload)
+            self._replay[record["key"]].append(entry)
+            self._replay[_loose_key(record["symbol"], record["attr"])].append(entry)
+
+        for key, entries in self._replay.items():
+            entries.sort(key=lambda e: e[0])
+            self._replay_times[key] = [ts for ts, _ in entries]
+
+        logger.info(f"📼 Loaded {len(records)} recorded market data responses")
+
+    def _replay_fetch(self, symbol: str, attr: str, args: Tuple, kwargs: Dict):
+        key = _make_key(symbol, attr, args, kwargs)
+        if key not in self._replay:
+            # Arguments derived from the wall clock never match exactly; fall back by attribute
+            key = _loose_key(symbol, attr)
+        entries = self._replay.get(key)
+
+        if not entries:
+            self.stats["replay_misses"] += 1
+            raise LookupError(f"No recorded market data for {symbol}.{attr}")
+
+        with self._lock:
+            if self._clock_pinned and self.clock is not None:
+                index = bisect_right(self._replay_times[key], self.clock) - 1
+                if index < 0:
+                    # Serving the first record would leak data from after the simulated clock
+                    self.stats["replay_misses"] += 1
+                    raise LookupError(f"No recorded market data for {symbol}.{attr} at or before {self.clock}")
+            else:
+                index = min(self._cursors[key], len(entries) - 1)
+                self._cursors[key] += 1
+                ts = entries[index][0]
+                if self.clock is None or ts > self.clock:
+                    self.clock = ts
+            self.stats["replayed"] += 1
+
+        return entries[index][1]
+
+# Global instance
+market_data = MarketDataProvider.from_env()
@@ -5,7 +5,7 @@ Different market regimes require different approaches for options trading
 """
 import asyncio
 import logging
-import yfinance as yf
+from src.core.market_data_provider import market_data
 import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta, date
@@ -89,7 +89,7 @@ class MarketRegimeDetector:
             data = {}
             for symbol in symbols:
                 try:
-                    ticker = yf.Ticker(symbol)
+                    ticker = market_data.ticker(symbol)
                     hist = ticker.history(period=period)
                     if not hist.empty:
                         data[symbol] = hist
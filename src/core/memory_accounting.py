@@ -0,0 +1,251 @@
+"""
+Memory Accounting
+Per-component memory report and budget enforcement for small servers
+
+Components opt in with two duck-typed hooks:
+    MEMORY_ATTRIBUTES = ("closed_positions", ...)   # containers worth measuring
+    def trim_memory(self) -> int                    # drop cached/bounded data, return items freed
+
+Built registry components (see component_registry) are measured automatically; other
+long-lived objects are added with memory_accountant.track(name, obj). Sizes come from a
+bounded deep walk of the declared attributes, plus tracemalloc attribution by source file
+when tracing is on (MEMORY_TRACEMALLOC=1). RSS is sampled for the whole process.
+/metrics and the Telegram report reuse the component walk for MEMORY_SAMPLE_SECONDS
+(RSS is always current), so frequent scrapes do not re-walk the history containers.
+
+When MEMORY_BUDGET_MB is set and RSS crosses it, every trimmable component is trimmed
+(largest first) and the collector is run.
+"""
+
+import gc
+import inspect
+import os
+import sys
+import threading
+import time
+import tracemalloc
+import weakref
+from typing import Any, Dict, List, Optional
+
+from loguru import logger
+
+from src.core.component_registry import components
+
+_MAX_WALK = 200_000  # Objects visited per component before the estimate is cut short
+MEMORY_SAMPLE_SECONDS = float(os.getenv("MEMORY_SAMPLE_SECONDS", "60"))
+
+def deep_sizeof(root: Any, limit: int = _MAX_WALK) -> int:
+    """Approximate retained bytes of a container tree (arrays and frames via nbytes/memory_usage)"""
+    seen = set()
+    stack = [root]
+    total = 0
+    while stack and len(seen) < limit:
+        obj = stack.pop()
+        if id(obj) in seen or isinstance(obj, (type, weakref.ref)) or inspect.ismodule(obj) or inspect.isroutine(obj):
+            continue
+        seen.add(id(obj))
+
+        memory_usage = getattr(obj, "memory_usage", None)
+        if callable(memory_usage) and hasattr(obj, "columns"):
+            try:
+                total += int(memory_usage(deep=True).sum())  # DataFrame
+                continue
+            except Exception:
+                pass
+        if hasattr(obj, "nbytes") and not isinstance(obj, (str, bytes)):
+            total += sys.getsizeof(obj, 0) + int(getattr(obj, "nbytes", 0) or 0)  # ndarray / shared buffers
+            continue
+
+        total += sys.getsizeof(obj, 0)
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)) or type(obj).__name__ == "deque":
+            stack.extend(obj)
+        elif not isinstance(obj, (str, bytes, int, float, bool)) and obj is not None:
+            if hasattr(obj, "__dict__"):
+                stack.append(vars(obj))
+            for slot in getattr(type(obj), "__slots__", ()):
+                if hasattr(obj, slot):
+                    stack.append(getattr(obj, slot))
+    return total
+
+def process_rss() -> int:
+    """Resident set size of this process in bytes"""
+    try:
+        import psutil
+        return psutil.Process(os.getpid()).memory_info().rss
+    except ImportError:
+        pass
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024  # Peak, not current
+
+class MemoryAccountant:
+    """Samples RSS and per-component sizes; trims caches when over budget"""
+
+    def __init__(self, budget_mb: Optional[float] = None, trace: Optional[bool] = None,
+                 sample_interval: float = MEMORY_SAMPLE_SECONDS):
+        self.budget_mb = budget_mb if budget_mb is not None else float(os.getenv("MEMORY_BUDGET_MB", 0))
+        self.sample_interval = sample_interval
+        self._tracked: Dict[str, weakref.ref] = {}
+        self._lock = threading.Lock()
+        self._sample_lock = threading.Lock()
+        self.last_report: Optional[Dict] = None
+        self._sampled_at = 0.0
+        self.trim_events = 0
+        if trace if trace is not None else os.getenv("MEMORY_TRACEMALLOC", "").lower() in ("1", "true"):
+            self.start_tracing()
+
+    def start_tracing(self, frames: int = 1):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+
+    def track(self, name: str, obj: Any):
+        """Account for an object that is not a registry component (held weakly)"""
+        with self._lock:
+            self._tracked[name] = weakref.ref(obj)
+
+    def _components(self) -> Dict[str, Any]:
+        objects = {name: components.get(name) for name in components.status() if components.is_built(name)}
+        with self._lock:
+            for name, ref in list(self._tracked.items()):
+                obj = ref()
+                if obj is None:
+                    del self._tracked[name]
+                else:
+                    objects[name] = obj
+        return objects
+
+    def _traced_by_file(self) -> Dict[str, int]:
+        if not tracemalloc.is_tracing():
+            return {}
+        stats = tracemalloc.take_snapshot().statistics("filename")
+        return {stat.traceback[0].filename: stat.size for stat in stats}
+
+    def sample(self) -> Dict:
+        """RSS plus the size of every measurable component (always a fresh walk)"""
+        with self._sample_lock:
+            return self._sample()
+
+    def report(self, max_age: Optional[float] = None) -> Dict:
+        """Last sample if its component walk is younger than max_age seconds (default sample_interval)
+
+        RSS and the budget flag are refreshed on every call; concurrent callers share one walk.
+        """
+        max_age = self.sample_interval if max_age is None else max_age
+        with self._sample_lock:
+            if self.last_report is None or time.monotonic() - self._sampled_at > max_age:
+                return self._sample()
+            rss = process_rss()
+            self.last_report = {
+                **self.last_report,
+                "rss_bytes": rss,
+                "over_budget": self.budget_mb > 0 and rss > self.budget_mb * 1024 * 1024,
+                "trim_events": self.trim_events,
+            }
+            return self.last_report
+
+    def _sample(self) -> Dict:
+        start = time.perf_counter()
+        traced = self._traced_by_file()
+        report_components = {}
+        for name, obj in self._components().items():
+            attributes = getattr(obj, "MEMORY_ATTRIBUTES", ())
+            entry = {
+                "bytes": sum(deep_sizeof(getattr(obj, attribute, None)) for attribute in attributes),
+                "trimmable": callable(getattr(obj, "trim_memory", None)),
+                "attributes": {attribute: _length(getattr(obj, attribute, None)) for attribute in attributes},
+            }
+            if traced:
+                try:
+                    entry["traced_bytes"] = traced.get(inspect.getsourcefile(type(obj)), 0)
+                except TypeError:
+                    pass
+            report_components[name] = entry
+
+        rss = process_rss()
+        self.last_report = {
+            "rss_bytes": rss,
+            "budget_bytes": int(self.budget_mb * 1024 * 1024),
+            "over_budget": self.budget_mb > 0 and rss > self.budget_mb * 1024 * 1024,
+            "traced_bytes": tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else None,
+            "components": report_components,
+            "trim_events": self.trim_events,
+            "sample_ms": round((time.perf_counter() - start) * 1000, 1),
+        }
+        self._sampled_at = time.monotonic()
+        return self.last_report
+
+    def trim(self) -> Dict[str, int]:
+        """Trim every trimmable component, largest first"""
+        report = self.sample()
+        objects = self._components()
+        freed = {}
+        for name in sorted(report["components"], key=lambda n: report["components"][n]["bytes"], reverse=True):
+            trim_memory = getattr(objects.get(name), "trim_memory", None)
+            if callable(trim_memory):
+                try:
+                    freed[name] = trim_memory()
+                except Exception as e:
+                    logger.warning(f"⚠️ Could not trim {name}: {e}")
+        gc.collect()
+        self.trim_events += 1
+        return freed
+
+    def enforce_budget(self) -> Optional[Dict[str, int]]:
+        """Cheap RSS check; trims only when the configured budget is crossed"""
+        if self.budget_mb <= 0:
+            return None
+        rss_mb = process_rss() / (1024 * 1024)
+        if rss_mb <= self.budget_mb:
+            return None
+
+        freed = self.trim()
+        after_mb = process_rss() / (1024 * 1024)
+        logger.warning(
+            f"🧹 RSS {rss_mb:.0f}MB over {self.budget_mb:.0f}MB budget - trimmed {freed} (now {after_mb:.0f}MB)"
+        )
+        return freed
+
+    def render_prometheus(self) -> str:
+        report = self.report()
+        lines = [
+            "# HELP algoslayer_memory_rss_bytes Resident set size of the trading process",
+            "# TYPE algoslayer_memory_rss_bytes gauge",
+            f"algoslayer_memory_rss_bytes {report['rss_bytes']}",
+            "# HELP algoslayer_memory_budget_bytes Configured memory budget (0 = disabled)",
+            "# TYPE algoslayer_memory_budget_bytes gauge",
+            f"algoslayer_memory_budget_bytes {report['budget_bytes']}",
+            "# HELP algoslayer_memory_trim_total Budget-triggered cache trims",
+            "# TYPE algoslayer_memory_trim_total counter",
+            f"algoslayer_memory_trim_total {report['trim_events']}",
+            "# HELP algoslayer_component_memory_bytes Estimated bytes held per component",
+            "# TYPE algoslayer_component_memory_bytes gauge",
+        ]
+        for name, entry in report["components"].items():
+            lines.append(f'algoslayer_component_memory_bytes{{component="{name}"}} {entry["bytes"]}')
+        return "\n".join(lines) + "\n"
+
+    def format_report(self, top: int = 8) -> List[str]:
+        """Telegram-friendly lines, largest components first"""
+        report = self.report()
+        lines = [f"• Process RSS: {report['rss_bytes'] / 1048576:.0f}MB"
+                 + (f" / {report['budget_bytes'] / 1048576:.0f}MB budget" if report["budget_bytes"] else "")]
+        ranked = sorted(report["components"].items(), key=lambda item: item[1]["bytes"], reverse=True)
+        for name, entry in ranked[:top]:
+            sizes = ", ".join(f"{attribute}={count}" for attribute, count in entry["attributes"].items() if count is not None)
+            lines.append(f"• {name}: {entry['bytes'] / 1024:.0f}KB" + (f" ({sizes})" if sizes else ""))
+        return lines
+
+def _length(value: Any) -> Optional[int]:
+    try:
+        return len(value)
+    except TypeError:
+        return None
+
+# Global instance
+memory_accountant = MemoryAccountant()
@@ -13,6 +13,8 @@ from loguru import logger
 import asyncio
 from dataclasses import dataclass
 
+from src.core.db_migrations import MULTI_STRATEGY_SCHEMA, migrate
+
 @dataclass
 class StrategyConfig:
     """Configuration for each trading strategy"""
@@ -145,6 +147,7 @@ class MultiStrategyManager:
         ''')
         
         conn.commit()
+        migrate(conn, MULTI_STRATEGY_SCHEMA)
         conn.close()
         
     def _load_or_create_strategies(self) -> Dict[str, Dict]:
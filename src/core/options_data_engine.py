@@ -3,7 +3,7 @@ Real Options Data Engine
 Fetches, validates, and manages real RTX options data
 Ensures 100% accuracy for learning system
 """
-import yfinance as yf
+from src.core.market_data_provider import market_data
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
@@ -12,26 +12,42 @@ from loguru import logger
 import warnings
 warnings.filterwarnings('ignore')
 
-from config.options_config import options_config
+from config.options_config import SizingContext, options_config
+from src.core.iv_history import IVHistoryStore, iv_history
+from src.core.iv_surface import IVSurface
+from src.core.quote_cache import QuoteCache
+from src.core.options_scoring import (
+    CandidateSet, ChainTable, OPTION_SCORE_WEIGHTS, option_score_components
+)
 
 class OptionsDataEngine:
     """Real-time options data with validation and quality checks"""
     
-    def __init__(self, symbol: str = "RTX"):
+    MEMORY_ATTRIBUTES = ("cached_chain", "quotes", "_chain_table", "_candidate_sets", "_iv_surface")
+    
+    def __init__(self, symbol: str = "RTX", score_weights: Optional[np.ndarray] = None,
+                 iv_history: Optional[IVHistoryStore] = None):
         self.symbol = symbol
-        self.ticker = yf.Ticker(symbol)
+        self.iv_history = iv_history  # Each new IV surface is recorded here when set
+        self.score_weights = np.asarray(score_weights if score_weights is not None else OPTION_SCORE_WEIGHTS)
+        self.ticker = market_data.ticker(symbol)
         self.last_update = None
         self.cached_chain = {}
+        self.quotes = QuoteCache()
+        self._chain_table = None  # (chain, ChainTable, scores) for the current chain
+        self._candidate_sets = (None, None, {})  # (chain, spot, {direction: CandidateSet})
+        self._iv_surface = (None, None)  # (chain, IVSurface) for the current chain
+        
+    def get_real_options_chain(self, force_refresh: bool = False, max_age: Optional[float] = None) -> Dict:
+        """Get validated, real options chain data no older than max_age seconds"""
         
-    def get_real_options_chain(self, force_refresh: bool = False) -> Dict:
-        """Get validated, real options chain data"""
+        if max_age is None:
+            max_age = 0 if force_refresh else options_config.MAX_DATA_AGE_MINUTES * 60
         
-        # Check if we need fresh data
-        if (not force_refresh and 
-            self.last_update and 
-            datetime.now() - self.last_update < timedelta(minutes=options_config.MAX_DATA_AGE_MINUTES)):
-            logger.info("📊 Using cached options data")
-            return self.cached_chain
+        return self.quotes.get("chain", self._fetch_options_chain, max_age) or {}
+    
+    def _fetch_options_chain(self) -> Dict:
+        """Download and validate the full options chain"""
         
         if not options_config.is_market_hours():
             logger.warning("⏰ Market closed - options data may be stale")
@@ -81,7 +97,7 @@ class OptionsDataEngine:
                     continue
             
             self.cached_chain = validated_chain
-            self.last_update = datetime.now()
+            self.last_update = market_data.now()
             
             logger.success(f"✅ Loaded {total_contracts} validated options contracts")
             return validated_chain
@@ -94,7 +110,7 @@ class OptionsDataEngine:
         """Check if expiration date meets our criteria"""
         try:
             exp_datetime = datetime.strptime(exp_date, "%Y-%m-%d")
-            days_to_expiry = (exp_datetime - datetime.now()).days
+            days_to_expiry = (exp_datetime - market_data.now()).days
             
             # Check DTE limits
             if days_to_expiry < 3:  # Too close to expiry (less than 3 days)
@@ -229,7 +245,7 @@ class OptionsDataEngine:
                 'gamma': safe_float(option.get('gamma', 0)),
                 'theta': safe_float(option.get('theta', 0)),
                 'vega': safe_float(option.get('vega', 0)),
-                'timestamp': datetime.now().isoformat(),
+                'timestamp': market_data.now().isoformat(),
                 'mid_price': (bid + ask) / 2 if bid > 0 and ask > 0 else 0,
                 'spread_pct': ((ask - bid) / ((ask + bid) / 2)) if bid > 0 else 0
             }
@@ -237,186 +253,160 @@ class OptionsDataEngine:
             logger.error(f"Error formatting option data: {e}")
             raise
     
-    def get_best_options_for_direction(self, direction: str, confidence: float, account_balance: float) -> List[Dict]:
-        """Find the best options for predicted direction"""
+    def get_chain_table(self, max_age: Optional[float] = None) -> Optional[ChainTable]:
+        """Columnar view of the validated chain (rebuilt only when the chain changes)"""
+        scored = self._get_scored_chain(max_age)
+        return scored[1] if scored else None
+    
+    def _get_scored_chain(self, max_age: Optional[float] = None) -> Optional[Tuple[Dict, ChainTable, np.ndarray]]:
+        """(chain, table, option scores) snapshot for the current chain"""
         
-        options_chain = self.get_real_options_chain()
+        options_chain = self.get_real_options_chain(max_age=max_age)
         if not options_chain:
+            return None
+        
+        scored = self._chain_table
+        if scored is None or scored[0] is not options_chain:
+            table = ChainTable.from_chain(options_chain)
+            scored = self._chain_table = (options_chain, table, option_score_components(table) @ self.score_weights)
+        return scored
+    
+    def get_iv_surface(self, max_age: Optional[float] = None) -> Optional[IVSurface]:
+        """IV smile/term structure/skew for the current chain (built once per chain refresh, shared by IV consumers)"""
+        
+        scored = self._get_scored_chain(max_age)
+        if scored is None:
+            return None
+        options_chain, table, _ = scored
+        
+        cached_chain, surface = self._iv_surface
+        if cached_chain is not options_chain:
+            stock_price = self.get_current_stock_price()
+            if not stock_price:
+                return None
+            fetched = self.quotes.peek("chain")
+            surface = IVSurface.build(table, stock_price, fetched[0] if fetched else market_data.now())
+            self._iv_surface = (options_chain, surface)
+            if surface:
+                logger.debug(f"📐 IV surface: {len(surface.expiries)} expiries, "
+                             f"front ATM {surface.atm_iv[0]:.1%}, skew {surface.skew[0]:+.1%}")
+                if self.iv_history is not None:
+                    try:
+                        self.iv_history.record_surface(surface)
+                    except Exception as e:
+                        logger.warning(f"⚠️ Could not record IV history: {e}")
+        return surface
+    
+    def get_candidate_set(self, direction: str) -> Optional[CandidateSet]:
+        """Scored candidates for one direction, built once per chain snapshot and spot price"""
+        
+        scored = self._get_scored_chain()
+        if scored is None:
             logger.warning("❌ No options chain available")
-            return []
+            return None
+        options_chain, table, scores = scored
         
-        # Get current stock price for strike selection
         stock_price = self.get_current_stock_price()
         if not stock_price:
             logger.warning("❌ No current stock price available")
-            return []
+            return None
+        
+        cached_chain, cached_price, sets = self._candidate_sets
+        if cached_chain is not options_chain or cached_price != stock_price:
+            sets = {}
+            self._candidate_sets = (options_chain, stock_price, sets)
+        
+        candidate_set = sets.get(direction)
+        if candidate_set is None:
+            strike_selection = getattr(options_config, 'STRIKE_SELECTION', 'adaptive')
+            candidate_set = sets[direction] = CandidateSet.build(
+                direction, stock_price, options_chain, table, scores, strike_selection
+            )
+        return candidate_set
+    
+    def get_best_options_for_direction(self, direction: str, confidence: float, account_balance: float,
+                                       top_k: int = 5, candidates: Optional[CandidateSet] = None,
+                                       sizing: Optional[SizingContext] = None) -> List[Dict]:
+        """Find the best options for predicted direction
+        
+        Pass a CandidateSet computed earlier in the cycle to skip the chain lookup and scoring,
+        and a SizingContext to cap cost per request.
+        """
+        
+        if candidates is None or candidates.direction != direction:
+            candidates = self.get_candidate_set(direction)
+            if candidates is None:
+                return []
+        table = candidates.table
+        
+        max_investment = options_config.get_position_size(account_balance, sizing)
+        
+        logger.debug(f"🔍 OPTIONS FILTER DEBUG:")
+        logger.debug(f"   • Direction: {direction}")
+        logger.debug(f"   • Stock price: ${candidates.stock_price:.2f}")
+        logger.debug(f"   • Account balance: ${account_balance:.2f}")
+        logger.debug(f"   • Available contracts: {len(table)}")
         
-        logger.info(f"🔍 OPTIONS FILTER DEBUG:")
-        logger.info(f"   • Direction: {direction}")
-        logger.info(f"   • Stock price: ${stock_price:.2f}")
-        logger.info(f"   • Account balance: ${account_balance:.2f}")
-        logger.info(f"   • Available contracts: {len(options_chain)}")
-        
-        # Filter options by direction
-        filtered_options = []
-        rejected_reasons = {"direction": 0, "strike": 0, "cost": 0, "quality": 0}
-        
-        for contract_symbol, option_data in options_chain.items():
-            # Direction filtering
-            if direction == "BUY" and option_data['type'] != 'call':
-                rejected_reasons["direction"] += 1
-                continue
-            if direction == "SELL" and option_data['type'] != 'put':
-                rejected_reasons["direction"] += 1
-                continue
-            if direction == "HOLD":
-                rejected_reasons["direction"] += 1
-                continue
-            
-            # Strike selection logic
-            if not self._is_suitable_strike(option_data['strike'], stock_price, direction, confidence):
-                rejected_reasons["strike"] += 1
-                continue
-            
-            # Affordability check
-            max_investment = options_config.get_position_size(account_balance)
-            option_cost = option_data['ask'] * 100  # Cost for 1 contract
-            
-            if option_cost > max_investment:
-                rejected_reasons["cost"] += 1
-                logger.debug(f"   ❌ {contract_symbol}: Too expensive (${option_cost:.0f} > ${max_investment:.0f})")
-                continue
-            
-            # Add to candidates with additional fields
-            option_data['contract_symbol'] = contract_symbol
-            option_data['cost_per_contract'] = option_cost
-            option_data['max_contracts'] = options_config.get_contracts_for_trade(option_data['ask'], account_balance)
-            
-            # Calculate days to expiry
-            from datetime import datetime
-            exp_date = datetime.strptime(option_data['expiry'], "%Y-%m-%d")
-            option_data['dte'] = (exp_date - datetime.now()).days
-            option_data['days_to_expiry'] = option_data['dte']
-            
-            # Add pricing info
-            option_data['ask_price'] = option_data['ask']
-            option_data['contracts'] = min(1, option_data['max_contracts'])  # Start with 1 contract
-            option_data['total_cost'] = option_cost + options_config.calculate_commission("BUY", 1)
-            
-            # Add volume and OI with better names
-            option_data['open_interest'] = option_data.get('openInterest', 0)
-            option_data['iv'] = option_data.get('impliedVolatility', 0)
-            
-            # Calculate and add score
-            option_data['score'] = self._calculate_option_score(option_data)
-            
-            filtered_options.append(option_data)
-            logger.debug(f"   ✅ {contract_symbol}: ${option_data['strike']} strike @ ${option_cost:.0f}")
+        # Filter options by direction, strike and affordability as masks over the shared scores
+        strike_mask = candidates.strike_mask(confidence)
+        passed = candidates.affordable_mask(confidence, max_investment)
         
         # Log filtering summary
-        logger.info(f"   📊 FILTERING SUMMARY:")
-        logger.info(f"      • Rejected by direction: {rejected_reasons['direction']}")
-        logger.info(f"      • Rejected by strike: {rejected_reasons['strike']}")
-        logger.info(f"      • Rejected by cost: {rejected_reasons['cost']}")
-        logger.info(f"      • Passed all filters: {len(filtered_options)}")
-        
-        if not filtered_options:
-            logger.warning(f"   ❌ No options passed filters! Max investment: ${options_config.get_position_size(account_balance):.0f}")
+        logger.debug(f"   📊 FILTERING SUMMARY:")
+        logger.debug(f"      • Rejected by direction: {int((~candidates.direction_mask).sum())}")
+        logger.debug(f"      • Rejected by strike: {int((candidates.direction_mask & ~strike_mask).sum())}")
+        logger.debug(f"      • Rejected by cost: {int((strike_mask & ~passed).sum())}")
+        logger.debug(f"      • Passed all filters: {int(passed.sum())}")
+        
+        if not passed.any():
+            logger.warning(f"   ❌ No options passed filters! Max investment: ${max_investment:.0f}")
             return []
         
         # Sort by attractiveness (combination of liquidity, pricing, Greeks)
-        filtered_options.sort(key=self._calculate_option_score, reverse=True)
+        scores = candidates.scores
+        best = [
+            self._candidate_from_row(candidates.chain, table, i, scores[i], account_balance, sizing)
+            for i in candidates.select(confidence, max_investment, top_k)
+        ]
         
-        logger.info(f"   🎯 Top candidate: {filtered_options[0]['contract_symbol']} @ ${filtered_options[0]['cost_per_contract']:.0f}")
+        logger.debug(f"   🎯 Top candidate: {best[0]['contract_symbol']} @ ${best[0]['cost_per_contract']:.0f}")
         
-        return filtered_options[:5]  # Return top 5 candidates
+        return best
     
-    def _is_suitable_strike(self, strike: float, stock_price: float, direction: str, confidence: float) -> bool:
-        """Determine if strike price is suitable for our strategy"""
-        
-        # Get strike selection from config (default to adaptive if not set)
-        strike_selection = getattr(options_config, 'STRIKE_SELECTION', 'adaptive')
-        
-        if strike_selection == "atm":
-            # At-the-money: within 3% of current price (more flexible)
-            suitable = abs(strike - stock_price) / stock_price <= 0.03
-        
-        elif strike_selection == "otm":
-            if direction == "BUY":  # OTM calls
-                suitable = strike > stock_price * 1.005  # At least 0.5% OTM
-            else:  # OTM puts
-                suitable = strike < stock_price * 0.995
-        
-        elif strike_selection == "itm":
-            if direction == "BUY":  # ITM calls
-                suitable = strike < stock_price * 0.995
-            else:  # ITM puts
-                suitable = strike > stock_price * 1.005
-        
-        else:  # "adaptive" - use confidence to determine strategy
-            if confidence > 0.8:
-                # High confidence: ATM for maximum delta
-                suitable = abs(strike - stock_price) / stock_price <= 0.05
-            elif confidence > 0.65:
-                # Medium confidence: Slightly OTM for better risk/reward
-                if direction == "BUY":
-                    suitable = strike >= stock_price * 0.98 and strike <= stock_price * 1.05
-                else:
-                    suitable = strike >= stock_price * 0.95 and strike <= stock_price * 1.02
-            else:
-                # Lower confidence: More conservative ATM
-                suitable = abs(strike - stock_price) / stock_price <= 0.02
+    def _candidate_from_row(self, options_chain: Dict, table: ChainTable, row: int, score: float,
+                            account_balance: float, sizing: Optional[SizingContext] = None) -> Dict:
+        """Materialize one selected chain row as a candidate dict"""
+        
+        option_data = dict(options_chain[table.symbols[row]])
+        option_cost = float(table.ask[row]) * 100  # Cost for 1 contract
+        
+        option_data['contract_symbol'] = table.symbols[row]
+        option_data['cost_per_contract'] = option_cost
+        option_data['max_contracts'] = options_config.get_contracts_for_trade(float(table.ask[row]), account_balance, sizing)
+        
+        # Calculate days to expiry
+        exp_date = datetime.strptime(table.expiry[row], "%Y-%m-%d")
+        option_data['dte'] = (exp_date - market_data.now()).days
+        option_data['days_to_expiry'] = option_data['dte']
         
-        if not suitable:
-            logger.debug(f"   ❌ Strike ${strike:.0f} unsuitable for ${stock_price:.2f} stock (mode: {strike_selection})")
+        # Add pricing info
+        option_data['ask_price'] = option_data['ask']
+        option_data['contracts'] = min(1, option_data['max_contracts'])  # Start with 1 contract
+        option_data['total_cost'] = option_cost + options_config.calculate_commission("BUY", 1)
         
-        return suitable
+        # Add volume and OI with better names
+        option_data['open_interest'] = option_data.get('openInterest', 0)
+        option_data['iv'] = option_data.get('impliedVolatility', 0)
+        option_data['score'] = float(score)
+        
+        return option_data
     
-    def _calculate_option_score(self, option: Dict) -> float:
-        """Calculate attractiveness score for option selection"""
-        score = 0
-        
-        # Liquidity score (30% weight)
-        volume_score = min(option['volume'] / 1000, 1) * 0.3
-        oi_score = min(option['openInterest'] / 5000, 1) * 0.3
-        
-        # Spread score (20% weight) - lower spread is better
-        spread_score = max(0, (0.2 - option['spread_pct']) / 0.2) * 0.2
-        
-        # Enhanced Greeks score (30% weight)
-        delta = option.get('delta', 0)
-        gamma = option.get('gamma', 0)
-        theta = option.get('theta', 0)
-        vega = option.get('vega', 0)
-        
-        # Delta score: Higher delta for directional bets, but not too close to 1.0
-        if option.get("type", "").upper() == "CALL":
-            optimal_delta = 0.6  # Sweet spot for calls
-            delta_score = max(0, 1 - abs(delta - optimal_delta) / optimal_delta) * 0.10
-        else:  # PUT
-            optimal_delta = -0.6  # Sweet spot for puts  
-            delta_score = max(0, 1 - abs(abs(delta) - abs(optimal_delta)) / abs(optimal_delta)) * 0.10
-            
-        # Gamma score: Positive gamma is good, but not excessive
-        gamma_score = min(gamma * 100, 1.0) * 0.08
-        
-        # Theta score: Less negative theta is better (less time decay)
-        theta_score = max(0, 1 + theta / 10) * 0.07  # Normalize theta decay
-        
-        # Vega score: Lower vega during high IV periods
-        vega_score = max(0, 1 - abs(vega) / 20) * 0.05  # Prefer lower vega
-        
-        # Price score (20% weight) - not too cheap, not too expensive
-        price = option['mid_price']
-        if 0.5 <= price <= 5.0:  # Sweet spot for options pricing
-            price_score = 0.2
-        else:
-            price_score = 0.1
-        
-        return volume_score + oi_score + spread_score + delta_score + gamma_score + price_score
+    def get_current_stock_price(self, max_age: float = options_config.QUOTE_MAX_AGE_SCORING) -> Optional[float]:
+        """Get current RTX stock price no older than max_age seconds"""
+        return self.quotes.get("spot", self._fetch_stock_price, max_age)
     
-    def get_current_stock_price(self) -> Optional[float]:
-        """Get current RTX stock price"""
+    def _fetch_stock_price(self) -> Optional[float]:
+        """Latest 1-minute close"""
         try:
             data = self.ticker.history(period="1d", interval="1m")
             if not data.empty:
@@ -425,11 +415,11 @@ class OptionsDataEngine:
             logger.error(f"❌ Failed to get stock price: {e}")
         return None
     
-    def get_option_price_realtime(self, contract_symbol: str) -> Optional[Dict]:
-        """Get real-time price for specific option contract"""
+    def get_option_price_realtime(self, contract_symbol: str, max_age: float = options_config.QUOTE_MAX_AGE_EXIT) -> Optional[Dict]:
+        """Get price for specific option contract no older than max_age seconds"""
         
-        # First try to get from cached/validated chain
-        options_chain = self.get_real_options_chain(force_refresh=True)
+        # First try to get from the validated chain (one refresh shared by all positions)
+        options_chain = self.get_real_options_chain(max_age=max_age)
         if contract_symbol in options_chain:
             return options_chain[contract_symbol]
         
@@ -455,7 +445,7 @@ class OptionsDataEngine:
             strike = int(symbol_parts['strike']) / 1000
             
             # Get the option chain for this expiry
-            chain = self.ticker.option_chain(expiry)
+            chain = self.quotes.get(("expiry_chain", expiry), lambda: self.ticker.option_chain(expiry), max_age)
             
             if symbol_parts['type'] == 'C':
                 options_df = chain.calls
@@ -491,7 +481,7 @@ class OptionsDataEngine:
                 'gamma': float(option.get('gamma', 0)) if not pd.isna(option.get('gamma', 0)) else 0.0,
                 'theta': float(option.get('theta', 0)) if not pd.isna(option.get('theta', 0)) else 0.0,
                 'vega': float(option.get('vega', 0)) if not pd.isna(option.get('vega', 0)) else 0.0,
-                'timestamp': datetime.now().isoformat(),
+                'timestamp': market_data.now().isoformat(),
                 'mid_price': (bid + ask) / 2 if bid > 0 and ask > 0 else 0,
                 'spread_pct': ((ask - bid) / ((ask + bid) / 2)) if bid > 0 and ask > 0 else 0
             }
@@ -503,8 +493,18 @@ class OptionsDataEngine:
             logger.error(f"❌ Failed to fetch {contract_symbol} directly: {e}")
             return None
 
+    def trim_memory(self) -> int:
+        """Drop the cached chain and derived tables; the next cycle refetches (memory budget hook)"""
+        dropped = len(self.cached_chain)
+        self.cached_chain = {}
+        self.quotes.invalidate()
+        self._chain_table = None
+        self._candidate_sets = (None, None, {})
+        self._iv_surface = (None, None)
+        return dropped
+
 # Create global instance
-options_data_engine = OptionsDataEngine("RTX")
+options_data_engine = OptionsDataEngine("RTX", iv_history=iv_history)
 
 if __name__ == "__main__":
     # Test the options data engine
@@ -8,14 +8,20 @@ import json
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
 from loguru import logger
 
+from src.core.db_migrations import PAPER_TRADER_SCHEMA, ensure_schema
+from src.core.prediction_signals import load_signal_features, signal_features, signal_rows
+from src.ml.feature_store import FEATURE_STORE_DIR, FeatureStore, feature_version
+
 class OptionsMLIntegration:
     """Integrates options performance data into ML training"""
     
-    def __init__(self, options_db_path: str = "data/options_performance.db"):
+    def __init__(self, options_db_path: str = "data/options_performance.db", feature_store_dir: str = FEATURE_STORE_DIR):
         self.options_db_path = options_db_path
+        self.feature_store_dir = feature_store_dir
         self.feature_importance = {}
         self.signal_performance = {}
     
@@ -76,107 +82,115 @@ class OptionsMLIntegration:
         return df
     
     def engineer_options_features(self, df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.Series]:
-        """Engineer features specifically for options trading"""
+        """Engineer features specifically for options trading (cached per prediction in the feature store)"""
         
         logger.info("🔧 Engineering options features...")
         
-        features = []
-        labels = []
+        if df.empty:
+            logger.error("❌ No features engineered")
+            return pd.DataFrame(), pd.Series()
         
-        for _, row in df.iterrows():
-            try:
-                # Parse signals data
-                signals_data = json.loads(row['signals_data']) if row['signals_data'] else {}
-                
-                # Time-based features
-                entry_time = pd.to_datetime(row['entry_timestamp'])
-                
-                # Basic features
-                feature_dict = {
-                    # Prediction features
-                    'confidence': row['confidence'],
-                    'expected_move': row['expected_move'],
-                    'expected_profit_pct': row['expected_profit_pct'],
-                    
-                    # Options characteristics
-                    'days_to_expiry': row['days_to_expiry'],
-                    'option_type_call': 1 if row['option_type'] == 'call' else 0,
-                    'strike_to_stock_ratio': row['strike'] / row['stock_price_entry'] if row['stock_price_entry'] > 0 else 1,
-                    'iv_entry': row['iv_entry'],
-                    'delta_entry': row['delta_entry'],
-                    'gamma_entry': row['gamma_entry'],
-                    'theta_entry': abs(row['theta_entry']),  # Absolute value for theta
-                    'vega_entry': row['vega_entry'],
-                    
-                    # Market timing
-                    'hour': entry_time.hour,
-                    'day_of_week': entry_time.dayofweek,
-                    'month': entry_time.month,
-                    
-                    # Position sizing
-                    'contracts': row['contracts'],
-                    'entry_price': row['entry_price'],
-                }
-                
-                # Signal-specific features
-                for signal_name, signal_info in signals_data.items():
-                    if isinstance(signal_info, dict):
-                        signal_direction = signal_info.get('direction', 'HOLD')
-                        signal_confidence = signal_info.get('confidence', 0.5)
-                        signal_strength = signal_info.get('strength', 0.1)
-                        
-                        # Binary direction features
-                        feature_dict[f'{signal_name}_buy'] = 1 if signal_direction == 'BUY' else 0
-                        feature_dict[f'{signal_name}_sell'] = 1 if signal_direction == 'SELL' else 0
-                        feature_dict[f'{signal_name}_confidence'] = signal_confidence
-                        feature_dict[f'{signal_name}_strength'] = signal_strength
-                
-                # Fill missing signal features with defaults
-                signal_names = ['news_sentiment', 'technical_analysis', 'options_flow', 'volatility_analysis', 
-                               'momentum', 'sector_correlation', 'mean_reversion', 'market_regime']
-                
-                for signal_name in signal_names:
-                    for suffix in ['_buy', '_sell', '_confidence', '_strength']:
-                        key = f'{signal_name}{suffix}'
-                        if key not in feature_dict:
-                            if suffix in ['_buy', '_sell']:
-                                feature_dict[key] = 0
-                            elif suffix == '_confidence':
-                                feature_dict[key] = 0.5
-                            else:  # strength
-                                feature_dict[key] = 0.1
-                
-                features.append(feature_dict)
-                
-                # Options-specific labels
-                # Primary label: Was it profitable?
-                profit_label = 1 if row['net_pnl'] > 0 else 0
-                
-                # Additional learning targets
-                pnl_category = self._categorize_pnl(row['pnl_percentage'])
-                
-                labels.append({
-                    'profitable': profit_label,
-                    'pnl_percentage': row['pnl_percentage'],
-                    'pnl_category': pnl_category,
-                    'days_held': row['days_held'],
-                    'exit_reason': row['exit_reason']
-                })
-                
-            except Exception as e:
-                logger.warning(f"⚠️ Error processing trade {row.get('prediction_id', 'unknown')}: {e}")
-                continue
+        store = FeatureStore(
+            f"options_{Path(self.options_db_path).stem}",
+            feature_version(OptionsMLIntegration._trade_features, signal_features),
+            root=self.feature_store_dir
+        )
+        features_df = store.build(df, self._compute_trade_features)
         
-        if not features:
+        if features_df.empty:
             logger.error("❌ No features engineered")
             return pd.DataFrame(), pd.Series()
         
-        features_df = pd.DataFrame(features)
-        labels_df = pd.DataFrame(labels)
+        # Labels come from outcomes, which can still change: never cached
+        profitable = (df.loc[features_df.index, 'net_pnl'] > 0).astype(int)
         
         logger.success(f"✅ Engineered {len(features_df.columns)} features from {len(features_df)} trades")
         
-        return features_df, labels_df['profitable']  # Return profitability as main target
+        return features_df.reset_index(drop=True), profitable.reset_index(drop=True)  # Profitability is the main target
+    
+    def _compute_trade_features(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Feature rows for trades not yet in the feature store"""
+        features = {}
+        stored_signal_features = self._load_signal_features(df['prediction_id'])
+        
+        for index, row in zip(df.index, df.to_dict('records')):
+            try:
+                features[index] = self._trade_features(row, stored_signal_features)
+            except Exception as e:
+                logger.warning(f"⚠️ Error processing trade {row.get('prediction_id', 'unknown')}: {e}")
+        
+        return pd.DataFrame.from_dict(features, orient='index')
+    
+    @staticmethod
+    def _trade_features(row: Dict, stored_signal_features: Dict[str, Dict[str, float]]) -> Dict[str, float]:
+        """Feature vector for one closed trade"""
+        # Time-based features
+        entry_time = pd.to_datetime(row['entry_timestamp'])
+        
+        # Basic features
+        feature_dict = {
+            # Prediction features
+            'confidence': row['confidence'],
+            'expected_move': row['expected_move'],
+            'expected_profit_pct': row['expected_profit_pct'],
+            
+            # Options characteristics
+            'days_to_expiry': row['days_to_expiry'],
+            'option_type_call': 1 if row['option_type'] == 'call' else 0,
+            'strike_to_stock_ratio': row['strike'] / row['stock_price_entry'] if row['stock_price_entry'] > 0 else 1,
+            'iv_entry': row['iv_entry'],
+            'delta_entry': row['delta_entry'],
+            'gamma_entry': row['gamma_entry'],
+            'theta_entry': abs(row['theta_entry']),  # Absolute value for theta
+            'vega_entry': row['vega_entry'],
+            
+            # Market timing
+            'hour': entry_time.hour,
+            'day_of_week': entry_time.dayofweek,
+            'month': entry_time.month,
+            
+            # Position sizing
+            'contracts': row['contracts'],
+            'entry_price': row['entry_price'],
+        }
+        
+        # Signal-specific features (prediction_signals rows; JSON only for rows not in this database)
+        prediction_features = stored_signal_features.get(row['prediction_id'])
+        if prediction_features is None and row['signals_data']:
+            rows = signal_rows(row['prediction_id'], json.loads(row['signals_data']))
+            prediction_features = signal_features(r[2:6] for r in rows)
+        feature_dict.update(prediction_features or {})
+        
+        # Fill missing signal features with defaults
+        signal_names = ['news_sentiment', 'technical_analysis', 'options_flow', 'volatility_analysis', 
+                       'momentum', 'sector_correlation', 'mean_reversion', 'market_regime']
+        
+        for signal_name in signal_names:
+            for suffix in ['_buy', '_sell', '_confidence', '_strength']:
+                key = f'{signal_name}{suffix}'
+                if key not in feature_dict:
+                    if suffix in ['_buy', '_sell']:
+                        feature_dict[key] = 0
+                    elif suffix == '_confidence':
+                        feature_dict[key] = 0.5
+                    else:  # strength
+                        feature_dict[key] = 0.1
+        
+        return feature_dict
+    
+    def _load_signal_features(self, prediction_ids: Iterable[str]) -> Dict[str, Dict[str, float]]:
+        """Signal feature columns for the given predictions from the normalized prediction_signals table"""
+        try:
+            conn = sqlite3.connect(self.options_db_path)
+            try:
+                if not ensure_schema(conn, PAPER_TRADER_SCHEMA):
+                    return {}
+                return load_signal_features(conn, prediction_ids)
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            logger.warning(f"⚠️ Could not load prediction signals: {e}")
+            return {}
     
     def _categorize_pnl(self, pnl_pct: float) -> int:
         """Categorize P&L into buckets for classification"""
@@ -6,24 +6,35 @@ Tracks P&L for learning system with 100% realistic execution
 import json
 import sqlite3
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Tuple
 from loguru import logger
 
 from config.options_config import options_config
 from src.core.options_data_engine import options_data_engine
+from src.core.cycle_tracer import cycle_tracer
+from src.core.db_migrations import PAPER_TRADER_SCHEMA, migrate
+from src.core.prediction_signals import write_prediction_signals
+from src.core.market_data_provider import market_data
+from src.core.trade_history import ClosedPosition, HistoryRing
 
 class OptionsPaperTrader:
     """Realistic options paper trading simulation"""
     
-    def __init__(self, db_path: str = "data/options_performance.db", initial_balance: float = 1000.0, db_suffix: str = ""):
+    MEMORY_ATTRIBUTES = ("open_positions", "closed_positions")
+    CLOSED_HISTORY_SIZE = 200  # Closed-position summaries kept in memory; full history stays in SQLite
+    CLOSED_POSITIONS_KEPT_ON_TRIM = 50
+    
+    def __init__(self, db_path: str = "data/options_performance.db", initial_balance: float = 1000.0, db_suffix: str = "",
+                 closed_history: Optional[int] = CLOSED_HISTORY_SIZE):
         if db_suffix:
             self.db_path = db_path.replace(".db", f"{db_suffix}.db")
         else:
             self.db_path = db_path
         self.open_positions = {}
-        self.closed_positions = []
+        self.closed_positions = HistoryRing(closed_history, loader=self.load_closed_position)
         self.account_balance = initial_balance  # Default, will be overridden by DB if exists
         self.total_pnl = 0.0
+        self.position_callbacks: List[Callable] = []
         self._init_database()
         self._load_open_positions()  # Load existing open positions and balance from database
     
@@ -136,6 +147,7 @@ class OptionsPaperTrader:
         """)
         
         conn.commit()
+        migrate(conn, PAPER_TRADER_SCHEMA)
         conn.close()
         logger.info("📊 Options paper trading database initialized")
     
@@ -257,6 +269,19 @@ class OptionsPaperTrader:
         else:
             logger.info("📊 No open positions to restore")
     
+    def add_position_callback(self, callback: Callable):
+        """Add callback for position events: callback(event, prediction_id, position, account_balance)"""
+        self.position_callbacks.append(callback)
+        logger.info(f"📡 Added position callback: {callback.__name__}")
+    
+    def _notify_position_callbacks(self, event: str, prediction_id: str, position: Dict):
+        """Notify listeners of an OPEN/CLOSE event without letting them break trading"""
+        for callback in self.position_callbacks:
+            try:
+                callback(event, prediction_id, position, self.account_balance)
+            except Exception as e:
+                logger.error(f"❌ Position callback {callback.__name__} failed: {e}")
+    
     def open_position(self, prediction: Dict) -> bool:
         """Open a new options position based on prediction"""
         
@@ -282,7 +307,7 @@ class OptionsPaperTrader:
         position = {
             'prediction': prediction,
             'execution': execution_result,
-            'entry_timestamp': datetime.now(),
+            'entry_timestamp': market_data.now(),
             'status': 'OPEN'
         }
         
@@ -295,6 +320,7 @@ class OptionsPaperTrader:
             old_balance, self.account_balance,
             f"Opened {prediction['contract_symbol']} x{prediction['contracts']}"
         )
+        self._notify_position_callbacks('OPEN', prediction_id, position)
         
         logger.success(
             f"✅ Opened position: {prediction['contract_symbol']} x{prediction['contracts']} "
@@ -348,7 +374,7 @@ class OptionsPaperTrader:
                 'gross_cost': gross_cost,
                 'commission': commission,
                 'total_cost': total_cost,
-                'timestamp': datetime.now(),
+                'timestamp': market_data.now(),
                 'current_bid': current_data['bid'],
                 'current_ask': current_data['ask'],
                 'slippage_applied': contracts > 5
@@ -405,7 +431,7 @@ class OptionsPaperTrader:
         
         # Check time decay (close before expiration)
         exp_date = datetime.strptime(prediction['expiry'], "%Y-%m-%d")
-        days_to_expiry = (exp_date - datetime.now()).days
+        days_to_expiry = (exp_date - market_data.now()).days
         
         if days_to_expiry <= 1:
             return 'TIME_DECAY'
@@ -413,7 +439,7 @@ class OptionsPaperTrader:
         # Check if held too long (25% of original DTE)
         original_dte = prediction['days_to_expiry']
         max_hold_days = max(1, original_dte // 4)
-        days_held = (datetime.now() - entry_timestamp).days
+        days_held = (market_data.now() - entry_timestamp).days
         
         if days_held >= max_hold_days:
             return 'MAX_HOLD_TIME'
@@ -454,7 +480,7 @@ class OptionsPaperTrader:
         
         # Calculate performance metrics
         entry_timestamp = position['entry_timestamp']
-        days_held = (datetime.now() - entry_timestamp).days
+        days_held = (market_data.now() - entry_timestamp).days
         
         # Get stock performance for comparison
         stock_price_entry = prediction.get('stock_price_entry', 0)
@@ -464,7 +490,7 @@ class OptionsPaperTrader:
         # Create outcome record
         outcome = {
             'prediction_id': prediction_id,
-            'exit_timestamp': datetime.now(),
+            'exit_timestamp': market_data.now(),
             'exit_price': exit_execution['execution_price'],
             'exit_reason': exit_reason,
             'days_held': days_held,
@@ -495,8 +521,9 @@ class OptionsPaperTrader:
         # Move to closed positions
         position['outcome'] = outcome
         position['status'] = 'CLOSED'
-        self.closed_positions.append(position)
+        self.closed_positions.append(ClosedPosition.from_position(position))
         del self.open_positions[prediction_id]
+        self._notify_position_callbacks('CLOSE', prediction_id, position)
         
         pnl_emoji = "💰" if net_pnl > 0 else "💸"
         logger.success(
@@ -506,6 +533,7 @@ class OptionsPaperTrader:
         
         return True
     
+    @cycle_tracer.traced("db")
     def _store_prediction(self, prediction: Dict, execution: Dict):
         """Store prediction in database"""
         
@@ -537,10 +565,14 @@ class OptionsPaperTrader:
             stock_price, prediction['volume'], prediction['open_interest'],
             json.dumps(prediction.get('individual_signals', {})), prediction['reasoning'], self.account_balance
         ))
+        write_prediction_signals(
+            conn, prediction['prediction_id'], prediction.get('individual_signals', {}), prediction.get('signal_weights')
+        )
         
         conn.commit()
         conn.close()
     
+    @cycle_tracer.traced("db")
     def _store_outcome(self, outcome: Dict):
         """Store trade outcome in database"""
         
@@ -562,6 +594,7 @@ class OptionsPaperTrader:
         conn.commit()
         conn.close()
     
+    @cycle_tracer.traced("db")
     def _record_account_transaction(self, action: str, trade_id: str, amount: float, balance_before: float, balance_after: float, description: str):
         """Record account transaction"""
         
@@ -576,6 +609,7 @@ class OptionsPaperTrader:
         conn.commit()
         conn.close()
     
+    @cycle_tracer.traced("db")
     def _update_position_status(self, prediction_id: str, status: str):
         """Update position status in database"""
         
@@ -648,7 +682,33 @@ class OptionsPaperTrader:
             'best_trade': best_trade or 0,
             'worst_trade': worst_trade or 0,
             'open_positions_count': len(self.open_positions),
-            'closed_positions_count': len(self.closed_positions)
+            'closed_positions_count': self.closed_positions.appended
+        }
+    
+    def trim_memory(self) -> int:
+        """Drop older closed positions from memory (memory budget hook)"""
+        return self.closed_positions.trim(self.CLOSED_POSITIONS_KEPT_ON_TRIM)
+    
+    def load_closed_position(self, prediction_id: str) -> Optional[Dict]:
+        """Full prediction and outcome rows of a closed position, read from the database"""
+        
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        cursor = conn.cursor()
+        
+        cursor.execute("SELECT * FROM options_predictions WHERE prediction_id = ?", (prediction_id,))
+        prediction = cursor.fetchone()
+        cursor.execute(
+            "SELECT * FROM options_outcomes WHERE prediction_id = ? ORDER BY outcome_id DESC LIMIT 1", (prediction_id,)
+        )
+        outcome = cursor.fetchone()
+        conn.close()
+        
+        if prediction is None and outcome is None:
+            return None
+        return {
+            'prediction': dict(prediction) if prediction else {},
+            'outcome': dict(outcome) if outcome else {}
         }
     
     def get_open_positions_summary(self) -> List[Dict]:
@@ -660,8 +720,10 @@ class OptionsPaperTrader:
             prediction = position['prediction']
             entry_timestamp = position['entry_timestamp']
             
-            # Get current P&L
-            current_data = options_data_engine.get_option_price_realtime(prediction['contract_symbol'])
+            # Get current P&L (display only - a few minutes old is fine)
+            current_data = options_data_engine.get_option_price_realtime(
+                prediction['contract_symbol'], max_age=options_config.QUOTE_MAX_AGE_DASHBOARD
+            )
             
             if current_data:
                 current_price = current_data['mid_price']
@@ -671,7 +733,7 @@ class OptionsPaperTrader:
             else:
                 unrealized_pnl = unrealized_pnl_pct = 0
             
-            days_held = (datetime.now() - entry_timestamp).days
+            days_held = (market_data.now() - entry_timestamp).days
             
             summaries.append({
                 'prediction_id': prediction_id,
@@ -4,21 +4,38 @@ Converts AI signals into specific options trade recommendations
 Predicts exact option contracts, entry prices, and profit targets
 """
 import json
+import numpy as np
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
 from loguru import logger
 
-from config.options_config import options_config
+from config.options_config import SizingContext, options_config
 from src.core.options_data_engine import options_data_engine
+from src.core.market_data_provider import market_data
+from src.core.options_scoring import CandidateSet, ChainTable, ATTRACTIVENESS_WEIGHTS, attractiveness_components
+from src.core.trade_history import HistoryRing, HistoryStore, PredictionRecord
+from src.signals.base_signal import SignalVector
 
 class OptionsPredictionEngine:
     """Converts AI signals into actionable options predictions"""
     
-    def __init__(self):
+    MEMORY_ATTRIBUTES = ("prediction_history",)
+    HISTORY_SIZE = 500  # Prediction summaries kept in memory; full payloads go to history_db
+    HISTORY_KEPT_ON_TRIM = 100
+    
+    def __init__(self, attractiveness_weights: Optional[np.ndarray] = None,
+                 history_db: Optional[str] = "data/prediction_history.db"):
+        self.attractiveness_weights = np.asarray(
+            attractiveness_weights if attractiveness_weights is not None else ATTRACTIVENESS_WEIGHTS
+        )
         self.last_prediction = None
-        self.prediction_history = []
+        self.history_store = HistoryStore(history_db, "options_predictions") if history_db else None
+        self.prediction_history = HistoryRing(
+            self.HISTORY_SIZE, loader=self.history_store.load if self.history_store else None
+        )
     
-    def generate_options_prediction(self, signals_data: Dict, account_balance: float, strategy_id: str = "default", strategy_weights: Optional[Dict] = None) -> Optional[Dict]:
+    def generate_options_prediction(self, signals_data: Dict, account_balance: float, strategy_id: str = "default", strategy_weights: Optional[Dict] = None,
+                                    candidates: Optional[CandidateSet] = None, sizing: Optional[SizingContext] = None) -> Optional[Dict]:
         """
         Generate specific options prediction from AI signals with SIMULATION-BASED LEARNING
         
@@ -27,6 +44,8 @@ class OptionsPredictionEngine:
             account_balance: Current account balance for position sizing
             strategy_id: Strategy making the prediction for learning application
             strategy_weights: Strategy-specific signal weights from simulation learning
+            candidates: Per-cycle CandidateSet shared across strategies (computed here if omitted)
+            sizing: Per-request position sizing (adaptive account-based sizing if omitted)
             
         Returns:
             Specific options trade prediction with all details
@@ -60,7 +79,7 @@ class OptionsPredictionEngine:
         
         # Get best option candidates
         best_options = options_data_engine.get_best_options_for_direction(
-            direction, confidence, account_balance
+            direction, confidence, account_balance, candidates=candidates, sizing=sizing
         )
         
         if not best_options:
@@ -68,7 +87,10 @@ class OptionsPredictionEngine:
             return None
         
         # Select the best option
-        selected_option = self._select_optimal_option(best_options, confidence, expected_move)
+        selected_option = self._select_optimal_option(
+            best_options, confidence, expected_move,
+            stock_price=candidates.stock_price if candidates is not None else None
+        )
         
         if not selected_option:
             logger.warning("❌ No optimal option selected")
@@ -77,7 +99,7 @@ class OptionsPredictionEngine:
         # Generate complete prediction
         prediction = self._create_options_prediction(
             selected_option, direction, confidence, expected_move, 
-            signals_data, account_balance, strategy_id
+            signals_data, account_balance, strategy_id, sizing
         )
         
         # Validate prediction
@@ -87,79 +109,33 @@ class OptionsPredictionEngine:
         
         # Store prediction
         self.last_prediction = prediction
-        self.prediction_history.append(prediction)
+        self.prediction_history.append(PredictionRecord.from_prediction(prediction))
+        if self.history_store:
+            self.history_store.save(prediction['prediction_id'], prediction, prediction.get('timestamp'))
         
         logger.success(f"✅ Options prediction: {prediction['action']} {prediction['contract_symbol']} @ ${prediction['entry_price']:.2f}")
         
         return prediction
     
-    def _select_optimal_option(self, candidates: List[Dict], confidence: float, expected_move: float) -> Optional[Dict]:
-        """Select the most optimal option from candidates"""
+    def _select_optimal_option(self, candidates: List[Dict], confidence: float, expected_move: float,
+                               stock_price: Optional[float] = None) -> Optional[Dict]:
+        """Select the most optimal option from candidates (spot defaults to the data engine's quote)"""
         
         if not candidates:
             return None
         
-        # Score each candidate
-        scored_options = []
-        
-        for option in candidates:
-            score = self._calculate_option_attractiveness(option, confidence, expected_move)
-            scored_options.append((score, option))
-        
-        # Sort by score (highest first)
-        scored_options.sort(key=lambda x: x[0], reverse=True)
+        # Score all candidates at once (one spot fetch for the whole pass)
+        table = ChainTable.from_records([c.get('contract_symbol', '') for c in candidates], candidates)
+        if stock_price is None:
+            stock_price = options_data_engine.get_current_stock_price()
+        scores = attractiveness_components(table, confidence, expected_move, stock_price) @ self.attractiveness_weights
         
         # Return the best option
-        return scored_options[0][1] if scored_options else None
-    
-    def _calculate_option_attractiveness(self, option: Dict, confidence: float, expected_move: float) -> float:
-        """Calculate how attractive an option is for our prediction"""
-        
-        score = 0.0
-        
-        # Liquidity Score (25%)
-        volume_score = min(option['volume'] / 500, 1.0) * 0.15
-        oi_score = min(option['openInterest'] / 2000, 1.0) * 0.10
-        
-        # Pricing Score (25%)
-        spread_score = max(0, (0.15 - option['spread_pct']) / 0.15) * 0.15
-        price_score = 0.10 if 0.50 <= option['mid_price'] <= 8.0 else 0.05
-        
-        # Greeks Score (30%)
-        delta = abs(option.get('delta', 0))
-        gamma = option.get('gamma', 0)
-        theta = abs(option.get('theta', 0))
-        
-        # Higher delta for high confidence predictions
-        delta_score = (delta * confidence) * 0.15
-        
-        # Positive gamma (acceleration)
-        gamma_score = min(gamma * 1000, 0.10) * 0.10
-        
-        # Lower theta decay is better for long options
-        theta_score = max(0, (0.10 - theta) / 0.10) * 0.05
-        
-        # Expected Move Alignment (20%)
-        # Check if option strike aligns with expected move
-        stock_price = options_data_engine.get_current_stock_price()
-        if stock_price:
-            strike = option['strike']
-            
-            if option['type'] == 'call':
-                # For calls, we want the strike below target price
-                target_price = stock_price * (1 + expected_move)
-                strike_alignment = max(0, min(1, (target_price - strike) / stock_price)) * 0.20
-            else:
-                # For puts, we want the strike above target price
-                target_price = stock_price * (1 - expected_move)
-                strike_alignment = max(0, min(1, (strike - target_price) / stock_price)) * 0.20
-            
-            score += strike_alignment
-        
-        return volume_score + oi_score + spread_score + price_score + delta_score + gamma_score + theta_score
+        return candidates[int(np.argmax(scores))]
     
     def _create_options_prediction(self, option: Dict, direction: str, confidence: float, 
-                                 expected_move: float, signals_data: Dict, account_balance: float, strategy_id: str = "default") -> Dict:
+                                 expected_move: float, signals_data: Dict, account_balance: float, strategy_id: str = "default",
+                                 sizing: Optional[SizingContext] = None) -> Dict:
         """Create complete options prediction with all details"""
         
         # Determine action
@@ -173,7 +149,7 @@ class OptionsPredictionEngine:
         # Calculate position sizing
         entry_price = option['ask']  # We'll pay the ask price
         max_contracts = option['max_contracts']
-        position_size = options_config.get_position_size(account_balance)
+        position_size = options_config.get_position_size(account_balance, sizing)
         
         # Calculate costs
         cost_per_contract = entry_price * 100
@@ -187,7 +163,7 @@ class OptionsPredictionEngine:
         
         # Calculate days to expiration
         exp_date = datetime.strptime(option['expiry'], "%Y-%m-%d")
-        days_to_expiry = (exp_date - datetime.now()).days
+        days_to_expiry = (exp_date - market_data.now()).days
         
         # Exit strategy
         exit_before_expiry = max(1, days_to_expiry // 4)  # Exit when 25% of time remains
@@ -202,7 +178,7 @@ class OptionsPredictionEngine:
         
         prediction = {
             # Basic Trade Information
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': market_data.now().isoformat(),
             'symbol': 'RTX',
             'action': action,
             'contract_symbol': option['contract_symbol'],
@@ -264,7 +240,7 @@ class OptionsPredictionEngine:
             'signal_weights': signals_data.get('signal_weights', {}),
             
             # Metadata
-            'prediction_id': f"RTX_{strategy_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
+            'prediction_id': f"RTX_{strategy_id}_{market_data.now().strftime('%Y%m%d_%H%M%S')}",
             'account_balance': account_balance,
             'market_hours': options_config.is_market_hours(),
             'reasoning': self._generate_reasoning(option, direction, confidence, expected_move)
@@ -346,64 +322,53 @@ class OptionsPredictionEngine:
         )
     
     def get_recent_predictions(self, limit: int = 5) -> List[Dict]:
-        """Get recent predictions for analysis"""
-        return self.prediction_history[-limit:] if self.prediction_history else []
+        """Get recent predictions for analysis (full payloads loaded from the prediction log)"""
+        return [
+            self.prediction_history.details(record.prediction_id) or record.to_dict()
+            for record in self.prediction_history[-limit:]
+        ]
+    
+    def trim_memory(self) -> int:
+        """Keep only the most recent predictions (memory budget hook)"""
+        return self.prediction_history.trim(self.HISTORY_KEPT_ON_TRIM)
     
     def _apply_strategy_learning(self, signals_data: Dict, strategy_weights: Optional[Dict], strategy_id: str) -> Dict:
-        """Apply simulation-based learning to enhance signals"""
+        """Apply simulation-based learning to enhance signals
+        
+        Confidence becomes the mean of the strategy-weighted confidences of the signals that ran
+        (0-1 scale; signals without a learned weight count at 1.0), plus the conservative-pattern
+        boost for every other strategy.
+        """
         
         if not strategy_weights:
             return signals_data  # No learning weights available
         
-        # Get individual signal confidences
-        individual_signals = signals_data.get('individual_signals', [])
-        if not individual_signals:
+        # Per-cycle signal vector (rebuilt from individual_signals when it did not travel with the data)
+        vector = SignalVector.from_signals_data(signals_data)
+        if not vector.valid.any():
             return signals_data
         
-        # Apply strategy-specific weights to recalculate confidence
-        weighted_confidences = []
-        total_weight = 0
-        
         logger.info(f"🧠 {strategy_id}: Applying simulation-based learning weights")
         
-        for signal in individual_signals:
-            signal_name = signal.get('name', '').lower()
-            confidence = signal.get('confidence', 0)
-            
-            # Find matching weight (handle various signal name formats)
-            weight = 1.0  # Default weight
-            for weight_key, weight_value in strategy_weights.items():
-                if weight_key.lower() in signal_name or signal_name in weight_key.lower():
-                    weight = weight_value
-                    break
-            
-            weighted_confidence = confidence * weight
-            weighted_confidences.append(weighted_confidence)
-            total_weight += weight
-            
-            logger.debug(f"   • {signal_name}: {confidence:.1%} × {weight:.1f} = {weighted_confidence:.1%}")
+        # Strategy weights matched to signals once, then one dot product over the signals that ran
+        weights = vector.weight_vector(strategy_weights, default=1.0, loose=True)
+        enhanced_confidence = float(weights @ (vector.confidence * vector.valid)) / int(vector.valid.sum())
         
-        # Calculate new enhanced confidence
-        if total_weight > 0:
-            enhanced_confidence = sum(weighted_confidences) / len(weighted_confidences)
-            
-            # Apply Conservative strategy pattern (85% optimal from simulation)
-            if strategy_id != 'conservative':
-                conservative_boost = 0.85 * 0.1  # 10% of optimal pattern
-                enhanced_confidence = min(1.0, enhanced_confidence + conservative_boost)
-            
-            # Create enhanced signals data
-            enhanced_data = signals_data.copy()
-            enhanced_data['confidence'] = enhanced_confidence
-            enhanced_data['learning_applied'] = True
-            enhanced_data['original_confidence'] = signals_data.get('confidence', 0)
-            enhanced_data['learning_boost'] = enhanced_confidence - signals_data.get('confidence', 0)
-            
-            logger.info(f"🎯 {strategy_id}: Confidence enhanced {signals_data.get('confidence', 0):.1%} → {enhanced_confidence:.1%} (+{enhanced_data['learning_boost']:.1%})")
-            
-            return enhanced_data
+        # Apply Conservative strategy pattern (85% optimal from simulation)
+        if strategy_id != 'conservative':
+            conservative_boost = 0.85 * 0.1  # 10% of optimal pattern
+            enhanced_confidence = min(1.0, enhanced_confidence + conservative_boost)
+        
+        # Create enhanced signals data
+        enhanced_data = signals_data.copy()
+        enhanced_data['confidence'] = enhanced_confidence
+        enhanced_data['learning_applied'] = True
+        enhanced_data['original_confidence'] = signals_data.get('confidence', 0)
+        enhanced_data['learning_boost'] = enhanced_confidence - signals_data.get('confidence', 0)
+        
+        logger.info(f"🎯 {strategy_id}: Confidence enhanced {signals_data.get('confidence', 0):.1%} → {enhanced_confidence:.1%} (+{enhanced_data['learning_boost']:.1%})")
         
-        return signals_data
+        return enhanced_data
     
     def _get_strategy_threshold(self, strategy_id: str) -> float:
         """Get strategy-specific confidence threshold from simulation learning"""
@@ -4,42 +4,67 @@ Enhanced scheduler that focuses on options predictions and trading
 Integrates all AI signals with options-specific logic
 """
 import asyncio
+import importlib
+import numpy as np
 from datetime import datetime, time as dt_time
 from typing import Dict, List, Optional
 from loguru import logger
 
 from config.trading_config import config, TradingModeConfig
 from config.options_config import options_config
-from src.core.telegram_bot import telegram_bot
-from src.core.options_data_engine import options_data_engine
-from src.core.options_prediction_engine import options_prediction_engine
-from src.core.options_paper_trader import options_paper_trader
-from src.core.prediction_outcome_tracker import outcome_tracker
-from src.core.signal_effectiveness_tracker import signal_tracker
-from src.core.kelly_criterion_optimizer import kelly_optimizer
-from src.core.iv_rank_optimizer import iv_rank_optimizer
-from src.core.rtx_earnings_calendar import rtx_earnings_calendar
-from src.core.multi_timeframe_confirmation import multi_timeframe_confirmation
+from src.core.component_registry import components
+from src.core.cycle_tracer import cycle_tracer
+from src.core.data_retention import data_retention
+from src.core.market_data_provider import market_data
+from src.core.memory_accounting import memory_accountant
+from src.core.signal_cadence import SignalCadence
+from src.signals.base_signal import SignalResult, SignalVector
 
-# Import all AI signals
-from src.signals.news_sentiment_signal import NewsSentimentSignal
-from src.signals.technical_analysis_signal import TechnicalAnalysisSignal
-from src.signals.options_flow_signal import OptionsFlowSignal
-from src.signals.volatility_analysis_signal import VolatilityAnalysisSignal
-from src.signals.momentum_signal import MomentumSignal
-from src.signals.sector_correlation_signal import SectorCorrelationSignal
-from src.signals.mean_reversion_signal import MeanReversionSignal
-from src.signals.market_regime_signal import MarketRegimeSignal
+# Shared components are imported and built on first use (see component_registry)
+telegram_bot = components.lazy("telegram_bot")
+options_data_engine = components.lazy("options_data_engine")
+options_prediction_engine = components.lazy("options_prediction_engine")
+options_paper_trader = components.lazy("options_paper_trader")
+outcome_tracker = components.lazy("outcome_tracker")
+signal_tracker = components.lazy("signal_tracker")
+kelly_optimizer = components.lazy("kelly_optimizer")
+iv_rank_optimizer = components.lazy("iv_rank_optimizer")
+rtx_earnings_calendar = components.lazy("rtx_earnings_calendar")
+multi_timeframe_confirmation = components.lazy("multi_timeframe_confirmation")
 
-# Import new high-value options signals
-from src.signals.trump_geopolitical_signal import TrumpGeopoliticalSignal
-from src.signals.defense_contract_signal import DefenseContractSignal
-from src.signals.rtx_earnings_signal import RTXEarningsSignal
-from src.signals.options_iv_percentile_signal import OptionsIVPercentileSignal
+# AI signals (12 total), imported when the scheduler first needs them
+SIGNAL_CLASSES = {
+    # Classic signals
+    "news_sentiment": "src.signals.news_sentiment_signal:NewsSentimentSignal",
+    "technical_analysis": "src.signals.technical_analysis_signal:TechnicalAnalysisSignal",
+    "options_flow": "src.signals.options_flow_signal:OptionsFlowSignal",
+    "volatility_analysis": "src.signals.volatility_analysis_signal:VolatilityAnalysisSignal",
+    "momentum": "src.signals.momentum_signal:MomentumSignal",
+    "sector_correlation": "src.signals.sector_correlation_signal:SectorCorrelationSignal",
+    "mean_reversion": "src.signals.mean_reversion_signal:MeanReversionSignal",
+    "market_regime": "src.signals.market_regime_signal:MarketRegimeSignal",
+    
+    # New high-value options signals
+    "trump_geopolitical": "src.signals.trump_geopolitical_signal:TrumpGeopoliticalSignal",
+    "defense_contract": "src.signals.defense_contract_signal:DefenseContractSignal",
+    "rtx_earnings": "src.signals.rtx_earnings_signal:RTXEarningsSignal",
+    "options_iv_percentile": "src.signals.options_iv_percentile_signal:OptionsIVPercentileSignal"
+}
+
+def build_signals(names=None) -> Dict:
+    """Import and instantiate the configured signals (all of them by default)"""
+    signals = {}
+    for name in names or SIGNAL_CLASSES:
+        module_name, _, class_name = SIGNAL_CLASSES[name].partition(":")
+        signals[name] = getattr(importlib.import_module(module_name), class_name)()
+    return signals
 
 class OptionsScheduler:
     """Advanced scheduler for autonomous RTX options trading"""
     
+    OPTIONS_CONFIDENCE_THRESHOLD = 0.75
+    MAX_OPEN_POSITIONS = 8
+    
     def __init__(self):
         self.running = False
         self.start_time = None
@@ -65,23 +90,10 @@ class OptionsScheduler:
             "options_iv_percentile": 0.05 # IV rank analysis
         }
         
-        self.signals = {
-            # Classic signals
-            "news_sentiment": NewsSentimentSignal(),
-            "technical_analysis": TechnicalAnalysisSignal(),
-            "options_flow": OptionsFlowSignal(),
-            "volatility_analysis": VolatilityAnalysisSignal(),
-            "momentum": MomentumSignal(),
-            "sector_correlation": SectorCorrelationSignal(),
-            "mean_reversion": MeanReversionSignal(),
-            "market_regime": MarketRegimeSignal(),
-            
-            # New high-value options signals
-            "trump_geopolitical": TrumpGeopoliticalSignal(),
-            "defense_contract": DefenseContractSignal(),
-            "rtx_earnings": RTXEarningsSignal(),
-            "options_iv_percentile": OptionsIVPercentileSignal()
-        }
+        self._signals: Optional[Dict] = None  # Built on first use
+        
+        # Slow signals (earnings, regime, contracts...) are served from memo between refreshes
+        self.signal_cadence = SignalCadence()
         
         # Options trading state
         self.last_options_prediction = None
@@ -104,6 +116,16 @@ class OptionsScheduler:
         logger.info(f"💰 Starting balance: ${options_paper_trader.account_balance:.2f}")
         logger.info(f"🎮 Life #{life_status['life_number']} - Health: {life_status['health_percentage']:.1f}%")
     
+    @property
+    def signals(self) -> Dict:
+        if self._signals is None:
+            self._signals = build_signals()
+        return self._signals
+    
+    @signals.setter
+    def signals(self, signals: Dict):
+        self._signals = signals
+    
     async def start_autonomous_trading(self):
         """Start the main autonomous trading loop"""
         
@@ -131,6 +153,7 @@ class OptionsScheduler:
                 # Check if market is open
                 if not options_config.is_market_hours():
                     logger.info("⏰ Market closed - sleeping")
+                    await asyncio.to_thread(data_retention.run_if_due)  # Rollups, archives, vacuum (once a day)
                     await asyncio.sleep(300)  # Check every 5 minutes
                     continue
                 
@@ -167,6 +190,8 @@ class OptionsScheduler:
         
         self.cycle_count += 1
         cycle_start = datetime.now()
+        cycle_tracer.start_cycle(self.cycle_count, source=self.strategy_id)
+        market_data.begin_cycle(cycle_start)
         
         # Log current balance at start of cycle for tracking
         current_balance = options_paper_trader.account_balance
@@ -178,15 +203,20 @@ class OptionsScheduler:
             # current_balance = self.paper_trader.account_balance
             # life_status = self.lives_tracker.check_life_status(current_balance)
             
+            # Trim caches first if the process is over its memory budget
+            memory_accountant.enforce_budget()
+            
             # Step 1: Check existing positions
-            await self._check_existing_positions()
+            with cycle_tracer.span("position_check"):
+                await self._check_existing_positions()
             
             # Step 2: Track prediction outcomes (every 5th cycle)
             if self.cycle_count % 5 == 0:
                 asyncio.create_task(outcome_tracker.track_all_outcomes())
             
             # Step 3: Generate new signals
-            signals_data = await self._generate_signals()
+            with cycle_tracer.span("signals"):
+                signals_data = await self._generate_signals()
             
             if not signals_data:
                 logger.warning("⚠️ No signals generated")
@@ -194,21 +224,28 @@ class OptionsScheduler:
             
             # Step 3: Create options prediction
             logger.info("🎯 Creating options prediction from signals...")
-            prediction = await self._create_options_prediction(signals_data)
+            with cycle_tracer.span("option_selection"):
+                prediction = await self._create_options_prediction(signals_data)
             
             if prediction:
                 logger.info(f"📋 Options prediction created: {prediction.get('action', 'UNKNOWN')} confidence={prediction.get('confidence', 0):.1%}")
                 # Step 4: Execute trade (if conditions are met)
-                await self._execute_options_trade(prediction)
+                with cycle_tracer.span("execution"):
+                    await self._execute_options_trade(prediction)
             else:
                 logger.warning("⚠️ No options prediction generated - confidence too low or no suitable contracts")
             
             # Step 5: Send status update
-            await self._send_cycle_update(signals_data, prediction)
+            with cycle_tracer.span("notification", "cycle_update"):
+                await self._send_cycle_update(signals_data, prediction)
             
         except Exception as e:
             logger.error(f"❌ Trading cycle error: {e}")
             await telegram_bot.send_message(f"🚨 **Cycle Error:** {e}")
+        finally:
+            # Always close the trace, including the early "no signals" return
+            cycle_tracer.end_cycle(balance=current_balance)
+            market_data.end_cycle()
         
         cycle_duration = (datetime.now() - cycle_start).total_seconds()
         logger.info(f"✅ Trading cycle #{self.cycle_count} completed in {cycle_duration:.1f}s")
@@ -242,7 +279,8 @@ class OptionsScheduler:
             logger.info(f"🎯 Found {len(actions)} position actions to execute")
             for action in actions:
                 logger.info(f"📈 Position action: {action}")
-                await telegram_bot.send_message(f"📈 **Position Update**\n{action}")
+                with cycle_tracer.span("notification", "position_update"):
+                    await telegram_bot.send_message(f"📈 **Position Update**\n{action}")
         else:
             logger.info("✓ All positions within normal parameters")
     
@@ -251,13 +289,15 @@ class OptionsScheduler:
         
         logger.info("🤖 Generating AI signals...")
         
-        signal_results = {}
-        successful_signals = 0
+        # Only signals past their refresh cadence are recomputed
+        due_signals, memoized = self.signal_cadence.partition(self.signals)
+        if memoized:
+            logger.info(f"♻️ Reusing {len(memoized)} memoized signals, computing {len(due_signals)}")
         
-        # Run all signals in parallel for speed
+        # Run due signals in parallel for speed
         signal_tasks = []
         
-        for signal_name, signal_instance in self.signals.items():
+        for signal_name, signal_instance in due_signals.items():
             task = asyncio.create_task(
                 self._run_single_signal(signal_name, signal_instance),
                 name=signal_name
@@ -267,28 +307,44 @@ class OptionsScheduler:
         # Wait for all signals to complete
         results = await asyncio.gather(*signal_tasks, return_exceptions=True)
         
-        for i, result in enumerate(results):
-            signal_name = list(self.signals.keys())[i]
-            
+        computed = {}
+        for signal_name, result in zip(due_signals, results):
             if isinstance(result, Exception):
                 logger.error(f"❌ Signal {signal_name} failed: {result}")
-                signal_results[signal_name] = {
+                computed[signal_name] = {
                     "direction": "HOLD",
                     "confidence": 0.5,
                     "strength": 0.0,
                     "error": str(result)
                 }
             else:
-                signal_results[signal_name] = result
-                if result.get("direction") != "HOLD":
-                    successful_signals += 1
+                computed[signal_name] = result
+                self.signal_cadence.store(signal_name, result)
+        
+        # Keep the configured signal order regardless of which ones ran
+        signal_results = {
+            name: computed[name] if name in computed else memoized[name]
+            for name in self.signals
+        }
+        
+        # Archive raw signal outputs so recorded sessions can be replayed offline
+        market_data.record_event("RTX", "signals", signal_results)
+        
+        return self._build_signals_data(signal_results)
+    
+    def _build_signals_data(self, signal_results: Dict) -> Optional[Dict]:
+        """Aggregate raw signal outputs into the signals_data consumed by prediction"""
+        
+        vector = SignalVector.from_results(signal_results)
+        successful_signals = int((vector.valid & (vector.direction != 0)).sum())
         
         if successful_signals == 0:
             logger.warning("⚠️ No actionable signals generated")
             return None
         
         # Aggregate signals using weighted voting
-        aggregated = self._aggregate_signals(signal_results)
+        with cycle_tracer.span("aggregation"):
+            aggregated = self._aggregate_signals(signal_results, vector)
         
         # DEBUG: Log detailed signal analysis
         logger.info(f"🔍 SIGNAL ANALYSIS DEBUG:")
@@ -313,6 +369,7 @@ class OptionsScheduler:
         
         return {
             "individual_signals": signal_results,
+            "signal_vector": vector,
             "signal_weights": self.signal_weights,
             "signals_agreeing": successful_signals,
             "total_signals": len(self.signals),
@@ -323,17 +380,16 @@ class OptionsScheduler:
         """Run a single signal with error handling"""
         
         try:
-            result = await signal_instance.analyze("RTX")
+            with cycle_tracer.span("signal", name):
+                result = await signal_instance.analyze("RTX")
             
             # Ensure result has required fields
+            if isinstance(result, SignalResult):
+                return result.to_dict()
             if not isinstance(result, dict):
                 raise ValueError(f"Signal {name} returned invalid format")
             
-            result.setdefault("direction", "HOLD")
-            result.setdefault("confidence", 0.5)
-            result.setdefault("strength", 0.1)
-            
-            return result
+            return SignalResult.from_output(name, result).to_dict()
             
         except Exception as e:
             logger.error(f"❌ Signal {name} error: {e}")
@@ -344,64 +400,39 @@ class OptionsScheduler:
                 "error": str(e)
             }
     
-    def _aggregate_signals(self, signal_results: Dict) -> Dict:
+    def _aggregate_signals(self, signal_results: Dict, vector: Optional[SignalVector] = None) -> Dict:
         """Enhanced signal aggregation with high-confidence bias"""
         
-        buy_signals = []
-        sell_signals = []
-        high_conf_signals = []
-        
-        for signal_name, result in signal_results.items():
-            if "error" in result:
-                continue
-            
-            direction = result.get("direction", "HOLD")
-            strength = result.get("strength", 0.1)
-            confidence = result.get("confidence", 0.5)
-            weight = self.signal_weights.get(signal_name, 0.1)
-            
-            # Convert percentage confidence to decimal if needed
-            if confidence > 1:
-                confidence = confidence / 100.0
-            
-            signal_data = {
-                'name': signal_name,
-                'direction': direction,
-                'confidence': confidence,
-                'strength': strength,
-                'weight': weight,
-                'weighted_strength': weight * confidence
-            }
-            
-            if direction == "BUY":
-                buy_signals.append(signal_data)
-            elif direction == "SELL":
-                sell_signals.append(signal_data)
-                
-            # Track high confidence signals (>70%)
-            if confidence > 0.7:
-                high_conf_signals.append(signal_data)
+        vector = vector or SignalVector.from_results(signal_results)
+        weights = vector.weight_vector(self.signal_weights, default=0.1)
+        weighted = weights * vector.confidence
+        total_weight = max(sum(self.signal_weights.values()), 1.0)
         
         # Calculate total strengths
-        buy_strength = sum(s['weighted_strength'] for s in buy_signals) / max(sum(self.signal_weights.values()), 1.0) if buy_signals else 0
-        sell_strength = sum(s['weighted_strength'] for s in sell_signals) / max(sum(self.signal_weights.values()), 1.0) if sell_signals else 0
+        buy_strength = float(weighted @ vector.mask("BUY")) / total_weight
+        sell_strength = float(weighted @ vector.mask("SELL")) / total_weight
+        
+        # Track high confidence signals (>70%)
+        high_conf = vector.valid & (vector.confidence > 0.7)
         
         # Enhanced decision logic
         logger.info(f"🔍 AGGREGATION DEBUG: BUY={buy_strength:.3f}, SELL={sell_strength:.3f}")
-        logger.info(f"   High-confidence signals: {len(high_conf_signals)}")
+        logger.info(f"   High-confidence signals: {int(high_conf.sum())}")
         
         # Check for overwhelming high-confidence signal
-        if high_conf_signals:
-            strongest_signal = max(high_conf_signals, key=lambda x: x['confidence'] * x['weight'])
-            if strongest_signal['confidence'] > 0.85:
-                logger.info(f"   🎯 Using strongest signal: {strongest_signal['name']} ({strongest_signal['confidence']:.1%})")
+        if high_conf.any():
+            strongest = int(np.argmax(np.where(high_conf, weighted, -np.inf)))
+            name = vector.names[strongest]
+            confidence = float(vector.confidence[strongest])
+            if confidence > 0.85:
+                logger.info(f"   🎯 Using strongest signal: {name} ({confidence:.1%})")
                 return {
-                    "direction": strongest_signal['direction'],
-                    "confidence": strongest_signal['confidence'] * 0.9,  # Slight discount for safety
-                    "expected_move_pct": strongest_signal['strength'] * 0.05,
+                    "direction": signal_results[name].get("direction", "HOLD"),
+                    "confidence": confidence * 0.9,  # Slight discount for safety
+                    "expected_move_pct": float(vector.strength[strongest]) * 0.05,
                     "buy_strength": buy_strength,
                     "sell_strength": sell_strength,
-                    "dominant_signal": strongest_signal['name']
+                    "dominant_signal": name
                 }
         
         # Standard aggregation with lower thresholds
@@ -483,8 +514,8 @@ class OptionsScheduler:
         if signals_data.get("direction", "HOLD") == "HOLD":
             return None
         
-        if signals_data.get("confidence", 0.5) < 0.75:  # Higher threshold for options
-            logger.info(f"📊 Confidence {signals_data['confidence']:.1%} below 75% options threshold")
+        if signals_data.get("confidence", 0.5) < self.OPTIONS_CONFIDENCE_THRESHOLD:  # Higher threshold for options
+            logger.info(f"📊 Confidence {signals_data['confidence']:.1%} below {self.OPTIONS_CONFIDENCE_THRESHOLD:.0%} options threshold")
             return None
         
         # Generate options prediction
@@ -530,7 +561,7 @@ class OptionsScheduler:
             return
         
         # Check if we should limit position count
-        max_positions = 8  # Increased from 3 to allow more trades
+        max_positions = self.MAX_OPEN_POSITIONS  # Increased from 3 to allow more trades
         current_positions = len(options_paper_trader.open_positions)
         
         if current_positions >= max_positions:
@@ -648,6 +679,7 @@ class OptionsScheduler:
             elif self.last_market_open_date != current_date:
                 self.market_open_message_sent = False
                 self.last_market_open_date = current_date
+                self.signal_cadence.invalidate()  # New session: recompute every signal once
                 
         except Exception as e:
             logger.error(f"❌ Error checking market open status: {e}")
@@ -679,11 +711,15 @@ class OptionsScheduler:
             "last_prediction": self.last_options_prediction,
             "open_positions": len(options_paper_trader.open_positions),
             "account_balance": options_paper_trader.account_balance,
-            "performance": options_paper_trader.get_performance_summary()
+            "performance": options_paper_trader.get_performance_summary(),
+            "signal_cadence": self.signal_cadence.status(self.signals)
         }
 
-# Create global instance
-options_scheduler = OptionsScheduler()
+def __getattr__(name: str):
+    # Global instance, built the first time it is imported or accessed
+    if name == "options_scheduler":
+        return components.get("options_scheduler")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 if __name__ == "__main__":
     # Test the scheduler
@@ -0,0 +1,198 @@
+"""
+Options Scoring
+Columnar option chain table and vectorized candidate filtering/scoring
+
+Every score is a weighted sum of normalized components, so the weights are a plain vector
+(configurable per engine) and a whole chain is scored with a handful of array expressions.
+Top-k selection uses argpartition instead of sorting the full chain.
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import numpy as np
+
+# Ranking score used by OptionsDataEngine.get_best_options_for_direction
+OPTION_SCORE_COMPONENTS = ("volume", "open_interest", "spread", "delta", "gamma", "theta", "vega", "price")
+# Theta/vega were always computed but never summed into the score; kept at 0 to preserve rankings
+OPTION_SCORE_WEIGHTS = np.array([0.30, 0.30, 0.20, 0.10, 0.08, 0.00, 0.00, 0.20])
+
+# Final pick used by OptionsPredictionEngine._select_optimal_option
+ATTRACTIVENESS_COMPONENTS = ("volume", "open_interest", "spread", "price", "delta", "gamma", "theta", "alignment")
+# Strike alignment was computed but never added to the returned score; kept at 0 to preserve picks
+ATTRACTIVENESS_WEIGHTS = np.array([0.15, 0.10, 0.15, 0.10, 0.15, 0.10, 0.05, 0.00])
+
+_NUMERIC_FIELDS = {
+    "strike": "strike", "bid": "bid", "ask": "ask", "last": "last", "volume": "volume",
+    "open_interest": "openInterest", "iv": "impliedVolatility", "delta": "delta", "gamma": "gamma",
+    "theta": "theta", "vega": "vega", "mid": "mid_price", "spread_pct": "spread_pct"
+}
+
+@dataclass
+class ChainTable:
+    """Struct-of-arrays view of a validated options chain (one row per contract)"""
+    symbols: np.ndarray
+    is_call: np.ndarray
+    expiry: np.ndarray
+    strike: np.ndarray
+    bid: np.ndarray
+    ask: np.ndarray
+    last: np.ndarray
+    volume: np.ndarray
+    open_interest: np.ndarray
+    iv: np.ndarray
+    delta: np.ndarray
+    gamma: np.ndarray
+    theta: np.ndarray
+    vega: np.ndarray
+    mid: np.ndarray
+    spread_pct: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    @classmethod
+    def from_chain(cls, chain: Dict[str, Dict]) -> "ChainTable":
+        """Build from the {contract_symbol: option_data} dict produced by OptionsDataEngine"""
+        return cls.from_records(list(chain.keys()), list(chain.values()))
+
+    @classmethod
+    def from_records(cls, symbols: List[str], records: List[Dict]) -> "ChainTable":
+        columns = {
+            name: np.fromiter((float(r.get(key, 0) or 0) for r in records), dtype=np.float64, count=len(records))
+            for name, key in _NUMERIC_FIELDS.items()
+        }
+        return cls(
+            symbols=np.array(symbols, dtype=object),
+            is_call=np.fromiter((r.get("type") == "call" for r in records), dtype=bool, count=len(records)),
+            expiry=np.array([r.get("expiry", "") for r in records], dtype=object),
+            **columns
+        )
+
+    def record(self, row: int) -> Dict:
+        """Rebuild one row as an option_data dict (the chain's field names)"""
+        option_data = {key: float(getattr(self, name)[row]) for name, key in _NUMERIC_FIELDS.items()}
+        option_data["volume"] = int(option_data["volume"])
+        option_data["openInterest"] = int(option_data["openInterest"])
+        option_data["type"] = "call" if self.is_call[row] else "put"
+        option_data["expiry"] = self.expiry[row]
+        return option_data
+
+def option_score_components(table: ChainTable) -> np.ndarray:
+    """Normalized (rows × OPTION_SCORE_COMPONENTS) liquidity/spread/Greeks/price matrix"""
+    delta_distance = np.where(table.is_call, np.abs(table.delta - 0.6), np.abs(np.abs(table.delta) - 0.6))
+    return np.column_stack([
+        np.minimum(table.volume / 1000, 1),
+        np.minimum(table.open_interest / 5000, 1),
+        np.maximum(0, (0.2 - table.spread_pct) / 0.2),
+        np.maximum(0, 1 - delta_distance / 0.6),
+        np.minimum(table.gamma * 100, 1.0),
+        np.maximum(0, 1 + table.theta / 10),
+        np.maximum(0, 1 - np.abs(table.vega) / 20),
+        np.where((table.mid >= 0.5) & (table.mid <= 5.0), 1.0, 0.5)
+    ])
+
+def attractiveness_components(table: ChainTable, confidence: float, expected_move: float,
+                              stock_price: Optional[float]) -> np.ndarray:
+    """Normalized (rows × ATTRACTIVENESS_COMPONENTS) matrix for the final pick"""
+    if stock_price:
+        call_alignment = (stock_price * (1 + expected_move) - table.strike) / stock_price
+        put_alignment = (table.strike - stock_price * (1 - expected_move)) / stock_price
+        alignment = np.clip(np.where(table.is_call, call_alignment, put_alignment), 0, 1)
+    else:
+        alignment = np.zeros(len(table))
+
+    return np.column_stack([
+        np.minimum(table.volume / 500, 1.0),
+        np.minimum(table.open_interest / 2000, 1.0),
+        np.maximum(0, (0.15 - table.spread_pct) / 0.15),
+        np.where((table.mid >= 0.50) & (table.mid <= 8.0), 1.0, 0.5),
+        np.abs(table.delta) * confidence,
+        np.minimum(table.gamma * 1000, 0.10),
+        np.maximum(0, (0.10 - np.abs(table.theta)) / 0.10),
+        alignment
+    ])
+
+def strike_tier(confidence: float, strike_selection: str) -> str:
+    """Strike rule actually applied; "adaptive" resolves to one of three confidence tiers"""
+    if strike_selection != "adaptive":
+        return strike_selection
+    if confidence > 0.8:
+        return "adaptive_wide"
+    if confidence > 0.65:
+        return "adaptive_skewed"
+    return "adaptive_tight"
+
+def suitable_strike_mask(strike: np.ndarray, stock_price: float, direction: str,
+                         confidence: float, strike_selection: str) -> np.ndarray:
+    """Vectorized strike selection rule (atm / otm / itm / adaptive)"""
+    distance = np.abs(strike - stock_price) / stock_price
+    bullish = direction == "BUY"
+    tier = strike_tier(confidence, strike_selection)
+
+    if tier == "atm":
+        return distance <= 0.03
+    if tier == "otm":
+        return strike > stock_price * 1.005 if bullish else strike < stock_price * 0.995
+    if tier == "itm":
+        return strike < stock_price * 0.995 if bullish else strike > stock_price * 1.005
+
+    # "adaptive" - use confidence to determine strategy
+    if tier == "adaptive_wide":
+        return distance <= 0.05
+    if tier == "adaptive_skewed":
+        if bullish:
+            return (strike >= stock_price * 0.98) & (strike <= stock_price * 1.05)
+        return (strike >= stock_price * 0.95) & (strike <= stock_price * 1.02)
+    return distance <= 0.02
+
+def top_k_indices(scores: np.ndarray, mask: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k best masked scores, best first (argpartition, no full sort)"""
+    candidates = np.flatnonzero(mask)
+    if len(candidates) > k:
+        candidates = candidates[np.argpartition(-scores[candidates], k - 1)[:k]]
+    return candidates[np.argsort(-scores[candidates], kind="stable")]
+
+@dataclass
+class CandidateSet:
+    """Scored chain snapshot filtered to one direction, shared by every strategy in a cycle
+
+    Only balance and confidence differ between strategies, so each one selects from the same
+    scores with a cheap strike-tier and affordability mask instead of re-scoring the chain.
+    """
+    direction: str
+    stock_price: float
+    chain: Dict[str, Dict]
+    table: ChainTable
+    scores: np.ndarray
+    direction_mask: np.ndarray
+    strike_selection: str
+    _strike_masks: Dict[str, np.ndarray] = field(default_factory=dict, repr=False)
+
+    @classmethod
+    def build(cls, direction: str, stock_price: float, chain: Dict[str, Dict], table: ChainTable,
+              scores: np.ndarray, strike_selection: str) -> "CandidateSet":
+        if direction == "BUY":
+            direction_mask = table.is_call
+        elif direction == "SELL":
+            direction_mask = ~table.is_call
+        else:
+            direction_mask = np.zeros(len(table), dtype=bool)
+        return cls(direction, stock_price, chain, table, scores, direction_mask, strike_selection)
+
+    def strike_mask(self, confidence: float) -> np.ndarray:
+        """Direction & strike mask, computed once per strike tier"""
+        tier = strike_tier(confidence, self.strike_selection)
+        mask = self._strike_masks.get(tier)
+        if mask is None:
+            mask = self._strike_masks[tier] = self.direction_mask & suitable_strike_mask(
+                self.table.strike, self.stock_price, self.direction, confidence, self.strike_selection
+            )
+        return mask
+
+    def affordable_mask(self, confidence: float, max_investment: float) -> np.ndarray:
+        return self.strike_mask(confidence) & (self.table.ask * 100 <= max_investment)
+
+    def select(self, confidence: float, max_investment: float, k: int) -> np.ndarray:
+        """Row indices of the k best affordable candidates for one strategy, best first"""
+        return top_k_indices(self.scores, self.affordable_mask(confidence, max_investment), k)
@@ -5,7 +5,7 @@ Runs multiple trading strategies simultaneously with independent decision making
 """
 
 import asyncio
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 from loguru import logger
 from copy import deepcopy
@@ -14,13 +14,19 @@ from src.core.multi_strategy_manager import MultiStrategyManager, StrategyConfig
 from src.core.options_scheduler import OptionsScheduler
 from src.core.options_prediction_engine import OptionsPredictionEngine
 from src.core.options_paper_trader import OptionsPaperTrader
+from src.core.options_data_engine import options_data_engine
+from src.core.options_scoring import CandidateSet
 from src.core.telegram_bot import telegram_bot
 from src.core.adaptive_learning_system import AdaptiveLearningSystem
 from src.core.dynamic_thresholds import dynamic_threshold_manager
 from src.core.dashboard import dashboard
+from src.core.dashboard_snapshot import dashboard_snapshots
 from src.core.kelly_position_sizer import kelly_sizer
+from src.core.cycle_tracer import cycle_tracer
 from config.trading_config import config as base_config
-from config.options_config import options_config
+from config.options_config import SizingContext, options_config
+
+STRATEGY_IDS = ["conservative", "moderate", "aggressive", "scalping", "swing", "momentum", "volatility", "mean_reversion"]
 
 class StrategyInstance:
     """Independent instance of a trading strategy"""
@@ -59,6 +65,84 @@ class StrategyInstance:
     def update_signal_weights(self, weights: Dict[str, float]):
         """Update signal weights from ML optimization"""
         self.strategy_config.signal_weights = weights
+        
+    def decide(self, signals_data: Dict, candidates: Optional[CandidateSet] = None) -> Tuple[str, Optional[Dict]]:
+        """Run this strategy's decision for one cycle: (outcome message, executed prediction or None)
+        
+        Self-contained (own paper trader, explicit sizing), so it runs the same in-process or in a shard worker.
+        """
+        strategy_id = self.strategy_id
+        try:
+            config = self.strategy_config
+            
+            # Check if signals meet strategy requirements
+            confidence = signals_data.get("confidence", 0)
+            signals_agreeing = signals_data.get("signals_agreeing", 0)
+            
+            # Get dynamic confidence threshold
+            dynamic_threshold, threshold_reason = dynamic_threshold_manager.calculate_optimal_threshold(strategy_id)
+            
+            # Update the instance config with dynamic threshold
+            original_threshold = config.confidence_threshold
+            config.confidence_threshold = dynamic_threshold
+            
+            logger.info(f"🎯 {config.name}: Confidence {confidence:.1%}, Dynamic threshold: {dynamic_threshold:.1%} (was {original_threshold:.1%}, reason: {threshold_reason}), Signals agreeing: {signals_agreeing}")
+            
+            # Apply dynamic threshold
+            if confidence < dynamic_threshold:
+                return f"Below dynamic threshold ({confidence:.1%} < {dynamic_threshold:.1%}, reason: {threshold_reason})", None
+                
+            if signals_agreeing < config.min_signals_required:
+                return f"Insufficient signals ({signals_agreeing} < {config.min_signals_required})", None
+                
+            # Get Kelly-optimized position size
+            kelly_size, kelly_reason, kelly_metrics = kelly_sizer.calculate_optimal_position_size(strategy_id)
+            
+            logger.info(f"🎯 {config.name}: Kelly position size {kelly_size:.1%} (reason: {kelly_reason})")
+            
+            # Generate prediction with Kelly-optimized position size
+            with cycle_tracer.span("option_selection", strategy_id):
+                prediction = self.generate_prediction(signals_data, kelly_size, candidates)
+            
+            if prediction and isinstance(prediction, dict) and "id" in prediction:
+                # Execute trade
+                with cycle_tracer.span("execution", strategy_id):
+                    self.paper_trader.open_position(prediction)
+                
+                self.predictions_made += 1
+                self.last_prediction = prediction
+                
+                return f"Executed: {prediction['contract_symbol']} @ ${prediction['entry_price']:.2f}", prediction
+            else:
+                return "No suitable options found", None
+                
+        except Exception as e:
+            logger.error(f"❌ Strategy {strategy_id} error: {e}")
+            return f"Error: {str(e)}", None
+            
+    def generate_prediction(self, signals_data: Dict, position_size_pct: float,
+                            candidates: Optional[CandidateSet] = None) -> Optional[Dict]:
+        """Generate prediction with strategy-specific parameters
+        
+        Sizing travels with the request, so concurrent strategy decisions never share mutable config.
+        """
+        sizing = SizingContext.from_fraction(position_size_pct, source="kelly")
+        
+        # Use strategy's signal weights for SIMULATION-BASED LEARNING
+        if self.strategy_config.signal_weights:
+            # Apply learning-enhanced prediction with strategy weights
+            prediction = self.prediction_engine.generate_options_prediction(
+                signals_data, self.balance, self.strategy_id, 
+                strategy_weights=self.strategy_config.signal_weights,
+                candidates=candidates, sizing=sizing
+            )
+            logger.info(f"🧠 {self.strategy_id}: Using simulation-based learning weights")
+        else:
+            prediction = self.prediction_engine.generate_options_prediction(
+                signals_data, self.balance, self.strategy_id, candidates=candidates, sizing=sizing
+            )
+            
+        return prediction
 
 class ParallelStrategyRunner:
     """Run multiple strategies in parallel with shared market data"""
@@ -75,7 +159,7 @@ class ParallelStrategyRunner:
         
     def _init_strategies(self):
         """Initialize all strategy instances"""
-        for strategy_id in ["conservative", "moderate", "aggressive", "scalping", "swing", "momentum", "volatility", "mean_reversion"]:
+        for strategy_id in STRATEGY_IDS:
             config, state = self.manager.get_strategy_config(strategy_id)
             
             # Create strategy instance with current balance
@@ -88,6 +172,9 @@ class ParallelStrategyRunner:
             # Apply ML-optimized weights if available
             if state.get("signal_weights"):
                 instance.update_signal_weights(state["signal_weights"])
+            
+            # Keep dashboard snapshot live from this strategy's position events
+            dashboard_snapshots.attach(strategy_id, instance.paper_trader)
                 
             self.strategies[strategy_id] = instance
             
@@ -99,6 +186,7 @@ class ParallelStrategyRunner:
             
         self.running = True
         logger.info("🚀 Starting parallel multi-strategy trading")
+        dashboard_snapshots.start()
         
         # Send startup notification
         await self._send_startup_notification()
@@ -146,24 +234,34 @@ class ParallelStrategyRunner:
         """Run one trading cycle for all strategies in parallel"""
         self.cycle_count = getattr(self, 'cycle_count', 0) + 1
         logger.info(f"🔄 Parallel cycle #{self.cycle_count}")
+        cycle_tracer.start_cycle(self.cycle_count, source="parallel_runner")
         
-        # Step 1: Generate signals (shared across all strategies)
-        signals_data = await self.scheduler._generate_signals()
-        
-        if not signals_data or signals_data.get("direction") == "HOLD":
-            logger.info("📊 No actionable signals - all strategies holding")
-            return
+        try:
+            # Step 1: Generate signals (shared across all strategies)
+            with cycle_tracer.span("signals"):
+                signals_data = await self.scheduler._generate_signals()
             
-        # Step 2: Each strategy makes independent decisions
-        tasks = []
-        for strategy_id, instance in self.strategies.items():
-            task = self._process_strategy_decision(
-                strategy_id, instance, signals_data
-            )
-            tasks.append(task)
+            if not signals_data or signals_data.get("direction") == "HOLD":
+                logger.info("📊 No actionable signals - all strategies holding")
+                return
             
-        # Run all strategies in parallel
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+            # Step 2: Score the chain once for this direction; strategies only mask it
+            with cycle_tracer.span("candidates"):
+                candidates = options_data_engine.get_candidate_set(signals_data["direction"])
+                
+            # Step 3: Each strategy makes independent decisions
+            tasks = []
+            for strategy_id, instance in self.strategies.items():
+                task = self._process_strategy_decision(
+                    strategy_id, instance, signals_data, candidates
+                )
+                tasks.append(task)
+                
+            # Run all strategies in parallel
+            with cycle_tracer.span("strategy_decisions"):
+                results = await asyncio.gather(*tasks, return_exceptions=True)
+        finally:
+            cycle_tracer.end_cycle()
         
         # Log results
         for strategy_id, result in zip(self.strategies.keys(), results):
@@ -172,90 +270,24 @@ class ParallelStrategyRunner:
             elif result:
                 logger.success(f"✅ {strategy_id}: {result}")
                 
-    async def _process_strategy_decision(self, strategy_id: str, instance: StrategyInstance, signals_data: Dict) -> Optional[str]:
+    async def _process_strategy_decision(self, strategy_id: str, instance: StrategyInstance, signals_data: Dict,
+                                         candidates: Optional[CandidateSet] = None) -> Optional[str]:
         """Process trading decision for a single strategy"""
-        try:
-            config = instance.strategy_config
-            
-            # Check if signals meet strategy requirements
-            confidence = signals_data.get("confidence", 0)
-            signals_agreeing = signals_data.get("signals_agreeing", 0)
-            
-            # Get dynamic confidence threshold
-            dynamic_threshold, threshold_reason = dynamic_threshold_manager.calculate_optimal_threshold(strategy_id)
-            
-            # Update the instance config with dynamic threshold
-            original_threshold = config.confidence_threshold
-            config.confidence_threshold = dynamic_threshold
-            
-            logger.info(f"🎯 {config.name}: Confidence {confidence:.1%}, Dynamic threshold: {dynamic_threshold:.1%} (was {original_threshold:.1%}, reason: {threshold_reason}), Signals agreeing: {signals_agreeing}")
-            
-            # Apply dynamic threshold
-            if confidence < dynamic_threshold:
-                return f"Below dynamic threshold ({confidence:.1%} < {dynamic_threshold:.1%}, reason: {threshold_reason})"
-                
-            if signals_agreeing < config.min_signals_required:
-                return f"Insufficient signals ({signals_agreeing} < {config.min_signals_required})"
-                
-            # Get Kelly-optimized position size
-            kelly_size, kelly_reason, kelly_metrics = kelly_sizer.calculate_optimal_position_size(strategy_id)
-            
-            logger.info(f"🎯 {config.name}: Kelly position size {kelly_size:.1%} (reason: {kelly_reason})")
-            
-            # Generate prediction with Kelly-optimized position size
-            prediction = await self._generate_strategy_prediction(
-                instance, signals_data, kelly_size
-            )
-            
-            if prediction and isinstance(prediction, dict) and "id" in prediction:
-                # Execute trade
-                instance.paper_trader.open_position(prediction)
-                
-                # Record prediction for tracking
-                self.manager.record_prediction(strategy_id, prediction["id"])
-                instance.predictions_made += 1
-                instance.last_prediction = prediction
-                
-                # Update balance
-                new_balance = instance.paper_trader.account_balance
-                self.manager.update_strategy_balance(
-                    strategy_id, new_balance, 
-                    {"profitable": False}  # Will be updated when trade closes
-                )
-                
-                return f"Executed: {prediction['contract_symbol']} @ ${prediction['entry_price']:.2f}"
-            else:
-                return "No suitable options found"
-                
-        except Exception as e:
-            logger.error(f"❌ Strategy {strategy_id} error: {e}")
-            return f"Error: {str(e)}"
-            
-    async def _generate_strategy_prediction(self, instance: StrategyInstance, signals_data: Dict, position_size_pct: float) -> Optional[Dict]:
-        """Generate prediction with strategy-specific parameters"""
-        # Override position size for this prediction
-        original_max = base_config.MAX_POSITION_SIZE
-        base_config.MAX_POSITION_SIZE = int(instance.balance * position_size_pct)
+        message, prediction = instance.decide(signals_data, candidates)
+        if prediction:
+            self._record_execution(strategy_id, prediction, instance.paper_trader.account_balance)
+        return message
         
-        try:
-            # Use strategy's signal weights for SIMULATION-BASED LEARNING
-            if instance.strategy_config.signal_weights:
-                # Apply learning-enhanced prediction with strategy weights
-                prediction = instance.prediction_engine.generate_options_prediction(
-                    signals_data, instance.balance, instance.strategy_id, 
-                    strategy_weights=instance.strategy_config.signal_weights
-                )
-                logger.info(f"🧠 {instance.strategy_id}: Using simulation-based learning weights")
-            else:
-                prediction = instance.prediction_engine.generate_options_prediction(
-                    signals_data, instance.balance, instance.strategy_id
-                )
-                
-            return prediction
-            
-        finally:
-            # Restore original position size
-            base_config.MAX_POSITION_SIZE = original_max
+    def _record_execution(self, strategy_id: str, prediction: Dict, new_balance: float):
+        """Book an executed prediction against the strategy in the shared manager"""
+        # Record prediction for tracking
+        self.manager.record_prediction(strategy_id, prediction["id"])
+        
+        # Update balance
+        self.manager.update_strategy_balance(
+            strategy_id, new_balance, 
+            {"profitable": False}  # Will be updated when trade closes
+        )
             
     def _apply_custom_weights(self, signals_data: Dict, weights: Dict[str, float]) -> Dict:
         """Apply custom signal weights to signals data"""
@@ -4,7 +4,7 @@ Tracks actual RTX price movements and options P&L after predictions
 Runs periodically to update prediction_outcomes table
 """
 import sqlite3
-import yfinance as yf
+from src.core.market_data_provider import market_data
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
 from loguru import logger
@@ -15,7 +15,7 @@ class PredictionOutcomeTracker:
     
     def __init__(self, db_path: str = "data/signal_performance.db"):
         self.db_path = db_path
-        self.ticker = yf.Ticker("RTX")
+        self.ticker = market_data.ticker("RTX")
         
     async def track_all_outcomes(self):
         """Track outcomes for all untracked predictions"""
@@ -0,0 +1,146 @@
+"""
+Prediction Signals
+One normalized row per (prediction, signal) next to options_predictions
+
+options_predictions.signals_data keeps the raw signal dict as JSON. Analysis code used to
+json.loads it row by row to get each signal's direction and confidence; prediction_signals
+holds the same facts as indexed rows, so per-signal win rates and pair statistics are single
+SQL aggregates. Rows are written with the prediction and backfilled from the JSON for
+databases that predate the table (paper trader schema v2, see db_migrations).
+"""
+
+import json
+import sqlite3
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from src.signals.base_signal import SignalId, SignalResult
+
+CREATE_TABLE = """
+    CREATE TABLE IF NOT EXISTS prediction_signals (
+        prediction_id TEXT NOT NULL,
+        signal_id INTEGER,              -- SignalId slot; NULL for signals outside the fixed set
+        signal_name TEXT NOT NULL,
+        direction TEXT NOT NULL,
+        confidence REAL NOT NULL,       -- Normalized to 0-1
+        strength REAL NOT NULL,
+        weight REAL,                    -- Scheduler weight at prediction time (NULL when backfilled)
+        PRIMARY KEY (prediction_id, signal_name)
+    )
+"""
+
+_SIGNAL_IDS = {signal_id.key: int(signal_id) for signal_id in SignalId}
+
+Row = Tuple[str, Optional[int], str, str, float, float, Optional[float]]
+
+def signal_rows(prediction_id: str, individual_signals: Mapping[str, Any],
+                weights: Optional[Mapping[str, float]] = None) -> List[Row]:
+    """Rows for one prediction (non-dict entries in the signal map are skipped)"""
+    weights = weights or {}
+    rows = []
+    for name, output in (individual_signals or {}).items():
+        if isinstance(output, SignalResult):
+            result = output
+        elif isinstance(output, Mapping):
+            result = SignalResult.from_output(name, output)
+        else:
+            continue
+        rows.append((
+            prediction_id, _SIGNAL_IDS.get(name), name, result.direction,
+            result.normalized_confidence, result.strength, weights.get(name)
+        ))
+    return rows
+
+def write_prediction_signals(conn: sqlite3.Connection, prediction_id: str, individual_signals: Mapping[str, Any],
+                             weights: Optional[Mapping[str, float]] = None) -> int:
+    """Insert (or replace) a prediction's signal rows; the caller commits"""
+    rows = signal_rows(prediction_id, individual_signals, weights)
+    conn.executemany("INSERT OR REPLACE INTO prediction_signals VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+    return len(rows)
+
+def backfill_prediction_signals(conn: sqlite3.Connection, batch_size: int = 500) -> int:
+    """Expand signals_data JSON for predictions that have no rows yet; returns rows written"""
+    cursor = conn.execute("""
+        SELECT prediction_id, signals_data FROM options_predictions p
+        WHERE signals_data IS NOT NULL AND signals_data NOT IN ('', '{}')
+        AND NOT EXISTS (SELECT 1 FROM prediction_signals s WHERE s.prediction_id = p.prediction_id)
+    """)
+    written = 0
+    while True:
+        batch = cursor.fetchmany(batch_size)
+        if not batch:
+            break
+        rows = []
+        for prediction_id, signals_data in batch:
+            try:
+                rows.extend(signal_rows(prediction_id, json.loads(signals_data)))
+            except (TypeError, ValueError):
+                continue  # Unparseable blob: leave the JSON as the only record
+        conn.executemany("INSERT OR IGNORE INTO prediction_signals VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+        written += len(rows)
+    return written
+
+def signal_features(rows: Iterable[Tuple[str, str, float, float]]) -> Dict[str, float]:
+    """ML feature columns from (signal_name, direction, confidence, strength) rows"""
+    features = {}
+    for name, direction, confidence, strength in rows:
+        features[f'{name}_buy'] = 1 if direction == 'BUY' else 0
+        features[f'{name}_sell'] = 1 if direction == 'SELL' else 0
+        features[f'{name}_confidence'] = confidence
+        features[f'{name}_strength'] = strength
+    return features
+
+def load_signal_features(conn: sqlite3.Connection, prediction_ids: Optional[Iterable[str]] = None,
+                         batch_size: int = 500) -> Dict[str, Dict[str, float]]:
+    """Feature columns keyed by prediction_id, for the given ids only (every prediction when None)"""
+    query = "SELECT prediction_id, signal_name, direction, confidence, strength FROM prediction_signals"
+    if prediction_ids is None:
+        cursors = [conn.execute(query)]
+    else:
+        ids = list(dict.fromkeys(map(str, prediction_ids)))
+        cursors = (  # Batched to stay under SQLite's bound-parameter limit
+            conn.execute(f"{query} WHERE prediction_id IN ({','.join('?' * len(batch))})", batch)
+            for batch in (ids[i:i + batch_size] for i in range(0, len(ids), batch_size))
+        )
+    grouped: Dict[str, List[Tuple]] = {}
+    for cursor in cursors:
+        for prediction_id, *row in cursor:
+            grouped.setdefault(prediction_id, []).append(row)
+    return {prediction_id: signal_features(rows) for prediction_id, rows in grouped.items()}
+
+def signal_outcome_stats(conn: sqlite3.Connection) -> List[Dict[str, Any]]:
+    """Closed-trade totals per (signal, direction)"""
+    cursor = conn.execute("""
+        SELECT s.signal_name, s.direction,
+               COUNT(*),
+               SUM(CASE WHEN o.net_pnl > 0 THEN 1 ELSE 0 END),
+               SUM(o.pnl_percentage),
+               SUM(s.confidence)
+        FROM prediction_signals s
+        JOIN options_outcomes o ON o.prediction_id = s.prediction_id
+        GROUP BY s.signal_name, s.direction
+    """)
+    return [
+        {'signal_name': name, 'direction': direction, 'trades': trades, 'wins': wins or 0,
+         'total_pnl_pct': total_pnl or 0.0, 'total_confidence': total_confidence or 0.0}
+        for name, direction, trades, wins, total_pnl, total_confidence in cursor.fetchall()
+    ]
+
+def signal_pair_stats(conn: sqlite3.Connection, min_trades: int = 3) -> List[Dict[str, Any]]:
+    """Win rate of closed trades where two signals pointed the same (non-HOLD) way"""
+    cursor = conn.execute("""
+        SELECT a.signal_name, b.signal_name,
+               COUNT(*),
+               AVG(CASE WHEN o.net_pnl > 0 THEN 1.0 ELSE 0.0 END)
+        FROM prediction_signals a
+        JOIN prediction_signals b
+          ON b.prediction_id = a.prediction_id AND b.signal_name > a.signal_name AND b.direction = a.direction
+        JOIN options_outcomes o ON o.prediction_id = a.prediction_id
+        WHERE a.direction != 'HOLD'
+        GROUP BY a.signal_name, b.signal_name
+        HAVING COUNT(*) >= ?
+        ORDER BY 4 DESC
+    """, (min_trades,))
+    return [
+        {'signal_a': a, 'signal_b': b, 'trades_together': trades, 'combined_win_rate': win_rate}
+        for a, b, trades, win_rate in cursor.fetchall()
+    ]
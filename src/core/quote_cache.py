@@ -0,0 +1,73 @@
+"""
+Quote Cache
+Freshness-budgeted cache for spot prices and option chains with shared in-flight fetches
+
+Each caller states how stale a quote it can tolerate (seconds). A cached value inside that
+budget is returned immediately; otherwise one caller fetches while concurrent callers for
+the same key wait on that fetch instead of issuing their own.
+"""
+
+import threading
+from concurrent.futures import Future
+from datetime import datetime
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from src.core.market_data_provider import market_data
+
+class QuoteCache:
+    """Keyed cache where every read carries its own maximum staleness"""
+
+    def __init__(self, clock: Callable[[], datetime] = market_data.now):
+        self.clock = clock  # Simulated clock during replay, wall clock otherwise
+        self._entries: Dict[Hashable, Tuple[datetime, Any]] = {}
+        self._inflight: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "shared": 0}
+
+    def get(self, key: Hashable, fetch: Callable[[], Any], max_age: float) -> Any:
+        """Return a value at most max_age seconds old, fetching (once) if needed"""
+        with self._lock:
+            fetched_at = self.clock()
+            entry = self._entries.get(key)
+            if entry is not None and 0 <= (fetched_at - entry[0]).total_seconds() <= max_age:
+                self.stats["hits"] += 1
+                return entry[1]
+
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = self._inflight[key] = Future()
+                self.stats["misses"] += 1
+            else:
+                self.stats["shared"] += 1
+
+        if not owner:
+            return future.result()
+
+        try:
+            value = fetch()
+        except Exception as e:
+            with self._lock:
+                self._inflight.pop(key, None)
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            # Empty results (failed fetches) are handed to waiters but never cached
+            if value:
+                self._entries[key] = (fetched_at, value)
+            self._inflight.pop(key, None)
+        future.set_result(value)
+        return value
+
+    def peek(self, key: Hashable) -> Optional[Tuple[datetime, Any]]:
+        """Cached (timestamp, value) regardless of age"""
+        return self._entries.get(key)
+
+    def invalidate(self, key: Optional[Hashable] = None):
+        """Drop one key, or everything"""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
@@ -67,6 +67,9 @@ class RealTimeDataStream:
     - Data persistence
     """
     
+    MEMORY_ATTRIBUTES = ("price_history", "options_data")
+    HISTORY_KEPT_ON_TRIM = 100
+    
     def __init__(self):
         """Initialize real-time data stream"""
         self.is_running = False
@@ -458,6 +461,16 @@ class RealTimeDataStream:
         loop = asyncio.get_event_loop()
         return await loop.run_in_executor(self.executor, callback, data)
     
+    def trim_memory(self) -> int:
+        """Shorten per-symbol price histories (memory budget hook)"""
+        dropped = 0
+        with self.data_lock:
+            for history in self.price_history.values():
+                excess = max(0, len(history) - self.HISTORY_KEPT_ON_TRIM)
+                del history[:excess]
+                dropped += excess
+        return dropped
+    
     def get_current_data_summary(self) -> dict:
         """Get summary of current market data"""
         summary = {
@@ -0,0 +1,223 @@
+"""
+Replay Backtester
+Event-driven backtest that replays recorded market data through the production decision path
+
+Unlike BacktestingEngine/WalkForwardBacktester, nothing is re-implemented here: each recorded
+cycle pins the market data clock, then runs the real OptionsPaperTrader.check_positions,
+OptionsScheduler._build_signals_data (_aggregate_signals), OptionsPredictionEngine.generate_options_prediction
+and OptionsPaperTrader.open_position against the recorded bars and option chain snapshots.
+Record a session with MARKET_DATA_MODE=record, then replay it here as fast as the CPU allows.
+"""
+
+import os
+import tempfile
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+from loguru import logger
+
+from src.core.market_data_provider import market_data, DEFAULT_ARCHIVE
+from src.core.options_data_engine import options_data_engine
+from src.core.options_paper_trader import OptionsPaperTrader
+from src.core.options_prediction_engine import OptionsPredictionEngine
+from src.core.backtesting_engine import backtesting_engine
+
+class ReplayBacktester:
+    """Replays a recorded market data archive through the live trading components"""
+
+    def __init__(self, archive_path: str = DEFAULT_ARCHIVE, initial_balance: float = 1000.0,
+                 symbol: str = "RTX", quiet: bool = True):
+        self.archive_path = archive_path
+        self.initial_balance = initial_balance
+        self.symbol = symbol
+        self.quiet = quiet  # Silence component logging during replay (it dominates runtime)
+
+    def run(self, strategy_id: str = "default", strategy_weights: Optional[Dict] = None,
+            signal_weights: Optional[Dict] = None, start: Optional[datetime] = None,
+            end: Optional[datetime] = None, scheduler=None) -> Dict:
+        """Replay every recorded cycle in [start, end] and return performance results"""
+
+        if scheduler is None:
+            from src.core.options_scheduler import OptionsScheduler
+            scheduler = OptionsScheduler()
+        if signal_weights:
+            scheduler.signal_weights = dict(signal_weights)
+
+        previous_mode, previous_archive = market_data.mode, market_data.archive.path
+        previous_ticker = options_data_engine.ticker
+        wall_start = time.perf_counter()
+
+        try:
+            market_data.configure("replay", self.archive_path)
+            options_data_engine.ticker = market_data.ticker(self.symbol)
+            self._reset_chain_cache()
+
+            cycles = [
+                (ts, results) for ts, results in market_data.events(self.symbol, "signals")
+                if (start is None or ts >= start) and (end is None or ts <= end)
+            ]
+            if not cycles:
+                return {"status": "error", "message": f"No recorded signal cycles in {self.archive_path}"}
+
+            logger.info(f"⏪ Replaying {len(cycles)} recorded cycles ({cycles[0][0]} → {cycles[-1][0]})")
+            if self.quiet:
+                logger.disable("src")
+
+            with tempfile.TemporaryDirectory() as tmp:
+                paper_trader = OptionsPaperTrader(
+                    db_path=os.path.join(tmp, "replay_performance.db"),
+                    initial_balance=self.initial_balance,
+                    closed_history=None  # The report needs every trade of the run
+                )
+                prediction_engine = OptionsPredictionEngine(history_db=os.path.join(tmp, "replay_predictions.db"))
+                stats = self._replay_cycles(
+                    cycles, scheduler, paper_trader, prediction_engine, strategy_id, strategy_weights
+                )
+        finally:
+            if self.quiet:
+                logger.enable("src")
+            market_data.configure(previous_mode, previous_archive)
+            options_data_engine.ticker = previous_ticker
+            self._reset_chain_cache()
+
+        elapsed = time.perf_counter() - wall_start
+        simulated_days = (cycles[-1][0] - cycles[0][0]).total_seconds() / 86400
+
+        results = self._calculate_results(paper_trader, stats)
+        results.update({
+            "cycles": len(cycles),
+            "simulated_days": round(simulated_days, 2),
+            "replay_seconds": round(elapsed, 2)
+        })
+
+        logger.success(
+            f"✅ Replayed {simulated_days:.1f} days ({len(cycles)} cycles) in {elapsed:.1f}s: "
+            f"{results['total_trades']} trades, return {results['total_return']:.1%}"
+        )
+
+        return {
+            "status": "success",
+            "strategy": strategy_id,
+            "period": f"{cycles[0][0]:%Y-%m-%d %H:%M} to {cycles[-1][0]:%Y-%m-%d %H:%M}",
+            "results": results
+        }
+
+    def _replay_cycles(self, cycles: List, scheduler, paper_trader: OptionsPaperTrader,
+                       prediction_engine: OptionsPredictionEngine, strategy_id: str,
+                       strategy_weights: Optional[Dict]) -> Dict:
+        """Drive one production trading cycle per recorded signal snapshot"""
+
+        stats = {"predictions": 0, "skipped_max_positions": 0, "failed_opens": 0}
+        equity_curve = []
+
+        for ts, signal_results in cycles:
+            market_data.set_clock(ts)
+
+            # Same order as OptionsScheduler._run_trading_cycle: exits first, then new entries
+            paper_trader.check_positions()
+
+            signals_data = scheduler._build_signals_data(signal_results)
+            if (signals_data and signals_data.get("direction", "HOLD") != "HOLD"
+                    and signals_data.get("confidence", 0.5) >= scheduler.OPTIONS_CONFIDENCE_THRESHOLD):
+                prediction = prediction_engine.generate_options_prediction(
+                    signals_data, paper_trader.account_balance,
+                    strategy_id=strategy_id, strategy_weights=strategy_weights
+                )
+                if prediction:
+                    stats["predictions"] += 1
+                    if len(paper_trader.open_positions) >= scheduler.MAX_OPEN_POSITIONS:
+                        stats["skipped_max_positions"] += 1
+                    elif not paper_trader.open_position(prediction):
+                        stats["failed_opens"] += 1
+
+            # Equity at cost: cash plus capital still tied up in open positions
+            open_cost = sum(p["execution"]["total_cost"] for p in paper_trader.open_positions.values())
+            equity_curve.append((ts, paper_trader.account_balance + open_cost))
+
+        stats["equity_curve"] = equity_curve
+        return stats
+
+    def _calculate_results(self, paper_trader: OptionsPaperTrader, stats: Dict) -> Dict:
+        """Summarise closed trades in the same shape as BacktestingEngine results"""
+
+        trade_log = []
+        balance = self.initial_balance
+        for trade in paper_trader.closed_positions:
+            balance += trade.net_pnl
+            trade_log.append({
+                "timestamp": trade.exit_timestamp.isoformat(),
+                "contract": trade.contract_symbol,
+                "direction": trade.direction,
+                "confidence": trade.confidence,
+                "exit_reason": trade.exit_reason,
+                "pnl": round(trade.net_pnl, 2),
+                "balance": round(balance, 2)
+            })
+
+        total_trades = len(trade_log)
+        winning_trades = sum(1 for t in trade_log if t["pnl"] > 0)
+        total_pnl = sum(t["pnl"] for t in trade_log)
+
+        peak = self.initial_balance
+        max_drawdown = 0.0
+        for _, equity in stats["equity_curve"]:
+            peak = max(peak, equity)
+            if peak > 0:
+                max_drawdown = max(max_drawdown, (peak - equity) / peak)
+
+        final_equity = stats["equity_curve"][-1][1] if stats["equity_curve"] else self.initial_balance
+
+        return {
+            "final_balance": round(final_equity, 2),
+            "total_return": round((final_equity - self.initial_balance) / self.initial_balance, 4),
+            "total_trades": total_trades,
+            "winning_trades": winning_trades,
+            "win_rate": round(winning_trades / total_trades, 4) if total_trades else 0,
+            "total_pnl": round(total_pnl, 2),
+            "max_drawdown": round(max_drawdown, 4),
+            "sharpe_ratio": backtesting_engine._calculate_sharpe_ratio(trade_log),
+            "open_positions": len(paper_trader.open_positions),
+            "predictions": stats["predictions"],
+            "skipped_max_positions": stats["skipped_max_positions"],
+            "failed_opens": stats["failed_opens"],
+            "trade_log": trade_log[-10:] if len(trade_log) > 10 else trade_log  # Last 10 trades
+        }
+
+    def _reset_chain_cache(self):
+        """Drop cached chains so nothing leaks between live and replayed data"""
+        options_data_engine.quotes.invalidate()
+        options_data_engine.cached_chain = {}
+        options_data_engine.last_update = None
+
+    def generate_report(self, strategy_id: str = "default", **kwargs) -> str:
+        """Run a replay and format it for Telegram"""
+
+        results = self.run(strategy_id=strategy_id, **kwargs)
+
+        if results["status"] != "success":
+            return f"❌ **REPLAY BACKTEST FAILED**: {results.get('message', 'Unknown error')}"
+
+        data = results["results"]
+
+        report = f"""
+⏪ **REPLAY BACKTEST REPORT**
+
+📊 **Strategy**: {strategy_id.upper()}
+📅 **Period**: {results['period']}
+⚡ **Replayed**: {data['simulated_days']:.1f} days ({data['cycles']} cycles) in {data['replay_seconds']:.1f}s
+🎯 **Total Trades**: {data['total_trades']} ({data['open_positions']} still open)
+
+💰 **Performance**:
+• Final Balance: ${data['final_balance']:.2f}
+• Total Return: {data['total_return']:.1%}
+• Win Rate: {data['win_rate']:.1%} ({data['winning_trades']}/{data['total_trades']})
+• Total P&L: ${data['total_pnl']:.2f}
+
+📉 **Risk Metrics**:
+• Max Drawdown: {data['max_drawdown']:.1%}
+• Sharpe Ratio: {data['sharpe_ratio']}
+"""
+        return report.strip()
+
+# Global instance
+replay_backtester = ReplayBacktester()
@@ -4,7 +4,7 @@ Predicts and captures volatility around RTX earnings announcements
 """
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
-import yfinance as yf
+from src.core.market_data_provider import market_data
 import requests
 
 class RTXEarningsCalendar:
@@ -44,7 +44,7 @@ class RTXEarningsCalendar:
         
         try:
             # Try to get earnings from yfinance
-            ticker = yf.Ticker(self.symbol)
+            ticker = market_data.ticker(self.symbol)
             calendar = ticker.calendar
             
             if calendar is not None and not calendar.empty:
@@ -226,8 +226,8 @@ class RTXSignalOrchestrator:
     async def _get_ml_prediction(self, rtx_data: pd.DataFrame) -> MLPrediction:
         """Get ML system prediction"""
         try:
-            # Prepare features from RTX data
-            features = await ml_system.prepare_features(self.symbol, lookback_days=10)
+            # Prepare features from RTX data (enough history for the 7-day volatility window)
+            features = await ml_system.prepare_features(self.symbol, lookback_days=ml_system.FEATURE_LOOKBACK_DAYS)
             
             if features.empty:
                 return MLPrediction(
@@ -240,6 +240,12 @@ class RTXSignalOrchestrator:
                     model_name="no_data"
                 )
             
+            # Online mode: learn newly resolved outcomes first; full refit only on drift
+            if ml_system.online:
+                await ml_system.learn_resolved(features)
+                if ml_system.should_retrain():
+                    await ml_system.refit(self.symbol)
+            
             # Make prediction
             prediction = await ml_system.predict(features)
             return prediction
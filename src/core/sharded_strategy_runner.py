@@ -0,0 +1,447 @@
+"""
+Sharded Strategy Runner
+Multi-strategy trading with strategies sharded across worker processes
+
+The coordinator computes signals and the cycle's candidate set once, writes both into one
+shared-memory block (CycleBroadcast) and sends each worker only the cycle number. Workers own
+their StrategyInstances (paper trader, prediction engine, per-strategy DB) and run
+StrategyInstance.decide against zero-copy views of the broadcast, returning decisions over a
+result queue. A slow or GIL-bound strategy then only holds up its own shard.
+
+Enable from run_multi_strategy.py with STRATEGY_WORKERS=N.
+"""
+
+import asyncio
+import multiprocessing as mp
+import os
+import queue
+import time
+from collections.abc import Mapping
+from multiprocessing.shared_memory import SharedMemory
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+from loguru import logger
+
+from config.options_config import options_config
+from src.core.cycle_tracer import cycle_tracer
+from src.core.multi_strategy_manager import StrategyConfig
+from src.core.options_data_engine import options_data_engine
+from src.core.options_scoring import CandidateSet, ChainTable
+from src.core.parallel_strategy_runner import ParallelStrategyRunner, StrategyInstance, STRATEGY_IDS
+
+_HEADER = ("seq", "direction", "confidence", "expected_move_pct", "signals_agreeing", "total_signals",
+           "buy_strength", "sell_strength", "stock_price", "rows")
+_SIGNAL_COLUMNS = ("direction", "confidence", "strength", "weight")
+_ROW_COLUMNS = ("strike", "bid", "ask", "last", "volume", "open_interest", "iv", "delta", "gamma",
+                "theta", "vega", "mid", "spread_pct", "is_call", "score")
+_DIRECTION_CODES = {"BUY": 1.0, "SELL": -1.0, "HOLD": 0.0}
+_DIRECTIONS = {1.0: "BUY", -1.0: "SELL", 0.0: "HOLD"}
+SYMBOL_WIDTH = 32
+EXPIRY_WIDTH = 10
+
+class CycleBroadcast:
+    """Fixed-layout shared-memory block holding one cycle's signal vector and candidate table
+
+    Columns are stored contiguously (column-major) so workers get numpy views without copying.
+    The coordinator only rewrites the block after every shard has answered the previous cycle
+    (including shards that missed the decision timeout), so a shard never reads a block that is
+    being overwritten. Workers check the sequence number before deciding to skip stale dispatches.
+    """
+
+    def __init__(self, signal_names: List[str], capacity: int = 4096, name: Optional[str] = None):
+        self.signal_names = list(signal_names)
+        self.capacity = capacity
+        self.owner = name is None
+
+        layout = [
+            ("header", np.float64, (len(_HEADER),)),
+            ("signals", np.float64, (len(self.signal_names), len(_SIGNAL_COLUMNS))),
+            ("rows", np.float64, (len(_ROW_COLUMNS), capacity)),
+            ("symbols", np.dtype(f"S{SYMBOL_WIDTH}"), (capacity,)),
+            ("expiry", np.dtype(f"S{EXPIRY_WIDTH}"), (capacity,)),
+        ]
+        size = sum(np.dtype(dtype).itemsize * int(np.prod(shape)) for _, dtype, shape in layout)
+        self._shm = SharedMemory(name=name, create=self.owner, size=size)
+
+        offset = 0
+        for field, dtype, shape in layout:
+            view = np.ndarray(shape, dtype=dtype, buffer=self._shm.buf, offset=offset)
+            setattr(self, field, view)
+            offset += view.nbytes
+
+        if self.owner:
+            self.header[:] = 0
+
+    @property
+    def spec(self) -> Dict:
+        """Everything a worker needs to attach"""
+        return {"name": self._shm.name, "signal_names": self.signal_names, "capacity": self.capacity}
+
+    @classmethod
+    def attach(cls, spec: Dict) -> "CycleBroadcast":
+        return cls(spec["signal_names"], spec["capacity"], name=spec["name"])
+
+    @property
+    def seq(self) -> int:
+        return int(self.header[_HEADER.index("seq")])
+
+    def publish(self, seq: int, signals_data: Dict, candidates: Optional[CandidateSet]) -> int:
+        """Write one cycle; returns the number of candidate rows broadcast"""
+        header = dict.fromkeys(_HEADER, 0.0)
+        header.update({
+            "direction": _DIRECTION_CODES.get(signals_data.get("direction", "HOLD"), 0.0),
+            "confidence": signals_data.get("confidence", 0.0),
+            "expected_move_pct": signals_data.get("expected_move_pct", 0.0),
+            "signals_agreeing": signals_data.get("signals_agreeing", 0),
+            "total_signals": signals_data.get("total_signals", 0),
+            "buy_strength": signals_data.get("buy_strength", 0.0),
+            "sell_strength": signals_data.get("sell_strength", 0.0),
+        })
+
+        # Per-signal vector in a fixed order (NaN marks a signal absent this cycle)
+        individual = signals_data.get("individual_signals") or {}
+        weights = signals_data.get("signal_weights") or {}
+        self.signals[:] = np.nan
+        for i, name in enumerate(self.signal_names):
+            result = individual.get(name)
+            if result:
+                self.signals[i] = (
+                    _DIRECTION_CODES.get(result.get("direction", "HOLD"), 0.0),
+                    result.get("confidence", 0.5), result.get("strength", 0.0), weights.get(name, 0.0)
+                )
+
+        # Only rows this cycle's direction can trade, best scores first
+        rows = 0
+        if candidates is not None:
+            table = candidates.table
+            index = np.flatnonzero(candidates.direction_mask)
+            index = index[np.argsort(-candidates.scores[index], kind="stable")]
+            if len(index) > self.capacity:
+                logger.warning(f"⚠️ Broadcast capacity {self.capacity} < {len(index)} candidates; keeping best scores")
+                index = index[:self.capacity]
+            rows = len(index)
+            columns = {name: getattr(table, name) for name in _ROW_COLUMNS if name not in ("is_call", "score")}
+            columns["is_call"] = table.is_call
+            columns["score"] = candidates.scores
+            for c, name in enumerate(_ROW_COLUMNS):
+                self.rows[c, :rows] = columns[name][index]
+            self.symbols[:rows] = [str(s).encode()[:SYMBOL_WIDTH] for s in table.symbols[index]]
+            self.expiry[:rows] = [str(e).encode()[:EXPIRY_WIDTH] for e in table.expiry[index]]
+            header["stock_price"] = candidates.stock_price
+        header["rows"] = rows
+
+        # Sequence number last: a worker seeing the new seq sees a complete cycle
+        for i, field in enumerate(_HEADER):
+            if field != "seq":
+                self.header[i] = header[field]
+        self.header[_HEADER.index("seq")] = seq
+        return rows
+
+    def read(self) -> Tuple[int, Dict, Optional[CandidateSet]]:
+        """(seq, signals_data, candidate set) for the current cycle, backed by views of the block"""
+        header = dict(zip(_HEADER, self.header.tolist()))
+        direction = _DIRECTIONS.get(header["direction"], "HOLD")
+
+        individual, weights = {}, {}
+        for name, (code, confidence, strength, weight) in zip(self.signal_names, self.signals.tolist()):
+            if np.isnan(code):
+                continue
+            individual[name] = {"direction": _DIRECTIONS.get(code, "HOLD"), "confidence": confidence, "strength": strength}
+            weights[name] = weight
+
+        signals_data = {
+            "direction": direction,
+            "confidence": header["confidence"],
+            "expected_move_pct": header["expected_move_pct"],
+            "signals_agreeing": int(header["signals_agreeing"]),
+            "total_signals": int(header["total_signals"]),
+            "buy_strength": header["buy_strength"],
+            "sell_strength": header["sell_strength"],
+            "individual_signals": individual,
+            "signal_weights": weights,
+        }
+
+        rows = int(header["rows"])
+        if not rows or not header["stock_price"]:
+            return int(header["seq"]), signals_data, None
+
+        columns = {name: self.rows[c, :rows] for c, name in enumerate(_ROW_COLUMNS)}
+        scores = columns.pop("score")
+        is_call = columns.pop("is_call") > 0.5
+        table = ChainTable(
+            symbols=np.char.decode(self.symbols[:rows]).astype(object),
+            is_call=is_call,
+            expiry=np.char.decode(self.expiry[:rows]).astype(object),
+            **columns
+        )
+        candidates = CandidateSet.build(
+            direction, header["stock_price"], _TableRecords(table), table, scores,
+            getattr(options_config, 'STRIKE_SELECTION', 'adaptive')
+        )
+        return int(header["seq"]), signals_data, candidates
+
+    def close(self):
+        for field in ("header", "signals", "rows", "symbols", "expiry"):
+            setattr(self, field, None)
+        self._shm.close()
+
+    def unlink(self):
+        if self.owner:
+            self._shm.unlink()
+
+class _TableRecords(Mapping):
+    """{contract_symbol: option_data} view over a ChainTable, rows materialized on access"""
+
+    def __init__(self, table: ChainTable):
+        self.table = table
+        self._index = None
+
+    def __getitem__(self, symbol: str) -> Dict:
+        if self._index is None:
+            self._index = {s: i for i, s in enumerate(self.table.symbols)}
+        return self.table.record(self._index[symbol])
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.table.symbols)
+
+    def __len__(self) -> int:
+        return len(self.table)
+
+def _run_shard_cycle(instances: Dict[str, StrategyInstance], broadcast: CycleBroadcast, seq: int) -> List[Tuple]:
+    """Decide every strategy in this shard against the broadcast cycle
+
+    Decisions open positions, so they are always returned; the coordinator does not rewrite the
+    block until this shard has answered, so the check below only skips dispatches that never ran.
+    """
+    published_seq, signals_data, candidates = broadcast.read()
+    if published_seq != seq:
+        return []
+
+    decisions = []
+    for strategy_id, instance in instances.items():
+        message, prediction = instance.decide(signals_data, candidates)
+        decisions.append((strategy_id, message, prediction, instance.paper_trader.account_balance))
+    return decisions
+
+def _shard_worker(shard: int, strategy_specs: List[Tuple[str, StrategyConfig, float]], broadcast_spec: Dict,
+                  tasks, results):
+    """Worker process entry point: owns a shard of strategies for the runner's lifetime"""
+    instances = {
+        strategy_id: StrategyInstance(strategy_id, config, initial_balance=balance)
+        for strategy_id, config, balance in strategy_specs
+    }
+    broadcast = CycleBroadcast.attach(broadcast_spec)
+    results.put(("ready", shard, os.getpid()))
+
+    try:
+        while True:
+            message = tasks.get()
+            kind = message[0]
+            if kind == "stop":
+                break
+            if kind == "weights":
+                _, strategy_id, weights = message
+                instances[strategy_id].update_signal_weights(weights)
+            elif kind == "cycle":
+                seq = message[1]
+                started = time.perf_counter()
+                decisions = _run_shard_cycle(instances, broadcast, seq)
+                results.put(("decisions", shard, seq, decisions, time.perf_counter() - started))
+    finally:
+        broadcast.close()
+
+class ShardedStrategy:
+    """Coordinator-side handle for a strategy that lives in a worker process"""
+
+    def __init__(self, strategy_id: str, strategy_config: StrategyConfig, balance: float, shard: int):
+        self.strategy_id = strategy_id
+        self.strategy_config = strategy_config
+        self.balance = balance
+        self.shard = shard
+        self.predictions_made = 0
+        self.last_prediction = None
+        self.pending_weights = None  # Forwarded to the worker before the next cycle
+
+    def update_signal_weights(self, weights: Dict[str, float]):
+        """Update signal weights from ML optimization"""
+        self.strategy_config.signal_weights = weights
+        self.pending_weights = weights
+
+class ShardedStrategyRunner(ParallelStrategyRunner):
+    """ParallelStrategyRunner with strategy decisions sharded across worker processes"""
+
+    def __init__(self, workers: Optional[int] = None, extra_strategies: Optional[Dict[str, StrategyConfig]] = None,
+                 capacity: int = 4096, decision_timeout: float = 120.0, startup_timeout: float = 120.0):
+        self.workers = workers or int(os.getenv("STRATEGY_WORKERS", 0)) or os.cpu_count() or 1
+        self.extra_strategies = extra_strategies or {}
+        self.capacity = capacity
+        self.decision_timeout = decision_timeout
+        self.startup_timeout = startup_timeout
+        self._processes = []
+        self._task_queues = []
+        self._results = None
+        self._broadcast = None
+        self._seq = 0
+        self._outstanding: Dict[int, int] = {}  # shard -> cycle it has not answered yet
+        super().__init__()
+
+    def _init_strategies(self):
+        """Build coordinator-side handles; the real instances are created inside the workers"""
+        specs = []
+        for strategy_id in STRATEGY_IDS:
+            config, state = self.manager.get_strategy_config(strategy_id)
+            specs.append((strategy_id, config, state["balance"]))
+        for strategy_id, config in self.extra_strategies.items():
+            specs.append((strategy_id, config, self.manager.starting_capital))
+
+        self.workers = max(1, min(self.workers, len(specs)))
+        for i, (strategy_id, config, balance) in enumerate(specs):
+            self.strategies[strategy_id] = ShardedStrategy(strategy_id, config, balance, shard=i % self.workers)
+
+        logger.info(f"🧩 {len(specs)} strategies sharded across {self.workers} worker processes")
+
+    def start_workers(self):
+        """Spawn shard workers and the shared broadcast block (idempotent)"""
+        if self._processes:
+            return
+
+        ctx = mp.get_context("spawn")
+        self._broadcast = CycleBroadcast(list(self.scheduler.signals), self.capacity)
+        self._results = ctx.Queue()
+
+        for shard in range(self.workers):
+            specs = [
+                (handle.strategy_id, handle.strategy_config, handle.balance)
+                for handle in self.strategies.values() if handle.shard == shard
+            ]
+            tasks = ctx.Queue()
+            process = ctx.Process(
+                target=_shard_worker, args=(shard, specs, self._broadcast.spec, tasks, self._results),
+                name=f"strategy-shard-{shard}", daemon=True
+            )
+            process.start()
+            self._processes.append(process)
+            self._task_queues.append(tasks)
+
+        ready = set()
+        deadline = time.monotonic() + self.startup_timeout
+        while len(ready) < self.workers:
+            try:
+                message = self._results.get(timeout=max(0.1, deadline - time.monotonic()))
+            except queue.Empty:
+                self.stop_workers()
+                raise RuntimeError(f"Strategy shards failed to start ({len(ready)}/{self.workers} ready)")
+            if message[0] == "ready":
+                ready.add(message[1])
+
+        logger.success(f"✅ {self.workers} strategy shard workers ready")
+
+    def stop_workers(self):
+        for tasks in self._task_queues:
+            tasks.put(("stop",))
+        for process in self._processes:
+            process.join(timeout=10)
+            if process.is_alive():
+                process.terminate()
+        self._processes, self._task_queues = [], []
+        self._outstanding = {}
+        if self._broadcast is not None:
+            self._broadcast.close()
+            self._broadcast.unlink()
+            self._broadcast = None
+
+    def stop(self):
+        super().stop()
+        self.stop_workers()
+
+    async def _run_parallel_cycle(self):
+        """Run one trading cycle: signals and candidates once, decisions in the shard workers"""
+        self.cycle_count = getattr(self, 'cycle_count', 0) + 1
+        logger.info(f"🔄 Sharded cycle #{self.cycle_count}")
+        cycle_tracer.start_cycle(self.cycle_count, source="sharded_runner")
+
+        try:
+            with cycle_tracer.span("signals"):
+                signals_data = await self.scheduler._generate_signals()
+
+            if not signals_data or signals_data.get("direction") == "HOLD":
+                logger.info("📊 No actionable signals - all strategies holding")
+                return
+
+            with cycle_tracer.span("candidates"):
+                candidates = options_data_engine.get_candidate_set(signals_data["direction"])
+
+            self.start_workers()
+            self._flush_signal_weights()
+
+            with cycle_tracer.span("broadcast"):
+                if not await self._await_previous_cycle():
+                    logger.warning(f"⚠️ Shards {sorted(self._outstanding)} still deciding an earlier cycle; skipping")
+                    return
+                self._seq += 1
+                self._broadcast.publish(self._seq, signals_data, candidates)
+
+            with cycle_tracer.span("strategy_decisions"):
+                decisions = await self._collect_decisions(self._seq)
+        finally:
+            cycle_tracer.end_cycle()
+
+        self._record_decisions(decisions)
+
+    def _record_decisions(self, decisions: List[Tuple]):
+        for strategy_id, message, prediction, balance in decisions:
+            if prediction:
+                self._record_execution(strategy_id, prediction, balance)
+                handle = self.strategies[strategy_id]
+                handle.predictions_made += 1
+                handle.last_prediction = prediction
+            if message:
+                logger.success(f"✅ {strategy_id}: {message}")
+
+    def _flush_signal_weights(self):
+        for handle in self.strategies.values():
+            if handle.pending_weights is not None:
+                self._task_queues[handle.shard].put(("weights", handle.strategy_id, handle.pending_weights))
+                handle.pending_weights = None
+
+    async def _collect_decisions(self, seq: int) -> List[Tuple]:
+        """Dispatch the cycle to every shard and gather their decisions"""
+        for tasks in self._task_queues:
+            tasks.put(("cycle", seq))
+
+        waiting = {shard: seq for shard in range(self.workers)}
+        decisions = await self._receive(waiting, self.decision_timeout)
+        if waiting:
+            # Their positions may already be open: record them when they answer, before the next broadcast
+            logger.warning(f"⚠️ Shards {sorted(waiting)} missed cycle {seq} ({self.decision_timeout:.0f}s timeout)")
+            self._outstanding.update(waiting)
+        return decisions
+
+    async def _await_previous_cycle(self) -> bool:
+        """Fence before rewriting the broadcast: record late shards' decisions, False if any is still deciding"""
+        if self._outstanding:
+            self._record_decisions(await self._receive(self._outstanding, self.decision_timeout))
+        return not self._outstanding
+
+    async def _receive(self, waiting: Dict[int, int], timeout: float) -> List[Tuple]:
+        """Gather decisions until every shard in waiting (shard -> cycle) has answered; answered shards are removed"""
+        loop = asyncio.get_running_loop()
+        decisions = []
+        deadline = time.monotonic() + timeout
+
+        while waiting:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                message = await loop.run_in_executor(None, self._results.get, True, remaining)
+            except queue.Empty:
+                break
+            if message[0] != "decisions" or waiting.get(message[1]) != message[2]:
+                continue
+            _, shard, _, shard_decisions, elapsed = message
+            del waiting[shard]
+            decisions.extend(shard_decisions)
+            logger.debug(f"🧩 Shard {shard}: {len(shard_decisions)} decisions in {elapsed * 1000:.0f}ms")
+        return decisions
@@ -0,0 +1,74 @@
+"""
+Signal Cadence
+Per-signal refresh schedule with a timestamped memo of the last good result
+
+Each signal class declares REFRESH_SECONDS (how long its output stays valid) and
+DATA_DEPENDENCIES (the feeds it reads, reported in status()). Every cycle only the stale
+signals are recomputed; the rest are served from the memo.
+"""
+
+import threading
+from datetime import datetime
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+from src.core.market_data_provider import market_data
+
+class SignalCadence:
+    """Decides which signals are due and memoizes the results of the others"""
+
+    def __init__(self, clock: Callable[[], datetime] = market_data.now, default_refresh: float = 0):
+        self.clock = clock  # Simulated clock during replay, wall clock otherwise
+        self.default_refresh = default_refresh  # Signals without a declared cadence run every cycle
+        self._memo: Dict[str, Tuple[datetime, Dict]] = {}
+        self._lock = threading.Lock()
+        self.stats = {"computed": 0, "memoized": 0, "invalidated": 0}
+
+    def refresh_seconds(self, signal) -> float:
+        return getattr(signal, "REFRESH_SECONDS", self.default_refresh)
+
+    def partition(self, signals: Dict[str, object]) -> Tuple[Dict[str, object], Dict[str, Dict]]:
+        """Split signals into (due to recompute, memoized results still within their cadence)"""
+        now = self.clock()
+        due, memoized = {}, {}
+        with self._lock:
+            for name, signal in signals.items():
+                entry = self._memo.get(name)
+                if entry is not None and 0 <= (now - entry[0]).total_seconds() < self.refresh_seconds(signal):
+                    memoized[name] = dict(entry[1])
+                else:
+                    due[name] = signal
+            self.stats["computed"] += len(due)
+            self.stats["memoized"] += len(memoized)
+        return due, memoized
+
+    def store(self, name: str, result: Dict, computed_at: Optional[datetime] = None):
+        """Memoize a fresh result (failed runs are never memoized so they retry next cycle)"""
+        if not isinstance(result, dict) or "error" in result:
+            return
+        with self._lock:
+            self._memo[name] = (computed_at or self.clock(), dict(result))
+
+    def invalidate(self, names: Iterable[str] = ()):
+        """Drop memoized results for specific signals, or everything"""
+        names = set(names)
+        with self._lock:
+            stale = [name for name in self._memo if not names or name in names]
+            for name in stale:
+                del self._memo[name]
+            self.stats["invalidated"] += len(stale)
+
+    def status(self, signals: Dict[str, object]) -> Dict[str, Dict]:
+        """Age and cadence of every signal's memoized result"""
+        now = self.clock()
+        report = {}
+        for name, signal in signals.items():
+            entry = self._memo.get(name)
+            age = (now - entry[0]).total_seconds() if entry else None
+            refresh = self.refresh_seconds(signal)
+            report[name] = {
+                "refresh_seconds": refresh,
+                "age_seconds": round(age, 1) if age is not None else None,
+                "fresh": age is not None and 0 <= age < refresh,
+                "depends_on": list(getattr(signal, "DATA_DEPENDENCIES", ()))
+            }
+        return report
@@ -12,6 +12,9 @@ from typing import Dict, List, Optional, Tuple
 from loguru import logger
 from collections import defaultdict
 
+from src.core.db_migrations import SIGNAL_EFFECTIVENESS_SCHEMA, SIGNAL_SUMMARY_UPSERT, migrate
+from src.core.prediction_signals import signal_rows
+
 class SignalEffectivenessTracker:
     """Tracks signal effectiveness in real-time for ML optimization"""
     
@@ -78,6 +81,7 @@ class SignalEffectivenessTracker:
         """)
         
         conn.commit()
+        migrate(conn, SIGNAL_EFFECTIVENESS_SCHEMA)
         conn.close()
         
         logger.info("📊 Signal Effectiveness Tracker initialized")
@@ -118,18 +122,14 @@ class SignalEffectivenessTracker:
             conn = sqlite3.connect(self.db_path)
             cursor = conn.cursor()
             
-            # Store each signal's contribution to this prediction
-            for signal_name, signal_info in signals_data.items():
-                if isinstance(signal_info, dict):
-                    confidence = signal_info.get('confidence', 0.0)
-                    direction = signal_info.get('direction', 'UNKNOWN')
-                    
-                    cursor.execute("""
-                        INSERT OR REPLACE INTO signal_effectiveness 
-                        (signal_name, prediction_id, signal_confidence, signal_direction, 
-                         strategy_id, trade_outcome)
-                        VALUES (?, ?, ?, ?, ?, 'pending')
-                    """, (signal_name, prediction_id, confidence, direction, strategy_id))
+            # Store each signal's contribution to this prediction (confidence normalized to 0-1)
+            cursor.executemany("""
+                INSERT OR REPLACE INTO signal_effectiveness 
+                (signal_name, prediction_id, signal_confidence, signal_direction, 
+                 strategy_id, trade_outcome)
+                VALUES (?, ?, ?, ?, ?, 'pending')
+            """, [(name, prediction_id, confidence, direction, strategy_id)
+                  for _, _, name, direction, confidence, _, _ in signal_rows(prediction_id, signals_data)])
             
             conn.commit()
             conn.close()
@@ -180,44 +180,10 @@ class SignalEffectivenessTracker:
             conn = sqlite3.connect(self.db_path)
             cursor = conn.cursor()
             
-            # Get all signals involved in this prediction
-            cursor.execute("""
-                SELECT signal_name FROM signal_effectiveness 
-                WHERE prediction_id = ?
-            """, (prediction_id,))
-            
-            signals = [row[0] for row in cursor.fetchall()]
-            
-            # Update summary for each signal
-            for signal_name in signals:
-                cursor.execute("""
-                    SELECT 
-                        COUNT(*) as total_trades,
-                        SUM(CASE WHEN trade_outcome = 'win' THEN 1 ELSE 0 END) as wins,
-                        SUM(CASE WHEN trade_outcome = 'loss' THEN 1 ELSE 0 END) as losses,
-                        AVG(trade_pnl) as avg_pnl,
-                        SUM(trade_pnl) as total_pnl,
-                        AVG(signal_confidence) as avg_confidence
-                    FROM signal_effectiveness 
-                    WHERE signal_name = ? AND trade_outcome IN ('win', 'loss')
-                """, (signal_name,))
-                
-                result = cursor.fetchone()
-                if result:
-                    total, wins, losses, avg_pnl, total_pnl, avg_conf = result
-                    win_rate = (wins / total) * 100 if total > 0 else 0
-                    
-                    # Calculate effectiveness score (win rate * avg confidence * avg pnl)
-                    effectiveness = (win_rate / 100) * (avg_conf or 0) * (avg_pnl or 0)
-                    
-                    cursor.execute("""
-                        INSERT OR REPLACE INTO signal_performance_summary
-                        (signal_name, total_trades, winning_trades, losing_trades,
-                         win_rate, avg_pnl, total_pnl, avg_confidence, effectiveness_score,
-                         last_updated)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-                    """, (signal_name, total, wins, losses, win_rate, avg_pnl or 0, 
-                         total_pnl or 0, avg_conf or 0, effectiveness))
+            # Recompute the summary of every signal involved in this prediction in one aggregate
+            cursor.execute(SIGNAL_SUMMARY_UPSERT.format(
+                signals="SELECT signal_name FROM signal_effectiveness WHERE prediction_id = ?"
+            ), (prediction_id,))
             
             conn.commit()
             conn.close()
@@ -225,6 +191,37 @@ class SignalEffectivenessTracker:
         except Exception as e:
             logger.error(f"❌ Failed to update performance summaries: {e}")
     
+    def update_signal_correlations(self, min_trades: int = 3) -> int:
+        """Refresh signal_correlations from closed trades where both signals were present"""
+        try:
+            conn = sqlite3.connect(self.db_path)
+            cursor = conn.cursor()
+            
+            # Strength is +1 when a pair always agreed on direction and -1 when it always disagreed
+            cursor.execute("""
+                INSERT OR REPLACE INTO signal_correlations
+                (signal_a, signal_b, correlation_strength, combined_win_rate, trades_together, last_updated)
+                SELECT a.signal_name, b.signal_name,
+                       AVG(CASE WHEN a.signal_direction = b.signal_direction THEN 1.0 ELSE -1.0 END),
+                       AVG(CASE WHEN a.trade_outcome = 'win' THEN 100.0 ELSE 0.0 END),
+                       COUNT(*),
+                       CURRENT_TIMESTAMP
+                FROM signal_effectiveness a
+                JOIN signal_effectiveness b ON b.prediction_id = a.prediction_id AND b.signal_name > a.signal_name
+                WHERE a.trade_outcome IN ('win', 'loss')
+                GROUP BY a.signal_name, b.signal_name
+                HAVING COUNT(*) >= ?
+            """, (min_trades,))
+            
+            pairs = cursor.rowcount
+            conn.commit()
+            conn.close()
+            return pairs
+            
+        except Exception as e:
+            logger.error(f"❌ Failed to update signal correlations: {e}")
+            return 0
+    
     def get_signal_rankings(self, min_trades: int = 5) -> List[Dict]:
         """Get signals ranked by effectiveness"""
         try:
@@ -294,6 +291,7 @@ class SignalEffectivenessTracker:
         try:
             top_signals = self.get_signal_rankings()[:5]
             underperforming = self.get_underperforming_signals()
+            self.update_signal_correlations()
             
             # Get total signal statistics
             conn = sqlite3.connect(self.db_path)
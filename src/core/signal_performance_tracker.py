@@ -13,6 +13,8 @@ import sqlite3
 import pandas as pd
 import numpy as np
 
+from src.core.db_migrations import SIGNAL_PERFORMANCE_SCHEMA, ensure_schema
+
 @dataclass
 class SignalPrediction:
     """Individual signal prediction record"""
@@ -149,6 +151,9 @@ class SignalPerformanceTracker:
                     )
                 """)
                 
+                if not ensure_schema(conn, SIGNAL_PERFORMANCE_SCHEMA):
+                    # data/signal_performance.db may hold performance_tracker's layout instead
+                    self.logger.warning(f"⚠️ {self.db_path} predictions table has another layout; schema migrations skipped")
                 self.logger.info("📊 Signal performance database initialized")
                 
         except Exception as e:
@@ -0,0 +1,282 @@
+"""
+Strategy Parameter Sweep
+Grid search over StrategyConfig parameters against a precomputed signal matrix
+
+The expensive part of evaluating a strategy (running every signal and aggregating them)
+happens once per recorded cycle and is stored as a SignalMatrix. Every parameter
+combination (confidence_threshold × min_signals_required × position_size_pct) is then
+scored with vectorized entry/exit rules, in chunks spread over a process pool, and ranked
+by Sharpe ratio, max drawdown and Kelly growth.
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import product
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+from config.options_config import options_config
+from src.core.market_data_provider import market_data, DEFAULT_ARCHIVE
+from src.core.strategy_auto_discovery import StrategyConfig
+
+DIRECTION_CODES = {"BUY": 1, "SELL": -1, "HOLD": 0}
+
+@dataclass
+class SignalMatrix:
+    """Per-cycle aggregated signal outputs and underlying price, one row per trading cycle"""
+    timestamps: np.ndarray   # datetime64[s]
+    direction: np.ndarray    # +1 BUY, -1 SELL, 0 HOLD
+    confidence: np.ndarray   # Aggregated confidence (0-1)
+    agreeing: np.ndarray     # Number of actionable signals
+    price: np.ndarray        # Underlying price at the cycle
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    @classmethod
+    def from_archive(cls, archive_path: str = DEFAULT_ARCHIVE, symbol: str = "RTX", scheduler=None) -> "SignalMatrix":
+        """Aggregate every recorded signal cycle once, through the production aggregation"""
+        if scheduler is None:
+            from src.core.options_scheduler import OptionsScheduler
+            scheduler = OptionsScheduler()
+
+        rows = []
+        logger.disable("src")
+        try:
+            with market_data.replaying(archive_path):
+                ticker = market_data.ticker(symbol)
+                for ts, signal_results in market_data.events(symbol, "signals"):
+                    market_data.set_clock(ts)
+                    try:
+                        bars = ticker.history(period="1d", interval="1m")
+                        price = float(bars["Close"].iloc[-1])
+                    except (LookupError, IndexError, KeyError):
+                        continue
+
+                    signals_data = scheduler._build_signals_data(signal_results) or {}
+                    rows.append((
+                        np.datetime64(ts, "s"),
+                        DIRECTION_CODES.get(signals_data.get("direction", "HOLD"), 0),
+                        signals_data.get("confidence", 0.5),
+                        signals_data.get("signals_agreeing", 0),
+                        price
+                    ))
+        finally:
+            logger.enable("src")
+
+        logger.info(f"📐 Signal matrix: {len(rows)} cycles from {archive_path}")
+        return cls.from_rows(rows)
+
+    @classmethod
+    def from_rows(cls, rows: List[tuple]) -> "SignalMatrix":
+        """Build from (timestamp, direction, confidence, agreeing, price) tuples"""
+        columns = list(zip(*rows)) if rows else [[], [], [], [], []]
+        return cls(
+            timestamps=np.array(columns[0], dtype="datetime64[s]"),
+            direction=np.array(columns[1], dtype=np.int8),
+            confidence=np.array(columns[2], dtype=np.float64),
+            agreeing=np.array(columns[3], dtype=np.int16),
+            price=np.array(columns[4], dtype=np.float64)
+        )
+
+    def save(self, path: str):
+        """Persist so later sweeps skip signal aggregation entirely"""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        np.savez_compressed(path, timestamps=self.timestamps, direction=self.direction,
+                            confidence=self.confidence, agreeing=self.agreeing, price=self.price)
+
+    @classmethod
+    def load(cls, path: str) -> "SignalMatrix":
+        data = np.load(path)
+        return cls(**{name: data[name] for name in ("timestamps", "direction", "confidence", "agreeing", "price")})
+
+def simulate_trade_returns(matrix: SignalMatrix, leverage: float, profit_target: float,
+                           stop_loss: float, max_hold_cycles: int) -> Dict[str, np.ndarray]:
+    """
+    Option return of a trade entered at every cycle, independent of strategy parameters
+
+    The option is approximated as `leverage` × the underlying move in the signal direction.
+    Each trade exits at the first cycle that hits the profit target or stop loss, otherwise
+    after max_hold_cycles (or at the end of the data). Trades are returned in exit order
+    so equity curves can be built with a cumulative product.
+    """
+    n = len(matrix)
+    horizon = np.arange(1, max_hold_cycles + 1)
+    forward_index = np.arange(n)[:, None] + horizon[None, :]
+    in_range = forward_index < n
+    forward_index = np.minimum(forward_index, n - 1)
+
+    underlying_move = matrix.price[forward_index] / matrix.price[:, None] - 1.0
+    option_return = np.maximum(matrix.direction[:, None] * underlying_move * leverage, -1.0)
+
+    hit = ((option_return >= profit_target) | (option_return <= -stop_loss)) & in_range
+    last_valid = np.maximum(in_range.sum(axis=1) - 1, 0)
+    exit_step = np.where(hit.any(axis=1), hit.argmax(axis=1), last_valid)
+
+    returns = option_return[np.arange(n), exit_step]
+    exit_cycle = forward_index[np.arange(n), exit_step]
+    tradeable = (matrix.direction != 0) & in_range[:, 0]
+
+    order = np.argsort(exit_cycle, kind="stable")
+    return {
+        "returns": np.where(tradeable, returns, 0.0)[order],
+        "tradeable": tradeable[order],
+        "confidence": matrix.confidence[order],
+        "agreeing": matrix.agreeing[order]
+    }
+
+# Worker state: trade arrays are sent once per process instead of once per chunk
+_worker_trades: Optional[Dict[str, np.ndarray]] = None
+
+def _init_worker(trades: Dict[str, np.ndarray]):
+    global _worker_trades
+    _worker_trades = trades
+
+def _evaluate_chunk(args) -> np.ndarray:
+    """Score a chunk of parameter rows [threshold, min_signals, position_pct, cost_frac]"""
+    params, min_trades = args
+    trades = _worker_trades
+    threshold, min_signals, position_pct, cost_frac = (params[:, i][:, None] for i in range(4))
+
+    taken = (
+        trades["tradeable"][None, :]
+        & (trades["confidence"][None, :] >= threshold)
+        & (trades["agreeing"][None, :] >= min_signals)
+    )
+    trade_return = np.where(taken, position_pct * trades["returns"][None, :] - cost_frac, 0.0)
+    log_growth = np.log(np.maximum(1.0 + trade_return, 1e-9))
+
+    equity = np.exp(np.cumsum(log_growth, axis=1))
+    peak = np.maximum(np.maximum.accumulate(equity, axis=1), 1.0)
+    max_drawdown = (1.0 - equity / peak).max(axis=1) if equity.shape[1] else np.zeros(len(params))
+
+    count = taken.sum(axis=1)
+    safe_count = np.maximum(count, 1)
+    mean = trade_return.sum(axis=1) / safe_count
+    variance = (np.where(taken, trade_return - mean[:, None], 0.0) ** 2).sum(axis=1) / safe_count
+    std = np.sqrt(variance)
+    sharpe = np.where((std > 0) & (count >= min_trades), mean / np.where(std > 0, std, 1.0), 0.0)
+
+    raw = trades["returns"][None, :]
+    wins = taken & (raw > 0)
+    losses = taken & (raw <= 0)
+    win_rate = wins.sum(axis=1) / safe_count
+    avg_win = np.where(wins, raw, 0.0).sum(axis=1) / np.maximum(wins.sum(axis=1), 1)
+    avg_loss = -np.where(losses, raw, 0.0).sum(axis=1) / np.maximum(losses.sum(axis=1), 1)
+    payoff = np.where(avg_loss > 0, avg_win / np.where(avg_loss > 0, avg_loss, 1.0), 0.0)
+    kelly = np.where(payoff > 0, win_rate - (1 - win_rate) / np.where(payoff > 0, payoff, 1.0), win_rate)
+
+    total_return = equity[:, -1] - 1.0 if equity.shape[1] else np.zeros(len(params))
+    kelly_growth = log_growth.sum(axis=1) / safe_count
+
+    return np.column_stack([count, win_rate, total_return, max_drawdown, sharpe, kelly, kelly_growth])
+
+class StrategyParameterSweep:
+    """Evaluates thousands of StrategyConfig parameter combinations over one signal matrix"""
+
+    RESULT_COLUMNS = ["trades", "win_rate", "total_return", "max_drawdown", "sharpe_ratio", "kelly_fraction", "kelly_growth"]
+
+    def __init__(self, matrix: SignalMatrix, initial_balance: float = 1000.0, leverage: float = 4.0,
+                 max_hold_cycles: int = 52, min_trades: int = 10, workers: Optional[int] = None,
+                 chunk_size: int = 256):
+        self.matrix = matrix
+        self.initial_balance = initial_balance
+        self.leverage = leverage                # Options move ~3-5x the underlying (see OptionsPredictionEngine)
+        self.max_hold_cycles = max_hold_cycles  # 2 trading days of 15-minute cycles
+        self.min_trades = min_trades
+        self.workers = workers if workers is not None else (os.cpu_count() or 1)
+        self.chunk_size = chunk_size
+
+        self.trades = simulate_trade_returns(
+            matrix, leverage, options_config.PROFIT_TARGET_PCT, options_config.STOP_LOSS_PCT, max_hold_cycles
+        )
+
+    @staticmethod
+    def default_grid() -> Dict[str, Iterable]:
+        """~12k combinations around the hand-tuned strategies in strategy_auto_discovery"""
+        return {
+            "confidence_threshold": np.round(np.arange(0.50, 0.901, 0.01), 2),
+            "min_signals_required": range(1, 9),
+            "position_size_pct": np.round(np.arange(0.05, 0.401, 0.01), 2)
+        }
+
+    def run(self, grid: Optional[Dict[str, Iterable]] = None, rank_by: str = "composite") -> pd.DataFrame:
+        """Score every combination and return them ranked best-first"""
+        grid = grid or self.default_grid()
+        combos = np.array(list(product(
+            grid["confidence_threshold"], grid["min_signals_required"], grid["position_size_pct"]
+        )), dtype=np.float64)
+
+        # Round-trip commission for one contract, as a fraction of the account
+        round_trip = 2 * options_config.calculate_commission("BUY", 1)
+        params = np.column_stack([combos, np.full(len(combos), round_trip / self.initial_balance)])
+
+        chunks = [(params[i:i + self.chunk_size], self.min_trades) for i in range(0, len(params), self.chunk_size)]
+        start = time.perf_counter()
+
+        if self.workers <= 1 or len(chunks) == 1:
+            _init_worker(self.trades)
+            scored = [_evaluate_chunk(chunk) for chunk in chunks]
+        else:
+            with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                     initargs=(self.trades,)) as executor:
+                scored = list(executor.map(_evaluate_chunk, chunks))
+
+        results = pd.DataFrame(combos, columns=["confidence_threshold", "min_signals_required", "position_size_pct"])
+        results["min_signals_required"] = results["min_signals_required"].astype(int)
+        results[self.RESULT_COLUMNS] = np.vstack(scored) if scored else np.empty((0, len(self.RESULT_COLUMNS)))
+        results["trades"] = results["trades"].astype(int)
+
+        ranked = self._rank(results, rank_by)
+        logger.info(
+            f"🧪 Swept {len(results)} parameter sets over {len(self.matrix)} cycles "
+            f"in {time.perf_counter() - start:.1f}s ({self.workers} workers)"
+        )
+        return ranked
+
+    def _rank(self, results: pd.DataFrame, rank_by: str) -> pd.DataFrame:
+        """Order by Sharpe, drawdown and Kelly growth (average rank), too-few-trade sets last"""
+        eligible = results["trades"] >= self.min_trades
+        results["rank_score"] = (
+            results["sharpe_ratio"].rank(ascending=False)
+            + results["max_drawdown"].rank(ascending=True)
+            + results["kelly_growth"].rank(ascending=False)
+        ) / 3
+
+        sort_keys = {
+            "composite": ("rank_score", True),
+            "sharpe": ("sharpe_ratio", False),
+            "drawdown": ("max_drawdown", True),
+            "kelly_growth": ("kelly_growth", False)
+        }
+        if rank_by not in sort_keys:
+            raise ValueError(f"Unknown rank_by: {rank_by} (expected one of {list(sort_keys)})")
+
+        column, ascending = sort_keys[rank_by]
+        results["eligible"] = eligible
+        return results.sort_values(["eligible", column], ascending=[False, ascending]).reset_index(drop=True)
+
+    @staticmethod
+    def to_strategy_configs(results: pd.DataFrame, top: int = 3) -> Dict[str, StrategyConfig]:
+        """Turn the best rows into StrategyConfigs usable alongside discover_all_strategies()"""
+        configs = {}
+        for i, row in results[results["eligible"]].head(top).iterrows():
+            strategy_id = f"sweep_{i + 1}"
+            configs[strategy_id] = StrategyConfig(
+                name=f"Sweep #{i + 1}",
+                confidence_threshold=float(row["confidence_threshold"]),
+                min_signals_required=int(row["min_signals_required"]),
+                position_size_pct=float(row["position_size_pct"]),
+                description=(
+                    f"Sweep result: Sharpe {row['sharpe_ratio']:.2f}, "
+                    f"max DD {row['max_drawdown']:.1%}, {int(row['trades'])} trades"
+                )
+            )
+        return configs
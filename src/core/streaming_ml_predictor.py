@@ -20,6 +20,7 @@ import json
 import pickle
 import sqlite3
 from typing import Dict, List, Optional, Tuple, Any
+from collections import deque
 from dataclasses import dataclass, asdict
 import threading
 from pathlib import Path
@@ -39,8 +40,10 @@ except ImportError as e:
     print(f"Warning: Could not import Phase 2 models: {e}")
 
 from loguru import logger
+from src.core.trade_history import HistoryRing
+from src.ml.model_registry import ModelRegistry
 
-@dataclass
+@dataclass(slots=True)
 class MLPrediction:
     """Container for ML prediction results"""
     prediction_id: str
@@ -92,24 +95,34 @@ class StreamingMLPredictor:
     on live market data with confidence scoring and risk management
     """
     
-    def __init__(self, model_dir: str = "trained_models"):
+    MEMORY_ATTRIBUTES = ("prediction_history", "prediction_times", "models", "_previous_models")
+    HISTORY_KEPT_ON_TRIM = 100
+    
+    def __init__(self, model_dir: str = "trained_models", registry: Optional[ModelRegistry] = None):
         """
         Initialize streaming ML predictor
         
         Args:
-            model_dir: Directory containing trained models
+            model_dir: Directory containing trained models (used when the registry has no promoted version)
+            registry: Versioned models to follow; a newly promoted version is swapped in between predictions
         """
         self.model_dir = Path(model_dir)
         self.models = ModelEnsemble()
         self.is_loaded = False
         
+        # Model versions
+        self.registry = registry if registry is not None else ModelRegistry("streaming")
+        self.model_version: Optional[str] = None
+        self._previous_models: Optional[Tuple[Optional[str], ModelEnsemble]] = None
+        self._failed_version: Optional[str] = None
+        
         # Prediction history
-        self.prediction_history: List[MLPrediction] = []
         self.max_history = 1000
+        self.prediction_history: HistoryRing = HistoryRing(self.max_history)
         
         # Performance tracking
         self.total_predictions = 0
-        self.prediction_times: List[float] = []
+        self.prediction_times: deque = deque(maxlen=100)
         
         # Configuration
         self.min_confidence_threshold = 0.6
@@ -125,6 +138,9 @@ class StreamingMLPredictor:
         """Load all available Phase 2 models"""
         logger.info("📥 Loading Phase 2 ML models...")
         
+        if await self.check_for_update():
+            return
+        
         try:
             # Try to load LSTM models
             await self._load_lstm_models()
@@ -183,20 +199,23 @@ class StreamingMLPredictor:
                 with open(ensemble_file, 'rb') as f:
                     ensemble_data = pickle.load(f)
                 
-                # Reconstruct ensemble model
-                ensemble_model = EnsembleStacker(use_lstm=False, use_attention=False)
-                ensemble_model.base_models = ensemble_data['base_models']
-                ensemble_model.meta_learners = ensemble_data['meta_learners']
-                ensemble_model.scaler = ensemble_data['scaler']
-                ensemble_model.meta_feature_names = ensemble_data['meta_feature_names']
-                ensemble_model.is_trained = True
-                
-                self.models.ensemble_model = ensemble_model
+                self.models.ensemble_model = self._ensemble_from_state(ensemble_data)
                 logger.info(f"✅ Loaded ensemble model: {ensemble_file.name}")
                 
         except Exception as e:
             logger.warning(f"⚠️ Ensemble loading error: {e}")
     
+    @staticmethod
+    def _ensemble_from_state(ensemble_data: Dict) -> Any:
+        """Reconstruct an EnsembleStacker from its saved state dict"""
+        ensemble_model = EnsembleStacker(use_lstm=False, use_attention=False)
+        ensemble_model.base_models = ensemble_data['base_models']
+        ensemble_model.meta_learners = ensemble_data['meta_learners']
+        ensemble_model.scaler = ensemble_data['scaler']
+        ensemble_model.meta_feature_names = ensemble_data['meta_feature_names']
+        ensemble_model.is_trained = True
+        return ensemble_model
+    
     async def _load_multitask_model(self):
         """Load multi-task model"""
         try:
@@ -213,6 +232,73 @@ class StreamingMLPredictor:
         except Exception as e:
             logger.warning(f"⚠️ Multi-task loading error: {e}")
     
+    def _models_from_registry(self, version: str) -> ModelEnsemble:
+        """Load a registry version into a fresh ModelEnsemble (hash-checked, arrays memory-mapped)"""
+        artifacts = self.registry.load(version)
+        models = ModelEnsemble()
+        
+        if 'lstm' in artifacts:
+            lstm_model = LSTMTradingModel()
+            if lstm_model.load_model(str(artifacts['lstm'])):
+                models.lstm_model = lstm_model
+        if 'lstm_attention' in artifacts:
+            attention_model = LSTMWithAttention()
+            if attention_model.load_model(str(artifacts['lstm_attention'])):
+                models.lstm_attention_model = attention_model
+        if 'ensemble' in artifacts:
+            models.ensemble_model = self._ensemble_from_state(artifacts['ensemble'])
+        if 'multitask' in artifacts:
+            multitask_model = MultiTaskTradingModel()
+            if multitask_model.load_model(str(artifacts['multitask'])):
+                models.multitask_model = multitask_model
+        
+        return models
+    
+    def _swap_models(self, version: Optional[str], models: ModelEnsemble):
+        """Replace the live ensemble in one step; the outgoing one is kept for an instant rollback"""
+        with self.prediction_lock:
+            self._previous_models = (self.model_version, self.models)
+            self.models = models
+            self.model_version = version
+            self.is_loaded = models.count_loaded_models() > 0
+    
+    async def check_for_update(self) -> bool:
+        """
+        Hot-swap to the registry's current version if it changed
+        
+        The new models are loaded off the event loop while the old ones keep serving;
+        predictions already running finish on the ensemble they started with.
+        """
+        version = self.registry.current()
+        if version is None or version in (self.model_version, self._failed_version):
+            return False
+        
+        try:
+            models = await asyncio.to_thread(self._models_from_registry, version)
+        except Exception as e:
+            self._failed_version = version
+            logger.error(f"❌ Could not load model version {version}, keeping {self.model_version}: {e}")
+            return False
+        
+        previous_version = self.model_version
+        self._swap_models(version, models)
+        logger.success(f"🔄 Hot-swapped ML models {previous_version} → {version} "
+                       f"({models.count_loaded_models()} models)")
+        return True
+    
+    async def rollback(self) -> Optional[str]:
+        """Roll the registry back one version and swap to it (instantly if it is the ensemble just replaced)"""
+        version = self.registry.rollback()
+        if version is None:
+            return None
+        
+        if self._previous_models and self._previous_models[0] == version:
+            self._swap_models(*self._previous_models)
+            logger.success(f"⏪ ML models rolled back to {version}")
+        else:
+            await self.check_for_update()
+        return version
+    
     async def make_prediction(self, features: Dict[str, float], 
                             current_price: float = None) -> MLPrediction:
         """
@@ -230,6 +316,10 @@ class StreamingMLPredictor:
         
         logger.info(f"🔮 Making streaming prediction {prediction_id}")
         
+        # Pick up a newly promoted model version between predictions
+        await self.check_for_update()
+        models = self.models
+        
         try:
             # Prepare features for models
             feature_array = self._prepare_features_for_models(features)
@@ -237,17 +327,17 @@ class StreamingMLPredictor:
             # Get predictions from each model
             predictions = {}
             
-            if self.models.lstm_model:
-                predictions['lstm'] = await self._get_lstm_prediction(feature_array)
+            if models.lstm_model:
+                predictions['lstm'] = await self._get_lstm_prediction(models.lstm_model, feature_array)
             
-            if self.models.lstm_attention_model:
-                predictions['lstm_attention'] = await self._get_lstm_attention_prediction(feature_array)
+            if models.lstm_attention_model:
+                predictions['lstm_attention'] = await self._get_lstm_attention_prediction(models.lstm_attention_model, feature_array)
             
-            if self.models.ensemble_model:
-                predictions['ensemble'] = await self._get_ensemble_prediction(feature_array)
+            if models.ensemble_model:
+                predictions['ensemble'] = await self._get_ensemble_prediction(models.ensemble_model, feature_array)
             
-            if self.models.multitask_model:
-                predictions['multitask'] = await self._get_multitask_prediction(feature_array)
+            if models.multitask_model:
+                predictions['multitask'] = await self._get_multitask_prediction(models.multitask_model, feature_array)
             
             # Combine predictions
             combined_result = self._combine_model_predictions(predictions)
@@ -283,13 +373,8 @@ class StreamingMLPredictor:
             # Store prediction
             with self.prediction_lock:
                 self.prediction_history.append(prediction)
-                if len(self.prediction_history) > self.max_history:
-                    self.prediction_history.pop(0)
-                
                 self.total_predictions += 1
                 self.prediction_times.append(calculation_time)
-                if len(self.prediction_times) > 100:
-                    self.prediction_times.pop(0)
             
             logger.success(f"✅ Prediction complete: {prediction.direction} @ {prediction.confidence:.1%} confidence")
             
@@ -326,14 +411,14 @@ class StreamingMLPredictor:
             logger.error(f"❌ Feature preparation error: {e}")
             return np.zeros((1, 82))
     
-    async def _get_lstm_prediction(self, features: np.ndarray) -> Dict:
+    async def _get_lstm_prediction(self, model: Any, features: np.ndarray) -> Dict:
         """Get prediction from LSTM model"""
         try:
             # LSTM expects sequences - create a simple sequence by repeating current features
             sequence_length = 20
             feature_sequence = np.repeat(features, sequence_length, axis=0).reshape(1, sequence_length, -1)
             
-            prediction = self.models.lstm_model.predict(feature_sequence)
+            prediction = model.predict(feature_sequence)
             
             if prediction is not None:
                 return {
@@ -346,14 +431,14 @@ class StreamingMLPredictor:
         
         return None
     
-    async def _get_lstm_attention_prediction(self, features: np.ndarray) -> Dict:
+    async def _get_lstm_attention_prediction(self, model: Any, features: np.ndarray) -> Dict:
         """Get prediction from LSTM attention model"""
         try:
             # Similar to LSTM but with attention
             sequence_length = 20
             feature_sequence = np.repeat(features, sequence_length, axis=0).reshape(1, sequence_length, -1)
             
-            prediction = self.models.lstm_attention_model.predict(feature_sequence)
+            prediction = model.predict(feature_sequence)
             
             if prediction is not None:
                 return {
@@ -366,13 +451,13 @@ class StreamingMLPredictor:
         
         return None
     
-    async def _get_ensemble_prediction(self, features: np.ndarray) -> Dict:
+    async def _get_ensemble_prediction(self, model: Any, features: np.ndarray) -> Dict:
         """Get prediction from ensemble model"""
         try:
             # Convert to DataFrame for ensemble
             feature_df = pd.DataFrame(features)
             
-            prediction = self.models.ensemble_model.predict(feature_df)
+            prediction = model.predict(feature_df)
             
             if prediction is not None:
                 # Ensemble returns probabilities for multiple targets
@@ -386,10 +471,10 @@ class StreamingMLPredictor:
         
         return None
     
-    async def _get_multitask_prediction(self, features: np.ndarray) -> Dict:
+    async def _get_multitask_prediction(self, model: Any, features: np.ndarray) -> Dict:
         """Get prediction from multi-task model"""
         try:
-            predictions = self.models.multitask_model.predict(features)
+            predictions = model.predict(features)
             
             if predictions:
                 return {
@@ -562,12 +647,18 @@ class StreamingMLPredictor:
         with self.prediction_lock:
             return self.prediction_history[-count:] if self.prediction_history else []
     
+    def trim_memory(self) -> int:
+        """Keep only recent predictions and timings (memory budget hook); models stay loaded"""
+        with self.prediction_lock:
+            return self.prediction_history.trim(self.HISTORY_KEPT_ON_TRIM)
+    
     def get_performance_stats(self) -> Dict:
         """Get predictor performance statistics"""
         with self.prediction_lock:
             return {
                 'total_predictions': self.total_predictions,
                 'models_loaded': self.models.count_loaded_models(),
+                'model_version': self.model_version,
                 'avg_prediction_time_ms': np.mean(self.prediction_times) if self.prediction_times else 0,
                 'max_prediction_time_ms': max(self.prediction_times) if self.prediction_times else 0,
                 'recent_predictions': len(self.prediction_history),
@@ -3,21 +3,24 @@ Telegram Bot for RTX Trading Notifications
 Professional hedge fund-style mobile alerts
 """
 import asyncio
-import aiohttp
 from datetime import datetime, time as dt_time
 from typing import Dict, List, Optional
 from loguru import logger
-from src.core.signal_effectiveness_tracker import signal_tracker
-from src.core.performance_monitor import performance_monitor
-from src.core.cross_strategy_learning import cross_strategy_learning
-from src.core.rtx_earnings_calendar import rtx_earnings_calendar
-from src.core.backtesting_engine import backtesting_engine
-from src.core.iv_percentile_alerts import iv_percentile_alerts
-from src.core.automated_reset_system import automated_reset_system
-from src.core.live_trading_framework import live_trading_framework
+from src.core.component_registry import components
+from src.core.memory_accounting import memory_accountant
 
 from config.trading_config import config
 
+# Command handlers reach these on demand; importing the bot stays cheap
+signal_tracker = components.lazy("signal_tracker")
+performance_monitor = components.lazy("performance_monitor")
+cross_strategy_learning = components.lazy("cross_strategy_learning")
+rtx_earnings_calendar = components.lazy("rtx_earnings_calendar")
+backtesting_engine = components.lazy("backtesting_engine")
+iv_percentile_alerts = components.lazy("iv_percentile_alerts")
+automated_reset_system = components.lazy("automated_reset_system")
+live_trading_framework = components.lazy("live_trading_framework")
+
 class TelegramBot:
     """Professional trading notifications via Telegram"""
     
@@ -80,6 +83,8 @@ class TelegramBot:
                 "disable_web_page_preview": True
             }
             
+            import aiohttp  # Deferred: ~0.3s import, only needed once a message is sent
+            
             async with aiohttp.ClientSession() as session:
                 async with session.post(url, json=data) as response:
                     if response.status == 200:
@@ -742,6 +747,9 @@ fi
 • Available: {disk_line[3]}
 • Usage: {disk_line[4]}
 
+<b>🔹 Components:</b>
+{chr(10).join(memory_accountant.format_report())}
+
 ⏰ <b>Updated:</b> {datetime.now().strftime('%H:%M:%S')}"""
             
             return await self.send_message(memory_text.strip())
@@ -757,6 +765,8 @@ fi
         params = {'offset': offset, 'timeout': 5}
         
         try:
+            import aiohttp
+            
             async with aiohttp.ClientSession() as session:
                 async with session.get(url, params=params) as response:
                     if response.status == 200:
@@ -856,7 +866,8 @@ fi
             try:
                 # Import options data engine to get stock price
                 from .options_data_engine import options_data_engine
-                current_price = options_data_engine.get_current_stock_price()
+                from config.options_config import options_config
+                current_price = options_data_engine.get_current_stock_price(max_age=options_config.QUOTE_MAX_AGE_DASHBOARD)
                 if current_price:
                     message += f"💰 *Current Price:* ${current_price:.2f}\n"
                 else:
@@ -877,7 +888,8 @@ fi
             # Check if options data is available
             try:
                 from .options_data_engine import options_data_engine
-                chain = options_data_engine.get_real_options_chain()
+                from config.options_config import options_config
+                chain = options_data_engine.get_real_options_chain(max_age=options_config.QUOTE_MAX_AGE_DASHBOARD)
                 options_count = len(chain)
                 message += f"📊 *Options Available:* {options_count} contracts\n"
             except:
@@ -1300,11 +1312,10 @@ _Please check system manually or contact support._"""
         try:
             # Import dashboard here to avoid circular imports
             try:
-                from .dashboard import PerformanceDashboard
+                from .dashboard import dashboard
             except ImportError:
-                from src.core.dashboard import PerformanceDashboard
+                from src.core.dashboard import dashboard
             
-            dashboard = PerformanceDashboard()
             dashboard_text = dashboard.generate_dashboard()
             
             # Limit message length for Telegram (4096 char limit)
@@ -1322,11 +1333,10 @@ _Please check system manually or contact support._"""
         try:
             # Import dashboard here to avoid circular imports
             try:
-                from .dashboard import PerformanceDashboard
+                from .dashboard import dashboard
             except ImportError:
-                from src.core.dashboard import PerformanceDashboard
+                from src.core.dashboard import dashboard
             
-            dashboard = PerformanceDashboard()
             # Use the comprehensive dashboard which includes positions info
             dashboard_text = dashboard.generate_dashboard()
             
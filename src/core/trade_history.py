@@ -0,0 +1,167 @@
+"""
+Trade History
+Bounded in-memory rings of compact records, with full details kept in SQLite
+
+Long-running processes used to keep every closed position and prediction as a nested dict
+(with copies of the prediction and its signals). The rings below keep only the most recent
+N slotted summaries; anything older, or any full payload, is loaded from SQLite on demand.
+"""
+
+import json
+import sqlite3
+import threading
+from collections import deque
+from datetime import datetime
+from itertools import islice
+from typing import Any, Callable, Dict, Iterator, List, Optional, Union
+
+class HistoryRing:
+    """Most recent maxlen records (maxlen=None keeps everything); details() loads the full entry"""
+
+    __slots__ = ("_items", "loader", "appended")
+
+    def __init__(self, maxlen: Optional[int] = 200, loader: Optional[Callable[[str], Optional[Dict]]] = None):
+        self._items = deque(maxlen=maxlen)
+        self.loader = loader
+        self.appended = 0  # Total ever appended (survives eviction)
+
+    @property
+    def maxlen(self) -> Optional[int]:
+        return self._items.maxlen
+
+    def append(self, record: Any):
+        self._items.append(record)
+        self.appended += 1
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __iter__(self) -> Iterator:
+        return iter(self._items)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Any, List]:
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self._items))
+            if step == 1 and start >= len(self._items) // 2:
+                return list(islice(self._items, start, stop))  # Tail slices ([-n:]) without copying it all
+            return list(self._items)[index]
+        return self._items[index]
+
+    def trim(self, keep: int) -> int:
+        """Drop all but the newest keep records; returns how many were dropped"""
+        dropped = max(0, len(self._items) - keep)
+        for _ in range(dropped):
+            self._items.popleft()
+        return dropped
+
+    def clear(self):
+        self._items.clear()
+
+    def details(self, key: str) -> Optional[Dict]:
+        """Full entry from storage (None when there is no loader or no such entry)"""
+        return self.loader(key) if self.loader else None
+
+class _Record:
+    """Slotted record base: dict view and readable repr"""
+
+    __slots__ = ()
+
+    def to_dict(self) -> Dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_dict()})"
+
+class ClosedPosition(_Record):
+    """Summary of a closed paper position (full prediction/outcome stay in options_performance.db)"""
+
+    __slots__ = (
+        "prediction_id", "contract_symbol", "action", "direction", "confidence", "contracts",
+        "total_cost", "entry_timestamp", "exit_timestamp", "exit_reason", "net_pnl", "pnl_percentage",
+        "days_held"
+    )
+
+    def __init__(self, **fields):
+        for name in self.__slots__:
+            setattr(self, name, fields.get(name))
+
+    @classmethod
+    def from_position(cls, position: Dict) -> "ClosedPosition":
+        prediction, outcome = position["prediction"], position["outcome"]
+        return cls(
+            prediction_id=outcome["prediction_id"],
+            contract_symbol=prediction.get("contract_symbol"),
+            action=prediction.get("action"),
+            direction=prediction.get("direction"),
+            confidence=prediction.get("confidence"),
+            contracts=position["execution"].get("contracts", prediction.get("contracts")),
+            total_cost=position["execution"].get("total_cost"),
+            entry_timestamp=position.get("entry_timestamp"),
+            exit_timestamp=outcome["exit_timestamp"],
+            exit_reason=outcome["exit_reason"],
+            net_pnl=outcome["net_pnl"],
+            pnl_percentage=outcome["pnl_percentage"],
+            days_held=outcome["days_held"],
+        )
+
+class PredictionRecord(_Record):
+    """Summary of a generated options prediction (full payload in the prediction log)"""
+
+    __slots__ = (
+        "prediction_id", "timestamp", "strategy_id", "action", "contract_symbol", "direction",
+        "confidence", "entry_price", "contracts", "total_cost"
+    )
+
+    def __init__(self, **fields):
+        for name in self.__slots__:
+            setattr(self, name, fields.get(name))
+
+    @classmethod
+    def from_prediction(cls, prediction: Dict) -> "PredictionRecord":
+        return cls(**{name: prediction.get(name) for name in cls.__slots__})
+
+class HistoryStore:
+    """Append-only JSON payloads keyed by id in a small SQLite table"""
+
+    def __init__(self, db_path: str, table: str = "history"):
+        self.db_path = db_path
+        self.table = table
+        self._lock = threading.Lock()
+        self._ready = False  # Table is created on first use, not at import
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path)
+        if not self._ready:
+            conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.table} ("
+                "key TEXT PRIMARY KEY, timestamp TEXT, payload TEXT NOT NULL)"
+            )
+            conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{self.table}_timestamp ON {self.table}(timestamp)")
+            self._ready = True
+        return conn
+
+    def save(self, key: str, payload: Dict, timestamp: Optional[datetime] = None):
+        stamp = timestamp.isoformat() if isinstance(timestamp, datetime) else timestamp
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute(
+                    f"INSERT OR REPLACE INTO {self.table} (key, timestamp, payload) VALUES (?, ?, ?)",
+                    (key, stamp, json.dumps(payload, default=str))
+                )
+            conn.close()
+
+    def load(self, key: str) -> Optional[Dict]:
+        conn = self._connect()
+        row = conn.execute(f"SELECT payload FROM {self.table} WHERE key = ?", (key,)).fetchone()
+        conn.close()
+        return json.loads(row[0]) if row else None
+
+    def recent(self, limit: int) -> List[Dict]:
+        """Newest limit payloads, oldest first"""
+        conn = self._connect()
+        rows = conn.execute(
+            f"SELECT payload FROM {self.table} ORDER BY timestamp DESC, rowid DESC LIMIT ?", (limit,)
+        ).fetchall()
+        conn.close()
+        return [json.loads(row[0]) for row in reversed(rows)]
@@ -54,17 +54,22 @@ class AdvancedFeatureEngineer:
         except Exception as e:
             logger.error(f"❌ Failed to cache external data: {e}")
     
-    def engineer_features(self, df):
+    def engineer_features(self, df, rows=None):
         """
         Main feature engineering pipeline
-        Input: DataFrame with basic prediction data
-        Output: DataFrame with advanced features
+        Input: DataFrame with basic prediction data, in time order (rows: optional index labels
+               to engineer, e.g. those missing from the feature store)
+        Output: DataFrame with advanced features, indexed like the engineered rows
+
+        Only the technical features look beyond the row itself: they read the up-to-20 rows
+        before it in df, so a row engineered alone gets the same features as in a full pass.
         """
         logger.info("🔧 Engineering advanced features...")
         
         features = []
+        targets = df if rows is None else df.loc[rows]
         
-        for idx, row in df.iterrows():
+        for idx, row in targets.iterrows():
             try:
                 feature_dict = self.create_base_features(row)
                 
@@ -75,7 +80,7 @@ class AdvancedFeatureEngineer:
                 feature_dict.update(self.create_market_features(row))
                 
                 # Add technical features
-                feature_dict.update(self.create_technical_features(row, df, idx))
+                feature_dict.update(self.create_technical_features(row, df, df.index.get_loc(idx)))
                 
                 # Add signal interaction features
                 feature_dict.update(self.create_signal_interactions(row))
@@ -93,7 +98,7 @@ class AdvancedFeatureEngineer:
                 # Create minimal feature dict on error
                 features.append(self.create_base_features(row))
         
-        result_df = pd.DataFrame(features).fillna(0)
+        result_df = pd.DataFrame(features, index=targets.index).fillna(0)
         logger.success(f"✅ Created {len(result_df.columns)} advanced features")
         return result_df
     
@@ -180,7 +185,7 @@ class AdvancedFeatureEngineer:
             return {'vix_level': 20, 'vix_regime_normal': 1}
     
     def create_technical_features(self, row, df, current_idx):
-        """Create technical analysis features"""
+        """Create technical analysis features (current_idx: the row's position in df)"""
         try:
             # Get historical context (last 20 predictions)
             start_idx = max(0, current_idx - 20)
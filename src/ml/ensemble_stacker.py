@@ -23,6 +23,7 @@ warnings.filterwarnings('ignore')
 
 # Import our LSTM model
 from .lstm_model import LSTMTradingModel, LSTMWithAttention
+from .parallel_cv import cross_val_meta_features
 
 class EnsembleStacker:
     """
@@ -33,16 +34,18 @@ class EnsembleStacker:
     Level 2: Meta-learner that combines base model predictions
     """
     
-    def __init__(self, use_lstm=True, use_attention=True):
+    def __init__(self, use_lstm=True, use_attention=True, cv_workers=None):
         """
         Initialize ensemble stacker
         
         Args:
             use_lstm: Whether to include LSTM models
             use_attention: Whether to include attention-based LSTM
+            cv_workers: Processes for cross-validated base-model fits (default: all cores, 1 = serial)
         """
         self.use_lstm = use_lstm
         self.use_attention = use_attention
+        self.cv_workers = cv_workers
         self.base_models = {}
         self.meta_learner = None
         self.scaler = StandardScaler()
@@ -161,70 +164,24 @@ class EnsembleStacker:
         """
         logger.info("🚀 Training base models with cross-validation...")
         
-        n_samples = len(X)
-        n_models = len([k for k in self.base_models.keys() if 'lstm' not in k])
+        # Traditional ML models (LSTMs are trained separately on sequences)
+        models = {name: model for name, model in self.base_models.items() if 'lstm' not in name}
         n_targets = y.shape[1] if len(y.shape) > 1 else 1
         
-        # Initialize meta-features array
-        meta_features = np.zeros((n_samples, n_models * n_targets))
-        meta_feature_names = []
-        
-        # Time series split for CV
-        tscv = TimeSeriesSplit(n_splits=cv_folds)
+        # Time series split for CV; the (model × fold × target) fits run on a process pool
+        splits = list(TimeSeriesSplit(n_splits=cv_folds).split(X))
+        meta_features, fitted = cross_val_meta_features(
+            models, X, np.asarray(y).reshape(len(X), n_targets), splits,
+            workers=self.cv_workers, full_scaler=self.scaler
+        )
         
-        # Train traditional ML models
-        model_idx = 0
-        for model_name, model in self.base_models.items():
-            if 'lstm' in model_name:
-                continue  # Skip LSTM models for now
-                
-            logger.info(f"Training {model_name} with CV...")
-            
-            fold_predictions = np.zeros((n_samples, n_targets))
-            
-            for fold, (train_idx, val_idx) in enumerate(tscv.split(X)):
-                X_train_fold = X.iloc[train_idx]
-                y_train_fold = y.iloc[train_idx] if hasattr(y, 'iloc') else y[train_idx]
-                X_val_fold = X.iloc[val_idx]
-                
-                # Scale features
-                scaler = StandardScaler()
-                X_train_scaled = scaler.fit_transform(X_train_fold)
-                X_val_scaled = scaler.transform(X_val_fold)
-                
-                # Train model
-                if n_targets == 1:
-                    model.fit(X_train_scaled, y_train_fold)
-                    pred = model.predict_proba(X_val_scaled)[:, 1]  # Get positive class probability
-                    fold_predictions[val_idx, 0] = pred
-                else:
-                    # Multi-target (train separate model for each target)
-                    for target_idx in range(n_targets):
-                        model_copy = type(model)(**model.get_params())
-                        target_col = y_train_fold.iloc[:, target_idx] if hasattr(y_train_fold, 'iloc') else y_train_fold[:, target_idx]
-                        
-                        model_copy.fit(X_train_scaled, target_col)
-                        pred = model_copy.predict_proba(X_val_scaled)[:, 1]
-                        fold_predictions[val_idx, target_idx] = pred
-            
-            # Store predictions as meta-features
-            for target_idx in range(n_targets):
-                meta_features[:, model_idx * n_targets + target_idx] = fold_predictions[:, target_idx]
-                meta_feature_names.append(f"{model_name}_target_{target_idx}")
-            
-            model_idx += 1
-            
-            # Train final model on full data
-            X_scaled = self.scaler.fit_transform(X) if model_idx == 1 else self.scaler.transform(X)
-            if n_targets == 1:
-                model.fit(X_scaled, y)
-            else:
-                # For multi-target, we need to handle this differently in production
-                # For now, train on first target
-                target_col = y.iloc[:, 0] if hasattr(y, 'iloc') else y[:, 0]
-                model.fit(X_scaled, target_col)
+        # Final models trained on full data (first target for multi-target, as production expects)
+        self.base_models.update(fitted)
+        meta_feature_names = [
+            f"{model_name}_target_{target_idx}" for model_name in models for target_idx in range(n_targets)
+        ]
         
-        logger.success(f"✅ Generated meta-features from {model_idx} models")
+        logger.success(f"✅ Generated meta-features from {len(models)} models")
         return meta_features, meta_feature_names
     
     def _train_lstm_models(self, X_lstm, y_lstm):
@@ -481,21 +438,23 @@ class EnsembleStacker:
         
         return metrics
     
+    def get_state(self):
+        """Picklable ensemble state (LSTM base models are saved separately as .h5)"""
+        return {
+            'base_models': {k: v for k, v in self.base_models.items() if 'lstm' not in k},
+            'meta_learners': self.meta_learners,
+            'scaler': self.scaler,
+            'meta_feature_names': self.meta_feature_names,
+            'use_lstm': self.use_lstm,
+            'use_attention': self.use_attention,
+            'is_trained': self.is_trained
+        }
+    
     def save_ensemble(self, filepath):
         """Save the trained ensemble"""
         try:
-            ensemble_data = {
-                'base_models': {k: v for k, v in self.base_models.items() if 'lstm' not in k},
-                'meta_learners': self.meta_learners,
-                'scaler': self.scaler,
-                'meta_feature_names': self.meta_feature_names,
-                'use_lstm': self.use_lstm,
-                'use_attention': self.use_attention,
-                'is_trained': self.is_trained
-            }
-            
             with open(filepath, 'wb') as f:
-                pickle.dump(ensemble_data, f)
+                pickle.dump(self.get_state(), f)
             
             # Save LSTM models separately
             if self.use_lstm and 'lstm' in self.base_models:
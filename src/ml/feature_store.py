@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Feature Store for AlgoSlayer ML Training
+Persistent cache of engineered feature vectors keyed by prediction_id
+
+Every training run used to rebuild features for the whole history row by row. The store
+keeps each prediction's feature vector on disk under a hash of the feature definition, so
+a run only engineers rows it has not seen; editing the feature code changes the hash and
+rebuilds everything once.
+
+Layout per feature set and version (feature_store/<name>/<version>/):
+    manifest.json          columns, row count and the list of segments
+    ids_<gen>.npy          prediction ids (unicode) of one segment
+    features_<gen>.npy     that segment's float64 matrix in column-major order, opened with mmap_mode='r'
+Each write appends a segment holding only the new rows, so a run costs what it adds rather
+than the whole history; a re-engineered id shadows its older row. Once there are more than
+MAX_SEGMENTS segments they are compacted into one. The manifest is swapped last, so readers
+never see a half-written store.
+"""
+import hashlib
+import inspect
+import json
+import os
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+FEATURE_STORE_DIR = os.getenv("FEATURE_STORE_DIR", "data/feature_store")
+
+def feature_version(*definitions, extra: str = "") -> str:
+    """Short hash of the feature definition: source of the given functions/classes plus any extra tag"""
+    digest = hashlib.sha256(extra.encode())
+    for definition in definitions:
+        try:
+            digest.update(inspect.getsource(definition).encode())
+        except (OSError, TypeError):
+            digest.update(repr(definition).encode())
+    return digest.hexdigest()[:12]
+
+class FeatureStore:
+    """
+    Feature vectors for one feature set and version
+
+    Usage:
+        store = FeatureStore("options", feature_version(engineer_fn))
+        X = store.build(df, compute)   # compute(new_rows_df) -> DataFrame indexed like new_rows_df
+    """
+
+    MAX_SEGMENTS = 16  # Appended segments before they are compacted into one
+
+    def __init__(self, name: str, version: str, root: str = FEATURE_STORE_DIR):
+        self.name = name
+        self.version = version
+        self.path = os.path.join(root, name, version)
+        self._manifest: Optional[Dict] = None
+        self._segments: List[Tuple[List[str], np.ndarray]] = []  # (columns, matrix) per segment
+        self._positions: Optional[Dict[str, Tuple[int, int]]] = None  # id -> (segment, row); later segments win
+
+    # Reading
+
+    def _load(self):
+        manifest_path = os.path.join(self.path, "manifest.json")
+        if not os.path.exists(manifest_path):
+            self._manifest = {"columns": [], "rows": 0, "generation": 0, "segments": []}
+        else:
+            with open(manifest_path) as f:
+                self._manifest = json.load(f)
+            if "segments" not in self._manifest:  # Single-matrix stores written before segments
+                self._manifest["segments"] = [{"generation": self._manifest["generation"],
+                                               "columns": self._manifest["columns"]}]
+        self._segments = []
+        self._positions = {}
+        for index, segment in enumerate(self._manifest["segments"]):
+            generation = segment["generation"]
+            ids = np.load(os.path.join(self.path, f"ids_{generation}.npy"))
+            matrix = np.load(os.path.join(self.path, f"features_{generation}.npy"), mmap_mode="r")
+            self._segments.append((segment["columns"], matrix))
+            self._positions.update((prediction_id, (index, row)) for row, prediction_id in enumerate(ids.tolist()))
+
+    @property
+    def columns(self) -> List[str]:
+        if self._manifest is None:
+            self._load()
+        return list(self._manifest["columns"])
+
+    def __len__(self) -> int:
+        if self._manifest is None:
+            self._load()
+        return len(self._positions)
+
+    def missing(self, prediction_ids: Iterable) -> List[str]:
+        """Ids (as strings) with no stored vector in this version"""
+        if self._positions is None:
+            self._load()
+        return [prediction_id for prediction_id in map(str, prediction_ids) if prediction_id not in self._positions]
+
+    def get(self, prediction_ids: Iterable) -> pd.DataFrame:
+        """Stored vectors for the given ids (unknown ids are skipped), indexed by id"""
+        if self._positions is None:
+            self._load()
+        found = [prediction_id for prediction_id in map(str, prediction_ids) if prediction_id in self._positions]
+        columns = self.columns
+        matrix = np.full((len(found), len(columns)), np.nan)  # Columns a row never had stay NaN
+        if found:
+            located = np.array([self._positions[prediction_id] for prediction_id in found], dtype=np.int64)
+            column_index = {column: i for i, column in enumerate(columns)}
+            for index, (segment_columns, segment_matrix) in enumerate(self._segments):
+                selected = np.flatnonzero(located[:, 0] == index)
+                if len(selected):
+                    targets = [column_index[column] for column in segment_columns]
+                    matrix[np.ix_(selected, targets)] = segment_matrix[located[selected, 1]]
+        return pd.DataFrame(matrix, index=pd.Index(found, name="prediction_id"), columns=columns)
+
+    # Writing
+
+    def put(self, features: pd.DataFrame):
+        """Add or replace vectors; features is indexed by prediction_id, non-numeric columns are dropped"""
+        if features.empty:
+            return
+        if self._positions is None:
+            self._load()
+        features = features.select_dtypes(include=[np.number, bool]).astype(np.float64)
+        features.index = features.index.map(str)
+        features = features[~features.index.duplicated(keep="last")]
+        columns = self.columns + [column for column in features.columns if column not in self._manifest["columns"]]
+
+        if len(self._segments) >= self.MAX_SEGMENTS:
+            old = self.get(list(self._positions)).drop(index=features.index, errors="ignore")
+            combined = pd.concat([old, features]).reindex(columns=columns)
+            self._write(combined, columns, replace=True)
+        else:
+            self._write(features, columns, replace=False)
+
+    def _write(self, features: pd.DataFrame, columns: List[str], replace: bool):
+        """Save features as a new segment; replace drops every existing segment (compaction)"""
+        os.makedirs(self.path, exist_ok=True)
+        generation = self._manifest.get("generation", 0) + 1
+        np.save(os.path.join(self.path, f"ids_{generation}.npy"), features.index.to_numpy(dtype=np.str_))
+        np.save(os.path.join(self.path, f"features_{generation}.npy"), np.asfortranarray(features.to_numpy(np.float64)))
+
+        stale = [] if not replace else [segment["generation"] for segment in self._manifest["segments"]]
+        segments = [] if replace else list(self._manifest["segments"])
+        segments.append({"generation": generation, "columns": list(features.columns)})
+        rows = len(features) if replace else len(set(self._positions).union(features.index))
+        manifest = {"columns": columns, "rows": rows, "generation": generation, "version": self.version,
+                    "segments": segments}
+        temp_path = os.path.join(self.path, "manifest.json.tmp")
+        with open(temp_path, "w") as f:
+            json.dump(manifest, f)
+        os.replace(temp_path, os.path.join(self.path, "manifest.json"))
+
+        self._segments = []  # Release the old mappings before removing their files
+        for previous in stale:
+            for name in (f"ids_{previous}.npy", f"features_{previous}.npy"):
+                stale_path = os.path.join(self.path, name)
+                if os.path.exists(stale_path):
+                    os.remove(stale_path)
+        self._load()
+
+    def build(self, df: pd.DataFrame, compute: Callable[[pd.DataFrame], pd.DataFrame],
+              id_column: str = "prediction_id") -> pd.DataFrame:
+        """
+        Feature matrix for df, engineering only rows missing from the store
+
+        compute receives the missing rows and returns one feature row per input row it could
+        handle, indexed like its input. The result is indexed like df (rows compute skipped are
+        absent) with columns in store order.
+        """
+        ids = df[id_column].astype(str)
+        new_rows = ids.isin(self.missing(ids))
+        if new_rows.any():
+            computed = compute(df[new_rows])
+            computed.index = ids.loc[computed.index].to_numpy()
+            self.put(computed)
+            logger.info(f"🧮 Feature store {self.name}: engineered {len(computed)} new rows, "
+                        f"{int((~new_rows).sum())} from cache")
+
+        features = self.get(ids)  # In df order, ids compute skipped left out
+        features.index = df.index[ids.isin(features.index)]
+        return features
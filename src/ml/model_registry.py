@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Model Registry for AlgoSlayer ML Models
+Versioned, content-hashed model artifacts with a validation gate and an atomic current pointer
+
+Training scripts used to drop timestamped files into trained_models/ and predictors picked
+whatever they found at startup. The registry gives every training run an immutable version;
+promotion only moves a small pointer file, so running predictors can pick up the new version
+between cycles and a rollback is just the pointer moving back.
+
+Layout per registry (registry/<name>/):
+    current.json                   promoted version plus the versions it replaced (for rollback)
+    versions/<version>/manifest.json   artifact files, sha256 hashes, metadata, metrics
+    versions/<version>/<artifact>      copied files (.h5, .json, ...) or joblib dumps of objects
+Versions are written to a staging directory and renamed into place, and the pointer is
+swapped with os.replace, so readers never see a half-written version.
+"""
+import hashlib
+import json
+import os
+import shutil
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import joblib
+from loguru import logger
+
+MODEL_REGISTRY_DIR = os.getenv("MODEL_REGISTRY_DIR", "trained_models/registry")
+MODEL_MIN_ACCURACY = float(os.getenv("MODEL_MIN_ACCURACY", "0.5"))
+MODEL_REGISTRY_KEEP = int(os.getenv("MODEL_REGISTRY_KEEP", "10"))
+
+def _sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def _atomic_json(path: Path, data: Dict):
+    temp_path = path.with_name(path.name + ".tmp")
+    with open(temp_path, "w") as f:
+        json.dump(data, f, indent=2, default=str)
+    os.replace(temp_path, path)
+
+class ModelRegistry:
+    """
+    Versions of one model family
+
+    Usage:
+        registry = ModelRegistry("streaming")
+        version = registry.register({"ensemble": state, "lstm": "model.h5"}, metrics={"accuracy": 0.61})
+        artifacts = registry.load()    # current version, numpy arrays memory-mapped
+        registry.rollback()
+    """
+
+    def __init__(self, name: str, root: str = MODEL_REGISTRY_DIR, min_metrics: Optional[Dict[str, float]] = None,
+                 keep: int = MODEL_REGISTRY_KEEP):
+        self.name = name
+        self.path = Path(root) / name
+        self.versions_path = self.path / "versions"
+        self.pointer_path = self.path / "current.json"
+        self.min_metrics = min_metrics if min_metrics is not None else {"accuracy": MODEL_MIN_ACCURACY}
+        self.keep = keep
+
+    # Writing
+
+    def register(self, artifacts: Dict[str, Any], metadata: Optional[Dict] = None,
+                 metrics: Optional[Dict[str, float]] = None, promote: bool = True) -> str:
+        """
+        Store a new immutable version and (by default) promote it if it passes validation
+
+        Artifacts that are paths to existing files are copied as-is; anything else is written
+        with joblib so its numpy arrays can be memory-mapped on load. Returns the version id.
+        """
+        self.versions_path.mkdir(parents=True, exist_ok=True)
+        staging = self.versions_path / f".staging_{os.getpid()}_{datetime.now():%H%M%S%f}"
+        staging.mkdir()
+
+        files = {}
+        for artifact, value in artifacts.items():
+            if isinstance(value, (str, Path)) and os.path.isfile(value):
+                filename = f"{artifact}{Path(value).suffix}"
+                shutil.copyfile(value, staging / filename)
+            else:
+                filename = f"{artifact}.joblib"
+                joblib.dump(value, staging / filename)
+            files[artifact] = {"file": filename, "sha256": _sha256(staging / filename),
+                               "bytes": (staging / filename).stat().st_size}
+
+        content_hash = hashlib.sha256("".join(files[a]["sha256"] for a in sorted(files)).encode()).hexdigest()
+        version = f"{datetime.now():%Y%m%d_%H%M%S}_{content_hash[:8]}"
+        manifest = {
+            "name": self.name,
+            "version": version,
+            "created_at": datetime.now().isoformat(),
+            "content_hash": content_hash,
+            "artifacts": files,
+            "metadata": metadata or {},
+            "metrics": metrics or {},
+        }
+        _atomic_json(staging / "manifest.json", manifest)
+        os.replace(staging, self.versions_path / version)
+        logger.info(f"📦 Registered {self.name} model {version} ({len(files)} artifacts)")
+
+        if promote:
+            self.promote(version)
+        self.prune()
+        return version
+
+    def _integrity_problems(self, version: str) -> List[str]:
+        try:
+            manifest = self.manifest(version)
+        except FileNotFoundError:
+            return [f"unknown version {version}"]
+        problems = []
+        for artifact, entry in manifest["artifacts"].items():
+            path = self.versions_path / version / entry["file"]
+            if not path.exists():
+                problems.append(f"{artifact}: missing file {entry['file']}")
+            elif _sha256(path) != entry["sha256"]:
+                problems.append(f"{artifact}: hash mismatch")
+        return problems
+
+    def validate(self, version: str) -> Tuple[bool, List[str]]:
+        """Validation gate: every artifact present with its recorded hash, metrics at or above min_metrics"""
+        problems = self._integrity_problems(version)
+        if problems:
+            return False, problems
+        metrics = self.manifest(version)["metrics"]
+        for metric, minimum in self.min_metrics.items():
+            value = metrics.get(metric)
+            if value is None or value < minimum:
+                problems.append(f"{metric}={value} below required {minimum}")
+        return not problems, problems
+
+    def promote(self, version: str, force: bool = False) -> bool:
+        """Point current at version if it passes validation (force skips the metric gate, never the hashes)"""
+        valid, problems = self.validate(version)
+        if not valid and (not force or self._integrity_problems(version)):
+            logger.warning(f"⚠️ {self.name} model {version} not promoted: {'; '.join(problems)}")
+            return False
+
+        pointer = self._pointer()
+        if pointer.get("version") == version:
+            return True
+        history = pointer.get("history", [])
+        if pointer.get("version"):
+            history = history + [pointer["version"]]
+        _atomic_json(self.pointer_path, {"version": version, "history": history[-self.keep:],
+                                         "promoted_at": datetime.now().isoformat()})
+        logger.success(f"✅ Promoted {self.name} model {version}")
+        return True
+
+    def rollback(self) -> Optional[str]:
+        """Point current back at the previously promoted version; returns it (None if there is none)"""
+        pointer = self._pointer()
+        history = [version for version in pointer.get("history", []) if (self.versions_path / version).exists()]
+        if not history:
+            logger.warning(f"⚠️ No earlier {self.name} model to roll back to")
+            return None
+        version = history[-1]
+        _atomic_json(self.pointer_path, {"version": version, "history": history[:-1],
+                                         "promoted_at": datetime.now().isoformat(),
+                                         "rolled_back_from": pointer.get("version")})
+        logger.warning(f"⏪ Rolled back {self.name} model {pointer.get('version')} → {version}")
+        return version
+
+    def prune(self):
+        """Drop the oldest versions beyond keep, never the current one or its rollback history"""
+        pointer = self._pointer()
+        protected = set(pointer.get("history", [])) | {pointer.get("version")}
+        versions = self.versions()
+        for version in versions[:max(0, len(versions) - self.keep)]:
+            if version not in protected:
+                shutil.rmtree(self.versions_path / version, ignore_errors=True)
+
+    # Reading
+
+    def _pointer(self) -> Dict:
+        if not self.pointer_path.exists():
+            return {}
+        with open(self.pointer_path) as f:
+            return json.load(f)
+
+    def current(self) -> Optional[str]:
+        """Currently promoted version (None before the first promotion)"""
+        return self._pointer().get("version")
+
+    def versions(self) -> List[str]:
+        """All stored versions, oldest first"""
+        if not self.versions_path.exists():
+            return []
+        return sorted(entry.name for entry in self.versions_path.iterdir()
+                      if entry.is_dir() and not entry.name.startswith("."))
+
+    def manifest(self, version: Optional[str] = None) -> Dict:
+        version = version or self.current()
+        if version is None:
+            raise FileNotFoundError(f"No {self.name} model promoted")
+        with open(self.versions_path / version / "manifest.json") as f:
+            return json.load(f)
+
+    def artifact_paths(self, version: Optional[str] = None) -> Dict[str, Path]:
+        """Artifact files of a version, for loaders that need a path (e.g. Keras .h5)"""
+        manifest = self.manifest(version)
+        return {artifact: self.versions_path / manifest["version"] / entry["file"]
+                for artifact, entry in manifest["artifacts"].items()}
+
+    def load(self, version: Optional[str] = None, mmap: bool = True,
+             loaders: Optional[Dict[str, Callable[[Path], Any]]] = None) -> Dict[str, Any]:
+        """
+        Load a version's artifacts (default: current) after checking their hashes
+
+        joblib artifacts open with mmap_mode='r' so large arrays are shared read-only pages,
+        .json files are parsed, other files go through loaders[suffix] or are returned as paths.
+        """
+        manifest = self.manifest(version)
+        version = manifest["version"]
+        paths = self.artifact_paths(version)
+        loaders = loaders or {}
+
+        loaded = {}
+        for artifact, path in paths.items():
+            if _sha256(path) != manifest["artifacts"][artifact]["sha256"]:
+                raise ValueError(f"{self.name} model {version}: {artifact} does not match its recorded hash")
+            if path.suffix == ".joblib":
+                loaded[artifact] = joblib.load(path, mmap_mode="r" if mmap else None)
+            elif path.suffix == ".json":
+                with open(path) as f:
+                    loaded[artifact] = json.load(f)
+            elif path.suffix in loaders:
+                loaded[artifact] = loaders[path.suffix](path)
+            else:
+                loaded[artifact] = path
+        return loaded
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Parallel Cross-Validation for Stacked Ensembles
+Schedules the (base model × fold × target) fit grid on a process pool
+
+Every fit in stacking cross-validation is independent: the parent scales each fold once,
+saves the scaled fold arrays as .npy files that workers open memory-mapped (read-only, no
+per-task copies through the pipe), and hands out small task tuples. Out-of-fold probabilities
+come back tagged with their (model, fold, target) and are written into the meta-feature
+matrix by position, so the result is identical whatever order tasks finish in, and identical
+to a serial run.
+"""
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from loguru import logger
+from sklearn.base import clone
+from sklearn.preprocessing import StandardScaler
+
+FULL_FIT = -1  # Fold index of the final fit on all data
+
+_worker_dir: Optional[str] = None
+_worker_models: Dict[str, object] = {}
+_worker_arrays: Dict[str, np.ndarray] = {}
+
+def _init_worker(array_dir: str, models: Dict[str, object]):
+    global _worker_dir, _worker_models, _worker_arrays
+    _worker_dir = array_dir
+    _worker_models = models
+    _worker_arrays = {}
+
+def _array(name: str) -> np.ndarray:
+    """Shared read-only array, mapped once per worker"""
+    if name not in _worker_arrays:
+        _worker_arrays[name] = np.load(os.path.join(_worker_dir, f"{name}.npy"), mmap_mode="r")
+    return _worker_arrays[name]
+
+def _fit_task(task: Tuple[str, int, int]):
+    """Fit one (model, fold, target) cell; fold FULL_FIT returns the fitted model instead of predictions"""
+    model_name, fold, target = task
+    model = clone(_worker_models[model_name])
+    Y = _array("Y")
+
+    if fold == FULL_FIT:
+        model.fit(_array("X_full"), Y[:, target])
+        return task, model
+
+    train_idx = _array(f"train_{fold}")
+    model.fit(_array(f"X_train_{fold}"), Y[train_idx, target])
+    return task, model.predict_proba(_array(f"X_val_{fold}"))[:, 1]  # Positive class probability
+
+def cross_val_meta_features(models: Dict[str, object], X, Y, splits: Sequence[Tuple[np.ndarray, np.ndarray]],
+                            workers: Optional[int] = None, final_target: int = 0,
+                            full_scaler: Optional[StandardScaler] = None) -> Tuple[np.ndarray, Dict[str, object]]:
+    """
+    Out-of-fold meta-features for every model and target, plus each model fit on all data
+
+    Columns are ordered model-major ([m0_t0, m0_t1, ..., m1_t0, ...]), matching the serial loop.
+    Final models are fit on final_target with full_scaler (fit here if given unfitted).
+    Returns (meta_features, fitted_models).
+    """
+    X = np.asarray(X, dtype=np.float64)
+    Y = np.asarray(Y).reshape(len(X), -1)
+    n_targets = Y.shape[1]
+    names = list(models)
+    workers = workers if workers is not None else (os.cpu_count() or 1)
+    full_scaler = full_scaler if full_scaler is not None else StandardScaler()
+
+    tasks: List[Tuple[str, int, int]] = [
+        (name, fold, target) for name in names for fold in range(len(splits)) for target in range(n_targets)
+    ] + [(name, FULL_FIT, final_target) for name in names]
+
+    meta_features = np.zeros((len(X), len(names) * n_targets))
+    fitted: Dict[str, object] = {}
+    start = time.perf_counter()
+
+    with tempfile.TemporaryDirectory(prefix="stack_cv_") as array_dir:
+        np.save(os.path.join(array_dir, "Y.npy"), Y)
+        np.save(os.path.join(array_dir, "X_full.npy"), full_scaler.fit_transform(X))
+        for fold, (train_idx, val_idx) in enumerate(splits):
+            scaler = StandardScaler()
+            np.save(os.path.join(array_dir, f"train_{fold}.npy"), np.asarray(train_idx))
+            np.save(os.path.join(array_dir, f"X_train_{fold}.npy"), scaler.fit_transform(X[train_idx]))
+            np.save(os.path.join(array_dir, f"X_val_{fold}.npy"), scaler.transform(X[val_idx]))
+
+        if workers <= 1:
+            _init_worker(array_dir, models)
+            results = [_fit_task(task) for task in tasks]
+            _init_worker(None, {})
+        else:
+            # One process per core: keep each fit single-threaded to avoid oversubscription
+            pool_models = {}
+            for name, model in models.items():
+                pool_models[name] = clone(model)
+                if "n_jobs" in model.get_params():
+                    pool_models[name].set_params(n_jobs=1)
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(array_dir, pool_models)) as executor:
+                results = list(executor.map(_fit_task, tasks))
+
+    for (name, fold, target), result in results:
+        if fold == FULL_FIT:
+            fitted[name] = result
+            if "n_jobs" in models[name].get_params():
+                result.set_params(n_jobs=models[name].get_params()["n_jobs"])  # Back to the caller's setting
+        else:
+            meta_features[splits[fold][1], names.index(name) * n_targets + target] = result
+
+    logger.info(f"⚡ Stacking CV: {len(tasks)} fits ({len(names)} models × {len(splits)} folds × {n_targets} targets "
+                f"+ final) in {time.perf_counter() - start:.1f}s on {workers} workers")
+    return meta_features, fitted
@@ -3,22 +3,165 @@ Base Signal Interface
 All AI signals inherit from this for consistent architecture
 """
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional
-from pydantic import BaseModel
+from enum import IntEnum
+from typing import Dict, Any, Iterable, Mapping, Optional, Tuple, Union
 from datetime import datetime
 import asyncio
 
-class SignalResult(BaseModel):
-    """Standard signal result format"""
-    signal_name: str
-    timestamp: datetime
-    confidence: float  # 0.0 to 1.0
-    direction: str  # "BUY", "SELL", "HOLD"
-    reasoning: str
-    data: Optional[Dict[str, Any]] = None
-    trade_type: Optional[str] = None  # "CALL", "PUT", "STOCK"
-    expiry_suggestion: Optional[str] = None
-    strike_suggestion: Optional[float] = None
+import numpy as np
+
+class SignalId(IntEnum):
+    """Fixed signal ids; the value is the signal's slot in a SignalVector"""
+    NEWS_SENTIMENT = 0
+    TECHNICAL_ANALYSIS = 1
+    OPTIONS_FLOW = 2
+    VOLATILITY_ANALYSIS = 3
+    MOMENTUM = 4
+    SECTOR_CORRELATION = 5
+    MEAN_REVERSION = 6
+    MARKET_REGIME = 7
+    TRUMP_GEOPOLITICAL = 8
+    DEFENSE_CONTRACT = 9
+    RTX_EARNINGS = 10
+    OPTIONS_IV_PERCENTILE = 11
+    
+    @property
+    def key(self) -> str:
+        """Name used in signal_weights / individual_signals"""
+        return self.name.lower()
+
+_SIGNAL_KEYS = {signal_id.key: signal_id for signal_id in SignalId}
+DIRECTION_CODES = {"BUY": 1, "SELL": -1, "HOLD": 0}
+
+class SignalResult:
+    """Standard signal result format (slotted; extra signal output is kept in data)"""
+    
+    __slots__ = (
+        "signal_name", "timestamp", "confidence", "direction", "reasoning", "strength", "error",
+        "data", "trade_type", "expiry_suggestion", "strike_suggestion"
+    )
+    
+    def __init__(self, signal_name: str, timestamp: Optional[datetime] = None, confidence: float = 0.5,
+                 direction: str = "HOLD", reasoning: str = "", strength: float = 0.1, error: Optional[str] = None,
+                 data: Optional[Dict[str, Any]] = None, trade_type: Optional[str] = None,  # "CALL", "PUT", "STOCK"
+                 expiry_suggestion: Optional[str] = None, strike_suggestion: Optional[float] = None):
+        self.signal_name = signal_name
+        self.timestamp = timestamp or datetime.now()
+        self.confidence = float(confidence)  # 0.0 to 1.0 (some signals report 0-100)
+        self.direction = direction  # "BUY", "SELL", "HOLD"
+        self.reasoning = reasoning
+        self.strength = float(strength)
+        self.error = error
+        self.data = data
+        self.trade_type = trade_type
+        self.expiry_suggestion = expiry_suggestion
+        self.strike_suggestion = strike_suggestion
+    
+    @classmethod
+    def from_output(cls, signal_name: str, output: Mapping[str, Any]) -> "SignalResult":
+        """Normalize a signal's free-form dict output (missing fields get the usual defaults)"""
+        extra = {key: value for key, value in output.items() if key not in _RESULT_FIELDS}
+        return cls(
+            signal_name=signal_name,
+            confidence=output.get("confidence", 0.5) if output.get("confidence") is not None else 0.5,
+            direction=output.get("direction") or "HOLD",
+            reasoning=output.get("reasoning", ""),
+            strength=output.get("strength", 0.1) if output.get("strength") is not None else 0.1,
+            error=output.get("error"),
+            data=extra or None,
+        )
+    
+    @property
+    def normalized_confidence(self) -> float:
+        return self.confidence / 100.0 if self.confidence > 1 else self.confidence
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Flat dict in the shape consumers of individual_signals expect"""
+        result = dict(self.data) if self.data else {}
+        result.update(direction=self.direction, confidence=self.confidence, strength=self.strength)
+        if self.reasoning:
+            result["reasoning"] = self.reasoning
+        if self.error is not None:
+            result["error"] = self.error
+        return result
+    
+    def __repr__(self) -> str:
+        return f"SignalResult({self.signal_name}: {self.direction} {self.confidence:.2f}/{self.strength:.2f})"
+
+_RESULT_FIELDS = {"direction", "confidence", "strength", "reasoning", "error"}
+
+class SignalVector:
+    """One cycle of signals as parallel arrays (direction code, confidence 0-1, strength, valid)
+    
+    Known signals sit at their SignalId slot; any other names follow in arrival order.
+    Weighting and aggregation are dot products against weight_vector().
+    """
+    
+    __slots__ = ("names", "direction", "confidence", "strength", "valid")
+    
+    def __init__(self, names: Tuple[str, ...]):
+        self.names = names
+        size = len(names)
+        self.direction = np.zeros(size)
+        self.confidence = np.zeros(size)
+        self.strength = np.zeros(size)
+        self.valid = np.zeros(size, dtype=bool)
+    
+    @classmethod
+    def from_results(cls, results: Mapping[str, Union[SignalResult, Mapping[str, Any]]]) -> "SignalVector":
+        extra = tuple(name for name in results if name not in _SIGNAL_KEYS)
+        vector = cls(tuple(signal_id.key for signal_id in SignalId) + extra)
+        for name, result in results.items():
+            if not isinstance(result, SignalResult):
+                result = SignalResult.from_output(name, result or {})
+            i = vector.index(name)
+            vector.direction[i] = DIRECTION_CODES.get(result.direction, 0)
+            vector.confidence[i] = result.normalized_confidence
+            vector.strength[i] = result.strength
+            vector.valid[i] = result.error is None
+        return vector
+    
+    @classmethod
+    def from_signals_data(cls, signals_data: Mapping[str, Any]) -> "SignalVector":
+        vector = signals_data.get("signal_vector")
+        if isinstance(vector, cls):
+            return vector
+        return cls.from_results(signals_data.get("individual_signals") or {})
+    
+    def index(self, name: str) -> int:
+        signal_id = _SIGNAL_KEYS.get(name)
+        return int(signal_id) if signal_id is not None else self.names.index(name)
+    
+    def weight_vector(self, weights: Mapping[str, float], default: float = 0.0, loose: bool = False) -> np.ndarray:
+        """Weights aligned with this vector
+        
+        loose=True falls back to the first weight key contained in (or containing) the signal
+        name, the matching strategy weights have always used ('momentum' ~ 'momentum_signal').
+        """
+        vector = np.full(len(self.names), default, dtype=float)
+        for i, name in enumerate(self.names):
+            if name in weights:
+                vector[i] = weights[name]
+            elif loose:
+                for key, weight in weights.items():
+                    key = key.lower()
+                    if key in name or name in key:
+                        vector[i] = weight
+                        break
+        return vector
+    
+    def mask(self, direction: Optional[str] = None) -> np.ndarray:
+        """Valid signals, optionally only those pointing in one direction"""
+        if direction is None:
+            return self.valid
+        return self.valid & (self.direction == DIRECTION_CODES[direction])
+    
+    def present(self, results: Iterable[str]) -> np.ndarray:
+        """Boolean mask of the slots that belong to the given signal names"""
+        present = np.zeros(len(self.names), dtype=bool)
+        for name in results:
+            present[self.index(name)] = True
+        return present
 
 class BaseSignal(ABC):
     """Base class for all AI trading signals"""
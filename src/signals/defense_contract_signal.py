@@ -2,7 +2,7 @@
 Defense Contract News Signal - RTX-Specific Catalyst Detection
 Analyzes defense contract awards, geopolitical events, and DoD spending news
 """
-import yfinance as yf
+from src.core.market_data_provider import market_data
 import re
 import requests
 from datetime import datetime, timedelta
@@ -26,6 +26,9 @@ class DefenseContractSignal(BaseSignal):
     - Geopolitical tensions: BUY (defense spending driver)
     - Budget cuts/delays: SELL (sector headwind)
     """
+
+    REFRESH_SECONDS = 3600  # Contract awards are announced a few times a day
+    DATA_DEPENDENCIES = ("RTX:news", "sector:news")
     
     def __init__(self):
         super().__init__("defense_contract")
@@ -101,7 +104,7 @@ class DefenseContractSignal(BaseSignal):
     def _get_rtx_news(self) -> List[Dict]:
         """Get RTX-specific news from financial sources"""
         try:
-            rtx = yf.Ticker("RTX")
+            rtx = market_data.ticker("RTX")
             news = rtx.news
             
             # Filter for recent news (last 7 days)
@@ -142,7 +145,7 @@ class DefenseContractSignal(BaseSignal):
             
             for ticker in defense_tickers:
                 try:
-                    stock = yf.Ticker(ticker)
+                    stock = market_data.ticker(ticker)
                     news = stock.news
                     
                     # Get recent news
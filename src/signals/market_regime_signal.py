@@ -2,7 +2,7 @@
 Market Regime Analysis Signal
 Detect market regimes and adapt trading strategy accordingly
 """
-import yfinance as yf
+from src.core.market_data_provider import market_data
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
@@ -13,6 +13,9 @@ from config.trading_config import config
 
 class MarketRegimeSignal:
     """Analyze market regime and adapt trading strategy"""
+
+    REFRESH_SECONDS = 3600  # Broad-market regime
+    DATA_DEPENDENCIES = ("market:history", "RTX:history")
     
     def __init__(self):
         self.signal_name = "market_regime"
@@ -55,7 +58,7 @@ class MarketRegimeSignal:
         
         for ticker in self.market_indices:
             try:
-                yf_ticker = yf.Ticker(ticker)
+                yf_ticker = market_data.ticker(ticker)
                 data = yf_ticker.history(period=period)
                 
                 if not data.empty:
@@ -238,7 +241,7 @@ class MarketRegimeSignal:
         
         try:
             # Get RTX data
-            ticker = yf.Ticker(symbol)
+            ticker = market_data.ticker(symbol)
             rtx_data = ticker.history(period="60d")
             
             if rtx_data.empty:
@@ -2,7 +2,7 @@
 Mean Reversion Analysis Signal
 Identify mean reversion opportunities in RTX price action
 """
-import yfinance as yf
+from src.core.market_data_provider import market_data
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
@@ -13,6 +13,9 @@ from config.trading_config import config
 
 class MeanReversionSignal:
     """Analyze mean reversion patterns for RTX"""
+
+    REFRESH_SECONDS = 1800  # Daily-bar bands and z-scores
+    DATA_DEPENDENCIES = ("RTX:history",)
     
     def __init__(self):
         self.signal_name = "mean_reversion"
@@ -48,7 +51,7 @@ class MeanReversionSignal:
     async def _get_price_data(self, symbol: str, period: str = "60d") -> pd.DataFrame:
         """Get price data for mean reversion analysis"""
         try:
-            ticker = yf.Ticker(symbol)
+            ticker = market_data.ticker(symbol)
             data = ticker.history(period=period)
             
             logger.info(f"📊 Loaded {len(data)} days for mean reversion analysis")
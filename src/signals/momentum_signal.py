@@ -2,7 +2,7 @@
 Momentum Analysis Signal
 Multi-timeframe momentum detection for RTX
 """
-import yfinance as yf
+from src.core.market_data_provider import market_data
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
@@ -13,6 +13,9 @@ from config.trading_config import config
 
 class MomentumSignal:
     """Analyze momentum across multiple timeframes"""
+
+    REFRESH_SECONDS = 0  # Every cycle
+    DATA_DEPENDENCIES = ("RTX:history",)
     
     def __init__(self):
         self.signal_name = "momentum"
@@ -48,7 +51,7 @@ class MomentumSignal:
     async def _get_price_data(self, symbol: str, period: str = "60d") -> pd.DataFrame:
         """Get price data for momentum analysis"""
         try:
-            ticker = yf.Ticker(symbol)
+            ticker = market_data.ticker(symbol)
             data = ticker.history(period=period, interval="1d")
             
             logger.info(f"📊 Loaded {len(data)} days for momentum analysis")
@@ -7,13 +7,16 @@ import asyncio
 import aiohttp
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
-import yfinance as yf
+from src.core.market_data_provider import market_data
 from loguru import logger
 
 from config.trading_config import config
 
 class NewsSentimentSignal:
     """Analyze news sentiment for RTX and defense sector"""
+
+    REFRESH_SECONDS = 1800  # News flow; also bounds OpenAI calls
+    DATA_DEPENDENCIES = ("RTX:news", "openai")
     
     def __init__(self):
         self.signal_name = "news_sentiment"
@@ -48,7 +51,7 @@ class NewsSentimentSignal:
         """Get recent RTX-related news"""
         try:
             # Use yfinance for news (free and reliable)
-            ticker = yf.Ticker(symbol)
+            ticker = market_data.ticker(symbol)
             news = ticker.news
             
             # Filter recent news (last 24 hours)
@@ -2,16 +2,22 @@
 Options Flow Analysis Signal
 Track unusual options activity and smart money moves
 """
-import yfinance as yf
 import pandas as pd
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
 from loguru import logger
 
 from config.trading_config import config
+from src.core.component_registry import components
+
+# Quotes come from the engine's shared, validated chain refresh (via its IV surface)
+options_data_engine = components.lazy("options_data_engine")
 
 class OptionsFlowSignal:
     """Analyze options flow for RTX smart money signals"""
+
+    REFRESH_SECONDS = 0  # Live option volume/OI - every cycle
+    DATA_DEPENDENCIES = ("RTX:options",)
     
     def __init__(self):
         self.signal_name = "options_flow"
@@ -44,26 +50,19 @@ class OptionsFlowSignal:
     async def _get_options_data(self, symbol: str) -> Optional[Dict]:
         """Get options chain data"""
         try:
-            ticker = yf.Ticker(symbol)
-            
-            # Get current price for context
-            info = ticker.info
-            current_price = info.get('currentPrice', info.get('regularMarketPrice', 0))
-            
-            # Get options expiration dates
-            expirations = ticker.options
+            surface = options_data_engine.get_iv_surface()
             
-            if not expirations:
+            if surface is None:
                 logger.warning(f"📊 No options data for {symbol}")
                 return None
             
             # Use nearest expiration (usually most liquid)
-            nearest_exp = expirations[0]
+            current_price = surface.spot
+            nearest_exp = surface.expiries[0]
             
-            # Get options chain
-            chain = ticker.option_chain(nearest_exp)
-            calls = chain.calls
-            puts = chain.puts
+            contracts = surface.contracts(nearest_exp)
+            calls = contracts[contracts['type'] == 'call'].reset_index(drop=True)
+            puts = contracts[contracts['type'] == 'put'].reset_index(drop=True)
             
             logger.info(f"📊 Options data: {len(calls)} calls, {len(puts)} puts for {nearest_exp}")
             
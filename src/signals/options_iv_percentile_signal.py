@@ -2,13 +2,20 @@
 Options IV Percentile Signal - Historical Volatility Context
 Determines if RTX options are cheap or expensive based on historical IV patterns
 """
-import yfinance as yf
+from src.core.component_registry import components
+from src.core.iv_surface import IVSurface
+from src.core.market_data_provider import market_data
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
 from .base_signal import BaseSignal
 
+# Current IV comes from the engine's shared IV surface (no chain pull of our own),
+# its history from the persistent IV store fed by the same refreshes
+options_data_engine = components.lazy("options_data_engine")
+iv_history = components.lazy("iv_history")
+
 class OptionsIVPercentileSignal(BaseSignal):
     """
     Options IV Percentile Signal for Entry Timing
@@ -22,6 +29,9 @@ class OptionsIVPercentileSignal(BaseSignal):
     
     This signal helps time options entries when premium is attractive.
     """
+
+    REFRESH_SECONDS = 0  # Live IV - every cycle
+    DATA_DEPENDENCIES = ("RTX:options", "RTX:history")
     
     def __init__(self):
         super().__init__("options_iv_percentile")
@@ -32,17 +42,26 @@ class OptionsIVPercentileSignal(BaseSignal):
         """Analyze RTX options IV percentile for entry timing"""
         try:
             # Get current RTX options data
-            current_iv = self._get_current_iv()
+            surface = options_data_engine.get_iv_surface()
+            current_iv = self._get_current_iv(surface)
             if current_iv is None:
                 return self._create_hold_signal("Could not obtain current IV")
             
-            # Get historical volatility data
-            historical_vols = self._get_historical_volatility()
-            if len(historical_vols) < 50:
-                return self._create_hold_signal("Insufficient historical data")
-            
-            # Calculate IV percentile
-            iv_percentile = self._calculate_iv_percentile(current_iv, historical_vols)
+            # Rank against recorded IV; until enough days exist, against a realized-volatility proxy
+            history = iv_history.stats(current_iv)
+            if history["iv_percentile_252d"] is not None:
+                iv_percentile = history["iv_percentile_252d"]
+                historical_avg_iv = iv_history.mean(self.lookback_days)
+                lookback_days = history["iv_history_days"]
+                history_source = "iv_history"
+            else:
+                historical_vols = self._get_historical_volatility()
+                if len(historical_vols) < 50:
+                    return self._create_hold_signal("Insufficient historical data")
+                iv_percentile = self._calculate_iv_percentile(current_iv, historical_vols)
+                historical_avg_iv = np.mean(historical_vols)
+                lookback_days = len(historical_vols)
+                history_source = "realized_vol_proxy"
             
             # Generate signal based on IV percentile
             direction, confidence, reasoning = self._generate_iv_signal(iv_percentile, current_iv)
@@ -56,73 +75,30 @@ class OptionsIVPercentileSignal(BaseSignal):
                 'metadata': {
                     'current_iv': round(current_iv, 3),
                     'iv_percentile': round(iv_percentile, 1),
-                    'historical_avg_iv': round(np.mean(historical_vols), 3),
+                    'historical_avg_iv': round(historical_avg_iv, 3),
                     'iv_classification': self._classify_iv_level(iv_percentile),
-                    'lookback_days': len(historical_vols)
+                    'lookback_days': lookback_days,
+                    'history_source': history_source,
+                    **history,
+                    **(surface.summary() if surface else {})
                 }
             }
             
         except Exception as e:
             return self._create_error_signal(f"IV percentile analysis failed: {str(e)}")
     
-    def _get_current_iv(self) -> Optional[float]:
-        """Get current implied volatility from RTX options"""
-        try:
-            rtx = yf.Ticker("RTX")
-            
-            # Get ATM options (closest to current stock price)
-            current_price = self._get_current_price()
-            if not current_price:
-                return None
-            
-            # Get options chain for nearest expiration
-            expirations = rtx.options
-            if not expirations:
-                return None
-            
-            # Get nearest expiration (but not too close - avoid weird behavior)
-            valid_expirations = []
-            for exp in expirations:
-                exp_date = pd.to_datetime(exp)
-                days_to_exp = (exp_date - pd.Timestamp.now()).days
-                if 7 <= days_to_exp <= 45:  # 1-6 weeks out
-                    valid_expirations.append(exp)
-            
-            if not valid_expirations:
-                return None
-            
-            nearest_exp = valid_expirations[0]
-            options_chain = rtx.option_chain(nearest_exp)
-            
-            # Get ATM call IV
-            calls = options_chain.calls
-            if calls.empty:
-                return None
-            
-            # Find closest to ATM
-            calls['strike_diff'] = abs(calls['strike'] - current_price)
-            atm_call = calls.loc[calls['strike_diff'].idxmin()]
-            
-            iv = atm_call.get('impliedVolatility', None)
-            return float(iv) if iv and not pd.isna(iv) else None
-            
-        except Exception:
+    def _get_current_iv(self, surface: Optional[IVSurface]) -> Optional[float]:
+        """Current 30-day constant-maturity ATM IV from the shared IV surface (the series iv_history keeps)"""
+        if surface is None:
             # Fallback: estimate IV from historical volatility
             return self._estimate_iv_from_historical()
-    
-    def _get_current_price(self) -> Optional[float]:
-        """Get current RTX stock price"""
-        try:
-            rtx = yf.Ticker("RTX")
-            info = rtx.info
-            return info.get('currentPrice') or info.get('regularMarketPrice')
-        except:
-            return None
+        
+        return surface.atm_at(30)
     
     def _estimate_iv_from_historical(self) -> Optional[float]:
         """Estimate IV from recent historical volatility"""
         try:
-            rtx = yf.Ticker("RTX")
+            rtx = market_data.ticker("RTX")
             # Get last 30 days of price data
             hist = rtx.history(period="1mo")
             if len(hist) < 10:
@@ -142,7 +118,7 @@ class OptionsIVPercentileSignal(BaseSignal):
     def _get_historical_volatility(self) -> List[float]:
         """Get historical realized volatility for IV percentile calculation"""
         try:
-            rtx = yf.Ticker("RTX")
+            rtx = market_data.ticker("RTX")
             
             # Get historical data
             end_date = datetime.now()
@@ -2,7 +2,7 @@
 RTX Earnings Calendar Signal - Options IV Expansion/Contraction Timing
 Predicts optimal options entry/exit based on earnings proximity and historical patterns
 """
-import yfinance as yf
+from src.core.market_data_provider import market_data
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
@@ -21,6 +21,9 @@ class RTXEarningsSignal(BaseSignal):
     
     This signal is specifically designed for options trading timing.
     """
+
+    REFRESH_SECONDS = 86400  # Earnings calendar changes at most daily
+    DATA_DEPENDENCIES = ("RTX:calendar",)
     
     def __init__(self):
         super().__init__("rtx_earnings")
@@ -30,7 +33,7 @@ class RTXEarningsSignal(BaseSignal):
         """Analyze RTX earnings calendar for options timing"""
         try:
             # Get RTX earnings calendar
-            rtx = yf.Ticker("RTX")
+            rtx = market_data.ticker("RTX")
             
             # Get next earnings date
             next_earnings = self._get_next_earnings_date(rtx)
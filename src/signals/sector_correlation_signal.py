@@ -2,7 +2,7 @@
 Sector Correlation Analysis Signal
 Analyze RTX performance vs defense sector and broader market
 """
-import yfinance as yf
+from src.core.market_data_provider import market_data
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
@@ -13,6 +13,9 @@ from config.trading_config import config
 
 class SectorCorrelationSignal:
     """Analyze RTX correlation with defense sector and market"""
+
+    REFRESH_SECONDS = 3600  # 60-day correlations move slowly
+    DATA_DEPENDENCIES = ("RTX:history", "sector:history")
     
     def __init__(self):
         self.signal_name = "sector_correlation"
@@ -59,7 +62,7 @@ class SectorCorrelationSignal:
         
         for ticker in all_tickers:
             try:
-                yf_ticker = yf.Ticker(ticker)
+                yf_ticker = market_data.ticker(ticker)
                 data = yf_ticker.history(period=period)
                 
                 if not data.empty:
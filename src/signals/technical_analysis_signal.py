@@ -2,7 +2,7 @@
 Technical Analysis Signal
 Comprehensive technical indicators for RTX trading
 """
-import yfinance as yf
+from src.core.market_data_provider import market_data
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
@@ -13,6 +13,9 @@ from config.trading_config import config
 
 class TechnicalAnalysisSignal:
     """Advanced technical analysis for RTX"""
+
+    REFRESH_SECONDS = 0  # Intraday price action - every cycle
+    DATA_DEPENDENCIES = ("RTX:history",)
     
     def __init__(self):
         self.signal_name = "technical_analysis"
@@ -45,7 +48,7 @@ class TechnicalAnalysisSignal:
     async def _get_price_data(self, symbol: str, period: str = "60d") -> pd.DataFrame:
         """Get historical price data"""
         try:
-            ticker = yf.Ticker(symbol)
+            ticker = market_data.ticker(symbol)
             data = ticker.history(period=period)
             
             logger.info(f"📊 Loaded {len(data)} days of {symbol} price data")
@@ -2,7 +2,7 @@
 Trump Geopolitical Signal - Defense Stock Impact from Political Statements
 Analyzes Trump statements and geopolitical rhetoric affecting defense spending
 """
-import yfinance as yf
+from src.core.market_data_provider import market_data
 import re
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
@@ -28,6 +28,9 @@ class TrumpGeopoliticalSignal(BaseSignal):
     - Isolationist/budget cutting: SELL (sector headwind)
     - Geopolitical tension escalation: BUY (defense demand)
     """
+
+    REFRESH_SECONDS = 1800  # Political headlines
+    DATA_DEPENDENCIES = ("sector:news",)
     
     def __init__(self):
         super().__init__("trump_geopolitical")
@@ -122,7 +125,7 @@ class TrumpGeopoliticalSignal(BaseSignal):
             
             for ticker in defense_sources:
                 try:
-                    stock = yf.Ticker(ticker)
+                    stock = market_data.ticker(ticker)
                     news = stock.news
                     
                     # Filter for Trump-related defense news
@@ -2,7 +2,7 @@
 Volatility Analysis Signal
 Advanced volatility pattern recognition for RTX trading
 """
-import yfinance as yf
+from src.core.market_data_provider import market_data
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
@@ -13,6 +13,9 @@ from config.trading_config import config
 
 class VolatilityAnalysisSignal:
     """Analyze volatility patterns for trading opportunities"""
+
+    REFRESH_SECONDS = 1800  # Daily-bar volatility regime
+    DATA_DEPENDENCIES = ("RTX:history",)
     
     def __init__(self):
         self.signal_name = "volatility_analysis"
@@ -48,7 +51,7 @@ class VolatilityAnalysisSignal:
     async def _get_price_data(self, symbol: str, period: str = "90d") -> pd.DataFrame:
         """Get historical price data for volatility analysis"""
         try:
-            ticker = yf.Ticker(symbol)
+            ticker = market_data.ticker(symbol)
             data = ticker.history(period=period)
             
             logger.info(f"📊 Loaded {len(data)} days of {symbol} data for volatility analysis")
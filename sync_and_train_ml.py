@@ -10,7 +10,6 @@ import json
 import pickle
 import sqlite3
 import subprocess
-import shutil
 import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
@@ -27,9 +26,14 @@ from sklearn.linear_model import LogisticRegression
 from sklearn.neural_network import MLPClassifier
 import xgboost as xgb
 
+from src.core.delta_sync import pull_over_ssh, sync
+from src.ml.feature_store import FeatureStore, feature_version
+from src.ml.model_registry import ModelRegistry
+
 # Configuration
 CLOUD_SERVER = "root@64.226.96.90"
 CLOUD_DB_PATH = "/opt/rtx-trading/data/signal_performance.db"
+CLOUD_APP_DIR = "/opt/rtx-trading"
 LOCAL_DATA_DIR = "ml_training_data"
 MODEL_OUTPUT_DIR = "trained_models"
 CLOUD_MODEL_PATH = "/opt/rtx-trading/data/models"
@@ -67,9 +71,9 @@ class MLTrainingPipeline:
                 if count > 100:  # If we have substantial historical data
                     logger.success(f"✅ Using {count} historical predictions from bootstrap")
                     
-                    # Copy to ML training directory
+                    # Bring the ML training copy up to date (only rows it hasn't seen)
                     training_db_path = os.path.join(LOCAL_DATA_DIR, "signal_performance.db")
-                    shutil.copy2(local_bootstrap_path, training_db_path)
+                    sync(local_bootstrap_path, training_db_path)
                     return training_db_path
             except Exception as e:
                 logger.warning(f"⚠️ Could not check local bootstrap data: {e}")
@@ -77,13 +81,12 @@ class MLTrainingPipeline:
         # Fallback to cloud data
         logger.info("📥 Fetching data from cloud server...")
         
-        # Download SQLite database
+        # Pull rows past the local watermarks instead of the whole database
         local_db_path = os.path.join(LOCAL_DATA_DIR, "signal_performance.db")
-        cmd = f"scp -o StrictHostKeyChecking=no {CLOUD_SERVER}:{CLOUD_DB_PATH} {local_db_path}"
         
         try:
-            subprocess.run(cmd, shell=True, check=True)
-            logger.success(f"✅ Downloaded database to {local_db_path}")
+            pull_over_ssh(CLOUD_SERVER, CLOUD_DB_PATH, local_db_path, CLOUD_APP_DIR)
+            logger.success(f"✅ Synced cloud data into {local_db_path}")
             return local_db_path
         except subprocess.CalledProcessError as e:
             logger.error(f"❌ Failed to fetch data: {e}")
@@ -127,62 +130,55 @@ class MLTrainingPipeline:
         return df
     
     def engineer_features(self, df):
-        """Create features for ML training"""
+        """Create features for ML training (only predictions not already in the feature store)"""
         logger.info("🔧 Engineering features...")
         
-        features = []
-        labels = []
+        store = FeatureStore("signal_predictions", feature_version(MLTrainingPipeline._prediction_features))
+        X = store.build(df, lambda rows: pd.DataFrame.from_dict(
+            {index: self._prediction_features(row) for index, row in zip(rows.index, rows.to_dict('records'))},
+            orient='index'
+        )).fillna(0)
         
-        for _, row in df.iterrows():
-            # Parse signal data
-            signal_data = json.loads(row['signal_data']) if row['signal_data'] else {}
-            
-            # Extract features from each signal
-            feature_dict = {
-                'confidence': row['confidence'],
-                'expected_move': row.get('expected_move', 0.0) if pd.notna(row.get('expected_move')) else 0.0,
-                'hour': pd.to_datetime(row['timestamp']).hour,
-                'day_of_week': pd.to_datetime(row['timestamp']).dayofweek,
-            }
-            
-            # Signal-specific features
-            for signal_name, signal_info in signal_data.items():
-                if isinstance(signal_info, dict):
-                    feature_dict[f'{signal_name}_confidence'] = signal_info.get('confidence', 0)
-                    feature_dict[f'{signal_name}_strength'] = signal_info.get('strength', 0)
-                    # Binary feature for direction
-                    feature_dict[f'{signal_name}_buy'] = 1 if signal_info.get('direction') == 'BUY' else 0
-                    feature_dict[f'{signal_name}_sell'] = 1 if signal_info.get('direction') == 'SELL' else 0
-            
-            features.append(feature_dict)
-            
-            # Create labels for different objectives
+        # Create labels for different objectives (outcomes can still change, so never cached)
+        y = pd.DataFrame({
             # 1. Direction accuracy (primary)
-            direction_correct = 1 if row['direction'] == row.get('actual_direction', 'HOLD') else 0
+            'direction_correct': (df['direction'] == df['actual_direction'].fillna('HOLD')).astype(int),
             # 2. Profitable move (3%+ for options)
-            actual_move = row.get('actual_move_24h', 0)
-            if pd.isna(actual_move) or actual_move is None:
-                actual_move = 0
-            profitable_move = 1 if actual_move >= 0.03 else 0
+            'profitable_move': (df['actual_move_24h'].fillna(0) >= 0.03).astype(int),
             # 3. High profit potential
-            profit_potential = row.get('options_profit_potential', 0)
-            if pd.isna(profit_potential) or profit_potential is None:
-                profit_potential = 0
-            high_profit = 1 if profit_potential >= 1.0 else 0  # 100%+ profit
-            
-            labels.append({
-                'direction_correct': direction_correct,
-                'profitable_move': profitable_move,
-                'high_profit': high_profit
-            })
-        
-        # Convert to DataFrame
-        X = pd.DataFrame(features).fillna(0)
-        y = pd.DataFrame(labels)
+            'high_profit': (df['options_profit_potential'].fillna(0) >= 1.0).astype(int),  # 100%+ profit
+        }).loc[X.index]
         
+        X, y = X.reset_index(drop=True), y.reset_index(drop=True)
         logger.success(f"✅ Created {len(X.columns)} features")
         return X, y
     
+    @staticmethod
+    def _prediction_features(row):
+        """Feature vector for one prediction"""
+        # Parse signal data
+        signal_data = json.loads(row['signal_data']) if row['signal_data'] else {}
+        timestamp = pd.to_datetime(row['timestamp'])
+        
+        # Extract features from each signal
+        feature_dict = {
+            'confidence': row['confidence'],
+            'expected_move': row.get('expected_move', 0.0) if pd.notna(row.get('expected_move')) else 0.0,
+            'hour': timestamp.hour,
+            'day_of_week': timestamp.dayofweek,
+        }
+        
+        # Signal-specific features
+        for signal_name, signal_info in signal_data.items():
+            if isinstance(signal_info, dict):
+                feature_dict[f'{signal_name}_confidence'] = signal_info.get('confidence', 0)
+                feature_dict[f'{signal_name}_strength'] = signal_info.get('strength', 0)
+                # Binary feature for direction
+                feature_dict[f'{signal_name}_buy'] = 1 if signal_info.get('direction') == 'BUY' else 0
+                feature_dict[f'{signal_name}_sell'] = 1 if signal_info.get('direction') == 'SELL' else 0
+        
+        return feature_dict
+    
     def train_models(self, X, y):
         """Train multiple ML models"""
         logger.info("🤖 Training ML models...")
@@ -348,6 +344,13 @@ class MLTrainingPipeline:
             with open(weights_path, 'w') as f:
                 json.dump(weights, f, indent=2)
         
+        artifacts = {'model': model_path, 'signal_weights': weights_path} if weights else {'model': model_path}
+        ModelRegistry("rtx_model").register(
+            artifacts,
+            metadata={'source': 'sync_and_train_ml', 'timestamp': timestamp, 'features': model_data['features']},
+            metrics={'accuracy': self.best_model['score']}
+        )
+        
         logger.success(f"✅ Models saved to {MODEL_OUTPUT_DIR}")
         return model_path, weights_path if weights else None
     
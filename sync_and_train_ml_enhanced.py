@@ -12,7 +12,6 @@ import json
 import pickle
 import sqlite3
 import subprocess
-import shutil
 import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
@@ -23,6 +22,9 @@ warnings.filterwarnings('ignore')
 # Add src to path for importing our modules
 sys.path.append('src')
 from ml.advanced_features import AdvancedFeatureEngineer
+from src.core.delta_sync import pull_over_ssh, sync
+from src.ml.feature_store import FeatureStore, feature_version
+from src.ml.model_registry import ModelRegistry
 
 # ML Libraries
 from sklearn.model_selection import train_test_split, TimeSeriesSplit
@@ -36,6 +38,7 @@ import xgboost as xgb
 # Configuration
 CLOUD_SERVER = "root@64.226.96.90"
 CLOUD_DB_PATH = "/opt/rtx-trading/data/signal_performance.db"
+CLOUD_APP_DIR = "/opt/rtx-trading"
 LOCAL_DATA_DIR = "ml_training_data"
 MODEL_OUTPUT_DIR = "trained_models"
 CLOUD_MODEL_PATH = "/opt/rtx-trading/data/models"
@@ -74,7 +77,7 @@ class EnhancedMLTrainingPipeline:
                 if count > 100:
                     logger.success(f"✅ Using {count} historical predictions from bootstrap")
                     training_db_path = os.path.join(LOCAL_DATA_DIR, "signal_performance.db")
-                    shutil.copy2(local_bootstrap_path, training_db_path)
+                    sync(local_bootstrap_path, training_db_path)
                     return training_db_path
             except Exception as e:
                 logger.warning(f"⚠️ Could not check local bootstrap data: {e}")
@@ -82,11 +85,10 @@ class EnhancedMLTrainingPipeline:
         # Fallback to cloud data
         logger.info("📥 Fetching data from cloud server...")
         local_db_path = os.path.join(LOCAL_DATA_DIR, "signal_performance.db")
-        cmd = f"scp -o StrictHostKeyChecking=no {CLOUD_SERVER}:{CLOUD_DB_PATH} {local_db_path}"
         
         try:
-            subprocess.run(cmd, shell=True, check=True)
-            logger.success(f"✅ Downloaded database to {local_db_path}")
+            pull_over_ssh(CLOUD_SERVER, CLOUD_DB_PATH, local_db_path, CLOUD_APP_DIR)
+            logger.success(f"✅ Synced cloud data into {local_db_path}")
             return local_db_path
         except subprocess.CalledProcessError as e:
             logger.error(f"❌ Failed to fetch data: {e}")
@@ -134,34 +136,20 @@ class EnhancedMLTrainingPipeline:
         """Use our advanced feature engineering"""
         logger.info("🔧 Engineering advanced features...")
         
-        # Use our advanced feature engineer
-        X = self.feature_engineer.engineer_features(df)
+        # Use our advanced feature engineer, only for predictions not already in the feature store
+        store = FeatureStore("advanced_enhanced", feature_version(AdvancedFeatureEngineer))
+        X = store.build(df, lambda rows: self.feature_engineer.engineer_features(df, rows=rows.index)).fillna(0)
         
-        # Create labels for different objectives
-        labels = []
-        for _, row in df.iterrows():
+        # Create labels for different objectives (outcomes can still change, so never cached)
+        y = pd.DataFrame({
             # Direction accuracy (primary)
-            direction_correct = 1 if row['direction'] == row.get('actual_direction', 'HOLD') else 0
-            
+            'direction_correct': (df['direction'] == df['actual_direction'].fillna('HOLD')).astype(int),
             # Profitable move (3%+ for options)
-            actual_move = row.get('actual_move_24h', 0)
-            if pd.isna(actual_move) or actual_move is None:
-                actual_move = 0
-            profitable_move = 1 if actual_move >= 0.03 else 0
-            
+            'profitable_move': (df['actual_move_24h'].fillna(0) >= 0.03).astype(int),
             # High profit potential
-            profit_potential = row.get('options_profit_potential', 0)
-            if pd.isna(profit_potential) or profit_potential is None:
-                profit_potential = 0
-            high_profit = 1 if profit_potential >= 1.0 else 0
-            
-            labels.append({
-                'direction_correct': direction_correct,
-                'profitable_move': profitable_move,
-                'high_profit': high_profit
-            })
-        
-        y = pd.DataFrame(labels)
+            'high_profit': (df['options_profit_potential'].fillna(0) >= 1.0).astype(int),
+        }).loc[X.index]
+        X, y = X.reset_index(drop=True), y.reset_index(drop=True)
         
         logger.success(f"✅ Created {len(X.columns)} advanced features")
         logger.info("🎯 Top feature categories:")
@@ -413,6 +401,12 @@ class EnhancedMLTrainingPipeline:
         with open(weights_path, 'w') as f:
             json.dump(weights, f, indent=2)
         
+        ModelRegistry("rtx_model_enhanced").register(
+            {'model': model_path, 'feature_importance': importance_path, 'signal_weights': weights_path},
+            metadata={'source': 'sync_and_train_ml_enhanced'},
+            metrics={'accuracy': self.best_model['score'], 'f1': self.best_model['f1']}
+        )
+        
         logger.success("✅ Enhanced models saved locally")
         return weights
     
@@ -33,6 +33,8 @@ from src.ml.advanced_features import AdvancedFeatureEngineer
 from src.ml.lstm_model import LSTMTradingModel, LSTMWithAttention
 from src.ml.ensemble_stacker import EnsembleStacker
 from src.ml.multitask_model import MultiTaskTradingModel
+from src.ml.feature_store import FeatureStore, feature_version
+from src.ml.model_registry import ModelRegistry
 
 # Import base ML components - using minimal imports to avoid dependency issues
 from sklearn.model_selection import train_test_split
@@ -89,9 +91,10 @@ class Phase2MLPipeline:
         # High profit: move > 2% (very profitable for options)
         df['high_profit'] = (abs(df['actual_move_24h'].fillna(0)) > 0.02).astype(int)
         
-        # Create advanced features
+        # Create advanced features (only for predictions not already in the feature store)
         logger.info("🔧 Engineering advanced features...")
-        df_enhanced = self.feature_engineer.engineer_features(df)
+        store = FeatureStore("advanced_phase2", feature_version(AdvancedFeatureEngineer))
+        df_enhanced = store.build(df, lambda rows: self.feature_engineer.engineer_features(df, rows=rows.index)).fillna(0)
         
         # Prepare features and targets
         # The feature engineer creates descriptive column names, not prefixed with 'feature_'
@@ -104,7 +107,7 @@ class Phase2MLPipeline:
         X = df_enhanced[feature_columns]
         
         # Multi-target approach - get targets from original df
-        y_binary = df[['outcome_correct', 'profitable_move', 'high_profit']].fillna(0)
+        y_binary = df.loc[X.index, ['outcome_correct', 'profitable_move', 'high_profit']].fillna(0)
         
         logger.success(f"✅ Features: {X.shape[1]}, Samples: {len(X)}")
         logger.info(f"📊 Target distribution:")
@@ -298,47 +301,58 @@ class Phase2MLPipeline:
             logger.error(f"❌ Baseline comparison failed: {e}")
             return 0.5
     
+    def _model_accuracy(self, model_name):
+        """Headline accuracy of one trained model (None for results that are not models)"""
+        result = self.results.get(model_name, {})
+        if model_name == 'lstm' or model_name == 'lstm_attention':
+            return result.get('overall_accuracy', 0)
+        elif model_name == 'ensemble':
+            return result.get('overall', {}).get('accuracy', 0)
+        elif model_name == 'multitask':
+            return result.get('overall', {}).get('classification_accuracy', 0)
+        return None
+    
     def save_best_model(self):
-        """Save the best performing model"""
-        logger.info("💾 Saving best model...")
+        """Save every trained model and register them together, marking the best performer"""
+        logger.info("💾 Saving trained models...")
         
-        # Determine best model based on results
-        best_score = 0
-        best_name = None
+        scores = {name: self._model_accuracy(name) for name in self.results if name in self.models}
+        scores = {name: score for name, score in scores.items() if score is not None}
+        if not scores:
+            logger.warning("⚠️ No suitable model to save")
+            return
         
-        for model_name, result in self.results.items():
-            if model_name == 'lstm' or model_name == 'lstm_attention':
-                score = result.get('overall_accuracy', 0)
+        model_dir = Path('trained_models')
+        model_dir.mkdir(exist_ok=True)
+        
+        artifacts = {}
+        for model_name in scores:
+            if model_name in ['lstm', 'lstm_attention']:
+                filepath = model_dir / f'phase2_{model_name}_model.h5'
+                self.models[model_name].save_model(str(filepath))
+                artifacts[model_name] = filepath
             elif model_name == 'ensemble':
-                score = result.get('overall', {}).get('accuracy', 0)
+                filepath = model_dir / f'phase2_{model_name}_model.pkl'
+                self.models[model_name].save_ensemble(str(filepath))
+                artifacts[model_name] = self.models[model_name].get_state()
             elif model_name == 'multitask':
-                score = result.get('overall', {}).get('classification_accuracy', 0)
-            else:
-                continue
-            
-            if score > best_score:
-                best_score = score
-                best_name = model_name
-        
-        if best_name and best_name in self.models:
-            # Save best model
-            model_dir = Path('trained_models')
-            model_dir.mkdir(exist_ok=True)
-            
-            if best_name in ['lstm', 'lstm_attention']:
-                filepath = model_dir / f'phase2_{best_name}_model.h5'
-                self.models[best_name].save_model(str(filepath))
-            elif best_name == 'ensemble':
-                filepath = model_dir / f'phase2_{best_name}_model.pkl'
-                self.models[best_name].save_ensemble(str(filepath))
-            elif best_name == 'multitask':
-                filepath = model_dir / f'phase2_{best_name}_model.h5'
-                self.models[best_name].save_model(str(filepath))
-            
-            self.best_model = best_name
-            logger.success(f"✅ Best model saved: {best_name} ({best_score:.3f} accuracy)")
-        else:
-            logger.warning("⚠️ No suitable model to save")
+                filepath = model_dir / f'phase2_{model_name}_model.h5'
+                self.models[model_name].save_model(str(filepath))
+                artifacts[model_name] = filepath
+        
+        best_name = max(scores, key=scores.get)
+        best_score = scores[best_name]
+        
+        # Version all of them for the streaming predictor: a promoted version replaces its whole
+        # ensemble, so a version holding only the best model would drop the others
+        ModelRegistry("streaming").register(
+            artifacts,
+            metadata={'source': 'sync_and_train_ml_phase2', 'model': best_name, 'models': sorted(artifacts)},
+            metrics={'accuracy': best_score, **{f'{name}_accuracy': score for name, score in scores.items()}}
+        )
+        
+        self.best_model = best_name
+        logger.success(f"✅ Saved {len(artifacts)} models; best: {best_name} ({best_score:.3f} accuracy)")
     
     def generate_phase2_report(self, baseline_acc):
         """Generate comprehensive Phase 2 report"""
@@ -10,8 +10,6 @@ import time
 import requests
 import subprocess
 import sqlite3
-import ssl
-import certifi
 from datetime import datetime, timedelta
 from pathlib import Path
 
@@ -28,25 +26,26 @@ class TelegramMLBot:
         self._load_credentials()
     
     def _load_credentials(self):
-        """Load bot credentials from cloud server"""
+        """Load bot credentials from the environment, else from the cloud server"""
+        self.bot_token = os.getenv('TELEGRAM_BOT_TOKEN')
+        self.chat_id = os.getenv('TELEGRAM_CHAT_ID')
+        
         try:
-            # Get bot token
-            result = subprocess.run([
-                'ssh', '-o', 'ConnectTimeout=10', self.cloud_server,
-                'grep TELEGRAM_BOT_TOKEN /opt/rtx-trading/.env | cut -d= -f2'
-            ], capture_output=True, text=True, timeout=15)
-            
-            if result.returncode == 0:
-                self.bot_token = result.stdout.strip()
-            
-            # Get chat ID
-            result = subprocess.run([
-                'ssh', '-o', 'ConnectTimeout=10', self.cloud_server,
-                'grep TELEGRAM_CHAT_ID /opt/rtx-trading/.env | cut -d= -f2'
-            ], capture_output=True, text=True, timeout=15)
+            if not (self.bot_token and self.chat_id):
+                # One round trip for both values (was two sequential ssh sessions)
+                result = subprocess.run([
+                    'ssh', '-o', 'ConnectTimeout=10', self.cloud_server,
+                    'grep -E "^TELEGRAM_(BOT_TOKEN|CHAT_ID)=" /opt/rtx-trading/.env'
+                ], capture_output=True, text=True, timeout=15)
+                
+                if result.returncode == 0:
+                    values = dict(
+                        line.strip().split('=', 1) for line in result.stdout.splitlines() if '=' in line
+                    )
+                    self.bot_token = self.bot_token or values.get('TELEGRAM_BOT_TOKEN')
+                    self.chat_id = self.chat_id or values.get('TELEGRAM_CHAT_ID')
             
-            if result.returncode == 0:
-                self.chat_id = result.stdout.strip()
+            if self.chat_id:
                 self.authorized_users.add(self.chat_id)
             
         except Exception as e:
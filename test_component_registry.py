@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Test Component Registry
+Components are built once, on first use; importing the scheduler stays cheap
+"""
+
+import subprocess
+import sys
+import threading
+
+from src.core.component_registry import ComponentRegistry, format_import_profile, import_profile
+
+class _Counter:
+    built = 0
+
+    def __init__(self):
+        _Counter.built += 1
+        self.value = 1
+
+def test_component_registry():
+    """Lazy stand-ins build on first touch and forward attribute access"""
+    print("🧪 Testing Component Registry")
+    print("=" * 60)
+
+    registry = ComponentRegistry()
+    registry.register("counter", _Counter)
+    registry.register("json_dumps", "json:dumps")
+    counter = registry.lazy("counter")
+
+    assert _Counter.built == 0 and not registry.is_built("counter")
+    assert registry.status()["counter"] is None
+
+    # Concurrent first use still builds exactly once
+    threads = [threading.Thread(target=lambda: counter.value) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert _Counter.built == 1
+
+    counter.value = 5
+    assert registry.get("counter").value == 5
+    assert registry.get("json_dumps")([1]) == "[1]"
+    assert "built" in repr(counter) and registry.status()["counter"] is not None
+
+    registry.reset("counter")
+    assert counter.value == 1 and _Counter.built == 2
+
+    try:
+        registry.get("missing")
+        assert False, "unknown components must raise"
+    except KeyError:
+        pass
+
+    print("\n✅ Component Registry Test Complete!")
+
+def test_lazy_scheduler_import():
+    """Importing the scheduler defers its signals and heavy singletons"""
+    probe = (
+        "import sys, src.core.options_scheduler as m;"
+        "heavy = ['openai', 'aiohttp', 'yfinance', 'src.core.options_paper_trader', 'src.signals.news_sentiment_signal'];"
+        "print([h for h in heavy if h in sys.modules])"
+    )
+    result = subprocess.run([sys.executable, "-c", probe], capture_output=True, text=True)
+    assert result.stdout.strip().splitlines()[-1] == "[]", result.stdout + result.stderr
+
+    rows = import_profile("src.core.options_scheduler")
+    report = format_import_profile("src.core.options_scheduler", rows)
+    print(report)
+    assert report.startswith("📦 import src.core.options_scheduler")
+
+if __name__ == "__main__":
+    test_component_registry()
+    test_lazy_scheduler_import()
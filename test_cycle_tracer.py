@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Test Trading Cycle Tracer
+Checks span histograms, Prometheus rendering and the rolling trace file
+"""
+
+import asyncio
+import json
+import os
+import tempfile
+
+from src.core.cycle_tracer import CycleTracer, LatencyHistogram
+
+def test_latency_histogram():
+    """Cumulative buckets follow Prometheus semantics"""
+    histogram = LatencyHistogram(buckets=(0.1, 1.0))
+    for seconds in (0.05, 0.5, 0.7, 3.0):
+        histogram.observe(seconds)
+
+    assert histogram.cumulative() == [("0.1", 1), ("1", 3), ("+Inf", 4)]
+    assert histogram.count == 4
+    assert abs(histogram.sum - 4.25) < 1e-9
+    assert histogram.quantile(0.5) == 1.0
+    assert histogram.quantile(1.0) == 3.0
+
+def test_cycle_tracer():
+    """Spans land in histograms, the trace file and the metrics text"""
+    print("🧪 Testing Cycle Tracer")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        trace_path = os.path.join(tmp, "cycle_traces.jsonl")
+        tracer = CycleTracer(trace_path=trace_path, max_bytes=2048, backup_count=2)
+
+        async def fake_signal(name: str, delay: float):
+            with tracer.span("signal", name):
+                await asyncio.sleep(delay)
+
+        async def run_cycle(cycle_id: int):
+            tracer.start_cycle(cycle_id)
+            with tracer.span("position_check"):
+                pass
+            await asyncio.gather(fake_signal("momentum", 0.01), fake_signal("news_sentiment", 0.03))
+            with tracer.span("aggregation"):
+                pass
+            return tracer.end_cycle(balance=1000.0)
+
+        cycle = asyncio.run(run_cycle(1))
+        stages = [span["stage"] for span in cycle["spans"]]
+        print(f"📊 Cycle spans: {stages}")
+
+        assert stages.count("signal") == 2
+        assert "position_check" in stages and "aggregation" in stages
+        slow = next(s for s in cycle["spans"] if s.get("label") == "news_sentiment")
+        assert slow["duration_ms"] >= 25
+
+        with open(trace_path) as f:
+            written = json.loads(f.readline())
+        assert written["cycle_id"] == 1
+        assert written["balance"] == 1000.0
+
+        # Errors are recorded on the span and re-raised
+        tracer.start_cycle(2)
+        try:
+            with tracer.span("execution"):
+                raise ValueError("boom")
+        except ValueError:
+            pass
+        assert tracer.end_cycle()["spans"][0]["error"] == "ValueError"
+
+        # Rolling file: keep writing until it rotates
+        for cycle_id in range(3, 40):
+            asyncio.run(run_cycle(cycle_id))
+        assert os.path.exists(trace_path + ".1")
+        assert not os.path.exists(trace_path + ".3")
+
+        text = tracer.render_prometheus()
+        print(text.splitlines()[2])
+        assert '# TYPE algoslayer_cycle_stage_seconds histogram' in text
+        assert 'algoslayer_cycle_stage_seconds_count{stage="signal",label="momentum"} 38' in text
+        assert 'algoslayer_cycle_stage_seconds_bucket{stage="cycle",le="+Inf"} 39' in text
+        assert 'algoslayer_cycles_traced_total 39' in text
+
+        top = tracer.get_summary(top=1)[0]
+        assert top["label"] == "news_sentiment"
+
+    print("\n✅ Cycle Tracer Test Complete!")
+
+if __name__ == "__main__":
+    test_latency_histogram()
+    test_cycle_tracer()
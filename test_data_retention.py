@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Test Data Retention
+Daily rollups, compressed archives and incremental compaction of the SQLite stores
+"""
+
+import json
+import os
+import sqlite3
+import tempfile
+from datetime import datetime, timedelta
+
+from src.core.data_retention import DataRetention, archived_rows
+from src.core.options_paper_trader import OptionsPaperTrader
+from src.core.performance_tracker import PerformanceTracker
+from src.core.prediction_signals import write_prediction_signals
+from src.core.signal_performance_tracker import SignalPerformanceTracker
+
+NOW = datetime(2026, 10, 18, 20, 0)
+
+def _trade(conn, i: int, when: datetime, pnl, status: str = "CLOSED"):
+    prediction_id = f"RTX_{i:03d}"
+    signals = {"momentum": {"direction": "BUY", "confidence": 0.8}, "news_sentiment": {"direction": "SELL", "confidence": 0.6}}
+    conn.execute("""
+        INSERT INTO options_predictions (prediction_id, timestamp, action, contract_symbol, option_type, strike, expiry,
+            entry_price, contracts, total_cost, commission, direction, confidence, signals_data, status)
+        VALUES (?, ?, 'BUY_TO_OPEN', 'RTX250620C00150000', 'call', 150, '2025-06-20', 2.0, 1, 200, 1.3, 'BUY', 0.8, ?, ?)
+    """, (prediction_id, when.strftime("%Y-%m-%d %H:%M:%S"), json.dumps(signals), status))
+    write_prediction_signals(conn, prediction_id, signals)
+    if pnl is not None:
+        conn.execute("INSERT INTO options_outcomes (prediction_id, net_pnl, pnl_percentage) VALUES (?, ?, ?)",
+                     (prediction_id, pnl, pnl / 200.0))
+
+def test_retention_pass():
+    """Old closed trades become rollups + archive rows; open positions and recent data stay hot"""
+    print("🧪 Testing Data Retention")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "options_performance_conservative.db")
+        OptionsPaperTrader(db_path=db_path, closed_history=None)
+        conn = sqlite3.connect(db_path)
+        old_pnls = [40.0, -15.0, 22.0, -8.0]
+        for i, pnl in enumerate(old_pnls):
+            _trade(conn, i, NOW - timedelta(days=120 + i % 2), pnl)
+        _trade(conn, 10, NOW - timedelta(days=200), None, status="OPEN")  # Still open: never archived
+        _trade(conn, 11, NOW - timedelta(days=2), 12.0)
+        for days_ago in (300, 250, 1):
+            conn.execute("INSERT INTO account_history (timestamp, balance_after) VALUES (?, 1000)",
+                         ((NOW - timedelta(days=days_ago)).isoformat(" "),))
+        conn.execute("INSERT INTO options_predictions (prediction_id, timestamp, action, contract_symbol, option_type, "
+                     "strike, expiry, entry_price, contracts, total_cost, commission, direction, confidence, status) "
+                     "VALUES ('PAD', ?, 'X', 'X', 'call', 1, '2025-01-01', 1, 1, 1, 1, 'BUY', 0.5, 'CLOSED')",
+                     ((NOW - timedelta(days=1)).isoformat(" "),))
+        conn.execute("UPDATE options_predictions SET reasoning = ? WHERE prediction_id = 'PAD'", ("x" * 200_000,))
+        conn.commit()
+        conn.close()
+
+        tracker_path = os.path.join(tmp, "signal_performance.db")
+        SignalPerformanceTracker(db_path=tracker_path)
+        conn = sqlite3.connect(tracker_path)
+        for i, days_ago in enumerate((100, 100, 5)):
+            conn.execute("INSERT INTO predictions VALUES (?, ?, 150.0, 'BUY', 0.7, 0.02, 3, 5, ?, '{}')",
+                         (f"pred_{i}", (NOW - timedelta(days=days_ago)).isoformat(), i % 2))
+            conn.execute("INSERT INTO outcomes (prediction_id, timestamp, start_price, price_24h) VALUES (?, ?, 150.0, 153.0)",
+                         (f"pred_{i}", NOW.isoformat()))
+        conn.commit()
+        conn.close()
+
+        retention = DataRetention(data_dir=tmp, keep_days=90)
+        report = retention.run(now=NOW)
+        trader_report = report[db_path]
+        assert trader_report["archived"] == {
+            "options_outcomes": 4, "prediction_signals": 8, "options_predictions": 4, "account_history": 2
+        }
+        assert report[tracker_path]["archived"] == {"outcomes": 2, "predictions": 2}
+
+        conn = sqlite3.connect(db_path)
+        remaining = {row[0] for row in conn.execute("SELECT prediction_id FROM options_predictions")}
+        assert remaining == {"RTX_010", "RTX_011", "PAD"}
+        assert conn.execute("SELECT COUNT(*) FROM account_history").fetchone()[0] == 1
+        trades, wins, net_pnl = conn.execute("SELECT SUM(trades), SUM(wins), SUM(net_pnl) FROM daily_strategy_rollups").fetchone()
+        assert (trades, wins, net_pnl) == (4, 2, sum(old_pnls))
+        momentum = conn.execute(
+            "SELECT SUM(signals), SUM(wins), SUM(total_confidence) FROM daily_signal_rollups WHERE signal_name = 'momentum'"
+        ).fetchone()
+        assert momentum[0] == 4 and momentum[1] == 2 and abs(momentum[2] - 3.2) < 1e-9
+        assert conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2  # Switched to incremental
+        conn.close()
+
+        conn = sqlite3.connect(tracker_path)
+        assert conn.execute("SELECT SUM(predictions), SUM(outcomes_24h) FROM daily_prediction_rollups").fetchone() == (2, 2)
+        conn.close()
+
+        # Archives keep the raw rows for long-horizon analysis
+        archive = list(archived_rows(retention.archive_dir, "options_performance_conservative", "options_outcomes"))
+        assert sorted(row["net_pnl"] for row in archive) == sorted(old_pnls)
+
+        # A second pass archives nothing new and rollups are not double counted
+        assert retention.run(now=NOW)[db_path]["archived"] == {}
+        conn = sqlite3.connect(db_path)
+        assert conn.execute("SELECT SUM(trades) FROM daily_strategy_rollups").fetchone()[0] == 4
+
+        # Incremental vacuum hands freed pages back once the file is in incremental mode
+        conn.execute("DELETE FROM options_predictions WHERE prediction_id = 'PAD'")
+        conn.commit()
+        conn.close()
+        assert retention.run(now=NOW)[db_path]["reclaimed_bytes"] > 100_000
+
+        # Once a day: a pass already made today is not repeated
+        retention.last_run_day = datetime.now().date()
+        assert retention.run_if_due() is None
+
+def test_legacy_layout_and_failed_archive():
+    """performance_tracker's signal_performance.db is archived by its own keys; a failed archive still compacts"""
+    with tempfile.TemporaryDirectory() as tmp:
+        tracker_path = os.path.join(tmp, "signal_performance.db")
+        PerformanceTracker(db_path=tracker_path)
+        conn = sqlite3.connect(tracker_path)
+        for days_ago in (120, 100, 3):
+            cursor = conn.execute("INSERT INTO predictions (timestamp, direction, confidence) VALUES (?, 'BUY', 0.7)",
+                                  ((NOW - timedelta(days=days_ago)).strftime("%Y-%m-%d %H:%M:%S"),))
+            conn.execute("INSERT INTO prediction_outcomes (prediction_id, actual_move_24h) VALUES (?, 0.02)", (cursor.lastrowid,))
+        conn.commit()
+        conn.close()
+
+        # An algoslayer.db without its rollup table: archiving fails, compaction still runs
+        algoslayer_path = os.path.join(tmp, "algoslayer.db")
+        conn = sqlite3.connect(algoslayer_path)
+        conn.execute("CREATE TABLE ai_predictions (timestamp TEXT, signal_name TEXT, direction TEXT, confidence REAL, was_correct INTEGER)")
+        conn.commit()
+        conn.close()
+
+        report = DataRetention(data_dir=tmp, keep_days=90).run(now=NOW)
+        assert report[tracker_path]["archived"] == {"prediction_outcomes": 2, "predictions": 2}
+        assert "daily_ai_signal_rollups" in report[algoslayer_path]["error"]
+        assert "reclaimed_bytes" in report[algoslayer_path]
+        for path in (tracker_path, algoslayer_path):
+            conn = sqlite3.connect(path)
+            assert conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+            conn.close()
+
+    print("\n✅ Data Retention Test Complete!")
+
+if __name__ == "__main__":
+    test_retention_pass()
+    test_legacy_layout_and_failed_archive()
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Test Database Migrations
+Versioned schema steps, declared indexes and EXPLAIN QUERY PLAN audits
+"""
+
+import os
+import sqlite3
+import tempfile
+
+from src.core.db_migrations import (
+    SCHEMAS, Index, Migration, Schema, add_column, audit_query_plans, current_version,
+    detect_schemas, main, migrate, table_columns
+)
+from src.core.iv_history import IVHistoryStore
+from src.core.multi_strategy_manager import MultiStrategyManager
+from src.core.options_paper_trader import OptionsPaperTrader
+from src.core.performance_tracker import PerformanceTracker
+from src.core.signal_effectiveness_tracker import SignalEffectivenessTracker
+from src.core.signal_performance_tracker import SignalPerformanceTracker
+
+def test_migrations_apply_once():
+    """Steps run in order, are recorded, and are skipped on the next open"""
+    print("🧪 Testing Database Migrations")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = sqlite3.connect(os.path.join(tmp, "store.db"))
+        conn.execute("CREATE TABLE trades (id TEXT PRIMARY KEY, symbol TEXT, opened_at TEXT)")
+        schema = Schema(
+            name="trades",
+            tables=("trades",),
+            migrations=(
+                Migration(1, "Symbol index", indexes=(Index("trades", ("symbol", "opened_at")),)),
+                Migration(2, "Closed flag", apply=add_column("trades", "closed", "INTEGER DEFAULT 0")),
+            ),
+            hot_queries={"by_symbol": "SELECT * FROM trades WHERE symbol = ? ORDER BY opened_at"},
+        )
+        assert migrate(conn, schema) == [1, 2] and current_version(conn, "trades") == 2
+        assert migrate(conn, schema) == []
+        assert "closed" in table_columns(conn, "trades")
+        entry = audit_query_plans(conn, schema)["by_symbol"]
+        assert not entry["full_scans"] and not entry["temp_sort"]
+        assert audit_query_plans(conn, Schema("t", ("trades",), (), {"all": "SELECT * FROM trades"}))["all"]["full_scans"] == ["trades"]
+
+        # A failing step rolls back and leaves the version where it was
+        broken = Schema("trades", ("trades",), schema.migrations + (Migration(3, "Bad", ("CREATE INDEX x ON missing(y)",)),))
+        try:
+            migrate(conn, broken)
+            assert False, "expected the bad step to raise"
+        except sqlite3.OperationalError:
+            pass
+        assert current_version(conn, "trades") == 2
+
+        # Partial work from a failed step is rolled back too, so a fixed step can be retried
+        partial = Schema("trades", ("trades",), schema.migrations + (Migration(3, "Partial", (
+            "CREATE TABLE audit (id INTEGER)", "INSERT INTO audit VALUES (1)", "BOGUS",
+        )),))
+        try:
+            migrate(conn, partial)
+            assert False, "expected the bad step to raise"
+        except sqlite3.OperationalError:
+            pass
+        assert "audit" not in {row[0] for row in conn.execute("SELECT name FROM sqlite_master")}
+        fixed = Schema("trades", ("trades",), schema.migrations + (Migration(3, "Audit", ("CREATE TABLE audit (id INTEGER)",)),))
+        assert migrate(conn, fixed) == [3]
+
+        # A step holds the write lock: a second connection cannot migrate until it commits
+        blocked = []
+        def concurrent_open(step_conn):
+            other = sqlite3.connect(os.path.join(tmp, "store.db"), timeout=0)
+            try:
+                migrate(other, fixed)
+            except sqlite3.OperationalError as e:
+                blocked.append(str(e))
+            finally:
+                other.close()
+        racing = Schema("trades", ("trades",), fixed.migrations + (Migration(4, "Racing", apply=concurrent_open),))
+        assert migrate(conn, racing) == [4]
+        assert blocked and "locked" in blocked[0]
+        conn.close()
+
+def test_store_schemas_are_indexed():
+    """Every store migrates on open and its hot queries avoid full table scans"""
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = {
+            "options_paper_trader": os.path.join(tmp, "options_performance.db"),
+            "signal_performance": os.path.join(tmp, "signal_performance.db"),
+            "signal_effectiveness": os.path.join(tmp, "signal_effectiveness.db"),
+            "multi_strategy": os.path.join(tmp, "multi_strategy.db"),
+            "iv_history": os.path.join(tmp, "iv_history.db"),
+        }
+        OptionsPaperTrader(db_path=paths["options_paper_trader"], closed_history=None)
+        SignalPerformanceTracker(db_path=paths["signal_performance"])
+        SignalEffectivenessTracker(db_path=paths["signal_effectiveness"])
+        MultiStrategyManager(db_path=paths["multi_strategy"])
+        IVHistoryStore(db_path=paths["iv_history"]).days()  # Opens (and migrates) on first use
+
+        for schema in SCHEMAS:
+            conn = sqlite3.connect(paths[schema.name])
+            assert [s.name for s in detect_schemas(conn)] == [schema.name]
+            assert current_version(conn, schema.name) == schema.version
+            for label, entry in audit_query_plans(conn, schema).items():
+                print(f"  {schema.name}.{label}: {entry['plan']}")
+                assert not entry["full_scans"], f"{schema.name}.{label} scans {entry['full_scans']}"
+            conn.close()
+
+def test_legacy_layouts_skipped():
+    """A table name reused with another layout is not migrated, and one bad file does not stop the run"""
+    with tempfile.TemporaryDirectory() as tmp:
+        # data/signal_performance.db as performance_tracker writes it: predictions has no trade_worthy
+        legacy = os.path.join(tmp, "signal_performance.db")
+        PerformanceTracker(db_path=legacy)
+        SignalPerformanceTracker(db_path=legacy)
+        conn = sqlite3.connect(legacy)
+        assert detect_schemas(conn) == []
+        assert current_version(conn, "signal_performance") == 0
+        conn.close()
+
+        effectiveness = os.path.join(tmp, "signal_effectiveness.db")
+        SignalEffectivenessTracker(db_path=effectiveness)
+        conn = sqlite3.connect(effectiveness)
+        conn.execute("DELETE FROM schema_migrations")
+        conn.commit()
+        conn.close()
+        corrupt = os.path.join(tmp, "corrupt.db")
+        with open(corrupt, "wb") as f:
+            f.write(b"not a database" * 100)
+
+        assert main([corrupt, legacy, effectiveness]) == 1
+        conn = sqlite3.connect(effectiveness)
+        assert current_version(conn, "signal_effectiveness") == len(SCHEMAS[2].migrations)
+        conn.close()
+
+    print("\n✅ Database Migrations Test Complete!")
+
+if __name__ == "__main__":
+    test_migrations_apply_once()
+    test_store_schemas_are_indexed()
+    test_legacy_layouts_skipped()
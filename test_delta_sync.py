@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Test Delta Sync
+Watermark-based incremental export/import between two local databases
+"""
+
+import os
+import sqlite3
+import tempfile
+from datetime import datetime, timedelta
+
+from src.core.delta_sync import export_delta, import_delta, read_delta, source_id, sync, watermarks_for
+from src.core.options_paper_trader import OptionsPaperTrader
+from src.core.performance_tracker import PerformanceTracker
+from src.core.signal_performance_tracker import SignalPerformanceTracker
+
+NOW = datetime(2026, 10, 18, 20, 0)
+
+def _predict(conn, i: int, days_ago: int = 1, status: str = "OPEN"):
+    conn.execute("""
+        INSERT INTO options_predictions (prediction_id, timestamp, action, contract_symbol, option_type, strike, expiry,
+            entry_price, contracts, total_cost, commission, direction, confidence, status)
+        VALUES (?, ?, 'BUY_TO_OPEN', 'RTX250620C00150000', 'call', 150, '2025-06-20', 2.0, 1, 200, 1.3, 'BUY', 0.8, ?)
+    """, (f"RTX_{i:03d}", (NOW - timedelta(days=days_ago)).strftime("%Y-%m-%d %H:%M:%S"), status))
+
+def test_incremental_sync():
+    """Only rows past the watermark travel; re-importing a delta changes nothing"""
+    print("🧪 Testing Delta Sync")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, "signal_performance.db")
+        target = os.path.join(tmp, "training", "signal_performance.db")
+        os.makedirs(os.path.dirname(target))
+        SignalPerformanceTracker(db_path=source)
+        conn = sqlite3.connect(source)
+        for i in range(50):
+            conn.execute("INSERT INTO predictions VALUES (?, ?, 150.0, 'BUY', 0.7, 0.02, 3, 5, ?, ?)",
+                         (f"pred_{i}", NOW.isoformat(), i % 2, '{}' if i % 3 else '{"momentum": 0.8}'))
+            conn.execute("INSERT INTO outcomes (prediction_id, timestamp, start_price, price_24h) VALUES (?, ?, 150.0, ?)",
+                         (f"pred_{i}", (NOW - timedelta(days=30)).isoformat(), None if i % 4 else 151.5))  # Settled
+        conn.commit()
+        conn.close()
+
+        applied = sync(source, target)
+        assert applied["predictions"] == 50 and applied["outcomes"] == 50
+        conn = sqlite3.connect(target)
+        assert conn.execute("SELECT COUNT(*), SUM(price_24h IS NULL) FROM outcomes").fetchone() == (50, 37)
+        assert conn.execute("SELECT individual_signals FROM predictions WHERE id = 'pred_3'").fetchone()[0] == '{"momentum": 0.8}'
+        assert conn.execute("SELECT individual_signals FROM predictions WHERE id = 'pred_1'").fetchone()[0] == '{}'
+        conn.close()
+
+        # Nothing new: the next delta is empty
+        assert sum(sync(source, target).values()) == 0
+
+        # Only new rows travel, and importing the same delta twice is idempotent
+        conn = sqlite3.connect(source)
+        conn.execute("INSERT INTO predictions VALUES ('pred_new', ?, 151.0, 'SELL', 0.6, -0.01, 2, 4, 0, '{}')", (NOW.isoformat(),))
+        conn.commit()
+        conn.close()
+        delta = os.path.join(tmp, "delta.npz")
+        manifest = export_delta(source, delta, watermarks_for(target, source_id(source)))
+        assert manifest["tables"]["predictions"]["rows"] == 1 and manifest["tables"]["outcomes"]["rows"] == 0
+        assert import_delta(delta, target) == {"predictions": 1}
+        assert import_delta(delta, target) == {"predictions": 1}
+        conn = sqlite3.connect(target)
+        assert conn.execute("SELECT COUNT(*) FROM predictions").fetchone()[0] == 51
+        conn.close()
+
+        # A second database with the same file name (bootstrap vs cloud) keeps its own watermarks
+        other = os.path.join(tmp, "cloud", "signal_performance.db")
+        os.makedirs(os.path.dirname(other))
+        SignalPerformanceTracker(db_path=other)
+        conn = sqlite3.connect(other)
+        for i in range(60):
+            conn.execute("INSERT INTO predictions VALUES (?, ?, 150.0, 'BUY', 0.7, 0.02, 3, 5, 0, '{}')", (f"cloud_{i}", NOW.isoformat()))
+        conn.commit()
+        conn.close()
+        assert sync(other, target)["predictions"] == 60
+        assert watermarks_for(target, source_id(source))["predictions"] == 51
+        assert source_id("/opt/rtx-trading/data/signal_performance.db", host="cloud") != source_id(source)
+
+def test_refresh_window():
+    """Positions that close in place are re-sent while inside the refresh window"""
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, "options_performance.db")
+        target = os.path.join(tmp, "mirror.db")
+        OptionsPaperTrader(db_path=source, closed_history=None)
+        conn = sqlite3.connect(source)
+        _predict(conn, 1)
+        _predict(conn, 2, days_ago=120, status="CLOSED")
+        conn.commit()
+        conn.close()
+
+        delta = os.path.join(tmp, "delta.npz")
+        export_delta(source, delta, now=NOW)
+        import_delta(delta, target)
+
+        conn = sqlite3.connect(source)
+        conn.execute("UPDATE options_predictions SET status = 'CLOSED' WHERE prediction_id = 'RTX_001'")
+        conn.commit()
+        conn.close()
+
+        manifest = export_delta(source, delta, watermarks_for(target, source_id(source)), now=NOW)
+        _, rows = read_delta(delta)
+        assert manifest["tables"]["options_predictions"]["rows"] == 1  # The recent one, not the 120-day-old one
+        assert rows["options_predictions"][0][0] == "RTX_001"
+        import_delta(delta, target)
+        conn = sqlite3.connect(target)
+        statuses = dict(conn.execute("SELECT prediction_id, status FROM options_predictions"))
+        conn.close()
+        assert statuses == {"RTX_001": "CLOSED", "RTX_002": "CLOSED"}
+
+def test_outcome_labels_refreshed():
+    """Outcome rows updated in place at 4h/24h reach the training copy on the next sync"""
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, "signal_performance.db")
+        target = os.path.join(tmp, "training.db")
+        PerformanceTracker(db_path=source)
+        conn = sqlite3.connect(source)
+        conn.execute("INSERT INTO predictions (direction, confidence) VALUES ('BUY', 0.7)")
+        conn.execute("INSERT INTO prediction_outcomes (prediction_id, actual_direction, actual_move_1h) VALUES (1, 'BUY', 0.01)")
+        conn.commit()
+        conn.close()
+        sync(source, target)
+
+        conn = sqlite3.connect(source)
+        conn.execute("UPDATE prediction_outcomes SET actual_move_24h = 0.05, options_profit_potential = 2.5 WHERE prediction_id = 1")
+        conn.commit()
+        conn.close()
+        assert sync(source, target)["prediction_outcomes"] == 1
+
+        conn = sqlite3.connect(target)
+        row = conn.execute("SELECT outcome_id, prediction_id, actual_move_1h, actual_move_24h, options_profit_potential "
+                           "FROM prediction_outcomes").fetchall()
+        conn.close()
+        assert row == [(1, 1, 0.01, 0.05, 2.5)]
+
+    print("\n✅ Delta Sync Test Complete!")
+
+if __name__ == "__main__":
+    test_incremental_sync()
+    test_refresh_window()
+    test_outcome_labels_refreshed()
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Test Feature Store
+Engineered feature vectors cached per prediction_id and feature-definition version
+"""
+
+import os
+import sqlite3
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from src.core.options_ml_integration import OptionsMLIntegration
+from src.core.options_paper_trader import OptionsPaperTrader
+from src.core.prediction_signals import load_signal_features, write_prediction_signals
+from src.ml.advanced_features import AdvancedFeatureEngineer
+from src.ml.feature_store import FeatureStore, feature_version
+
+def _square_features(rows: pd.DataFrame) -> pd.DataFrame:
+    _square_features.calls.append(len(rows))
+    return pd.DataFrame({"x": rows["value"], "x_squared": rows["value"] ** 2, "label": "text"}, index=rows.index)
+
+def test_incremental_build():
+    """Only unseen predictions are engineered; a new definition version starts over"""
+    print("🧪 Testing Feature Store")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        _square_features.calls = []
+        version = feature_version(_square_features)
+        df = pd.DataFrame({"prediction_id": range(100, 110), "value": np.arange(10.0)})
+
+        store = FeatureStore("demo", version, root=tmp)
+        X = store.build(df, _square_features)
+        assert list(X.columns) == ["x", "x_squared"]  # Non-numeric columns are not stored
+        assert X.index.equals(df.index) and X["x_squared"].tolist() == (np.arange(10.0) ** 2).tolist()
+
+        # A later run with 5 new rows (and a fresh process) only engineers those 5
+        df = pd.DataFrame({"prediction_id": range(100, 115), "value": np.arange(15.0)})
+        X = FeatureStore("demo", version, root=tmp).build(df, _square_features)
+        assert _square_features.calls == [10, 5]
+        assert X["x"].tolist() == list(np.arange(15.0))
+
+        # The second run appended a segment with just its 5 rows; reads are memory-mapped, column-major
+        reopened = FeatureStore("demo", version, root=tmp)
+        assert len(reopened) == 15 and reopened.missing([100, 999]) == ["999"]
+        matrix = np.load(os.path.join(reopened.path, "features_2.npy"), mmap_mode="r")
+        assert isinstance(matrix, np.memmap) and matrix.flags.f_contiguous and matrix.shape == (5, 2)
+        assert sorted(os.listdir(reopened.path)) == ["features_1.npy", "features_2.npy", "ids_1.npy", "ids_2.npy", "manifest.json"]
+
+        # A replaced row shadows its old copy; a new column is NaN for rows written before it
+        reopened.put(pd.DataFrame({"x": [-1.0], "x_cubed": [8.0]}, index=["102"]))
+        stored = reopened.get(["101", "102"])
+        assert list(stored.columns) == ["x", "x_squared", "x_cubed"]
+        assert stored.loc["102", "x"] == -1.0 and np.isnan(stored.loc["102", "x_squared"]) and np.isnan(stored.loc["101", "x_cubed"])
+
+        # Past MAX_SEGMENTS the segments are compacted into one matrix holding the same vectors
+        before = reopened.get(range(100, 115))
+        reopened.MAX_SEGMENTS = 3
+        reopened.put(pd.DataFrame({"x": [20.0]}, index=["120"]))
+        assert sorted(os.listdir(reopened.path)) == ["features_4.npy", "ids_4.npy", "manifest.json"]
+        pd.testing.assert_frame_equal(FeatureStore("demo", version, root=tmp).get(range(100, 115)), before)
+        assert len(reopened) == 16
+
+        # Rows the engineer could not handle are left out, not misaligned
+        skipping = FeatureStore("skipping", version, root=tmp)
+        X = skipping.build(df, lambda rows: _square_features(rows[rows["value"] % 2 == 0]))
+        assert X.index.tolist() == list(range(0, 15, 2))
+
+        # Changing the feature definition changes the version, so everything is rebuilt once
+        assert feature_version(_square_features, extra="v2") != version
+        FeatureStore("demo", feature_version(_square_features, extra="v2"), root=tmp).build(df, _square_features)
+        assert _square_features.calls[-1] == 15
+
+def test_rolling_context():
+    """Rows engineered on their own still see the earlier rows of the frame"""
+    engineer = AdvancedFeatureEngineer.__new__(AdvancedFeatureEngineer)  # Skip the market data download
+    engineer.spy_data = engineer.vix_data = engineer.ita_data = engineer.dxy_data = None
+    df = pd.DataFrame({
+        "prediction_id": [f"p{i}" for i in range(30)],
+        "timestamp": pd.date_range("2026-10-01 10:00", periods=30, freq="h").astype(str),
+        "confidence": np.linspace(0.4, 0.9, 30),
+        "expected_move": np.linspace(0.01, 0.03, 30),
+    }, index=np.arange(100, 130))  # Labels are not positions
+
+    full = engineer.engineer_features(df)
+    new_rows = engineer.engineer_features(df, rows=df.index[-3:])
+    assert list(new_rows.index) == list(df.index[-3:])
+    pd.testing.assert_frame_equal(new_rows, full.loc[new_rows.index, new_rows.columns], check_dtype=False)
+    assert new_rows["recent_confidence_std"].iloc[0] > 0
+
+def test_options_features_cached():
+    """OptionsMLIntegration reuses stored vectors and matches a cold build"""
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "options_performance.db")
+        OptionsPaperTrader(db_path=db_path, closed_history=None)
+        conn = sqlite3.connect(db_path)
+        for i in range(12):
+            prediction_id = f"RTX_{i:03d}"
+            conn.execute("""
+                INSERT INTO options_predictions (prediction_id, timestamp, action, contract_symbol, option_type, strike,
+                    expiry, days_to_expiry, entry_price, contracts, total_cost, commission, direction, confidence,
+                    expected_move, expected_profit_pct, implied_volatility, delta_entry, gamma_entry, theta_entry,
+                    vega_entry, stock_price_entry, signals_data, status)
+                VALUES (?, ?, 'BUY_TO_OPEN', 'RTX', ?, 150, '2025-06-20', 7, 2.0, 1, 200, 1.3, 'BUY', ?, 0.03, 0.4,
+                        0.3, 0.5, 0.05, -0.1, 0.2, 148.0, ?, 'CLOSED')
+            """, (prediction_id, f"2026-10-{1 + i:02d}T10:00:00", "call" if i % 2 else "put", 0.6 + i / 100,
+                  '{"momentum": {"direction": "BUY", "confidence": 0.8}}'))
+            conn.execute("INSERT INTO options_outcomes (prediction_id, net_pnl, pnl_percentage) VALUES (?, ?, ?)",
+                         (prediction_id, 10.0 - i, (10.0 - i) / 200))
+            write_prediction_signals(conn, prediction_id, {"momentum": {"direction": "BUY", "confidence": 0.8}})
+        conn.commit()
+        conn.close()
+
+        ml = OptionsMLIntegration(db_path, feature_store_dir=os.path.join(tmp, "features"))
+        df = ml.extract_options_training_data()
+        cold_X, cold_y = ml.engineer_options_features(df)
+        warm_X, warm_y = ml.engineer_options_features(df)
+        pd.testing.assert_frame_equal(cold_X, warm_X, check_dtype=False)
+        assert cold_y.tolist() == warm_y.tolist() == [int(10.0 - i > 0) for i in range(12)]
+        assert warm_X["momentum_confidence"].eq(0.8).all() and warm_X["option_type_call"].sum() == 6
+
+        # Signal rows are read only for the trades being engineered
+        conn = sqlite3.connect(db_path)
+        assert list(load_signal_features(conn, ["RTX_003", "RTX_999"])) == ["RTX_003"]
+        assert len(load_signal_features(conn, [f"RTX_{i:03d}" for i in range(12)], batch_size=5)) == 12
+        conn.close()
+
+    print("\n✅ Feature Store Test Complete!")
+
+if __name__ == "__main__":
+    test_incremental_build()
+    test_rolling_context()
+    test_options_features_cached()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Test IV History Store
+Recorded daily/intraday IV with sorted-window rank and percentile lookups
+"""
+
+import os
+import sqlite3
+import tempfile
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from src.core.data_retention import DataRetention
+from src.core.iv_history import IVHistoryStore, SortedWindow
+
+def test_sorted_window():
+    """Bisect rank/percentile match a brute-force recomputation as values roll off"""
+    print("🧪 Testing IV History Store")
+    print("=" * 60)
+
+    rng = np.random.default_rng(7)
+    window = SortedWindow(30)
+    values = rng.uniform(0.15, 0.45, 200).round(3)
+    for i, value in enumerate(values):
+        window.push(value)
+        recent = values[max(0, i - 29):i + 1]
+        assert window.sorted == sorted(recent) and np.isclose(window.mean(), recent.mean())
+        query = rng.uniform(0.1, 0.5)
+        assert np.isclose(window.percentile(query), (recent < query).mean() * 100)
+        if recent.max() > recent.min():
+            expected = (query - recent.min()) / (recent.max() - recent.min()) * 100
+            assert np.isclose(window.rank(query), min(max(expected, 0), 100))
+
+def test_store_windows_and_reload():
+    """Daily closes feed 30/90/252-day windows that survive a restart"""
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "iv_history.db")
+        store = IVHistoryStore(db_path, min_interval=300, min_days=20)
+        start = datetime(2026, 1, 5, 10, 0)
+
+        # 300 trading days, each with a few intraday observations 2 minutes apart
+        closes = []
+        for day in range(300):
+            base = 0.20 + 0.1 * np.sin(day / 20)
+            for step in range(3):
+                store.record(start + timedelta(days=day, minutes=2 * step), base + 0.001 * step)
+            closes.append(base + 0.002)
+            if day == 10:
+                assert store.rank(0.25) is None and store.stats(0.25)["iv_rank_252d"] is None
+
+        # The open day is excluded: windows hold the previous 252/90/30 closes
+        assert store.days(252) == 252 and store.days(30) == 30
+        previous = np.array(closes[-253:-1])
+        assert np.isclose(store.percentile(0.22), (previous < 0.22).mean() * 100)
+        low, high = min(closes[-91:-1]), max(closes[-91:-1])
+        assert np.isclose(store.rank(0.22, 90), (0.22 - low) / (high - low) * 100)
+        assert np.isclose(store.mean(30), np.mean(closes[-31:-1]))
+
+        conn = sqlite3.connect(db_path)
+        daily = conn.execute("SELECT open, high, low, close, samples FROM iv_daily ORDER BY day DESC LIMIT 1").fetchone()
+        intraday = conn.execute("SELECT COUNT(*) FROM iv_intraday").fetchone()[0]
+        conn.close()
+        assert np.allclose(daily[:4], [closes[-1] - 0.002, closes[-1], closes[-1] - 0.002, closes[-1]]) and daily[4] == 3
+        assert intraday == 300  # Throttled to one row per 5 minutes
+
+        # A new process rebuilds identical windows from iv_daily
+        reopened = IVHistoryStore(db_path, min_days=20)
+        assert reopened.stats(0.22) == store.stats(0.22)
+        assert reopened.open_day == store.open_day
+
+        # Intraday rows expire with the other stores; the daily series stays
+        retention = DataRetention(data_dir=tmp, keep_days=30, archive_dir=os.path.join(tmp, "archive"))
+        assert [path for path, _ in retention.targets()] == [db_path]
+        retention.run(now=start + timedelta(days=300))
+        conn = sqlite3.connect(db_path)
+        assert conn.execute("SELECT COUNT(*) FROM iv_intraday").fetchone()[0] == 30
+        assert conn.execute("SELECT COUNT(*) FROM iv_daily").fetchone()[0] == 300
+        conn.close()
+
+    print("\n✅ IV History Store Test Complete!")
+
+if __name__ == "__main__":
+    test_sorted_window()
+    test_store_windows_and_reload()
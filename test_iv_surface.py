@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Test IV Surface
+Smile, ATM term structure and skew built once per chain refresh and shared by IV consumers
+"""
+
+import asyncio
+import os
+import tempfile
+from datetime import date, timedelta
+
+import numpy as np
+
+from src.core.iv_history import IVHistoryStore
+from src.core.iv_surface import IVSurface
+from src.core.options_data_engine import OptionsDataEngine, options_data_engine
+from src.core.options_scoring import ChainTable
+from src.signals.options_flow_signal import OptionsFlowSignal
+from src.signals.options_iv_percentile_signal import OptionsIVPercentileSignal
+
+SPOT = 100.0
+TERM = {10: 0.30, 24: 0.27, 52: 0.25}  # Days to expiry -> ATM IV (downward-sloping term structure)
+
+def _chain(shift: float = 0.0) -> dict:
+    """Calls and puts at 80..120 with a put skew: IV rises 0.2 vol points per 1% below spot"""
+    chain = {}
+    for days, atm in TERM.items():
+        expiry = (date.today() + timedelta(days=days)).isoformat()
+        for strike in np.arange(80.0, 121.0, 2.5):
+            iv = atm + shift + 0.2 * (SPOT - strike) / SPOT
+            for option_type in ("call", "put"):
+                symbol = f"RTX{expiry}{option_type[0].upper()}{strike:08.1f}"
+                chain[symbol] = {
+                    "type": option_type, "strike": float(strike), "expiry": expiry, "bid": 1.0, "ask": 1.1,
+                    "last": 1.05, "volume": 600 if option_type == "call" else 100, "openInterest": 1000,
+                    "impliedVolatility": iv + (0.01 if option_type == "call" else 0.0),
+                    "mid_price": 1.05, "spread_pct": 0.095
+                }
+    return chain
+
+def test_surface_metrics():
+    """ATM IV, skew and term structure match the chain they were built from"""
+    print("🧪 Testing IV Surface")
+    print("=" * 60)
+
+    engine = OptionsDataEngine("RTX")
+    engine.quotes.get("chain", _chain, 1e9)
+    engine.quotes.get("spot", lambda: SPOT, 1e9)
+
+    surface = engine.get_iv_surface()
+    assert surface.days_to_expiry.tolist() == sorted(TERM)
+    # OTM side: puts at/below spot, calls above; at the money both quote, so ATM averages them
+    assert np.allclose(surface.atm_iv, [atm + 0.005 for atm in TERM.values()])
+    assert np.allclose(surface.skew, 0.2 * 0.1 - 0.01)  # Call IVs quote 1 point higher
+    assert surface.term_slope < 0 and surface.atm(min_dte=20, max_dte=45) == surface.atm_iv[1]
+    assert surface.atm(min_dte=60) is None
+    assert surface.atm_iv[1] > surface.atm_at(30) > surface.atm_iv[2]
+    assert abs(surface.iv_at(surface.expiries[0], 90.0) - (0.30 + 0.02)) < 1e-9
+    assert surface.summary()["expiries"] == 3
+
+    # Built once per chain refresh, rebuilt when the chain changes
+    assert engine.get_iv_surface() is surface
+    engine.quotes.invalidate("chain")
+    engine.quotes.get("chain", lambda: _chain(shift=0.05), 1e9)
+    refreshed = engine.get_iv_surface()
+    assert refreshed is not surface and np.allclose(refreshed.atm_iv - surface.atm_iv, 0.05)
+
+    # No usable quotes, no surface
+    assert IVSurface.build(ChainTable.from_chain({}), SPOT, surface.built_at) is None
+
+def test_consumers_share_surface():
+    """IV percentile and options flow read the shared surface instead of pulling chains"""
+    live_history = options_data_engine.iv_history
+    tmp = tempfile.mkdtemp()
+    options_data_engine.iv_history = IVHistoryStore(os.path.join(tmp, "iv_history.db"))
+    options_data_engine.quotes.get("chain", _chain, 1e9)
+    options_data_engine.quotes.get("spot", lambda: SPOT, 1e9)
+    surface = options_data_engine.get_iv_surface()
+    try:
+        assert OptionsIVPercentileSignal()._get_current_iv(surface) == surface.atm_at(30)
+        assert options_data_engine.iv_history.open_close == surface.atm_at(30)  # Recorded once per refresh
+
+        flow = OptionsFlowSignal()
+        data = asyncio.run(flow._get_options_data("RTX"))
+        assert data["expiration"] == surface.expiries[0] and data["current_price"] == SPOT
+        assert len(data["calls"]) == len(data["puts"]) == 17
+        assert flow._analyze_options_flow(data)["call_put_ratio"] == 6.0
+        assert options_data_engine.get_iv_surface() is surface
+    finally:
+        options_data_engine.trim_memory()
+        options_data_engine.iv_history = live_history
+
+    print("\n✅ IV Surface Test Complete!")
+
+if __name__ == "__main__":
+    test_surface_metrics()
+    test_consumers_share_surface()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Test Lightweight ML Online Mode
+Incremental partial_fit updates, atomic checkpoints and drift-triggered refits
+"""
+
+import asyncio
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+import src.core.lightweight_ml as lightweight_ml
+import src.core.rtx_signal_orchestrator as rtx_signal_orchestrator
+from src.core.lightweight_ml import DriftDetector, LightweightML
+from src.core.rtx_signal_orchestrator import RTXSignalOrchestrator
+
+def _features(start: str, hours: int, seed: int, flipped: bool = False) -> pd.DataFrame:
+    """Hourly frame shaped like prepare_features output; momentum_12h drives the 4h direction"""
+    rng = np.random.default_rng(seed)
+    index = pd.date_range(start, periods=hours, freq="h", tz="America/New_York")
+    momentum = rng.normal(0, 0.02, hours)
+    frame = pd.DataFrame({
+        "price": 150 + rng.normal(0, 1, hours),
+        "volume": rng.uniform(1e5, 1e6, hours),
+        "return_1h": rng.normal(0, 0.005, hours),
+        "momentum_12h": momentum,
+        "volatility_24h": rng.uniform(0.002, 0.02, hours),
+        "hour": index.hour,
+    }, index=index)
+    direction = -1 if flipped else 1
+    frame["future_return_4h"] = direction * np.sign(momentum) * 0.02 + rng.normal(0, 0.002, hours)
+    frame["future_return_24h"] = frame["future_return_4h"] * 2
+    return frame.astype(np.float32)
+
+def test_online_updates_and_checkpoint():
+    """Resolved rows update the models once each and survive a restart"""
+    print("🧪 Testing Lightweight ML Online Mode")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        ml = LightweightML(model_dir=tmp, online=True)
+        history = _features("2026-07-01", 400, seed=1)
+        assert asyncio.run(ml.train_models(history))
+        assert not ml.should_retrain() and ml.volatility_bounds is not None
+        assert os.listdir(tmp) == [LightweightML.CHECKPOINT]
+
+        # The next frame overlaps the history: only the 24 new rows are learned, and only once
+        frame = pd.concat([history.iloc[-50:], _features("2026-07-17 16:00", 24, seed=2)])
+        coef_before = ml.models["direction_classifier"].coef_.copy()
+        assert asyncio.run(ml.learn_resolved(frame)) == 24
+        assert asyncio.run(ml.learn_resolved(frame)) == 0
+        assert not np.allclose(coef_before, ml.models["direction_classifier"].coef_)
+        assert ml.online_samples == 24 and ml.model_performance["direction_classifier"].accuracy > 0.8
+        assert ml.scalers["features"].n_samples_seen_ == 424
+
+        # A fresh process resumes from the checkpoint with identical predictions
+        restored = LightweightML(model_dir=tmp, online=True)
+        assert restored.last_learned == frame.index[-1] and restored.online_samples == 24
+        before = asyncio.run(ml.predict(frame))
+        after = asyncio.run(restored.predict(frame))
+        assert (before.direction, before.confidence) == (after.direction, after.confidence)
+        assert not [name for name in os.listdir(tmp) if name.endswith(".tmp")]
+
+def test_drift_triggers_refit():
+    """A regime flip raises the error rate until the detector asks for a full refit"""
+    detector = DriftDetector(min_samples=10)
+    assert not any(detector.update(error) for error in [0.0, 1.0, 0.0, 0.0] * 10)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        ml = LightweightML(model_dir=tmp, online=True)
+        asyncio.run(ml.train_models(_features("2026-07-01", 400, seed=3)))
+        asyncio.run(ml.learn_resolved(_features("2026-07-17 16:00", 40, seed=4)))
+        assert not ml.should_retrain()
+
+        asyncio.run(ml.learn_resolved(_features("2026-07-19 08:00", 60, seed=5, flipped=True)))
+        assert ml.should_retrain() and ml.get_model_status()["drift_detected"]
+
+        # The refit resets the detector and the prequential counters
+        asyncio.run(ml.train_models(_features("2026-07-01", 400, seed=6, flipped=True)))
+        assert not ml.should_retrain() and ml.online_samples == 0
+
+    # Batch mode keeps the weekly schedule
+    assert LightweightML(model_dir=tempfile.mkdtemp(), online=False).should_retrain()
+
+class _HourlyTicker:
+    """Stands in for yf.Ticker: seven 1h bars per weekday over the requested calendar days"""
+    def __init__(self, symbol: str):
+        self.symbol = symbol
+
+    def history(self, period: str, interval: str = "1h") -> pd.DataFrame:
+        end = pd.Timestamp("2026-10-16 16:00", tz="America/New_York")
+        days = pd.bdate_range(end.normalize() - pd.Timedelta(days=int(period[:-1])), end.normalize())
+        index = pd.DatetimeIndex([day + pd.Timedelta(hours=hour) for day in days for hour in range(9, 16)])
+        close = 150 + np.cumsum(np.random.default_rng(len(index)).normal(0, 0.3, len(index)))
+        return pd.DataFrame({"Open": close, "High": close + 0.2, "Low": close - 0.2, "Close": close,
+                             "Volume": np.full(len(index), 5e5)}, index=index)
+
+def test_orchestrator_learns_online():
+    """The orchestrator's ML step fetches enough history for complete feature rows and learns from them"""
+    original_ticker, original_system = lightweight_ml.yf.Ticker, rtx_signal_orchestrator.ml_system
+    lightweight_ml.yf.Ticker = _HourlyTicker
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            ml = LightweightML(model_dir=tmp, online=True)
+            assert asyncio.run(ml.prepare_features("RTX", lookback_days=10)).empty  # Shorter than volatility_7d
+            assert asyncio.run(ml.refit("RTX", lookback_days=120))
+            rtx_signal_orchestrator.ml_system = ml
+
+            orchestrator = RTXSignalOrchestrator.__new__(RTXSignalOrchestrator)
+            orchestrator.symbol, orchestrator.logger = "RTX", rtx_signal_orchestrator.logging.getLogger("test")
+            ml.last_learned = None  # As if the refit predates every outcome in this frame
+            prediction = asyncio.run(orchestrator._get_ml_prediction(pd.DataFrame()))
+            assert prediction.model_name not in ("no_data", "error")
+            assert ml.online_samples > 0 and ml.last_learned is not None
+    finally:
+        lightweight_ml.yf.Ticker, rtx_signal_orchestrator.ml_system = original_ticker, original_system
+
+    print("\n✅ Lightweight ML Online Mode Test Complete!")
+
+if __name__ == "__main__":
+    test_online_updates_and_checkpoint()
+    test_drift_triggers_refit()
+    test_orchestrator_learns_online()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Test Model Registry
+Content-hashed model versions, the validation gate, and hot-swap / rollback in StreamingMLPredictor
+"""
+
+import asyncio
+import json
+import os
+import tempfile
+
+import numpy as np
+from sklearn.linear_model import LogisticRegression
+
+from src.core.streaming_ml_predictor import StreamingMLPredictor
+from src.ml.model_registry import ModelRegistry
+
+def _model(seed: int) -> LogisticRegression:
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(200, 4))
+    return LogisticRegression().fit(X, (X[:, 0] > 0).astype(int))
+
+def test_register_validate_rollback():
+    """Versions are immutable and hash-checked; only validated versions become current"""
+    print("🧪 Testing Model Registry")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        registry = ModelRegistry("demo", root=tmp, min_metrics={"accuracy": 0.55})
+        weights_path = os.path.join(tmp, "signal_weights.json")
+        with open(weights_path, "w") as f:
+            json.dump({"momentum": 0.3}, f)
+
+        v1 = registry.register({"model": _model(1), "signal_weights": weights_path},
+                               metadata={"source": "test"}, metrics={"accuracy": 0.61})
+        assert registry.current() == v1
+        manifest = registry.manifest()
+        assert set(manifest["artifacts"]) == {"model", "signal_weights"} and manifest["metadata"]["source"] == "test"
+
+        # Objects are memory-mapped on load, files come back parsed
+        loaded = registry.load()
+        assert isinstance(loaded["model"].coef_, np.memmap) and loaded["signal_weights"] == {"momentum": 0.3}
+
+        # Below the gate: stored, not promoted (unless forced)
+        weak = registry.register({"model": _model(2)}, metrics={"accuracy": 0.4})
+        assert registry.current() == v1 and weak in registry.versions()
+        assert not registry.validate(weak)[0]
+
+        v3 = registry.register({"model": _model(3)}, metrics={"accuracy": 0.7})
+        assert registry.current() == v3
+        assert registry.rollback() == v1 and registry.current() == v1
+        assert registry.rollback() is None
+
+        # A corrupted artifact fails the hash check and can never be promoted
+        with open(registry.artifact_paths(v3)["model"], "ab") as f:
+            f.write(b"corrupt")
+        assert not registry.promote(v3, force=True) and registry.current() == v1
+        assert registry.promote(weak, force=True) and registry.current() == weak
+        assert not [name for name in os.listdir(registry.path) if name.endswith(".tmp")]
+
+def test_predictor_hot_swap():
+    """The predictor follows the promoted version between predictions and rolls back instantly"""
+
+    class Stacker:
+        """Stands in for the streaming ensemble: wraps one saved sklearn model"""
+        def __init__(self, state):
+            self.model = state["base_models"]["logistic"]
+
+        def predict(self, feature_df):
+            return self.model.predict_proba(feature_df.to_numpy()[:, :4])
+
+    with tempfile.TemporaryDirectory() as tmp:
+        registry = ModelRegistry("streaming", root=tmp, min_metrics={})
+        predictor = StreamingMLPredictor(model_dir=tmp, registry=registry)
+        predictor._ensemble_from_state = Stacker
+        features = {f"feature_{i}": 1.0 for i in range(82)}
+
+        asyncio.run(predictor.load_models())
+        assert predictor.model_version is None and not predictor.is_loaded
+
+        v1 = registry.register({"ensemble": {"base_models": {"logistic": _model(1)}}})
+        first = asyncio.run(predictor.make_prediction(features))
+        assert predictor.model_version == v1 and first.model_count == 1
+        v1_models = predictor.models
+
+        # A retrain promotes v2; the next prediction runs on it without reloading anything else
+        v2 = registry.register({"ensemble": {"base_models": {"logistic": _model(2)}}})
+        asyncio.run(predictor.make_prediction(features))
+        assert predictor.model_version == v2 and predictor.models is not v1_models
+        assert predictor.get_performance_stats()["model_version"] == v2
+
+        # Rollback reuses the ensemble still held in memory
+        assert asyncio.run(predictor.rollback()) == v1
+        assert predictor.models is v1_models and registry.current() == v1
+        assert not asyncio.run(predictor.check_for_update())
+
+        # A version that fails to load is skipped and the live models keep serving
+        broken = registry.register({"ensemble": {"meta_learners": {}}})
+        assert registry.current() == broken
+        assert asyncio.run(predictor.make_prediction(features)).model_count == 1
+        assert predictor.models is v1_models and predictor.model_version == v1
+        assert not asyncio.run(predictor.check_for_update())
+
+    print("\n✅ Model Registry Test Complete!")
+
+if __name__ == "__main__":
+    test_register_validate_rollback()
+    test_predictor_hot_swap()
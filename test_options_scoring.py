@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Test Options Scoring
+Vectorized chain filtering, scoring and top-k selection
+"""
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from unittest.mock import patch
+
+from option_chain_fixtures import synthetic_chain
+from config.options_config import SizingContext, options_config
+from src.core.options_data_engine import OptionsDataEngine, options_data_engine
+from src.core.options_prediction_engine import OptionsPredictionEngine
+from src.core.options_scoring import (
+    CandidateSet, ChainTable, OPTION_SCORE_WEIGHTS, option_score_components, suitable_strike_mask, top_k_indices
+)
+
+def _reference_score(option: dict) -> float:
+    """The original scalar ranking formula"""
+    volume_score = min(option['volume'] / 1000, 1) * 0.3
+    oi_score = min(option['openInterest'] / 5000, 1) * 0.3
+    spread_score = max(0, (0.2 - option['spread_pct']) / 0.2) * 0.2
+    delta = option.get('delta', 0)
+    if option["type"] == "call":
+        delta_score = max(0, 1 - abs(delta - 0.6) / 0.6) * 0.10
+    else:
+        delta_score = max(0, 1 - abs(abs(delta) - 0.6) / 0.6) * 0.10
+    gamma_score = min(option.get('gamma', 0) * 100, 1.0) * 0.08
+    price_score = 0.2 if 0.5 <= option['mid_price'] <= 5.0 else 0.1
+    return volume_score + oi_score + spread_score + delta_score + gamma_score + price_score
+
+def _reference_attractiveness(option: dict, confidence: float) -> float:
+    """The original scalar final-pick formula (its strike alignment term never reached the sum)"""
+    volume_score = min(option['volume'] / 500, 1.0) * 0.15
+    oi_score = min(option['openInterest'] / 2000, 1.0) * 0.10
+    spread_score = max(0, (0.15 - option['spread_pct']) / 0.15) * 0.15
+    price_score = 0.10 if 0.50 <= option['mid_price'] <= 8.0 else 0.05
+    delta_score = (abs(option.get('delta', 0)) * confidence) * 0.15
+    gamma_score = min(option.get('gamma', 0) * 1000, 0.10) * 0.10
+    theta_score = max(0, (0.10 - abs(option.get('theta', 0))) / 0.10) * 0.05
+    return volume_score + oi_score + spread_score + price_score + delta_score + gamma_score + theta_score
+
+def _scalar_best(chain: dict, direction: str, confidence: float, budget: float, selection: str) -> list:
+    """Scalar reference: per-contract filters and a full sort, as the loop-based path did"""
+    wanted = "call" if direction == "BUY" else "put"
+    ranked = []
+    for symbol, option in chain.items():
+        if option["type"] != wanted or option["ask"] * 100 > budget:
+            continue
+        if not suitable_strike_mask(option["strike"], 100.0, direction, confidence, selection):
+            continue
+        ranked.append((_reference_score(option), symbol))
+    ranked.sort(key=lambda x: x[0], reverse=True)
+    return ranked
+
+def test_top_k_indices():
+    scores = np.array([0.1, 0.9, 0.5, 0.7, 0.3])
+    mask = np.array([True, False, True, True, True])
+    assert top_k_indices(scores, mask, 2).tolist() == [3, 2]
+    assert top_k_indices(scores, mask, 10).tolist() == [3, 2, 4, 0]
+    assert top_k_indices(scores, np.zeros(5, dtype=bool), 3).tolist() == []
+
+def test_vectorized_selection():
+    """Matches the scalar filter/ranking and the scalar final pick, and beats the scalar pass"""
+    print("🧪 Testing Options Scoring")
+    print("=" * 60)
+
+    chain = synthetic_chain()
+    engine = OptionsDataEngine("RTX")
+    engine.quotes.get("chain", lambda: chain, 1e9)
+    engine.quotes.get("spot", lambda: 100.0, 1e9)
+
+    best = engine.get_best_options_for_direction("BUY", 0.8, 1000)
+    assert len(best) == 5
+
+    # Scalar reference: same filters, full sort
+    budget = options_config.get_position_size(1000)
+    selection = getattr(options_config, "STRIKE_SELECTION", "adaptive")
+    expected = _scalar_best(chain, "BUY", 0.8, budget, selection)
+
+    assert [c["contract_symbol"] for c in best] == [symbol for _, symbol in expected[:5]]
+    assert np.isclose(best[0]["score"], expected[0][0])
+    assert all(c["type"] == "call" and c["cost_per_contract"] <= budget for c in best)
+    assert "score" not in chain[best[0]["contract_symbol"]]  # Cached chain is not mutated
+
+    # Timing relative to the scalar pass (absolute times depend on the machine):
+    # the table is cached per chain, so a selection pass is masks + argpartition
+    runs = 50
+    start = time.perf_counter()
+    for _ in range(runs):
+        engine.get_best_options_for_direction("SELL", 0.7, 1000)
+    per_pass_ms = (time.perf_counter() - start) / runs * 1000
+    start = time.perf_counter()
+    for _ in range(runs):
+        _scalar_best(chain, "SELL", 0.7, budget, selection)[:5]
+    scalar_ms = (time.perf_counter() - start) / runs * 1000
+    print(f"⚡ Selection over {len(chain)} contracts: {per_pass_ms:.3f} ms/pass (scalar {scalar_ms:.3f} ms)")
+    assert per_pass_ms < scalar_ms
+
+    # Final pick matches the scalar attractiveness formula
+    options_data_engine.quotes.get("spot", lambda: 100.0, 1e9)
+    prediction_engine = OptionsPredictionEngine()
+    for direction in ("BUY", "SELL"):
+        pool = engine.get_best_options_for_direction(direction, 0.8, 1000)
+        picked = prediction_engine._select_optimal_option(pool, 0.8, 0.03)
+        assert picked is max(pool, key=lambda c: _reference_attractiveness(c, 0.8))
+
+    candidates = [dict(c) for c in best[:2]]
+
+    # Weights are a plain vector: volume-only weighting picks the most liquid candidate
+    candidates[0]["volume"] = 400
+    candidates[1]["volume"] = 100
+    volume_only = OptionsPredictionEngine(attractiveness_weights=np.eye(8)[0])
+    assert volume_only._select_optimal_option(candidates, 0.8, 0.03) is candidates[0]
+    options_data_engine.quotes.invalidate("spot")
+
+    print("\n✅ Options Scoring Test Complete!")
+
+def test_shared_candidate_set():
+    """One candidate set per direction per chain; strategies only apply balance/confidence masks"""
+    print("🧪 Testing Shared Candidate Set")
+
+    chain = synthetic_chain(seed=5)
+    engine = OptionsDataEngine("RTX")
+    engine.quotes.get("chain", lambda: chain, 1e9)
+    engine.quotes.get("spot", lambda: 100.0, 1e9)
+
+    candidates = engine.get_candidate_set("BUY")
+    assert isinstance(candidates, CandidateSet)
+    assert engine.get_candidate_set("BUY") is candidates
+    assert engine.get_candidate_set("SELL") is not candidates
+
+    # Per-strategy overlays over the shared set match the standalone path
+    for balance, confidence in [(600, 0.7), (1000, 0.85), (2500, 0.6), (5000, 0.9)]:
+        shared = engine.get_best_options_for_direction("BUY", confidence, balance, candidates=candidates)
+        standalone = OptionsDataEngine("RTX")
+        standalone.quotes.get("chain", lambda: chain, 1e9)
+        standalone.quotes.get("spot", lambda: 100.0, 1e9)
+        fresh = standalone.get_best_options_for_direction("BUY", confidence, balance)
+        assert [c["contract_symbol"] for c in shared] == [c["contract_symbol"] for c in fresh]
+        assert [c["max_contracts"] for c in shared] == [c["max_contracts"] for c in fresh]
+
+    # A set for the wrong direction is ignored rather than trusted
+    puts = engine.get_best_options_for_direction("SELL", 0.8, 1000, candidates=candidates)
+    assert puts and all(c["type"] == "put" for c in puts)
+
+    # A new spot price (or chain) starts a new cycle's sets
+    engine.quotes.invalidate("spot")
+    engine.quotes.get("spot", lambda: 101.0, 1e9)
+    assert engine.get_candidate_set("BUY") is not candidates
+
+    # Strategy overlays stay flat as strategies are added: masks are cached per strike tier,
+    # so an overlay costs a fraction of scoring the chain for each strategy
+    runs = 50
+    start = time.perf_counter()
+    shared_set = engine.get_candidate_set("BUY")
+    for i in range(runs):
+        shared_set.select(0.6 + (i % 4) * 0.1, 400 + i, 5)
+    per_strategy_ms = (time.perf_counter() - start) / runs * 1000
+    start = time.perf_counter()
+    for i in range(runs):
+        table = ChainTable.from_chain(chain)
+        CandidateSet.build("BUY", 101.0, chain, table, option_score_components(table) @ OPTION_SCORE_WEIGHTS,
+                           shared_set.strike_selection).select(0.6 + (i % 4) * 0.1, 400 + i, 5)
+    rescoring_ms = (time.perf_counter() - start) / runs * 1000
+    print(f"⚡ Per-strategy overlay over {len(chain)} contracts: {per_strategy_ms:.3f} ms (rescoring {rescoring_ms:.3f} ms)")
+    assert per_strategy_ms < rescoring_ms / 2
+
+    print("\n✅ Shared Candidate Set Test Complete!")
+
+def test_sizing_context():
+    """Per-request sizing inputs go through the adaptive rule and apply independently when decisions overlap"""
+    print("🧪 Testing Sizing Context")
+
+    assert options_config.get_position_size(1000, SizingContext()) == options_config.get_position_size(1000)
+    # The $400 floor for small accounts still applies to a small Kelly fraction
+    assert options_config.get_position_size(1000, SizingContext.from_fraction(0.15)) == 400
+    assert options_config.get_position_size(2000, SizingContext.from_fraction(0.1)) == 150
+    assert options_config.get_contracts_for_trade(1.5, 4000, SizingContext.from_fraction(0.05)) == 0
+    with patch.dict(os.environ, {"MAX_POSITION_SIZE": "250"}):
+        assert options_config.get_position_size(5000, SizingContext.from_fraction(0.05)) == 250  # Env override last
+
+    chain = synthetic_chain(seed=7)
+    engine = OptionsDataEngine("RTX")
+    engine.quotes.get("chain", lambda: chain, 1e9)
+    engine.quotes.get("spot", lambda: 100.0, 1e9)
+    candidates = engine.get_candidate_set("BUY")
+
+    fractions = [0.08, 0.16, 0.30, 0.40] * 8  # Caps of $120, $240, $450 and $600 at a $2,000 balance
+    def select(fraction):
+        sizing = SizingContext.from_fraction(fraction)
+        best = engine.get_best_options_for_direction("BUY", 0.8, 2000, candidates=candidates, sizing=sizing)
+        return options_config.get_position_size(2000, sizing), max(c["cost_per_contract"] for c in best)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(select, fractions))
+    assert all(cost <= cap for cap, cost in results)
+    assert max(cost for cap, cost in results if cap == 600) > 250  # Larger caps are not clipped by smaller ones
+
+    print("\n✅ Sizing Context Test Complete!")
+
+if __name__ == "__main__":
+    test_top_k_indices()
+    test_vectorized_selection()
+    test_shared_candidate_set()
+    test_sizing_context()
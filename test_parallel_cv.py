@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Test Parallel Stacking Cross-Validation
+The (model × fold × target) grid on a process pool matches the serial stacking loop
+"""
+
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.model_selection import TimeSeriesSplit
+from sklearn.preprocessing import StandardScaler
+
+from src.ml.parallel_cv import cross_val_meta_features
+
+def _data(n_samples: int = 240, n_features: int = 12, n_targets: int = 3):
+    rng = np.random.default_rng(7)
+    X = rng.normal(size=(n_samples, n_features))
+    Y = np.column_stack([(X[:, t] + rng.normal(0, 0.5, n_samples) > 0).astype(int) for t in range(n_targets)])
+    return X, Y
+
+def _models():
+    return {
+        "logistic": LogisticRegression(max_iter=500, C=0.1, solver="liblinear", random_state=42),
+        "random_forest": RandomForestClassifier(n_estimators=20, max_depth=4, random_state=42, n_jobs=-1),
+    }
+
+def _serial_reference(models, X, Y, splits):
+    """The original nested loop from EnsembleStacker._train_base_models"""
+    meta = np.zeros((len(X), len(models) * Y.shape[1]))
+    for m, model in enumerate(models.values()):
+        for train_idx, val_idx in splits:
+            scaler = StandardScaler()
+            X_train, X_val = scaler.fit_transform(X[train_idx]), scaler.transform(X[val_idx])
+            for t in range(Y.shape[1]):
+                model_copy = type(model)(**model.get_params())
+                model_copy.fit(X_train, Y[train_idx, t])
+                meta[val_idx, m * Y.shape[1] + t] = model_copy.predict_proba(X_val)[:, 1]
+    return meta
+
+def test_parallel_matches_serial():
+    """Pool results are reassembled by (model, fold, target), identical to the serial loop"""
+    print("🧪 Testing Parallel Stacking CV")
+    print("=" * 60)
+
+    X, Y = _data()
+    splits = list(TimeSeriesSplit(n_splits=4).split(X))
+    reference = _serial_reference(_models(), X, Y, splits)
+
+    serial, serial_models = cross_val_meta_features(_models(), X, Y, splits, workers=1)
+    scaler = StandardScaler()
+    parallel, parallel_models = cross_val_meta_features(_models(), X, Y, splits, workers=3, full_scaler=scaler)
+
+    assert parallel.shape == (len(X), 2 * 3)
+    np.testing.assert_allclose(serial, reference)
+    np.testing.assert_allclose(parallel, reference)
+    assert not parallel[: len(splits[0][0])].any()  # The first training block never gets out-of-fold scores
+
+    # Final models are fit on all data (first target) with the caller's scaler, keeping their n_jobs
+    assert parallel_models["random_forest"].get_params()["n_jobs"] == -1
+    X_scaled = scaler.transform(X)
+    for name in ("logistic", "random_forest"):
+        np.testing.assert_allclose(parallel_models[name].predict_proba(X_scaled), serial_models[name].predict_proba(X_scaled))
+    assert parallel_models["logistic"].score(X_scaled, Y[:, 0]) > 0.8
+
+def test_single_target():
+    """One target column gives one meta-feature per model"""
+    X, Y = _data(n_targets=1)
+    splits = list(TimeSeriesSplit(n_splits=3).split(X))
+    meta, fitted = cross_val_meta_features(_models(), X, Y[:, 0], splits, workers=2)
+    assert meta.shape == (len(X), 2) and set(fitted) == {"logistic", "random_forest"}
+    np.testing.assert_allclose(meta, _serial_reference(_models(), X, Y, splits))
+
+    print("\n✅ Parallel Stacking CV Test Complete!")
+
+if __name__ == "__main__":
+    test_parallel_matches_serial()
+    test_single_target()
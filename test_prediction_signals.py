@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Test Prediction Signals
+Normalized per-signal rows, JSON backfill and SQL-aggregate signal analysis
+"""
+
+import json
+import os
+import random
+import sqlite3
+import tempfile
+
+from src.core.adaptive_learning_system import AdaptiveLearningSystem
+from src.core.db_migrations import PAPER_TRADER_SCHEMA, current_version
+from src.core.options_ml_integration import OptionsMLIntegration
+from src.core.options_paper_trader import OptionsPaperTrader
+from src.core.prediction_signals import signal_pair_stats, signal_rows, write_prediction_signals
+from src.core.signal_effectiveness_tracker import SignalEffectivenessTracker
+
+SIGNALS = ["momentum", "technical_analysis", "news_sentiment", "options_flow"]
+
+def _insert_trade(conn, i: int, individual_signals: dict, pnl: float):
+    prediction_id = f"RTX_{i:03d}"
+    conn.execute("""
+        INSERT INTO options_predictions (prediction_id, timestamp, action, contract_symbol, option_type, strike,
+            expiry, days_to_expiry, entry_price, contracts, total_cost, commission, direction, confidence,
+            expected_move, expected_profit_pct, implied_volatility, delta_entry, gamma_entry, theta_entry,
+            vega_entry, stock_price_entry, signals_data, status)
+        VALUES (?, ?, 'BUY_TO_OPEN', 'RTX250620C00150000', 'call', 150, '2025-06-20', 7, 2.0, 1, 200, 1.3,
+                'BUY', 0.8, 0.03, 0.4, 0.3, 0.5, 0.05, -0.1, 0.2, 148.0, ?, 'CLOSED')
+    """, (prediction_id, f"2026-10-{1 + i % 28:02d}T10:00:00", json.dumps(individual_signals)))
+    conn.execute(
+        "INSERT INTO options_outcomes (prediction_id, exit_reason, days_held, net_pnl, pnl_percentage) VALUES (?, 'TARGET', 1, ?, ?)",
+        (prediction_id, pnl, pnl / 200.0)
+    )
+    return prediction_id
+
+def _random_signals(rng: random.Random) -> dict:
+    return {
+        name: {"direction": rng.choice(["BUY", "SELL", "HOLD"]), "confidence": rng.choice([rng.uniform(0.4, 0.9), rng.uniform(40, 90)]),
+               "strength": rng.uniform(0, 1)}
+        for name in rng.sample(SIGNALS, rng.randint(1, len(SIGNALS)))
+    }
+
+def _reference_analysis(trades):
+    """The original json.loads loop over signals_data"""
+    performance = {}
+    for individual_signals, pnl in trades:
+        for name, info in individual_signals.items():
+            perf = performance.setdefault(name, {"total": 0, "wins": 0, "pnl": 0.0, "confidence": 0.0})
+            confidence = info["confidence"] / 100.0 if info["confidence"] > 1 else info["confidence"]
+            perf["total"] += 1
+            perf["wins"] += pnl > 0
+            perf["pnl"] += pnl / 200.0
+            perf["confidence"] += confidence
+    return performance
+
+def test_rows_and_backfill():
+    """Rows are normalized at write time and backfilled from existing JSON blobs"""
+    print("🧪 Testing Prediction Signals")
+    print("=" * 60)
+
+    rows = signal_rows("P1", {"momentum": {"direction": "BUY", "confidence": 82}, "custom": {"confidence": 0.4}, "meta": "x"},
+                       {"momentum": 0.2})
+    assert rows == [("P1", 4, "momentum", "BUY", 0.82, 0.1, 0.2), ("P1", None, "custom", "HOLD", 0.4, 0.1, None)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "options_performance.db")
+        OptionsPaperTrader(db_path=db_path, closed_history=None)
+
+        # Simulate a database from before prediction_signals existed
+        conn = sqlite3.connect(db_path)
+        conn.execute("DROP TABLE prediction_signals")
+        conn.execute("DELETE FROM schema_migrations WHERE version >= 2")
+        rng = random.Random(3)
+        trades = [(_random_signals(rng), rng.uniform(-80, 120)) for _ in range(60)]
+        for i, (individual_signals, pnl) in enumerate(trades):
+            _insert_trade(conn, i, individual_signals, pnl)
+        conn.commit()
+        conn.close()
+
+        OptionsPaperTrader(db_path=db_path, closed_history=None)  # Reopening migrates and backfills
+        conn = sqlite3.connect(db_path)
+        assert current_version(conn, PAPER_TRADER_SCHEMA.name) == PAPER_TRADER_SCHEMA.version
+        assert conn.execute("SELECT COUNT(*) FROM prediction_signals").fetchone()[0] == sum(len(s) for s, _ in trades)
+
+        # New predictions write their rows directly
+        fresh = {"momentum": {"direction": "SELL", "confidence": 0.7, "strength": 0.3}}
+        write_prediction_signals(conn, _insert_trade(conn, 99, fresh, 10.0), fresh, {"momentum": 0.15})
+        trades.append((fresh, 10.0))
+        conn.commit()
+        assert conn.execute("SELECT weight FROM prediction_signals WHERE prediction_id = 'RTX_099'").fetchone()[0] == 0.15
+        assert all(pair["trades_together"] >= 3 for pair in signal_pair_stats(conn))
+        conn.close()
+
+        # Adaptive learning aggregates match the per-row JSON loop
+        analysis = AdaptiveLearningSystem(db_path).analyze_signal_performance()
+        assert analysis["total_trades_analyzed"] == len(trades)
+        for name, expected in _reference_analysis(trades).items():
+            perf = analysis["signal_performance"][name]
+            assert perf["total_trades"] == expected["total"]
+            assert abs(perf["win_rate"] - expected["wins"] / expected["total"]) < 1e-9
+            assert abs(perf["avg_pnl_pct"] - expected["pnl"] / expected["total"]) < 1e-9
+            assert abs(perf["avg_confidence"] - expected["confidence"] / expected["total"]) < 1e-9
+
+        # ML features come from the table
+        ml = OptionsMLIntegration(db_path, feature_store_dir=os.path.join(tmp, "features"))
+        features, labels = ml.engineer_options_features(ml.extract_options_training_data())
+        assert len(features) == len(trades) and labels.sum() == sum(pnl > 0 for _, pnl in trades)
+        assert features["momentum_confidence"].max() <= 1.0
+
+def test_effectiveness_aggregates():
+    """Signal summaries and pair correlations are recomputed in SQL"""
+    with tempfile.TemporaryDirectory() as tmp:
+        tracker = SignalEffectivenessTracker(db_path=os.path.join(tmp, "signal_effectiveness.db"))
+        for i in range(4):
+            signals = {"momentum": {"direction": "BUY", "confidence": 80}, "news_sentiment": {"direction": "BUY" if i % 2 else "SELL", "confidence": 0.6}}
+            tracker.track_prediction_signals(f"P{i}", signals, "conservative")
+            tracker.update_trade_outcome(f"P{i}", "win" if i < 3 else "loss", 50.0 if i < 3 else -20.0, 0.1)
+
+        rankings = {r["signal_name"]: r for r in tracker.get_signal_rankings(min_trades=1)}
+        assert rankings["momentum"]["total_trades"] == 4 and rankings["momentum"]["win_rate"] == 75.0
+        assert abs(rankings["momentum"]["avg_confidence"] - 0.8) < 1e-9
+
+        assert tracker.update_signal_correlations() == 1
+        conn = sqlite3.connect(tracker.db_path)
+        strength, win_rate, together = conn.execute(
+            "SELECT correlation_strength, combined_win_rate, trades_together FROM signal_correlations"
+        ).fetchone()
+        conn.close()
+        assert (strength, win_rate, together) == (0.0, 75.0, 4)
+
+        # Files written before v2 stored raw 0-100 confidences; reopening rescales them and the summaries
+        conn = sqlite3.connect(tracker.db_path)
+        conn.execute("UPDATE signal_effectiveness SET signal_confidence = 80 WHERE signal_name = 'momentum'")
+        conn.execute("DELETE FROM schema_migrations WHERE schema = 'signal_effectiveness' AND version = 2")
+        conn.commit()
+        conn.close()
+        tracker._update_performance_summaries("P0")
+        assert tracker.get_signal_rankings(min_trades=1)[0]["avg_confidence"] > 1
+
+        tracker = SignalEffectivenessTracker(db_path=tracker.db_path)
+        conn = sqlite3.connect(tracker.db_path)
+        confidences = {row[0] for row in conn.execute("SELECT signal_confidence FROM signal_effectiveness")}
+        scores = {row[0] for row in conn.execute(
+            "SELECT contribution_score FROM signal_effectiveness WHERE signal_name = 'momentum'"
+        )}
+        conn.close()
+        assert confidences == {0.8, 0.6} and all(abs(score - 0.08) < 1e-9 for score in scores)
+        rankings = {r["signal_name"]: r for r in tracker.get_signal_rankings(min_trades=1)}
+        assert abs(rankings["momentum"]["avg_confidence"] - 0.8) < 1e-9
+
+    print("\n✅ Prediction Signals Test Complete!")
+
+if __name__ == "__main__":
+    test_rows_and_backfill()
+    test_effectiveness_aggregates()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Test Quote Cache
+Freshness budgets and shared in-flight fetches
+"""
+
+import threading
+import time
+from datetime import datetime, timedelta
+
+from src.core.quote_cache import QuoteCache
+
+def test_quote_cache():
+    """Callers inside their staleness budget reuse one fetch"""
+    print("🧪 Testing Quote Cache")
+    print("=" * 60)
+
+    now = [datetime(2026, 10, 12, 11, 0)]
+    cache = QuoteCache(clock=lambda: now[0])
+    fetches = []
+
+    def fetch_spot():
+        fetches.append(now[0])
+        return 100.0 + len(fetches)
+
+    assert cache.get("spot", fetch_spot, max_age=60) == 101.0
+    now[0] += timedelta(seconds=30)
+    assert cache.get("spot", fetch_spot, max_age=60) == 101.0   # Scoring budget: still fresh
+    assert cache.get("spot", fetch_spot, max_age=5) == 102.0    # Exit budget: refetch
+    now[0] += timedelta(seconds=200)
+    assert cache.get("spot", fetch_spot, max_age=300) == 102.0  # Dashboard budget
+    assert len(fetches) == 2
+
+    # Failed (empty) fetches are not cached
+    assert cache.get("chain", lambda: {}, max_age=60) == {}
+    assert cache.peek("chain") is None
+
+    # Clock moving backwards (new replay) never serves "future" data
+    now[0] -= timedelta(hours=1)
+    assert cache.get("spot", fetch_spot, max_age=300) == 103.0
+
+    print(f"📊 Stats: {cache.stats}")
+
+def test_shared_inflight_fetch():
+    """Concurrent callers share one slow fetch"""
+    cache = QuoteCache(clock=datetime.now)
+    calls = []
+    release = threading.Event()
+
+    def slow_chain():
+        calls.append(1)
+        release.wait(2)
+        return {"RTX261021C00100000": {"bid": 1.0}}
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get("chain", slow_chain, 5))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.1)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert len(results) == 8 and all(r is results[0] for r in results)
+    assert cache.stats["shared"] == 7
+
+    # Errors propagate to the caller and are not cached
+    def broken():
+        raise RuntimeError("feed down")
+    try:
+        cache.get("spot", broken, 5)
+        assert False, "expected RuntimeError"
+    except RuntimeError:
+        pass
+    assert cache.get("spot", lambda: 101.5, 5) == 101.5
+
+    print("\n✅ Quote Cache Test Complete!")
+
+if __name__ == "__main__":
+    test_quote_cache()
+    test_shared_inflight_fetch()
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Test Sharded Strategy Runner
+Shared-memory cycle broadcast and shard-side decisions
+"""
+
+import asyncio
+import multiprocessing as mp
+import queue
+
+import numpy as np
+
+from option_chain_fixtures import synthetic_chain
+from src.core.options_data_engine import OptionsDataEngine
+from src.core.sharded_strategy_runner import CycleBroadcast, ShardedStrategy, ShardedStrategyRunner, _run_shard_cycle
+
+SIGNAL_NAMES = ["technical_analysis", "momentum", "options_flow", "rtx_earnings"]
+SELECTIONS = [(0.7, 250), (0.85, 400), (0.6, 600)]
+
+def _signals_data() -> dict:
+    return {
+        "direction": "BUY", "confidence": 0.82, "expected_move_pct": 0.021, "signals_agreeing": 3,
+        "total_signals": 4, "buy_strength": 1.4, "sell_strength": 0.2,
+        "individual_signals": {
+            "technical_analysis": {"direction": "BUY", "confidence": 0.8, "strength": 0.6, "reasoning": "RSI"},
+            "momentum": {"direction": "BUY", "confidence": 0.75, "strength": 0.5},
+            "options_flow": {"direction": "SELL", "confidence": 0.6, "strength": 0.2},
+        },
+        "signal_weights": {"technical_analysis": 0.12, "momentum": 0.08, "options_flow": 0.12, "rtx_earnings": 0.05},
+    }
+
+def _source_candidates():
+    engine = OptionsDataEngine("RTX")
+    engine.quotes.get("chain", lambda: synthetic_chain(seed=11), 1e9)
+    engine.quotes.get("spot", lambda: 100.0, 1e9)
+    return engine.get_candidate_set("BUY")
+
+def _select_symbols(candidates) -> list:
+    return [
+        [candidates.table.symbols[i] for i in candidates.select(confidence, budget, 5)]
+        for confidence, budget in SELECTIONS
+    ]
+
+def _attach_and_select(spec, out):
+    """Runs in a spawned worker process"""
+    broadcast = CycleBroadcast.attach(spec)
+    seq, signals_data, candidates = broadcast.read()
+    out.put((seq, signals_data["direction"], _select_symbols(candidates)))
+    del candidates
+    broadcast.close()
+
+def test_cycle_broadcast():
+    """Workers see the same signal vector and candidate selections as the coordinator"""
+    print("🧪 Testing Cycle Broadcast")
+    print("=" * 60)
+
+    source = _source_candidates()
+    broadcast = CycleBroadcast(SIGNAL_NAMES, capacity=4096)
+    try:
+        rows = broadcast.publish(7, _signals_data(), source)
+        assert rows == int(source.direction_mask.sum())
+
+        reader = CycleBroadcast.attach(broadcast.spec)
+        seq, signals_data, candidates = reader.read()
+        assert seq == 7
+        assert signals_data["direction"] == "BUY" and signals_data["signals_agreeing"] == 3
+        assert np.isclose(signals_data["confidence"], 0.82)
+        assert set(signals_data["individual_signals"]) == {"technical_analysis", "momentum", "options_flow"}
+        assert signals_data["individual_signals"]["options_flow"]["direction"] == "SELL"
+        assert signals_data["signal_weights"]["momentum"] == 0.08
+
+        # Same selections, and the full candidate dicts rebuild from the broadcast columns
+        assert _select_symbols(candidates) == _select_symbols(source)
+        engine = OptionsDataEngine("RTX")
+        shared = engine.get_best_options_for_direction("BUY", 0.85, 2000, candidates=candidates)
+        original = engine.get_best_options_for_direction("BUY", 0.85, 2000, candidates=source)
+        assert [c["contract_symbol"] for c in shared] == [c["contract_symbol"] for c in original]
+        for key in ("ask", "strike", "volume", "openInterest", "type", "expiry", "max_contracts", "score"):
+            assert shared[0][key] == original[0][key], key
+
+        # A spawned process attaches by name and gets identical results
+        ctx = mp.get_context("spawn")
+        out = ctx.Queue()
+        worker = ctx.Process(target=_attach_and_select, args=(broadcast.spec, out))
+        worker.start()
+        seq, direction, selections = out.get(timeout=120)
+        worker.join(timeout=30)
+        assert (seq, direction) == (7, "BUY")
+        assert selections == _select_symbols(source)
+
+        del candidates, shared
+        reader.close()
+    finally:
+        broadcast.close()
+        broadcast.unlink()
+
+    print("\n✅ Cycle Broadcast Test Complete!")
+
+class _FakeTrader:
+    account_balance = 1500.0
+
+class _FakeInstance:
+    paper_trader = _FakeTrader()
+
+    def __init__(self):
+        self.seen = None
+
+    def decide(self, signals_data, candidates):
+        self.seen = (signals_data["direction"], len(candidates.table))
+        return "No suitable options found", None
+
+def test_shard_cycle():
+    """A shard decides every strategy once, and drops cycles it did not receive"""
+    source = _source_candidates()
+    broadcast = CycleBroadcast(SIGNAL_NAMES, capacity=64)
+    try:
+        broadcast.publish(3, _signals_data(), source)
+        assert int(broadcast.header[-1]) == 64  # Truncated to capacity (best scores kept)
+
+        instances = {"conservative": _FakeInstance(), "aggressive": _FakeInstance()}
+        decisions = _run_shard_cycle(instances, broadcast, 3)
+        assert [d[0] for d in decisions] == ["conservative", "aggressive"]
+        assert decisions[0][3] == 1500.0
+        assert instances["aggressive"].seen == ("BUY", 64)
+
+        assert _run_shard_cycle(instances, broadcast, 2) == []  # Stale dispatch
+    finally:
+        broadcast.close()
+        broadcast.unlink()
+
+def _fence_runner(workers: int) -> ShardedStrategyRunner:
+    """Coordinator with a local results queue in place of worker processes"""
+    runner = ShardedStrategyRunner.__new__(ShardedStrategyRunner)
+    runner.workers = workers
+    runner.decision_timeout = 0.2
+    runner._results = queue.Queue()
+    runner._task_queues = [queue.Queue() for _ in range(workers)]
+    runner._outstanding = {}
+    runner.strategies = {sid: ShardedStrategy(sid, None, 1000.0, shard=i) for i, sid in enumerate(["conservative", "aggressive"])}
+    runner.recorded = []
+    runner._record_execution = lambda strategy_id, prediction, balance: runner.recorded.append((strategy_id, prediction["id"]))
+    return runner
+
+def test_late_shard_fence():
+    """Decisions from a shard that missed the timeout are recorded, and the next cycle waits for it"""
+    runner = _fence_runner(workers=2)
+    runner._results.put(("decisions", 0, 1, [("conservative", "Executed", {"id": "p1"}, 990.0)], 0.01))
+    decisions = asyncio.run(runner._collect_decisions(1))
+    runner._record_decisions(decisions)
+    assert runner.recorded == [("conservative", "p1")]
+    assert runner._outstanding == {1: 1}
+
+    # Still deciding: the broadcast must not be rewritten
+    assert asyncio.run(runner._await_previous_cycle()) is False
+
+    # The late answer (a position it already opened) is recorded before the next cycle goes out
+    runner._results.put(("decisions", 1, 1, [("aggressive", "Executed", {"id": "p2"}, 950.0)], 5.0))
+    assert asyncio.run(runner._await_previous_cycle()) is True
+    assert runner.recorded == [("conservative", "p1"), ("aggressive", "p2")]
+    assert runner.strategies["aggressive"].predictions_made == 1
+
+if __name__ == "__main__":
+    test_cycle_broadcast()
+    test_shard_cycle()
+    test_late_shard_fence()
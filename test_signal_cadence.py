@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Test Signal Cadence
+Only stale signals are recomputed; the rest come from the timestamped memo
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+
+from src.core.signal_cadence import SignalCadence
+from src.core.options_scheduler import OptionsScheduler
+
+class _CountingSignal:
+    def __init__(self, refresh: float, dependencies=(), direction: str = "BUY", fail: bool = False):
+        self.REFRESH_SECONDS = refresh
+        self.DATA_DEPENDENCIES = dependencies
+        self.direction = direction
+        self.fail = fail
+        self.calls = 0
+
+    async def analyze(self, symbol: str = "RTX"):
+        self.calls += 1
+        if self.fail:
+            raise RuntimeError("feed down")
+        return {"direction": self.direction, "confidence": 0.8, "strength": 0.5, "run": self.calls}
+
+def test_signal_cadence():
+    """Slow signals run once per cadence, fast ones every cycle"""
+    print("🧪 Testing Signal Cadence")
+    print("=" * 60)
+
+    now = [datetime(2026, 10, 12, 10, 0)]
+    scheduler = OptionsScheduler()
+    scheduler.signal_cadence = SignalCadence(clock=lambda: now[0])
+    scheduler.signals = {
+        "technical_analysis": _CountingSignal(0, ("RTX:history",)),
+        "momentum": _CountingSignal(0, ("RTX:history",)),
+        "market_regime": _CountingSignal(3600, ("market:history",)),
+        "rtx_earnings": _CountingSignal(86400, ("RTX:calendar",)),
+        "defense_contract": _CountingSignal(3600, ("RTX:news",), fail=True),
+    }
+    signals = scheduler.signals
+
+    # 8 cycles, 15 minutes apart
+    for _ in range(8):
+        signals_data = asyncio.run(scheduler._generate_signals())
+        assert signals_data["direction"] == "BUY"
+        now[0] += timedelta(minutes=15)
+
+    assert signals["technical_analysis"].calls == 8
+    assert signals["momentum"].calls == 8
+    assert signals["market_regime"].calls == 2   # 10:00 and 11:00
+    assert signals["rtx_earnings"].calls == 1
+    assert signals["defense_contract"].calls == 8  # Failures are retried, never memoized
+
+    # Memoized results keep their original computation
+    results = {}
+    scheduler._build_signals_data = lambda r: results.update(r) or {"direction": "BUY"}
+    asyncio.run(scheduler._generate_signals())
+    assert results["rtx_earnings"]["run"] == 1
+    assert list(results) == list(signals)  # Configured order is preserved
+
+    # Invalidating a signal forces it (and only it) to recompute next cycle
+    regime_calls = signals["market_regime"].calls
+    scheduler.signal_cadence.invalidate(["rtx_earnings"])
+    asyncio.run(scheduler._generate_signals())
+    assert signals["rtx_earnings"].calls == 2
+    assert signals["market_regime"].calls == regime_calls
+
+    status = scheduler.signal_cadence.status(signals)
+    assert status["rtx_earnings"]["fresh"] and not status["technical_analysis"]["fresh"]
+    print(f"📊 Stats: {scheduler.signal_cadence.stats}")
+
+    # Production signals all declare a cadence; the fast-moving set stays small
+    production = OptionsScheduler().signals
+    every_cycle = [name for name, s in production.items() if s.REFRESH_SECONDS == 0]
+    assert all(hasattr(s, "DATA_DEPENDENCIES") for s in production.values())
+    assert 3 <= len(every_cycle) <= 4, every_cycle
+    print(f"⚡ Every-cycle signals: {every_cycle}")
+
+    print("\n✅ Signal Cadence Test Complete!")
+
+if __name__ == "__main__":
+    test_signal_cadence()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Test Signal Vector
+Slotted signal results and dot-product aggregation / strategy reweighting
+"""
+
+import random
+
+from src.core.options_prediction_engine import OptionsPredictionEngine
+from src.core.options_scheduler import OptionsScheduler, SIGNAL_CLASSES
+from src.signals.base_signal import SignalId, SignalResult, SignalVector
+
+def _reference_strengths(signal_results: dict, signal_weights: dict):
+    """The original per-signal dict scan"""
+    buy = sell = 0.0
+    strongest = None
+    for name, result in signal_results.items():
+        if "error" in result:
+            continue
+        confidence = result["confidence"] / 100.0 if result["confidence"] > 1 else result["confidence"]
+        weight = signal_weights.get(name, 0.1)
+        if result["direction"] == "BUY":
+            buy += weight * confidence
+        elif result["direction"] == "SELL":
+            sell += weight * confidence
+        if confidence > 0.7 and (strongest is None or confidence * weight > strongest[1]):
+            strongest = (name, confidence * weight, confidence)
+    norm = max(sum(signal_weights.values()), 1.0)
+    return buy / norm, sell / norm, strongest
+
+def _random_results(rng: random.Random) -> dict:
+    results = {}
+    for name in SIGNAL_CLASSES:
+        result = {
+            "direction": rng.choice(["BUY", "SELL", "HOLD"]),
+            "confidence": rng.choice([rng.uniform(0.3, 0.84), rng.uniform(30, 84)]),  # Some report 0-100
+            "strength": rng.uniform(0, 1),
+            "reasoning": "test"
+        }
+        if rng.random() < 0.15:
+            result["error"] = "feed down"
+        results[name] = result
+    return results
+
+def _reference_learning(results, strategy_weights, strategy_id):
+    """Per-signal loop the strategy reweighting replaced (None when no signal ran)"""
+    weighted = []
+    for name, result in results.items():
+        if result.get("error"):
+            continue
+        confidence = result.get("confidence") or 0
+        confidence = confidence / 100.0 if confidence > 1 else confidence
+        weight = strategy_weights.get(name)
+        if weight is None:
+            weight = next((w for key, w in strategy_weights.items() if key in name or name in key), 1.0)
+        weighted.append(confidence * weight)
+    if not weighted:
+        return None
+    confidence = sum(weighted) / len(weighted)
+    return confidence if strategy_id == "conservative" else min(1.0, confidence + 0.085)
+
+def test_signal_result():
+    """Signal outputs normalize into one slotted record and back"""
+    print("🧪 Testing Signal Vector")
+    print("=" * 60)
+
+    result = SignalResult.from_output("momentum", {"direction": "BUY", "confidence": 82, "rsi": 61.0})
+    assert not hasattr(result, "__dict__")
+    assert result.strength == 0.1 and result.normalized_confidence == 0.82
+    assert result.to_dict() == {"rsi": 61.0, "direction": "BUY", "confidence": 82.0, "strength": 0.1}
+    assert SignalResult.from_output("x", {"confidence": None}).to_dict()["direction"] == "HOLD"
+
+    assert [signal_id.key for signal_id in SignalId] == list(SIGNAL_CLASSES)
+    vector = SignalVector.from_results({"momentum": result, "custom_signal": {"direction": "SELL", "confidence": 0.9}})
+    assert vector.index("momentum") == SignalId.MOMENTUM and vector.names[-1] == "custom_signal"
+    assert vector.mask("BUY").sum() == 1 and vector.mask("SELL")[-1]
+    assert vector.weight_vector({"momentum_signal": 2.0}, default=1.0, loose=True)[SignalId.MOMENTUM] == 2.0
+
+def test_vector_aggregation():
+    """Dot-product aggregation matches the per-signal dict scan"""
+    scheduler = OptionsScheduler()
+    rng = random.Random(7)
+    for _ in range(200):
+        results = _random_results(rng)
+        buy, sell, strongest = _reference_strengths(results, scheduler.signal_weights)
+        aggregated = scheduler._aggregate_signals(results)
+        assert abs(aggregated["buy_strength"] - buy) < 1e-9
+        assert abs(aggregated["sell_strength"] - sell) < 1e-9
+        if strongest and strongest[2] > 0.85:
+            assert aggregated["dominant_signal"] == strongest[0]
+        else:
+            assert "dominant_signal" not in aggregated
+
+    # Strategy reweighting: mean of weighted confidences over the signals that ran
+    engine = OptionsPredictionEngine(history_db=None)
+    strategy_weights = {"momentum": 1.1, "technical": 0.5, "news_sentiment_signal": 1.3}
+    for _ in range(200):
+        results = _random_results(rng)
+        signals_data = {"confidence": 0.7, "individual_signals": results}
+        for strategy_id in ("conservative", "moderate"):
+            enhanced = engine._apply_strategy_learning(signals_data, strategy_weights, strategy_id)
+            expected = _reference_learning(results, strategy_weights, strategy_id)
+            if expected is None:
+                assert enhanced is signals_data
+            else:
+                assert enhanced["learning_applied"] and abs(enhanced["confidence"] - expected) < 1e-9
+                assert signals_data["confidence"] == 0.7  # The shared cycle data is not modified
+
+    signals_data = {
+        "confidence": 0.7,
+        "individual_signals": {
+            "momentum": {"direction": "BUY", "confidence": 0.8, "strength": 0.5},
+            "technical_analysis": {"direction": "BUY", "confidence": 60, "strength": 0.4},
+            "news_sentiment": {"direction": "HOLD", "confidence": 0.5, "error": "timeout"},
+        }
+    }
+    assert engine._apply_strategy_learning(signals_data, None, "moderate") is signals_data
+    enhanced = engine._apply_strategy_learning(signals_data, {"momentum": 1.1, "technical": 0.5}, "conservative")
+    assert abs(enhanced["confidence"] - (0.8 * 1.1 + 0.6 * 0.5) / 2) < 1e-9
+    moderate = engine._apply_strategy_learning(signals_data, {"momentum": 1.1, "technical": 0.5}, "moderate")
+    assert abs(moderate["confidence"] - enhanced["confidence"] - 0.085) < 1e-9
+
+    print("\n✅ Signal Vector Test Complete!")
+
+if __name__ == "__main__":
+    test_signal_result()
+    test_vector_aggregation()
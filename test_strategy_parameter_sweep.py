@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Test Strategy Parameter Sweep
+Vectorized grid evaluation over a synthetic signal matrix
+"""
+
+import os
+import tempfile
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from src.core.strategy_parameter_sweep import SignalMatrix, StrategyParameterSweep, simulate_trade_returns
+
+def _synthetic_matrix(n: int = 600, seed: int = 7) -> SignalMatrix:
+    """High-confidence signals with 4+ agreeing signals predict the next move; the rest are noise"""
+    rng = np.random.default_rng(seed)
+    start = datetime(2026, 1, 5, 9, 45)
+    direction = rng.choice([-1, 0, 1], size=n)
+    confidence = rng.uniform(0.5, 0.9, size=n)
+    agreeing = rng.integers(1, 9, size=n)
+    informative = (confidence > 0.75) & (agreeing >= 4)
+
+    moves = rng.normal(0, 0.002, size=n)
+    moves[1:] += np.where(informative[:-1], direction[:-1] * 0.01, -direction[:-1] * 0.004)
+    price = 100 * np.cumprod(1 + moves)
+
+    rows = [(start + timedelta(minutes=15 * i), int(direction[i]), float(confidence[i]), int(agreeing[i]), float(price[i]))
+            for i in range(n)]
+    return SignalMatrix.from_rows(rows)
+
+def test_trade_returns():
+    """Exits trigger on the profit target / stop loss, otherwise after the hold limit"""
+    rows = [(datetime(2026, 1, 5, 10) + timedelta(minutes=15 * i), d, 0.8, 5, p)
+            for i, (d, p) in enumerate([(1, 100.0), (-1, 101.0), (1, 130.0), (0, 131.0), (1, 131.0)])]
+    trades = simulate_trade_returns(SignalMatrix.from_rows(rows), leverage=4.0, profit_target=1.0,
+                                    stop_loss=0.5, max_hold_cycles=2)
+
+    # Entry 0 (BUY @100): +1% then +30% -> target hit at cycle 2 (+120%)
+    # Entry 1 (SELL @101): price jumps to 130 -> stop loss (capped at -100%)
+    # Entry 4 has no forward data and is not tradeable
+    assert trades["tradeable"].tolist().count(True) == 3
+    assert np.isclose(trades["returns"].max(), 4.0 * 0.30)
+    assert trades["returns"].min() == -1.0
+
+def test_parameter_sweep():
+    """Sweep ranks the informative region first and parallel results match serial ones"""
+    print("🧪 Testing Strategy Parameter Sweep")
+    print("=" * 60)
+
+    matrix = _synthetic_matrix()
+    grid = {
+        "confidence_threshold": np.round(np.arange(0.50, 0.86, 0.05), 2),
+        "min_signals_required": range(1, 7),
+        "position_size_pct": [0.10, 0.20, 0.30]
+    }
+
+    serial = StrategyParameterSweep(matrix, workers=1, chunk_size=32).run(grid)
+    parallel = StrategyParameterSweep(matrix, workers=2, chunk_size=32).run(grid)
+
+    assert len(serial) == 8 * 6 * 3
+    assert np.allclose(serial["sharpe_ratio"].values, parallel["sharpe_ratio"].values)
+
+    best = serial.iloc[0]
+    print(serial.head(5)[["confidence_threshold", "min_signals_required", "position_size_pct",
+                          "trades", "sharpe_ratio", "max_drawdown", "kelly_growth"]])
+    assert best["confidence_threshold"] >= 0.75
+    assert best["min_signals_required"] >= 4
+    assert best["sharpe_ratio"] > 0 and best["kelly_fraction"] > 0
+
+    # Loose parameters trade the noise and lose
+    loose = serial[(serial["confidence_threshold"] == 0.5) & (serial["min_signals_required"] == 1)]
+    assert (loose["sharpe_ratio"] < best["sharpe_ratio"]).all()
+
+    by_drawdown = StrategyParameterSweep(matrix, workers=1).run(grid, rank_by="drawdown")
+    eligible = by_drawdown[by_drawdown["eligible"]]
+    assert eligible["max_drawdown"].is_monotonic_increasing
+
+    configs = StrategyParameterSweep.to_strategy_configs(serial, top=2)
+    assert list(configs) == ["sweep_1", "sweep_2"]
+    assert configs["sweep_1"].confidence_threshold == best["confidence_threshold"]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "signal_matrix.npz")
+        matrix.save(path)
+        loaded = SignalMatrix.load(path)
+        assert len(loaded) == len(matrix)
+        assert np.array_equal(loaded.price, matrix.price)
+
+    print("\n✅ Strategy Parameter Sweep Test Complete!")
+
+if __name__ == "__main__":
+    test_trade_returns()
+    test_parameter_sweep()
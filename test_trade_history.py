@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Test Trade History
+Bounded rings of slotted records, with full payloads loaded lazily from SQLite
+"""
+
+import os
+import tempfile
+from datetime import datetime
+
+from src.core.options_paper_trader import OptionsPaperTrader
+from src.core.options_prediction_engine import OptionsPredictionEngine
+from src.core.trade_history import ClosedPosition, HistoryRing, HistoryStore, PredictionRecord
+
+def _closed_position(prediction_id: str, pnl: float) -> dict:
+    return {
+        'prediction': {'prediction_id': prediction_id, 'contract_symbol': 'RTX250620C00150000', 'action': 'BUY_TO_OPEN',
+                       'direction': 'BUY', 'confidence': 0.8, 'contracts': 1, 'signals_data': {'momentum': {'strength': 0.4}}},
+        'execution': {'total_cost': 200.0, 'contracts': 1},
+        'entry_timestamp': datetime(2026, 10, 12, 10, 0),
+        'outcome': {'prediction_id': prediction_id, 'exit_timestamp': datetime(2026, 10, 13, 15, 0), 'exit_price': 2.4,
+                    'exit_reason': 'PROFIT_TARGET', 'days_held': 1, 'entry_cost': 200.0, 'exit_proceeds': 200.0 + pnl,
+                    'gross_pnl': pnl, 'commissions_total': 1.3, 'net_pnl': pnl, 'pnl_percentage': pnl / 200.0,
+                    'stock_price_exit': 151.0, 'stock_move_pct': 0.01, 'prediction_accuracy': 1.0}
+    }
+
+def test_history_ring():
+    """Rings stay bounded, slice like lists and trim from the oldest end"""
+    print("🧪 Testing Trade History")
+    print("=" * 60)
+
+    ring = HistoryRing(maxlen=3)
+    for i in range(10):
+        ring.append(PredictionRecord(prediction_id=f"P{i}"))
+    assert len(ring) == 3 and ring.appended == 10
+    assert [r.prediction_id for r in ring] == ["P7", "P8", "P9"]
+    assert [r.prediction_id for r in ring[-2:]] == ["P8", "P9"]
+    assert ring[0].prediction_id == "P7" and ring[1:2][0].prediction_id == "P8"
+    assert ring.trim(1) == 2 and ring[-1].prediction_id == "P9"
+    assert ring.details("P9") is None  # No loader
+
+    record = PredictionRecord(prediction_id="X", confidence=0.9)
+    assert not hasattr(record, "__dict__")
+    assert record.to_dict()["confidence"] == 0.9
+
+def test_persisted_details():
+    """Closed positions and predictions keep summaries in memory, full rows in SQLite"""
+    with tempfile.TemporaryDirectory() as tmp:
+        trader = OptionsPaperTrader(db_path=os.path.join(tmp, "performance.db"), closed_history=2)
+        for i, pnl in enumerate([40.0, -15.0, 22.0]):
+            position = _closed_position(f"P{i}", pnl)
+            trader._store_outcome(position['outcome'])
+            trader.closed_positions.append(ClosedPosition.from_position(position))
+
+        assert len(trader.closed_positions) == 2
+        assert trader.get_performance_summary()['closed_positions_count'] == 3
+        latest = trader.closed_positions[-1]
+        assert latest.net_pnl == 22.0 and latest.contract_symbol == 'RTX250620C00150000'
+
+        details = trader.closed_positions.details("P0")  # Evicted from the ring, still in the database
+        assert details['outcome']['net_pnl'] == 40.0 and details['outcome']['exit_reason'] == 'PROFIT_TARGET'
+        assert trader.load_closed_position("missing") is None
+
+        engine = OptionsPredictionEngine(history_db=os.path.join(tmp, "predictions.db"))
+        store = engine.history_store
+        for i in range(3):
+            prediction = {'prediction_id': f"RTX_{i}", 'timestamp': f"2026-10-12T10:0{i}:00", 'action': 'BUY_TO_OPEN',
+                          'confidence': 0.8, 'signals_data': {'momentum': {'strength': 0.4}}}
+            engine.prediction_history.append(PredictionRecord.from_prediction(prediction))
+            store.save(prediction['prediction_id'], prediction, prediction['timestamp'])
+
+        recent = engine.get_recent_predictions(2)
+        assert [p['prediction_id'] for p in recent] == ["RTX_1", "RTX_2"]
+        assert recent[-1]['signals_data']['momentum']['strength'] == 0.4  # Full payload, loaded on demand
+        assert [p['prediction_id'] for p in HistoryStore(store.db_path, store.table).recent(2)] == ["RTX_1", "RTX_2"]
+        assert engine.trim_memory() == 0 and len(engine.prediction_history) == 3
+
+    print("\n✅ Trade History Test Complete!")
+
+if __name__ == "__main__":
+    test_history_ring()
+    test_persisted_details()